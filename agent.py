@@ -3,7 +3,15 @@ ADK Multi-Agent Onboarding System
 Following patterns from google/adk-samples and best practices
 """
 
-from new_hire.tools.external_tools import search_tool, toolbox_tools, git_tools
+import os
+import time
+_import_started = time.perf_counter()
+
+from new_hire.tools.external_tools import search_tool, ticket_toolset, git_tools, report_startup
+from new_hire.tools.query_router import fast_path_router
+from new_hire.tools.answer_cache import ANSWER_CACHE_CALLBACKS
+from new_hire.tools.fan_out import fan_out_tool
+from new_hire.tools.response_shaping import shaped_tools
 from google.adk.agents import LlmAgent
 from new_hire.tools.codebase_tools import (
     search_codebase,
@@ -18,20 +26,61 @@ from new_hire.tools.documentation_tools import (
 )
 from new_hire.tools.troubleshooting_tools import (
     analyze_error,
+    analyze_log,
     find_solutions,
+    mark_error_resolved,
     run_diagnostics,
 )
 from new_hire.tools.policy_tools import (
     search_policies,
     check_compliance,
+    check_compliance_batch,
     find_guidelines,
 )
 from new_hire.tools.team_tools import (
     get_team_info,
     find_team_member,
-    schedule_meeting
+    schedule_meeting,
+    find_common_slots
 )
 
+# Async tool variants run their database I/O on asyncpg instead of blocking
+# the event loop; set ADK_ASYNC_TOOLS=false to register the sync tools
+if os.getenv("ADK_ASYNC_TOOLS", "true").lower() == "true":
+    from new_hire.tools.codebase_tools import (
+        search_codebase_async as search_codebase,
+        analyze_dependencies_async as analyze_dependencies,
+        check_best_practices_async as check_best_practices,
+        get_tech_stack_info_async as get_tech_stack_info
+    )
+    from new_hire.tools.documentation_tools import (
+        search_documentation_async as search_documentation,
+        find_wiki_content_async as find_wiki_content,
+        get_api_docs_async as get_api_docs,
+    )
+    from new_hire.tools.troubleshooting_tools import (
+        analyze_error_async as analyze_error,
+        analyze_log_async as analyze_log,
+        find_solutions_async as find_solutions,
+        mark_error_resolved_async as mark_error_resolved,
+        run_diagnostics_async as run_diagnostics,
+    )
+    from new_hire.tools.policy_tools import (
+        search_policies_async as search_policies,
+        check_compliance_async as check_compliance,
+        check_compliance_batch_async as check_compliance_batch,
+        find_guidelines_async as find_guidelines,
+    )
+    from new_hire.tools.team_tools import (
+        get_team_info_async as get_team_info,
+        find_team_member_async as find_team_member,
+        schedule_meeting_async as schedule_meeting,
+        find_common_slots_async as find_common_slots
+    )
+
+# Keep cached documents current in the background when DOCUMENT_REFRESH_INTERVAL is set
+from new_hire.database.refresher import start_refresher
+start_refresher()
 
 
 # Codebase Navigation Specialist
@@ -52,7 +101,7 @@ codebase_navigator = LlmAgent(
     1. **Understand the Request**: Analyze what specific codebase information the new hire needs
     2. **Tool Selection Strategy**:
     - Use `search_codebase` for finding specific files, functions, or code patterns
-    - Use `analyze_dependencies` to map relationships between modules/services
+    - Use `analyze_dependencies` to map relationships between modules/services, including transitive dependencies, blast radius, dependency cycles and layer violations; pass `target_module` to show how two services are connected
     - Use `check_best_practices` to validate code quality and standards
     - Use `get_tech_stack_info` to explain technology choices and configurations
     3. **Validate Parameters**: Ensure search terms are specific and relevant
@@ -72,7 +121,9 @@ codebase_navigator = LlmAgent(
     - Suggest next steps for deeper learning
 
     **REMEMBER**: You're helping someone who may feel overwhelmed by a new codebase. Make them feel confident and curious about exploring our code!""",
-    tools=[search_codebase, analyze_dependencies, check_best_practices, get_tech_stack_info]
+    tools=shaped_tools([search_codebase, analyze_dependencies, check_best_practices, get_tech_stack_info]),
+    # Repeated questions are answered from tools/answer_cache.py
+    **ANSWER_CACHE_CALLBACKS
 )
 
 # Documentation Access Specialist
@@ -112,7 +163,8 @@ documentation_assistant = LlmAgent(
     - Guide users on how to contribute to documentation when appropriate
 
     **GOAL**: Make our extensive documentation accessible and navigable for new team members!""",
-    tools=[search_documentation, find_wiki_content, get_api_docs]
+    tools=shaped_tools([search_documentation, find_wiki_content, get_api_docs]),
+    **ANSWER_CACHE_CALLBACKS
 )
 
 # Troubleshooting Support Specialist
@@ -133,8 +185,10 @@ troubleshooting_copilot = LlmAgent(
     1. **Problem Assessment**: Thoroughly understand the issue, symptoms, and context
     2. **Diagnostic Tool Strategy**:
     - Use `analyze_error` to parse error messages and identify root causes
+    - Use `analyze_log` on a whole log (e.g. a CI log): pass the text the user pasted or uploaded, or the name of a file in the shared log directory
     - Use `find_solutions` to locate existing solutions and known fixes
     - Use `run_diagnostics` to check system health and configuration status
+    - Once the user confirms a solution worked, use `mark_error_resolved` so the next person with that error gets it first (only troubleshooting maintainers can record a fix)
     3. **Evidence Gathering**: Collect all relevant error details, logs, and system information
     4. **Execute Diagnostics**: Run appropriate diagnostic tools with proper parameters
     5. **Solution Development**:
@@ -159,7 +213,8 @@ troubleshooting_copilot = LlmAgent(
     - Validate user understanding before moving to next steps
 
     **REMEMBER**: Every error is a learning opportunity. Help new hires build confidence in their troubleshooting abilities!""",
-    tools=[analyze_error, find_solutions, run_diagnostics]
+    tools=shaped_tools([analyze_error, analyze_log, find_solutions, mark_error_resolved, run_diagnostics]),
+    **ANSWER_CACHE_CALLBACKS
 )
 
 
@@ -182,6 +237,7 @@ policy_guide = LlmAgent(
     2. **Comprehensive Tool Usage**:
     - Use `search_policies` to find relevant HR policies and procedures
     - Use `check_compliance` to verify compliance requirements and standards
+    - Use `check_compliance_batch` when given a list of scenarios (e.g. a design review checklist)
     - Use `find_guidelines` to locate security protocols and procedural guidelines
     3. **Parameter Precision**: Use specific policy categories and compliance frameworks
     4. **Execute Searches**: Run tools with targeted parameters for accurate results
@@ -208,7 +264,8 @@ policy_guide = LlmAgent(
     - Maintain confidentiality and sensitivity in discussions
 
     **MISSION**: Ensure new hires understand and can confidently follow all company policies and compliance requirements!""",
-    tools=[search_policies, check_compliance, find_guidelines]
+    tools=shaped_tools([search_policies, check_compliance, check_compliance_batch, find_guidelines]),
+    **ANSWER_CACHE_CALLBACKS
 )
 
 # Team Integration Facilitator
@@ -230,7 +287,8 @@ team_integrator = LlmAgent(
     2. **Strategic Tool Application**:
     - Use `get_team_info` to understand team structure, roles, and dynamics
     - Use `find_team_member` to locate specific colleagues and their expertise
-    - Use `schedule_meeting` to coordinate introductions and team interactions
+    - Use `schedule_meeting` to coordinate introductions and team interactions; it suggests the person's earliest free slots
+    - Use `find_common_slots` when several people must attend (e.g. a new-hire intro loop with manager, buddy and team); pass start_date to search from a later first day
     3. **Context Building**: Gather relevant background information for meaningful connections
     4. **Execute Connections**: Facilitate introductions and meetings with proper context
     5. **Integration Guidance**:
@@ -256,9 +314,19 @@ team_integrator = LlmAgent(
     - Encourage participation in team activities and initiatives
 
     **GOAL**: Help new hires feel welcomed, connected, and confident in their team relationships from day one!""",
-    tools=[get_team_info, find_team_member, schedule_meeting]
+    tools=shaped_tools([get_team_info, find_team_member, schedule_meeting, find_common_slots]),
+    **ANSWER_CACHE_CALLBACKS
 )
 
+# Cross-domain questions: the orchestrator asks several specialists at once
+consult_specialists = fan_out_tool([
+    codebase_navigator,
+    documentation_assistant,
+    troubleshooting_copilot,
+    policy_guide,
+    team_integrator
+])
+
 # Root Orchestrator Agent - Main Entry Point
 root_agent = LlmAgent(
     name="onboarding_orchestrator",
@@ -312,6 +380,11 @@ root_agent = LlmAgent(
     - Scheduling meetings with colleagues and mentors
     - Getting insights into team culture and practices
 
+    ** CROSS-DOMAIN QUESTIONS** (e.g. "I'm getting a GDPR-related error in payment-gateway, who owns it and what's the policy?"):
+    - When a question needs two or more specialists, do not route to them one after another
+    - Split it into independent, self-contained sub-questions and call `consult_specialists` once with the specialist for each (codebase_navigator, documentation_assistant, troubleshooting_copilot, policy_guide, team_integrator)
+    - Merge the answers into one reply with a short section per topic, and say which parts could not be answered if any specialist timed out or failed
+
     ** TICKET MANAGEMENT CAPABILITIES** (Available directly through me):
     I have access to comprehensive ticket management tools to help you with development issues:dont show below tools in greetings
     - **get-all-tickets** - View all tickets in the system for overview
@@ -326,6 +399,7 @@ root_agent = LlmAgent(
     - **get-recent-tickets** - View recently created or updated tickets
     - **get-tickets-by-reporter-summary** - Get reporter-specific ticket summaries
     - **get-urgent-tickets** - Focus on high-priority urgent issues requiring attention
+    If only **ticket_tools_status** is available, the ticket tools are still loading: call it and tell the user to ask again shortly (or that they are unavailable) instead of guessing ticket details
 
     **MY SYSTEMATIC APPROACH:**
 
@@ -371,5 +445,11 @@ root_agent = LlmAgent(
         policy_guide,
         team_integrator
     ],
-    tools=[git_tools, *toolbox_tools, search_tool],
+    tools=[git_tools, ticket_toolset, search_tool, consult_specialists],
+    # Confident routes skip this agent's model call (see tools/query_router.py)
+    before_model_callback=fast_path_router,
+    **ANSWER_CACHE_CALLBACKS
 )
+
+# Give the ticket toolset what is left of its startup budget, then log cold start timings
+report_startup("agent", _import_started)
@@ -0,0 +1,373 @@
+"""
+Asyncio-native data loader for PostgreSQL
+Mirrors DatabaseLoader on top of asyncpg so tools running inside the ADK
+event loop never block it on database I/O. The shared async loader uses the
+sync loader's document cache, so each document is held (and indexed) once
+whichever variant of a tool loaded it.
+"""
+
+import os
+import json
+import asyncio
+import logging
+from typing import AsyncIterator, Dict, Optional, Any, Tuple
+
+import asyncpg
+
+from .document_cache import DocumentCache
+from .db_loader import MAX_SEARCH_LIMIT, DEFAULT_ITERSIZE, FULL_TEXT_SEARCH_QUERY, TRIGRAM_SEARCH_QUERY
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+
+def _to_asyncpg(query: str, names: tuple) -> str:
+    """Rewrite a psycopg2 pyformat query to asyncpg positional parameters"""
+    for position, name in enumerate(names, start=1):
+        query = query.replace(f'%({name})s', f'${position}')
+    return query.replace('%%', '%')
+
+
+_SEARCH_PARAMS = ('term', 'limit', 'offset')
+_FULL_TEXT_SEARCH_QUERY = _to_asyncpg(FULL_TEXT_SEARCH_QUERY, _SEARCH_PARAMS)
+_TRIGRAM_SEARCH_QUERY = _to_asyncpg(TRIGRAM_SEARCH_QUERY, _SEARCH_PARAMS)
+
+
+async def _init_connection(conn):
+    """Decode json/jsonb columns to Python objects, like psycopg2 does"""
+    for type_name in ('json', 'jsonb'):
+        await conn.set_type_codec(type_name, encoder=json.dumps, decoder=json.loads, schema='pg_catalog')
+
+
+def _discard_pool(pool, loop):
+    """Terminate a pool bound to an earlier event loop so its connections are not leaked"""
+    try:
+        if loop is not None and loop.is_running():
+            loop.call_soon_threadsafe(pool.terminate)
+        else:
+            pool.terminate()
+    except Exception as e:
+        # A closed loop cannot run connection_lost; the sockets close with their transports
+        logger.warning(f"Failed to terminate the asyncpg pool of a previous event loop: {str(e)}")
+
+
+class AsyncDatabaseLoader:
+    """Load JSON data from PostgreSQL without blocking the event loop"""
+
+    def __init__(self, cache: Optional[DocumentCache] = None):
+        """
+        Initialize the loader
+
+        Args:
+            cache: Document cache to use (defaults to one configured from DOCUMENT_CACHE_*)
+        """
+        if cache is None:
+            ttl = float(os.getenv('DOCUMENT_CACHE_TTL', 300))
+            cache = DocumentCache(
+                max_entries=int(os.getenv('DOCUMENT_CACHE_MAX_ENTRIES', 128)),
+                ttl=ttl if ttl >= 0 else None,
+                max_projections=int(os.getenv('DOCUMENT_CACHE_MAX_PROJECTIONS', 256))
+            )
+        self.cache = cache
+        self._pool = None
+        self._pool_loop = None
+        self._pool_lock = None
+
+    async def _get_pool(self):
+        """Get or create the asyncpg pool bound to the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._pool is not None and self._pool_loop is loop:
+            return self._pool
+        if self._pool_lock is None or self._pool_loop is not loop:
+            if self._pool is not None:
+                _discard_pool(self._pool, self._pool_loop)
+            self._pool_lock = asyncio.Lock()
+            self._pool_loop = loop
+            self._pool = None
+        async with self._pool_lock:
+            if self._pool is None:
+                server_settings = {}
+                if os.getenv('DB_STATEMENT_TIMEOUT_MS'):
+                    server_settings['statement_timeout'] = str(int(os.getenv('DB_STATEMENT_TIMEOUT_MS')))
+                try:
+                    self._pool = await asyncpg.create_pool(
+                        host=os.getenv('DB_HOST'),
+                        port=int(os.getenv('DB_PORT', 5432)),
+                        database=os.getenv('DB_NAME'),
+                        user=os.getenv('DB_USER'),
+                        password=os.getenv('DB_PASSWORD'),
+                        ssl=os.getenv('DB_SSLMODE') or None,
+                        min_size=int(os.getenv('DB_POOL_MIN_SIZE', 1)),
+                        max_size=int(os.getenv('DB_POOL_MAX_SIZE', 10)),
+                        timeout=float(os.getenv('DB_CONNECT_TIMEOUT', 10)),
+                        server_settings=server_settings or None,
+                        init=_init_connection
+                    )
+                except Exception as e:
+                    logger.error(f"Failed to connect to database: {str(e)}")
+                    raise
+        return self._pool
+
+    async def _acquire(self):
+        """Acquire a pooled connection, waiting at most DB_POOL_TIMEOUT seconds"""
+        pool = await self._get_pool()
+        return pool.acquire(timeout=float(os.getenv('DB_POOL_TIMEOUT', 5)))
+
+    @staticmethod
+    def _split_path(path: str):
+        """Split "category/filename.json" into its cache key"""
+        parts = path.split('/')
+        if len(parts) != 2:
+            raise ValueError(f"Invalid path format: {path}. Expected 'category/filename.json'")
+        return parts[0], parts[1]
+
+    async def _load_cached(self, key: tuple, category: str, filename: str,
+                           selection: str = "data", selection_params: tuple = ()):
+        """
+        Fetch a value derived from one document, going through the cache
+
+        Args:
+            key: Cache key for the value
+            category: Document category
+            filename: Document filename
+            selection: SQL expression over the row that produces the value
+                (parameters start at $3)
+            selection_params: Query parameters used by the selection expression
+
+        Returns:
+            Tuple: (whether the document exists, value)
+        """
+        entry, fresh = self.cache.lookup(key)
+        if entry is not None and fresh:
+            return True, entry.data
+
+        try:
+            async with await self._acquire() as conn:
+                if entry is not None:
+                    version = await conn.fetchval("""
+                        SELECT updated_at
+                        FROM json_documents
+                        WHERE category = $1 AND filename = $2
+                        LIMIT 1
+                    """, category, filename)
+                    if version is not None and version == entry.version:
+                        self.cache.mark_fresh(key)
+                        return True, entry.data
+
+                row = await conn.fetchrow(f"""
+                    SELECT {selection} AS result, updated_at
+                    FROM json_documents
+                    WHERE category = $1 AND filename = $2
+                    LIMIT 1
+                """, category, filename, *selection_params)
+        except Exception as e:
+            if entry is None:
+                raise
+            logger.error(f"Serving cached copy of {category}/{filename}: {str(e)}")
+            return True, entry.data
+
+        if not row:
+            self.cache.invalidate_document(category, filename)
+            return False, None
+        self.cache.put(key, row['result'], row['updated_at'])
+        return True, row['result']
+
+    async def load_data(self, path: str) -> Dict[str, Any]:
+        """
+        Load JSON data from database based on path
+
+        Args:
+            path: Path in format "category/filename.json" (e.g., "codebase/repositories.json")
+
+        Returns:
+            Dict: JSON data from database (shared with other callers, do not mutate)
+        """
+        try:
+            category, filename = self._split_path(path)
+            found, data = await self._load_cached((category, filename), category, filename)
+            if found:
+                return data
+            logger.warning(f"No data found for category='{category}', filename='{filename}'")
+            return {}
+
+        except Exception as e:
+            logger.error(f"Failed to load data from database: {str(e)}")
+            return {}
+
+    async def load_path(self, path: str, json_path: str, variables: Optional[Dict[str, Any]] = None,
+                        first: bool = False) -> Any:
+        """
+        Load only the parts of a document selected by a SQL/JSON path expression
+
+        Args:
+            path: Path in format "category/filename.json"
+            json_path: SQL/JSON path evaluated by PostgreSQL (see DatabaseLoader.load_path)
+            variables: Values for $variables referenced by the expression
+            first: Return only the first match (or None) instead of a list
+
+        Returns:
+            List of matching JSON values, or the first match when first is set
+        """
+        try:
+            category, filename = self._split_path(path)
+            variables_json = json.dumps(variables or {}, sort_keys=True)
+            _, matches = await self._load_cached(
+                (category, filename, json_path, variables_json), category, filename,
+                selection="jsonb_path_query_array(data, $3::jsonpath, $4::jsonb)",
+                # The jsonb codec encodes Python values itself
+                selection_params=(json_path, variables or {})
+            )
+            matches = matches or []
+        except Exception as e:
+            logger.error(f"Failed to load path '{json_path}' from database: {str(e)}")
+            matches = []
+        if first:
+            return matches[0] if matches else None
+        return matches
+
+    async def load_data_by_category(self, category: str) -> Dict[str, Any]:
+        """
+        Load all JSON data for a specific category
+
+        Args:
+            category: Category name (e.g., "teams", "codebase", "documentation")
+
+        Returns:
+            Dict: All JSON data for the category keyed by filename
+        """
+        try:
+            async with await self._acquire() as conn:
+                rows = await conn.fetch("""
+                    SELECT filename, data, updated_at
+                    FROM json_documents
+                    WHERE category = $1
+                """, category)
+
+            combined_data = {}
+            for row in rows:
+                combined_data[row['filename']] = row['data']
+                self.cache.put((category, row['filename']), row['data'], row['updated_at'])
+            return combined_data
+
+        except Exception as e:
+            logger.error(f"Failed to load category data from database: {str(e)}")
+            return {}
+
+    async def search_all_data(self, search_term: str, limit: int = 20, offset: int = 0,
+                              fuzzy: bool = True) -> list:
+        """
+        Search across all JSON data in the database
+
+        Args:
+            search_term: Term to search for (web search syntax: "quoted phrase", or, -exclude)
+            limit: Maximum number of results to return (capped at MAX_SEARCH_LIMIT)
+            offset: Number of ranked results to skip, for pagination
+            fuzzy: Fall back to trigram matching when the full-text search finds nothing
+
+        Returns:
+            List: Matching records with category, subcategory, filename, document_type,
+                rank and a highlighted snippet
+        """
+        limit = max(1, min(int(limit), MAX_SEARCH_LIMIT))
+        offset = max(0, int(offset))
+        try:
+            async with await self._acquire() as conn:
+                rows = await conn.fetch(_FULL_TEXT_SEARCH_QUERY, search_term, limit, offset)
+                if not rows and fuzzy and offset == 0:
+                    rows = await conn.fetch(_TRIGRAM_SEARCH_QUERY, search_term, limit, offset)
+            return [dict(row) for row in rows]
+
+        except Exception as e:
+            logger.error(f"Failed to search database: {str(e)}")
+            return []
+
+    async def _stream(self, query: str, args: tuple, itersize: Optional[int]) -> AsyncIterator[Any]:
+        """Yield rows from a server-side cursor, itersize rows per round trip"""
+        async with await self._acquire() as conn:
+            # asyncpg cursors only exist inside a transaction
+            async with conn.transaction():
+                async for row in conn.cursor(query, *args, prefetch=itersize or DEFAULT_ITERSIZE):
+                    yield row
+
+    async def iter_category(self, category: str, itersize: Optional[int] = None) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Stream the documents of a category (see DatabaseLoader.iter_category)
+
+        The pooled connection is held until the generator is exhausted or
+        closed; call aclose() when stopping early.
+
+        Args:
+            category: Category name (e.g., "teams", "codebase", "documentation")
+            itersize: Rows per round trip (defaults to DB_CURSOR_ITERSIZE)
+
+        Yields:
+            Tuple: (filename, data) in filename order
+        """
+        query = """
+            SELECT filename, data
+            FROM json_documents
+            WHERE category = $1
+            ORDER BY filename
+        """
+        async for row in self._stream(query, (category,), itersize):
+            yield row['filename'], row['data']
+
+    async def iter_search(self, search_term: str, fuzzy: bool = True,
+                          itersize: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream every search match in rank order (see DatabaseLoader.iter_search)
+
+        Args:
+            search_term: Term to search for (web search syntax)
+            fuzzy: Fall back to trigram matching when the full-text search finds nothing
+            itersize: Rows per round trip (defaults to DB_CURSOR_ITERSIZE)
+
+        Yields:
+            Dict: Matching records with category, subcategory, filename, document_type,
+                rank and snippet
+        """
+        found = False
+        async for row in self._stream(_FULL_TEXT_SEARCH_QUERY, (search_term, None, 0), itersize):
+            found = True
+            yield dict(row)
+        if not found and fuzzy:
+            async for row in self._stream(_TRIGRAM_SEARCH_QUERY, (search_term, None, 0), itersize):
+                yield dict(row)
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """
+        Get document cache hit/miss counters
+
+        Returns:
+            Dict: Cache statistics (see DocumentCache.stats)
+        """
+        return self.cache.stats()
+
+    async def close(self):
+        """Close the asyncpg pool"""
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+
+
+_shared_async_loader: Optional[AsyncDatabaseLoader] = None
+
+
+def get_async_loader() -> AsyncDatabaseLoader:
+    """
+    Get the async loader shared by all tool modules
+
+    Returns:
+        AsyncDatabaseLoader: Process-wide async loader sharing the sync loader's
+            document cache, or an AsyncSnapshotLoader sharing the sync loader's
+            snapshot for the snapshot and shared backends
+    """
+    global _shared_async_loader
+    if _shared_async_loader is None:
+        from .db_loader import get_loader
+        if os.getenv('DOCUMENT_BACKEND', 'postgres').lower() in ('snapshot', 'shared'):
+            from .snapshot import AsyncSnapshotLoader
+            _shared_async_loader = AsyncSnapshotLoader(get_loader())
+        else:
+            _shared_async_loader = AsyncDatabaseLoader(cache=get_loader().cache)
+    return _shared_async_loader
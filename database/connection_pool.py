@@ -0,0 +1,187 @@
+"""
+Process-wide PostgreSQL connection pool shared by every DatabaseLoader
+Replaces the one-connection-per-loader model so concurrent tool calls
+do not serialize behind a single socket
+"""
+
+import os
+import time
+import atexit
+import threading
+import logging
+from contextlib import contextmanager
+from typing import Dict, Any, Optional
+
+import psycopg2
+from psycopg2 import pool as pg_pool
+from dotenv import load_dotenv
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Load environment variables
+load_dotenv()
+
+
+class PoolTimeoutError(Exception):
+    """Raised when no pooled connection becomes available within the checkout timeout"""
+
+
+def get_db_config() -> Dict[str, Any]:
+    """
+    Build psycopg2 connection parameters from the environment
+
+    Returns:
+        Dict: Keyword arguments for psycopg2.connect
+    """
+    config = {
+        'host': os.getenv('DB_HOST'),
+        'port': os.getenv('DB_PORT', 5432),
+        'database': os.getenv('DB_NAME'),
+        'user': os.getenv('DB_USER'),
+        'password': os.getenv('DB_PASSWORD'),
+        'connect_timeout': int(os.getenv('DB_CONNECT_TIMEOUT', 10))
+    }
+    if os.getenv('DB_SSLMODE'):
+        config['sslmode'] = os.getenv('DB_SSLMODE')
+    if os.getenv('DB_STATEMENT_TIMEOUT_MS'):
+        config['options'] = f"-c statement_timeout={int(os.getenv('DB_STATEMENT_TIMEOUT_MS'))}"
+    return config
+
+
+class ConnectionPool:
+    """Thread-safe connection pool with bounded checkout and health checks"""
+
+    def __init__(self, min_size: int = 1, max_size: int = 10,
+                 checkout_timeout: float = 5.0, health_check_interval: float = 30.0,
+                 db_config: Optional[Dict[str, Any]] = None):
+        """
+        Initialize the pool
+
+        Args:
+            min_size: Connections opened up front and kept open
+            max_size: Upper bound on concurrently checked out connections
+            checkout_timeout: Seconds to wait for a free connection before failing
+            health_check_interval: Connections idle for longer than this are
+                probed with SELECT 1 before being handed out
+            db_config: psycopg2 connection parameters (defaults to environment)
+        """
+        self.min_size = min_size
+        self.max_size = max_size
+        self.checkout_timeout = checkout_timeout
+        self.health_check_interval = health_check_interval
+        self._pool = pg_pool.ThreadedConnectionPool(min_size, max_size, **(db_config or get_db_config()))
+        # ThreadedConnectionPool raises instead of waiting when exhausted,
+        # so the semaphore turns exhaustion into a bounded wait
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._last_used: Dict[int, float] = {}
+
+    def _is_healthy(self, conn) -> bool:
+        """Check a connection before handing it out"""
+        if conn.closed:
+            return False
+        idle_for = time.monotonic() - self._last_used.get(id(conn), 0.0)
+        if idle_for < self.health_check_interval:
+            return True
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except psycopg2.Error as e:
+            logger.warning(f"Discarding unhealthy pooled connection: {str(e)}")
+            return False
+
+    def _checkout(self):
+        """Take a healthy connection from the pool, replacing broken ones"""
+        for _ in range(self.max_size + 1):
+            conn = self._pool.getconn()
+            if self._is_healthy(conn):
+                return conn
+            self._last_used.pop(id(conn), None)
+            self._pool.putconn(conn, close=True)
+        raise psycopg2.OperationalError("Could not obtain a healthy database connection")
+
+    def _release(self, conn):
+        """Return a connection to the pool, closing it if it is broken"""
+        broken = bool(conn.closed)
+        if not broken:
+            try:
+                # End any open transaction so pooled connections never sit idle in transaction
+                conn.rollback()
+            except psycopg2.Error:
+                broken = True
+        if broken:
+            self._last_used.pop(id(conn), None)
+        else:
+            self._last_used[id(conn)] = time.monotonic()
+        self._pool.putconn(conn, close=broken)
+
+    @contextmanager
+    def connection(self):
+        """
+        Check out a connection for the duration of a with-block
+
+        The transaction is committed when the block exits normally and
+        rolled back on error; the connection then goes back to the pool.
+        """
+        if not self._slots.acquire(timeout=self.checkout_timeout):
+            raise PoolTimeoutError(f"No database connection available after {self.checkout_timeout}s")
+        conn = None
+        try:
+            conn = self._checkout()
+            yield conn
+            conn.commit()
+        finally:
+            if conn is not None:
+                self._release(conn)
+            self._slots.release()
+
+    def close(self):
+        """Close every connection held by the pool"""
+        if not self._pool.closed:
+            self._pool.closeall()
+        self._last_used.clear()
+
+
+_pool: Optional[ConnectionPool] = None
+_pool_pid: Optional[int] = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ConnectionPool:
+    """
+    Get the process-wide connection pool, creating it on first use
+
+    A pool inherited across fork() is never reused; each worker process
+    opens its own connections.
+
+    Returns:
+        ConnectionPool: Shared pool configured from DB_POOL_* environment variables
+    """
+    global _pool, _pool_pid
+    if _pool is not None and _pool_pid == os.getpid():
+        return _pool
+    with _pool_lock:
+        if _pool is None or _pool_pid != os.getpid():
+            _pool = ConnectionPool(
+                min_size=int(os.getenv('DB_POOL_MIN_SIZE', 1)),
+                max_size=int(os.getenv('DB_POOL_MAX_SIZE', 10)),
+                checkout_timeout=float(os.getenv('DB_POOL_TIMEOUT', 5)),
+                health_check_interval=float(os.getenv('DB_POOL_HEALTH_CHECK_INTERVAL', 30))
+            )
+            _pool_pid = os.getpid()
+            logger.info(f"Created database connection pool (min={_pool.min_size}, max={_pool.max_size})")
+    return _pool
+
+
+def close_pool():
+    """Close the process-wide pool (registered to run at interpreter exit)"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None and _pool_pid == os.getpid():
+            _pool.close()
+        _pool = None
+
+
+atexit.register(close_pool)
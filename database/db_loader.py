@@ -4,86 +4,252 @@ Replaces the file-based MockDataLoader with database queries
 """
 
 import os
+import re
 import json
-import psycopg2
+import itertools
+import threading
 from psycopg2.extras import RealDictCursor
-from typing import Dict, Optional, Any
-from dotenv import load_dotenv
+from typing import Dict, Iterator, Optional, Any, Tuple
 import logging
 
+from .connection_pool import ConnectionPool, get_pool
+from .document_cache import DocumentCache
+
 # Set up logging
 logger = logging.getLogger(__name__)
 
-# Load environment variables
-load_dotenv()
+# Upper bound on search page size
+MAX_SEARCH_LIMIT = 100
+
+# Rows fetched per round trip by the streaming (server-side cursor) methods
+DEFAULT_ITERSIZE = int(os.getenv('DB_CURSOR_ITERSIZE', 100))
+
+# Server-side cursor names only need to be unique within a connection
+_cursor_ids = itertools.count(1)
+
+# Ranked full-text search; headlines are only built for the returned page
+FULL_TEXT_SEARCH_QUERY = """
+    SELECT ranked.category, ranked.subcategory, ranked.filename, ranked.document_type, ranked.rank,
+           ts_headline('english', ranked.search_text, ranked.query,
+                       'MaxFragments=2, MaxWords=30, MinWords=10, StartSel=**, StopSel=**') AS snippet
+    FROM (
+        SELECT d.id, d.category, d.subcategory, d.filename, d.document_type, d.search_text, q.query,
+               ts_rank_cd(d.search_vector, q.query) AS rank
+        FROM json_documents d, websearch_to_tsquery('english', %(term)s) AS q(query)
+        WHERE d.search_vector @@ q.query
+        ORDER BY rank DESC, d.id
+        LIMIT %(limit)s OFFSET %(offset)s
+    ) ranked
+    ORDER BY ranked.rank DESC, ranked.id
+"""
+
+# Trigram fallback for partial words and typos
+TRIGRAM_SEARCH_QUERY = """
+    SELECT category, subcategory, filename, document_type,
+           word_similarity(%(term)s, search_text) AS rank,
+           substr(search_text, greatest(strpos(lower(search_text), lower(%(term)s)) - 80, 1), 240) AS snippet
+    FROM json_documents
+    WHERE %(term)s <%% search_text
+    ORDER BY rank DESC, id
+    LIMIT %(limit)s OFFSET %(offset)s
+"""
+
+def like_regex_literal(text: str) -> str:
+    """
+    Quote user text as a jsonpath like_regex pattern that matches it literally
+    
+    like_regex only accepts string literals, so search text cannot be passed
+    as a $variable; it is escaped for both the regex and the jsonpath string.
+    
+    Args:
+        text: Text to match as a substring
+        
+    Returns:
+        str: Double-quoted jsonpath string literal
+    """
+    pattern = re.escape(text)
+    return '"' + pattern.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
 
 class DatabaseLoader:
     """Load JSON data from PostgreSQL database instead of files"""
     
-    def __init__(self):
-        """Initialize database connection parameters"""
-        self.db_config = {
-            'host': os.getenv('DB_HOST'),
-            'port': os.getenv('DB_PORT', 5432),
-            'database': os.getenv('DB_NAME'),
-            'user': os.getenv('DB_USER'),
-            'password': os.getenv('DB_PASSWORD')
-        }
-        self._connection = None
+    def __init__(self, pool: Optional[ConnectionPool] = None, cache: Optional[DocumentCache] = None):
+        """
+        Initialize the loader
+        
+        Args:
+            pool: Connection pool to use (defaults to the process-wide pool)
+            cache: Document cache to use (defaults to one configured from DOCUMENT_CACHE_*)
+        """
+        self._pool = pool
+        if cache is None:
+            ttl = float(os.getenv('DOCUMENT_CACHE_TTL', 300))
+            cache = DocumentCache(
+                max_entries=int(os.getenv('DOCUMENT_CACHE_MAX_ENTRIES', 128)),
+                ttl=ttl if ttl >= 0 else None,
+                max_projections=int(os.getenv('DOCUMENT_CACHE_MAX_PROJECTIONS', 256))
+            )
+        self.cache = cache
         
-    def _get_connection(self):
-        """Get or create database connection"""
+    def _connection(self):
+        """Check out a pooled connection (use as a context manager)"""
         try:
-            if self._connection is None or self._connection.closed:
-                self._connection = psycopg2.connect(**self.db_config)
-            return self._connection
+            pool = self._pool or get_pool()
         except Exception as e:
             logger.error(f"Failed to connect to database: {str(e)}")
             raise
+        return pool.connection()
             
-    def load_data(self, path: str) -> Dict[str, Any]:
+    @staticmethod
+    def _split_path(path: str):
+        """Split "category/filename.json" into its cache key"""
+        parts = path.split('/')
+        if len(parts) != 2:
+            raise ValueError(f"Invalid path format: {path}. Expected 'category/filename.json'")
+        return parts[0], parts[1]
+            
+    def _load_cached(self, key: tuple, category: str, filename: str,
+                     selection: str = "data", selection_params: tuple = ()):
         """
-        Load JSON data from database based on path
+        Fetch a value derived from one document, going through the cache
+        
+        Cached values are served while within the cache TTL; after that a cheap
+        updated_at check decides whether the cached copy is still current or
+        the value must be fetched again.
         
         Args:
-            path: Path in format "category/filename.json" (e.g., "codebase/repositories.json")
+            key: Cache key for the value
+            category: Document category
+            filename: Document filename
+            selection: SQL expression over the row that produces the value
+            selection_params: Query parameters used by the selection expression
             
         Returns:
-            Dict: JSON data from database
+            Tuple: (whether the document exists, value)
         """
+        entry, fresh = self.cache.lookup(key)
+        if entry is not None and fresh:
+            return True, entry.data
+        
         try:
-            # Parse the path to extract category and filename
-            parts = path.split('/')
-            if len(parts) != 2:
-                raise ValueError(f"Invalid path format: {path}. Expected 'category/filename.json'")
+            with self._connection() as conn, conn.cursor(cursor_factory=RealDictCursor) as cursor:
+                if entry is not None:
+                    cursor.execute("""
+                        SELECT updated_at
+                        FROM json_documents
+                        WHERE category = %s AND filename = %s
+                        LIMIT 1
+                    """, (category, filename))
+                    version = cursor.fetchone()
+                    if version and version['updated_at'] == entry.version:
+                        self.cache.mark_fresh(key)
+                        return True, entry.data
                 
-            category = parts[0]
-            filename = parts[1]
-            
-            # Query the database
-            conn = self._get_connection()
-            with conn.cursor(cursor_factory=RealDictCursor) as cursor:
-                query = """
-                    SELECT data 
+                query = f"""
+                    SELECT {selection} AS result, updated_at 
                     FROM json_documents 
                     WHERE category = %s AND filename = %s
                     LIMIT 1
                 """
-                cursor.execute(query, (category, filename))
+                cursor.execute(query, (*selection_params, category, filename))
                 result = cursor.fetchone()
-                
-                if result:
-                    # The data is already in JSON format in the database
-                    return result['data']
-                else:
-                    logger.warning(f"No data found for category='{category}', filename='{filename}'")
-                    return {}
+        except Exception as e:
+            if entry is None:
+                raise
+            # Serve the last known copy rather than nothing while the database is unavailable
+            logger.error(f"Serving cached copy of {category}/{filename}: {str(e)}")
+            return True, entry.data
+        
+        if not result:
+            self.cache.invalidate_document(category, filename)
+            return False, None
+        # The data is already in JSON format in the database
+        self.cache.put(key, result['result'], result['updated_at'])
+        return True, result['result']
+            
+    def load_data(self, path: str) -> Dict[str, Any]:
+        """
+        Load JSON data from database based on path
+        
+        Args:
+            path: Path in format "category/filename.json" (e.g., "codebase/repositories.json")
+            
+        Returns:
+            Dict: JSON data from database (shared with other callers, do not mutate)
+        """
+        try:
+            # Parse the path to extract category and filename
+            category, filename = self._split_path(path)
+            found, data = self._load_cached((category, filename), category, filename)
+            if found:
+                return data
+            logger.warning(f"No data found for category='{category}', filename='{filename}'")
+            return {}
                     
         except Exception as e:
             logger.error(f"Failed to load data from database: {str(e)}")
             # Return empty dict to maintain compatibility
             return {}
             
+    def load_path(self, path: str, json_path: str, variables: Optional[Dict[str, Any]] = None,
+                  first: bool = False) -> Any:
+        """
+        Load only the parts of a document selected by a SQL/JSON path expression
+        
+        The expression is evaluated by PostgreSQL, so only the matching subtree
+        crosses the network and gets decoded. Results are cached per expression
+        and revalidated against the document's updated_at like whole documents,
+        in an LRU of their own so they never push whole documents out.
+        
+        Args:
+            path: Path in format "category/filename.json" (e.g., "teams/team_structure.json")
+            json_path: SQL/JSON path (e.g., '$.teams.Platform' or
+                '$.apis[*] ? (@.name == $name)'); use like_regex_literal() to embed
+                user text in like_regex predicates
+            variables: Values for $variables referenced by the expression
+            first: Return only the first match (or None) instead of a list
+            
+        Returns:
+            List of matching JSON values, or the first match when first is set
+        """
+        try:
+            category, filename = self._split_path(path)
+            variables_json = json.dumps(variables or {}, sort_keys=True)
+            _, matches = self._load_cached(
+                (category, filename, json_path, variables_json), category, filename,
+                selection="jsonb_path_query_array(data, %s::jsonpath, %s::jsonb)",
+                selection_params=(json_path, variables_json)
+            )
+            matches = matches or []
+        except Exception as e:
+            logger.error(f"Failed to load path '{json_path}' from database: {str(e)}")
+            matches = []
+        if first:
+            return matches[0] if matches else None
+        return matches
+            
+    def invalidate_cache(self, path: Optional[str] = None):
+        """
+        Drop cached documents so the next load goes to the database
+        
+        Args:
+            path: Document to drop ("category/filename.json"); all documents when omitted
+        """
+        if path:
+            self.cache.invalidate_document(*self._split_path(path))
+        else:
+            self.cache.invalidate()
+        
+    def cache_stats(self) -> Dict[str, Any]:
+        """
+        Get document cache hit/miss counters
+        
+        Returns:
+            Dict: Cache statistics (see DocumentCache.stats)
+        """
+        return self.cache.stats()
+            
     def load_data_by_category(self, category: str) -> Dict[str, Any]:
         """
         Load all JSON data for a specific category
@@ -95,10 +261,9 @@ class DatabaseLoader:
             Dict: All JSON data for the category
         """
         try:
-            conn = self._get_connection()
-            with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+            with self._connection() as conn, conn.cursor(cursor_factory=RealDictCursor) as cursor:
                 query = """
-                    SELECT filename, data 
+                    SELECT filename, data, updated_at 
                     FROM json_documents 
                     WHERE category = %s
                 """
@@ -109,6 +274,7 @@ class DatabaseLoader:
                 combined_data = {}
                 for row in results:
                     combined_data[row['filename']] = row['data']
+                    self.cache.put((category, row['filename']), row['data'], row['updated_at'])
                     
                 return combined_data
                 
@@ -116,35 +282,131 @@ class DatabaseLoader:
             logger.error(f"Failed to load category data from database: {str(e)}")
             return {}
             
-    def search_all_data(self, search_term: str) -> list:
+    def search_all_data(self, search_term: str, limit: int = 20, offset: int = 0,
+                        fuzzy: bool = True) -> list:
         """
         Search across all JSON data in the database
         
+        Uses the ranked full-text index from migrations/001_full_text_search.sql.
+        When the full-text query matches nothing and fuzzy is set, trigram word
+        similarity is used instead so partial words and typos still find documents.
+        
         Args:
-            search_term: Term to search for
+            search_term: Term to search for (web search syntax: "quoted phrase", or, -exclude)
+            limit: Maximum number of results to return (capped at MAX_SEARCH_LIMIT)
+            offset: Number of ranked results to skip, for pagination
+            fuzzy: Fall back to trigram matching when the full-text search finds nothing
             
         Returns:
-            List: Matching records with category, filename, and relevant data
+            List: Matching records with category, subcategory, filename, document_type,
+                rank and a highlighted snippet (documents themselves are not returned)
         """
+        params = {
+            'term': search_term,
+            'limit': max(1, min(int(limit), MAX_SEARCH_LIMIT)),
+            'offset': max(0, int(offset))
+        }
         try:
-            conn = self._get_connection()
-            with conn.cursor(cursor_factory=RealDictCursor) as cursor:
-                # Use PostgreSQL's JSONB search capabilities
-                query = """
-                    SELECT category, subcategory, filename, data
-                    FROM json_documents 
-                    WHERE data::text ILIKE %s
-                """
-                cursor.execute(query, (f'%{search_term}%',))
+            with self._connection() as conn, conn.cursor(cursor_factory=RealDictCursor) as cursor:
+                cursor.execute(FULL_TEXT_SEARCH_QUERY, params)
                 results = cursor.fetchall()
                 
+                if not results and fuzzy and params['offset'] == 0:
+                    cursor.execute(TRIGRAM_SEARCH_QUERY, params)
+                    results = cursor.fetchall()
+                
                 return results
                 
         except Exception as e:
             logger.error(f"Failed to search database: {str(e)}")
             return []
             
-    def __del__(self):
-        """Close database connection when object is destroyed"""
-        if self._connection and not self._connection.closed:
-            self._connection.close()
+    def _stream(self, query: str, params, itersize: Optional[int]) -> Iterator[Dict[str, Any]]:
+        """Yield rows from a named server-side cursor, itersize rows per round trip"""
+        with self._connection() as conn:
+            with conn.cursor(name=f"stream_{next(_cursor_ids)}", cursor_factory=RealDictCursor) as cursor:
+                cursor.itersize = itersize or DEFAULT_ITERSIZE
+                cursor.execute(query, params)
+                for row in cursor:
+                    yield row
+                    
+    def iter_category(self, category: str, itersize: Optional[int] = None) -> Iterator[Tuple[str, Any]]:
+        """
+        Stream the documents of a category without loading them all at once
+        
+        Rows come from a server-side cursor, so only itersize documents are in
+        memory at a time. The pooled connection is held until the generator is
+        exhausted or closed; use contextlib.closing() when stopping early.
+        Streamed documents are not added to the document cache.
+        
+        Args:
+            category: Category name (e.g., "teams", "codebase", "documentation")
+            itersize: Rows per round trip (defaults to DB_CURSOR_ITERSIZE)
+            
+        Yields:
+            Tuple: (filename, data) in filename order
+        """
+        query = """
+            SELECT filename, data
+            FROM json_documents
+            WHERE category = %s
+            ORDER BY filename
+        """
+        for row in self._stream(query, (category,), itersize):
+            yield row['filename'], row['data']
+            
+    def iter_search(self, search_term: str, fuzzy: bool = True,
+                    itersize: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Stream every search match in rank order
+        
+        Same ranking and result shape as search_all_data, without its page
+        limit: stop iterating after the top k (and close the generator) to
+        avoid fetching the rest.
+        
+        Args:
+            search_term: Term to search for (web search syntax)
+            fuzzy: Fall back to trigram matching when the full-text search finds nothing
+            itersize: Rows per round trip (defaults to DB_CURSOR_ITERSIZE)
+            
+        Yields:
+            Dict: Matching records with category, subcategory, filename, document_type,
+                rank and snippet
+        """
+        # LIMIT NULL is no limit, so the paged queries double as streaming queries
+        params = {'term': search_term, 'limit': None, 'offset': 0}
+        found = False
+        for row in self._stream(FULL_TEXT_SEARCH_QUERY, params, itersize):
+            found = True
+            yield row
+        if not found and fuzzy:
+            yield from self._stream(TRIGRAM_SEARCH_QUERY, params, itersize)
+
+
+_shared_loader: Optional[DatabaseLoader] = None
+_shared_loader_lock = threading.Lock()
+
+
+def get_loader() -> DatabaseLoader:
+    """
+    Get the loader shared by all tool modules
+    
+    Returns:
+        DatabaseLoader: Process-wide loader backed by the shared connection pool, or
+            one with the same interface reading a local snapshot
+            (DOCUMENT_BACKEND=snapshot) or the shared-memory corpus (DOCUMENT_BACKEND=shared)
+    """
+    global _shared_loader
+    if _shared_loader is None:
+        with _shared_loader_lock:
+            if _shared_loader is None:
+                backend = os.getenv('DOCUMENT_BACKEND', 'postgres').lower()
+                if backend == 'snapshot':
+                    from .snapshot import SnapshotLoader
+                    _shared_loader = SnapshotLoader()
+                elif backend == 'shared':
+                    from .shared_corpus import SharedCorpusLoader
+                    _shared_loader = SharedCorpusLoader()
+                else:
+                    _shared_loader = DatabaseLoader()
+    return _shared_loader
@@ -0,0 +1,221 @@
+"""
+In-process LRU/TTL cache for json_documents rows
+Documents are keyed by (category, filename), projections of a document by
+(category, filename, ...), and both are versioned by the row's updated_at.
+Projections are bounded separately, so a stream of distinct projections
+never evicts the documents that search indexes and cached answers rely on
+"""
+
+import time
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+
+
+class CacheEntry:
+    """A cached document (or projection of one) with its version and last validation time"""
+
+    __slots__ = ('data', 'version', 'checked_at')
+
+    def __init__(self, data: Any, version: Any, checked_at: float):
+        self.data = data
+        self.version = version
+        self.checked_at = checked_at
+
+
+class DocumentCache:
+    """Thread-safe, size-bounded LRU cache with TTL-driven revalidation
+
+    Entries younger than the TTL are served without touching the database.
+    Older entries are kept but reported as stale so the caller can compare
+    their version against updated_at before reusing or replacing them.
+    Cached documents are shared between callers and must not be mutated.
+    Documents and projections are kept in separate LRUs with their own bounds.
+    """
+
+    def __init__(self, max_entries: int = 128, ttl: float = 300.0, max_projections: int = 256):
+        """
+        Initialize the cache
+
+        Args:
+            max_entries: Maximum number of documents kept before LRU eviction
+            ttl: Seconds an entry is trusted before it must be revalidated
+                (None keeps entries fresh until explicitly invalidated)
+            max_projections: Maximum number of projections kept before LRU eviction
+        """
+        self.max_entries = max_entries
+        self.max_projections = max_projections
+        self.ttl = ttl
+        self._entries: "OrderedDict[Tuple[str, str], CacheEntry]" = OrderedDict()
+        self._projections: "OrderedDict[tuple, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'stale': 0, 'misses': 0, 'revalidations': 0, 'reloads': 0, 'evictions': 0,
+                       'projection_evictions': 0}
+
+    def _table(self, key: tuple) -> "OrderedDict[tuple, CacheEntry]":
+        """LRU holding the key: documents for (category, filename), projections otherwise"""
+        return self._entries if len(key) == 2 else self._projections
+
+    def _evict(self):
+        """Drop least recently used entries of whichever LRU is over its bound"""
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats['evictions'] += 1
+        while len(self._projections) > self.max_projections:
+            self._projections.popitem(last=False)
+            self._stats['projection_evictions'] += 1
+
+    def _drop(self, keep) -> None:
+        """Remove every document and projection whose key and entry fail keep(key, entry)"""
+        for table in (self._entries, self._projections):
+            for key in [k for k, e in table.items() if not keep(k, e)]:
+                del table[key]
+
+    def lookup(self, key: Tuple[str, str]) -> Tuple[Optional[CacheEntry], bool]:
+        """
+        Look up a document or projection
+
+        Args:
+            key: (category, filename), or (category, filename, ...) for a projection
+
+        Returns:
+            Tuple: (entry or None, whether the entry is still within its TTL)
+        """
+        with self._lock:
+            table = self._table(key)
+            entry = table.get(key)
+            if entry is None:
+                self._stats['misses'] += 1
+                return None, False
+            table.move_to_end(key)
+            if self.ttl is None or time.monotonic() - entry.checked_at < self.ttl:
+                self._stats['hits'] += 1
+                return entry, True
+            self._stats['stale'] += 1
+            return entry, False
+
+    def put(self, key: Tuple[str, str], data: Any, version: Any = None):
+        """Store or replace a document or projection, evicting the least recently used entries
+
+        Storing the version that is already cached only refreshes the entry,
+        so callers holding the cached object keep seeing the same instance.
+        """
+        with self._lock:
+            table = self._table(key)
+            existing = table.get(key)
+            if existing is not None and version is not None and existing.version == version:
+                existing.checked_at = time.monotonic()
+                table.move_to_end(key)
+                return
+            if existing is not None:
+                self._stats['reloads'] += 1
+            table[key] = CacheEntry(data, version, time.monotonic())
+            table.move_to_end(key)
+            self._evict()
+
+    def mark_fresh(self, key: Tuple[str, str]):
+        """Record that a stale entry was revalidated and is still current"""
+        with self._lock:
+            entry = self._table(key).get(key)
+            if entry is not None:
+                entry.checked_at = time.monotonic()
+                self._stats['revalidations'] += 1
+
+    def keys(self) -> list:
+        """Keys of every cached document and projection"""
+        with self._lock:
+            return list(self._entries) + list(self._projections)
+
+    def mark_all_fresh(self):
+        """Restart the TTL of every entry (used when something else keeps them current)"""
+        with self._lock:
+            now = time.monotonic()
+            for entry in [*self._entries.values(), *self._projections.values()]:
+                entry.checked_at = now
+
+    def version_of(self, key: Tuple[str, str]) -> Any:
+        """Version of a cached entry without touching LRU order or counters (None if absent)"""
+        with self._lock:
+            entry = self._table(key).get(key)
+            return entry.version if entry is not None else None
+
+    def current_version(self, category: str, filename: str) -> Any:
+        """
+        Version of a document as long as the cache may still serve it without
+        revalidating, without touching LRU order or counters
+
+        The document's own entry is used, or its projections when only those
+        are cached (they must agree on one version).
+
+        Returns:
+            The version, or None when the document is not cached, is past its
+            TTL, or its projections hold different versions
+        """
+        key = (category, filename)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            entries = [entry] if entry is not None else [
+                e for k, e in self._projections.items() if k[:2] == key]
+        if not entries or any(e.version != entries[0].version for e in entries):
+            return None
+        if self.ttl is not None and any(now - e.checked_at >= self.ttl for e in entries):
+            return None
+        return entries[0].version
+
+    def replace_document(self, category: str, filename: str, data: Any, version: Any):
+        """Swap in a new version of a document and drop projections of other versions
+
+        The entry is replaced in one step, so readers see either the old or
+        the new document, never a mix.
+        """
+        key = (category, filename)
+        with self._lock:
+            for projection in [k for k, e in self._projections.items() if k[:2] == key and e.version != version]:
+                del self._projections[projection]
+            if key in self._entries:
+                self._stats['reloads'] += 1
+            self._entries[key] = CacheEntry(data, version, time.monotonic())
+            self._entries.move_to_end(key)
+            self._evict()
+
+    def discard_stale(self, category: str, filename: str, version: Any):
+        """Drop a document and its projections unless they are at the given version"""
+        with self._lock:
+            self._drop(lambda k, e: k[:2] != (category, filename) or e.version == version)
+
+    def invalidate(self, key: Optional[Tuple[str, str]] = None):
+        """Drop one document or projection, or everything when no key is given"""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+                self._projections.clear()
+            else:
+                self._table(key).pop(key, None)
+
+    def invalidate_document(self, category: str, filename: str):
+        """Drop a document together with every cached projection of it"""
+        with self._lock:
+            self._drop(lambda k, e: k[:2] != (category, filename))
+
+    def invalidate_category(self, category: str):
+        """Drop every cached document and projection in a category"""
+        with self._lock:
+            self._drop(lambda k, e: k[0] != category)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache counters
+
+        Returns:
+            Dict: hits, stale, misses, revalidations, reloads, evictions (documents),
+                projection_evictions, size (documents), projections and hit_rate
+                (lookups answered from memory, including revalidated entries)
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats['size'] = len(self._entries)
+            stats['projections'] = len(self._projections)
+        lookups = stats['hits'] + stats['stale'] + stats['misses']
+        stats['hit_rate'] = round((stats['hits'] + stats['revalidations']) / lookups, 4) if lookups else 0.0
+        return stats
@@ -0,0 +1,147 @@
+"""
+Indexed queries over the row-per-entity table entity_team_members
+(migrations/002_entity_tables.sql)
+Each method returns the candidate subset of the source document, shaped like
+that document and in document order, so the tools rank it unchanged
+"""
+
+import os
+import threading
+from psycopg2.extras import RealDictCursor
+from typing import Dict, List, Optional, Any
+import logging
+
+from .connection_pool import ConnectionPool, get_pool
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Members a name, email or slack handle can refer to; typo'd names match
+# through the pg_trgm word similarity operator (<%), served by the trigram
+# index on name
+_PERSON_CONDITION = """
+    lower(email) = %(exact)s
+    OR lower(ltrim(slack_handle, '@')) = %(handle)s
+    OR name ILIKE %(pattern)s
+    OR email ILIKE %(pattern)s
+    OR %(person)s <%% name
+"""
+
+
+def like_contains(text: str) -> str:
+    """
+    Build an ILIKE pattern matching text anywhere in a column
+
+    Args:
+        text: Text to match literally
+
+    Returns:
+        str: Pattern with LIKE wildcards in text escaped
+    """
+    escaped = text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f'%{escaped}%'
+
+
+def _person_params(person: str) -> Dict[str, str]:
+    """Query parameters of _PERSON_CONDITION for a name, email or slack handle"""
+    person = person.strip()
+    return {
+        'exact': person.lower(),
+        'handle': person.lstrip('@').lower(),
+        'pattern': like_contains(person),
+        'person': person
+    }
+
+
+class EntityStore:
+    """Point and range queries against the normalized entity tables"""
+
+    def __init__(self, pool: Optional[ConnectionPool] = None):
+        """
+        Initialize the store
+
+        Args:
+            pool: Connection pool to use (defaults to the process-wide pool)
+        """
+        self._pool = pool
+
+    def _fetch(self, query: str, params) -> List[Dict[str, Any]]:
+        """Run a query on a pooled connection and return all rows"""
+        pool = self._pool or get_pool()
+        with pool.connection() as conn, conn.cursor(cursor_factory=RealDictCursor) as cursor:
+            cursor.execute(query, params)
+            return cursor.fetchall()
+
+    def team_members(self, name: str = "", expertise: str = "", role: str = "") -> Dict[str, Any]:
+        """
+        Members that can match a find_team_member search
+
+        A name matches by email or slack handle, as a substring of the name or
+        email, or as a similar name; expertise and role match as substrings.
+
+        Args:
+            name: Name, email or slack handle (optional)
+            expertise: Expertise substring (optional)
+            role: Role substring (optional)
+
+        Returns:
+            Dict: {"members": [...]} in team_members.json order
+        """
+        conditions = []
+        params = {}
+        if name:
+            conditions.append(_PERSON_CONDITION)
+            params.update(_person_params(name))
+        if expertise:
+            conditions.append("expertise_text ILIKE %(expertise)s")
+            params['expertise'] = like_contains(expertise)
+        if role:
+            conditions.append("role ILIKE %(role)s")
+            params['role'] = like_contains(role)
+        if not conditions:
+            return {"members": []}
+        rows = self._fetch(f"""
+            SELECT data FROM entity_team_members
+            WHERE {' OR '.join(f'({condition})' for condition in conditions)}
+            ORDER BY position
+        """, params)
+        return {"members": [row['data'] for row in rows]}
+
+    def team_member_candidates(self, person: str) -> Dict[str, Any]:
+        """
+        Members a schedule_meeting lookup can resolve to
+
+        Args:
+            person: Name, email or slack handle
+
+        Returns:
+            Dict: {"members": [...]} in team_members.json order
+        """
+        rows = self._fetch(f"""
+            SELECT data FROM entity_team_members
+            WHERE {_PERSON_CONDITION}
+            ORDER BY position
+        """, _person_params(person))
+        return {"members": [row['data'] for row in rows]}
+
+
+_shared_store: Optional[EntityStore] = None
+_shared_store_lock = threading.Lock()
+
+
+def get_entity_store() -> Optional[EntityStore]:
+    """
+    Get the entity store shared by all tool modules
+
+    Returns:
+        EntityStore: Process-wide store when DB_LOADER_MODE=normalized, otherwise
+            None (tools then read whole documents from json_documents)
+    """
+    global _shared_store
+    if os.getenv('DB_LOADER_MODE', 'documents').lower() != 'normalized':
+        return None
+    if _shared_store is None:
+        with _shared_store_lock:
+            if _shared_store is None:
+                _shared_store = EntityStore()
+    return _shared_store
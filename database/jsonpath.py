@@ -0,0 +1,116 @@
+"""
+In-process evaluator for the SQL/JSON path subset the tools use
+Lets loaders without PostgreSQL (snapshot, shared memory) serve load_path()
+with the same results jsonb_path_query_array would return
+"""
+
+import re
+import json
+from typing import Any, Dict, List, Optional
+
+# Supported: $, .member, [*], .keyvalue(), and filters of the form
+#   ? (@.member... like_regex "pattern" [flag "i"])
+#   ? (@.member... == $variable | "string" | number)
+_STEP = re.compile(r'\s*(?:\.(?P<member>[A-Za-z_][A-Za-z0-9_]*)(?P<call>\(\))?|(?P<wildcard>\[\*\])|\?\s*\((?P<filter>.*)\))')
+_FILTER = re.compile(
+    r'\s*@(?P<path>(?:\.[A-Za-z_][A-Za-z0-9_]*)*)\s+'
+    r'(?:like_regex\s+(?P<regex>"(?:[^"\\]|\\.)*")(?:\s+flag\s+"(?P<flags>[a-z]*)")?'
+    r'|==\s*(?:\$(?P<variable>[A-Za-z_][A-Za-z0-9_]*)|(?P<literal>"(?:[^"\\]|\\.)*"|-?\d+(?:\.\d+)?)))\s*$'
+)
+
+
+def _members(items: List[Any], name: str) -> List[Any]:
+    """Member accessor in lax mode: arrays are unwrapped, missing keys yield nothing"""
+    result = []
+    for item in items:
+        for value in (item if isinstance(item, list) else [item]):
+            if isinstance(value, dict) and name in value:
+                result.append(value[name])
+    return result
+
+
+def _wildcard(items: List[Any]) -> List[Any]:
+    """[*] in lax mode: array elements, or the item itself when it is not an array"""
+    result = []
+    for item in items:
+        result.extend(item if isinstance(item, list) else [item])
+    return result
+
+
+def _keyvalue(items: List[Any]) -> List[Any]:
+    """keyvalue(): one {"key", "value"} pair per object member (the "id" field is omitted)"""
+    result = []
+    for item in items:
+        for value in (item if isinstance(item, list) else [item]):
+            if not isinstance(value, dict):
+                raise ValueError("keyvalue() can only be applied to an object")
+            result.extend({"key": key, "value": member} for key, member in value.items())
+    return result
+
+
+def _predicate(expression: str, variables: Dict[str, Any]):
+    """Compile a filter expression into a function of the current item"""
+    match = _FILTER.match(expression)
+    if not match:
+        raise ValueError(f"Unsupported jsonpath filter: {expression}")
+    path = [name for name in match.group('path').split('.') if name]
+
+    if match.group('regex') is not None:
+        flags = re.IGNORECASE if 'i' in (match.group('flags') or '') else 0
+        pattern = re.compile(json.loads(match.group('regex')), flags)
+        test = lambda value: isinstance(value, str) and pattern.search(value) is not None
+    else:
+        if match.group('variable') is not None:
+            if match.group('variable') not in variables:
+                raise ValueError(f"Missing jsonpath variable: ${match.group('variable')}")
+            expected = variables[match.group('variable')]
+        else:
+            expected = json.loads(match.group('literal'))
+        test = lambda value: value == expected
+
+    def predicate(item):
+        values = [item]
+        for name in path:
+            values = _members(values, name)
+        return any(test(value) for value in values)
+    return predicate
+
+
+def evaluate(document: Any, json_path: str, variables: Optional[Dict[str, Any]] = None) -> List[Any]:
+    """
+    Evaluate a SQL/JSON path against a decoded document
+
+    Args:
+        document: Decoded JSON document
+        json_path: Path in the supported subset (see module comment)
+        variables: Values for $variables referenced by filters
+
+    Returns:
+        List: Matching values, like jsonb_path_query_array
+
+    Raises:
+        ValueError: If the path uses syntax outside the supported subset
+    """
+    expression = json_path.strip()
+    if not expression.startswith('$'):
+        raise ValueError(f"Unsupported jsonpath: {json_path}")
+    items = [document]
+    position = 1
+    while position < len(expression):
+        step = _STEP.match(expression, position)
+        if not step:
+            raise ValueError(f"Unsupported jsonpath: {json_path}")
+        if step.group('filter') is not None:
+            # A filter extends to the last closing parenthesis of the expression
+            predicate = _predicate(step.group('filter'), variables or {})
+            items = [item for item in items if predicate(item)]
+        elif step.group('wildcard'):
+            items = _wildcard(items)
+        elif step.group('call'):
+            if step.group('member') != 'keyvalue':
+                raise ValueError(f"Unsupported jsonpath method: {step.group('member')}()")
+            items = _keyvalue(items)
+        else:
+            items = _members(items, step.group('member'))
+        position = step.end()
+    return items
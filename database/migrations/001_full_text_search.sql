@@ -0,0 +1,33 @@
+-- ============================================================================
+-- FULL-TEXT SEARCH FOR json_documents
+-- Run after onboard.sql: psql -d onboard_data -f database/migrations/001_full_text_search.sql
+-- ============================================================================
+
+-- Trigram matching for substring / typo-tolerant fallback searches
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- Concatenate every string value of a document (keys and structure are dropped)
+CREATE OR REPLACE FUNCTION json_document_text(doc jsonb)
+RETURNS text AS $$
+    SELECT coalesce(string_agg(value #>> '{}', ' '), '')
+    FROM jsonb_path_query(doc, 'strict $.** ? (@.type() == "string")') AS value
+$$ LANGUAGE sql IMMUTABLE PARALLEL SAFE;
+
+-- Plain text used for snippets and trigram search
+ALTER TABLE json_documents
+    ADD COLUMN IF NOT EXISTS search_text text
+    GENERATED ALWAYS AS (json_document_text(data)) STORED;
+
+-- Weighted search vector: file name (A) ranks above document content (D)
+ALTER TABLE json_documents
+    ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', replace(replace(filename, '_', ' '), '.json', '')), 'A') ||
+        setweight(to_tsvector('english', json_document_text(data)), 'D')
+    ) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_json_documents_search_vector
+    ON json_documents USING GIN (search_vector);
+
+CREATE INDEX IF NOT EXISTS idx_json_documents_search_text_trgm
+    ON json_documents USING GIN (search_text gin_trgm_ops);
@@ -0,0 +1,104 @@
+-- ============================================================================
+-- ROW-PER-ENTITY TABLE FOR TEAM MEMBERS
+-- Run after 001_full_text_search.sql: psql -d onboard_data -f database/migrations/002_entity_tables.sql
+-- Derived data read by find_team_member and schedule_meeting when
+-- DB_LOADER_MODE=normalized (database/entity_store.py). A trigger keeps it in
+-- step with teams/team_members.json, so content is still edited in one place;
+-- it only fires when that document changes, runs once per write, and
+-- rewrites only the members that changed. The other tools rank with
+-- in-process indexes over the cached documents and need no entity tables.
+-- ============================================================================
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- Team members (teams/team_members.json -> members[]), one row per member
+-- position so a sync can update rows in place
+CREATE TABLE IF NOT EXISTS entity_team_members (
+    id SERIAL PRIMARY KEY,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL DEFAULT '',
+    role TEXT NOT NULL DEFAULT '',
+    team TEXT NOT NULL DEFAULT '',
+    email TEXT NOT NULL DEFAULT '',
+    slack_handle TEXT NOT NULL DEFAULT '',
+    expertise TEXT[] NOT NULL DEFAULT '{}',
+    expertise_text TEXT NOT NULL DEFAULT '',
+    data JSONB NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_entity_team_members_position_key ON entity_team_members(position);
+CREATE INDEX IF NOT EXISTS idx_entity_team_members_email ON entity_team_members(lower(email));
+-- Slack handles are looked up without their leading @, as entity_store.py does
+CREATE INDEX IF NOT EXISTS idx_entity_team_members_handle ON entity_team_members(lower(ltrim(slack_handle, '@')));
+CREATE INDEX IF NOT EXISTS idx_entity_team_members_team ON entity_team_members(team);
+CREATE INDEX IF NOT EXISTS idx_entity_team_members_name_trgm ON entity_team_members USING GIN (name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_entity_team_members_email_trgm ON entity_team_members USING GIN (email gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_entity_team_members_role_trgm ON entity_team_members USING GIN (role gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_entity_team_members_expertise_trgm ON entity_team_members USING GIN (expertise_text gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_entity_team_members_expertise ON entity_team_members USING GIN (expertise);
+
+-- Bring entity_team_members in line with teams/team_members.json, touching
+-- only the members whose data differs
+CREATE OR REPLACE FUNCTION sync_entity_team_members()
+RETURNS VOID AS $$
+BEGIN
+    INSERT INTO entity_team_members (position, name, role, team, email, slack_handle, expertise, expertise_text, data)
+    SELECT m.position,
+           coalesce(m.value->>'name', ''), coalesce(m.value->>'role', ''), coalesce(m.value->>'team', ''),
+           coalesce(m.value->>'email', ''), coalesce(m.value->>'slack_handle', ''),
+           ARRAY(SELECT jsonb_array_elements_text(coalesce(m.value->'expertise', '[]'))),
+           coalesce((SELECT string_agg(e, E'\n') FROM jsonb_array_elements_text(coalesce(m.value->'expertise', '[]')) e), ''),
+           m.value
+    FROM json_documents d, jsonb_array_elements(coalesce(d.data->'members', '[]')) WITH ORDINALITY AS m(value, position)
+    WHERE d.category = 'teams' AND d.filename = 'team_members.json'
+    ON CONFLICT (position) DO UPDATE
+        SET name = EXCLUDED.name, role = EXCLUDED.role, team = EXCLUDED.team, email = EXCLUDED.email,
+            slack_handle = EXCLUDED.slack_handle, expertise = EXCLUDED.expertise,
+            expertise_text = EXCLUDED.expertise_text, data = EXCLUDED.data
+        WHERE entity_team_members.data IS DISTINCT FROM EXCLUDED.data;
+
+    -- Members removed from the end of the list (or the whole document deleted)
+    DELETE FROM entity_team_members
+    WHERE position > coalesce((
+        SELECT jsonb_array_length(coalesce(data->'members', '[]'))
+        FROM json_documents
+        WHERE category = 'teams' AND filename = 'team_members.json'
+    ), 0);
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION sync_entity_team_members_trigger()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM sync_entity_team_members();
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- The WHEN clauses keep writes to every other document trigger-free
+DROP TRIGGER IF EXISTS sync_entity_team_members_insert ON json_documents;
+CREATE TRIGGER sync_entity_team_members_insert
+    AFTER INSERT ON json_documents
+    FOR EACH ROW
+    WHEN (NEW.category = 'teams' AND NEW.filename = 'team_members.json')
+    EXECUTE FUNCTION sync_entity_team_members_trigger();
+
+DROP TRIGGER IF EXISTS sync_entity_team_members_update ON json_documents;
+CREATE TRIGGER sync_entity_team_members_update
+    AFTER UPDATE OF category, filename, data ON json_documents
+    FOR EACH ROW
+    WHEN (((OLD.category = 'teams' AND OLD.filename = 'team_members.json')
+           OR (NEW.category = 'teams' AND NEW.filename = 'team_members.json'))
+          AND (OLD.data IS DISTINCT FROM NEW.data
+               OR OLD.category IS DISTINCT FROM NEW.category
+               OR OLD.filename IS DISTINCT FROM NEW.filename))
+    EXECUTE FUNCTION sync_entity_team_members_trigger();
+
+DROP TRIGGER IF EXISTS sync_entity_team_members_delete ON json_documents;
+CREATE TRIGGER sync_entity_team_members_delete
+    AFTER DELETE ON json_documents
+    FOR EACH ROW
+    WHEN (OLD.category = 'teams' AND OLD.filename = 'team_members.json')
+    EXECUTE FUNCTION sync_entity_team_members_trigger();
+
+-- Initial population (or catch-up) from the existing document
+SELECT sync_entity_team_members();
@@ -0,0 +1,36 @@
+-- ============================================================================
+-- CHANGE TRACKING FOR json_documents
+-- Run after 002_entity_tables.sql: psql -d onboard_data -f database/migrations/003_change_notifications.sql
+-- Supports the background document refresher (database/refresher.py): an
+-- updated_at index for watermark polling and a NOTIFY on every change.
+-- ============================================================================
+
+-- Watermark polls: WHERE updated_at > :watermark
+CREATE INDEX IF NOT EXISTS idx_json_documents_updated_at ON json_documents(updated_at);
+
+-- Publish {"op", "category", "filename", "updated_at"} on channel json_documents_changed
+CREATE OR REPLACE FUNCTION notify_json_documents_changed()
+RETURNS TRIGGER AS $$
+DECLARE
+    changed json_documents%ROWTYPE;
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        changed := OLD;
+    ELSE
+        changed := NEW;
+    END IF;
+    PERFORM pg_notify('json_documents_changed', json_build_object(
+        'op', TG_OP,
+        'category', changed.category,
+        'filename', changed.filename,
+        'updated_at', changed.updated_at
+    )::text);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS notify_json_documents_changed ON json_documents;
+CREATE TRIGGER notify_json_documents_changed
+    AFTER INSERT OR UPDATE OR DELETE ON json_documents
+    FOR EACH ROW
+    EXECUTE FUNCTION notify_json_documents_changed();
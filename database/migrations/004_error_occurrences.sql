@@ -0,0 +1,26 @@
+-- ============================================================================
+-- ERROR OCCURRENCES SEEN BY analyze_error
+-- Run after 003_change_notifications.sql: psql -d onboard_data -f database/migrations/004_error_occurrences.sql
+-- One row per normalized stack trace fingerprint (database/occurrence_store.py),
+-- so a trace analyzed once is recognized on every later report.
+-- Used by the tools when ERROR_OCCURRENCE_TRACKING=true.
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS error_occurrences (
+    fingerprint CHAR(40) PRIMARY KEY,
+    normalized_trace TEXT NOT NULL,
+    -- Pattern matches for the trace: {"version": hash of the error patterns matched
+    -- against, "matches": [{"category", "pattern_matched", ...}] best first}
+    matches JSONB,
+    occurrences INTEGER NOT NULL DEFAULT 1,
+    first_seen TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    last_seen TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    -- Title of the troubleshooting/solutions.json entry that fixed it
+    resolved_by TEXT,
+    resolved_at TIMESTAMP
+);
+
+-- Most frequent / most recent unresolved errors
+CREATE INDEX IF NOT EXISTS idx_error_occurrences_last_seen ON error_occurrences(last_seen);
+CREATE INDEX IF NOT EXISTS idx_error_occurrences_unresolved
+    ON error_occurrences(occurrences DESC) WHERE resolved_by IS NULL;
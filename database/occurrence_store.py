@@ -0,0 +1,321 @@
+"""
+Stack-trace fingerprints and the error_occurrences table (migrations/004_error_occurrences.sql)
+A trace is normalized (line numbers, addresses, temp paths, timestamps and
+ids stripped) and hashed, so the same failure reported by different people
+maps to one row with its counts and known resolution
+"""
+
+import os
+import re
+import atexit
+import hashlib
+import datetime
+import threading
+from collections import OrderedDict
+from psycopg2.extras import Json, RealDictCursor, execute_values
+from typing import Any, Dict, List, Optional
+import logging
+
+from .connection_pool import ConnectionPool, get_pool
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Applied in order; each replaces volatile text with a stable placeholder
+_NORMALIZATIONS = [
+    # 2024-01-31T12:00:00.123Z, 2024-01-31 12:00:00,123 +02:00
+    (re.compile(r'\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(?:[.,]\d+)?(?:Z|\s?[+-]\d{2}:?\d{2})?'), '<time>'),
+    (re.compile(r'\b\d{2}:\d{2}:\d{2}(?:[.,]\d+)?\b'), '<time>'),
+    (re.compile(r'\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b', re.I), '<uuid>'),
+    (re.compile(r'\b0x[0-9a-f]+\b', re.I), '<addr>'),
+    # Temporary directories (POSIX, macOS, Windows) up to the next separator-free token end
+    (re.compile(r'(?:/tmp|/var/tmp|/private/var/folders|/var/folders)/[^\s"\'():,]*'), '<tmp>'),
+    (re.compile(r'[A-Za-z]:\\(?:[^\s"\']*\\)?(?:Temp|tmp)\\[^\s"\'():,]*', re.I), '<tmp>'),
+    # Python "line 42", Java/JavaScript "File.java:42" and "file.js:42:7"
+    (re.compile(r'\bline \d+'), 'line <n>'),
+    (re.compile(r'(\.\w+):\d+(?::\d+)?'), r'\1:<n>'),
+    # Request ids, pids, ports of ephemeral connections and the like
+    (re.compile(r'\b\d{5,}\b'), '<n>'),
+    (re.compile(r'[ \t]+'), ' '),
+]
+
+
+def normalize_trace(text: str) -> str:
+    """
+    Reduce an error message or stack trace to the parts that identify the failure
+
+    Args:
+        text: Error message or stack trace
+
+    Returns:
+        str: Normalized text, one stripped non-empty line per source line
+    """
+    lines = []
+    for line in text.splitlines():
+        for pattern, replacement in _NORMALIZATIONS:
+            line = pattern.sub(replacement, line)
+        line = line.strip()
+        if line:
+            lines.append(line)
+    return '\n'.join(lines)
+
+
+def fingerprint(text: str) -> str:
+    """
+    Stable identifier of an error message or stack trace
+
+    Args:
+        text: Error message or stack trace
+
+    Returns:
+        str: 40-character hex digest of the normalized trace
+    """
+    return hashlib.sha1(normalize_trace(text).encode('utf-8')).hexdigest()
+
+
+class OccurrenceStore:
+    """Error occurrences by fingerprint, served from memory
+
+    Known fingerprints (with their pattern matches and resolution) are kept
+    in process. A background thread writes the occurrences counted since the
+    last flush in one batched upsert, then reads back rows other workers
+    changed, so analyze_error never waits on the database. Failures are
+    logged; counts that could not be written are retried on the next flush,
+    and troubleshooting keeps working from memory when the table is unavailable.
+    """
+
+    def __init__(self, pool: Optional[ConnectionPool] = None, interval: float = 5.0,
+                 max_entries: int = 10000):
+        """
+        Initialize the store
+
+        Args:
+            pool: Connection pool to use (defaults to the process-wide pool)
+            interval: Seconds between background flushes
+            max_entries: Fingerprints kept in memory, least recently seen dropped first
+        """
+        self._pool = pool
+        self.interval = interval
+        self.max_entries = max_entries
+        # fingerprint -> occurrence row (fingerprint, matches, occurrences, first_seen,
+        # last_seen, resolved_by, resolved_at), most recently seen last
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        # fingerprint -> occurrences not yet written: normalized_trace, count, matches
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._watermark: Optional[datetime.datetime] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.stats = {'flushes': 0, 'written': 0, 'loaded': 0, 'errors': 0}
+
+    def _fetch(self, query: str, params) -> List[Dict[str, Any]]:
+        """Run a statement on a pooled connection and return its rows"""
+        pool = self._pool or get_pool()
+        with pool.connection() as conn, conn.cursor(cursor_factory=RealDictCursor) as cursor:
+            cursor.execute(query, params)
+            return cursor.fetchall() if cursor.description else []
+
+    def _remember(self, row: Dict[str, Any]):
+        """Store an occurrence row in memory (lock held)"""
+        self._entries[row['fingerprint']] = row
+        self._entries.move_to_end(row['fingerprint'])
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def lookup(self, error_fingerprint: str) -> Optional[Dict[str, Any]]:
+        """
+        Occurrence row of a fingerprint known to this process
+
+        Args:
+            error_fingerprint: Fingerprint of the trace
+
+        Returns:
+            Dict: Copy of the occurrence row, or None for a trace not seen yet
+        """
+        with self._lock:
+            entry = self._entries.get(error_fingerprint)
+            return dict(entry) if entry is not None else None
+
+    def record(self, error_fingerprint: str, normalized_trace: str,
+               matches: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Count one occurrence of a trace in memory; it is written on the next flush
+
+        Args:
+            error_fingerprint: Fingerprint of the trace
+            normalized_trace: Normalized trace, stored when the fingerprint is new
+            matches: Pattern matches of the trace when they were just computed
+                ({"version", "matches"}, the version naming the patterns matched against)
+
+        Returns:
+            Dict: Copy of the occurrence row after counting
+        """
+        now = datetime.datetime.now()
+        with self._lock:
+            entry = self._entries.get(error_fingerprint)
+            if entry is None:
+                entry = {'fingerprint': error_fingerprint, 'matches': None, 'occurrences': 0, 'first_seen': now,
+                         'last_seen': now, 'resolved_by': None, 'resolved_at': None}
+            entry['occurrences'] += 1
+            entry['last_seen'] = now
+            if matches is not None:
+                entry['matches'] = matches
+            self._remember(entry)
+
+            pending = self._pending.setdefault(error_fingerprint, {'normalized_trace': normalized_trace,
+                                                                   'count': 0, 'matches': None})
+            pending['count'] += 1
+            if matches is not None:
+                pending['matches'] = matches
+            return dict(entry)
+
+    def flush(self):
+        """Write the pending occurrences in one statement, then load rows changed elsewhere"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if pending:
+            try:
+                rows = [(error_fingerprint, item['normalized_trace'],
+                                        Json(item['matches']) if item['matches'] is not None else None,
+                                        item['count'])
+                                       for error_fingerprint, item in pending.items()]
+                pool = self._pool or get_pool()
+                with pool.connection() as conn, conn.cursor() as cursor:
+                    execute_values(cursor, """
+                        INSERT INTO error_occurrences (fingerprint, normalized_trace, matches, occurrences)
+                        VALUES %s
+                        ON CONFLICT (fingerprint) DO UPDATE
+                            SET occurrences = error_occurrences.occurrences + EXCLUDED.occurrences,
+                                last_seen = CURRENT_TIMESTAMP,
+                                matches = coalesce(EXCLUDED.matches, error_occurrences.matches)
+                    """, rows)
+                self.stats['written'] += len(pending)
+            except Exception:
+                # Keep the counts for the next flush, merged with any taken since
+                with self._lock:
+                    for error_fingerprint, item in pending.items():
+                        current = self._pending.setdefault(error_fingerprint, dict(item, count=0))
+                        current['count'] += item['count']
+                        if current['matches'] is None:
+                            current['matches'] = item['matches']
+                raise
+        self._load()
+        self.stats['flushes'] += 1
+
+    def _load(self):
+        """Bring the in-memory rows up to date with the table"""
+        if self._watermark is None:
+            rows = self._fetch("""
+                SELECT fingerprint, matches, occurrences, first_seen, last_seen, resolved_by, resolved_at
+                FROM error_occurrences
+                ORDER BY last_seen DESC
+                LIMIT %s
+            """, (self.max_entries,))
+        else:
+            # Overlap the watermark so rows from transactions that committed late are not missed
+            since = self._watermark - datetime.timedelta(seconds=max(self.interval, 1) * 6)
+            rows = self._fetch("""
+                SELECT fingerprint, matches, occurrences, first_seen, last_seen, resolved_by, resolved_at
+                FROM error_occurrences
+                WHERE last_seen > %s OR resolved_at > %s
+            """, (since, since))
+        with self._lock:
+            for row in sorted(rows, key=lambda row: row['last_seen']):
+                row = dict(row)
+                # Counts taken since the flush are not in the table yet
+                pending = self._pending.get(row['fingerprint'])
+                if pending:
+                    row['occurrences'] += pending['count']
+                    row['matches'] = pending['matches'] or row['matches']
+                self._remember(row)
+                self._watermark = max(self._watermark or row['last_seen'], row['last_seen'],
+                                      row['resolved_at'] or row['last_seen'])
+            if self._watermark is None:
+                self._watermark = datetime.datetime(1970, 1, 1)
+        self.stats['loaded'] += len(rows)
+
+    def mark_resolved(self, error_fingerprint: str, normalized_trace: str, solution_title: str) -> Optional[Dict[str, Any]]:
+        """
+        Record the solution that fixed a trace (creating the row if the trace was never analyzed)
+
+        Args:
+            error_fingerprint: Fingerprint of the trace
+            normalized_trace: Normalized trace, stored when the fingerprint is new
+            solution_title: Title of the troubleshooting/solutions.json entry
+
+        Returns:
+            Dict: The updated occurrence row, or None if it could not be stored
+        """
+        try:
+            rows = self._fetch("""
+                INSERT INTO error_occurrences (fingerprint, normalized_trace, resolved_by, resolved_at)
+                VALUES (%s, %s, %s, CURRENT_TIMESTAMP)
+                ON CONFLICT (fingerprint) DO UPDATE
+                    SET resolved_by = EXCLUDED.resolved_by,
+                        resolved_at = EXCLUDED.resolved_at
+                RETURNING fingerprint, matches, occurrences, first_seen, last_seen, resolved_by, resolved_at
+            """, (error_fingerprint, normalized_trace, solution_title))
+        except Exception as e:
+            logger.error(f"Failed to mark error occurrence resolved: {str(e)}")
+            return None
+        with self._lock:
+            row = dict(rows[0])
+            pending = self._pending.get(error_fingerprint)
+            if pending:
+                row['occurrences'] += pending['count']
+            self._remember(row)
+            return dict(row)
+
+    def _run(self):
+        """Thread body: flush, wait, repeat until stopped"""
+        while not self._stop.is_set():
+            try:
+                self.flush()
+            except Exception as e:
+                self.stats['errors'] += 1
+                logger.error(f"Failed to write error occurrences: {str(e)}")
+            self._stop.wait(self.interval)
+
+    def start(self):
+        """Start the background thread (no-op if already running)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='error-occurrences', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background thread and write what is still pending"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 1)
+        try:
+            self.flush()
+        except Exception as e:
+            logger.error(f"Failed to write error occurrences: {str(e)}")
+
+
+_shared_store: Optional[OccurrenceStore] = None
+_shared_store_lock = threading.Lock()
+
+
+def get_occurrence_store() -> Optional[OccurrenceStore]:
+    """
+    Get the occurrence store shared by all tool modules
+
+    Returns:
+        OccurrenceStore: Process-wide store, flushing in the background, when
+            ERROR_OCCURRENCE_TRACKING=true and documents come from PostgreSQL, otherwise None
+    """
+    global _shared_store
+    if os.getenv('ERROR_OCCURRENCE_TRACKING', 'false').lower() != 'true':
+        return None
+    if os.getenv('DOCUMENT_BACKEND', 'postgres').lower() != 'postgres':
+        return None
+    if _shared_store is None:
+        with _shared_store_lock:
+            if _shared_store is None:
+                _shared_store = OccurrenceStore(interval=float(os.getenv('ERROR_OCCURRENCE_FLUSH_INTERVAL', 5)))
+                _shared_store.start()
+                atexit.register(_shared_store.stop)
+    return _shared_store
@@ -0,0 +1,230 @@
+"""
+Background refresher for cached json_documents
+Polls for rows changed since an updated_at watermark (and optionally listens
+on the json_documents_changed channel from migrations/003) and swaps only the
+changed documents into the loaders' caches, so edits show up within seconds
+without restarts or full reloads
+"""
+
+import os
+import json
+import select
+import datetime
+import threading
+from psycopg2.extras import RealDictCursor
+from typing import List, Optional
+import logging
+
+import psycopg2
+
+from .connection_pool import ConnectionPool, get_pool, get_db_config
+from .document_cache import DocumentCache
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+NOTIFY_CHANNEL = 'json_documents_changed'
+
+# Newest updated_at plus a fingerprint of the (category, filename) key set
+_STATE_QUERY = """
+    SELECT max(updated_at) AS watermark,
+           md5(coalesce(string_agg(category || '/' || filename, ',' ORDER BY category, filename), '')) AS key_set
+    FROM json_documents
+"""
+
+
+class DocumentRefresher:
+    """Keep DocumentCache entries current from a background thread
+
+    Each poll reads only the (category, filename, updated_at) of rows changed
+    since the watermark, then fetches data just for documents that are cached
+    at an older version. Projections of a changed document are dropped and
+    reload lazily. After a successful poll every cached entry is known to be
+    current, so its TTL is restarted and readers skip their own revalidation.
+    If the refresher stalls, entries fall back to TTL revalidation.
+    """
+
+    def __init__(self, caches: List[DocumentCache], pool: Optional[ConnectionPool] = None,
+                 interval: float = 5.0, overlap: float = 30.0, listen: bool = False):
+        """
+        Initialize the refresher
+
+        Args:
+            caches: Document caches to keep current
+            pool: Connection pool to use (defaults to the process-wide pool)
+            interval: Seconds between watermark polls
+            overlap: Seconds re-read behind the watermark, so rows from transactions
+                that committed after a poll despite an earlier updated_at are not missed
+            listen: Also LISTEN on json_documents_changed for sub-interval updates
+        """
+        self.caches = caches
+        self._pool = pool
+        self.interval = interval
+        self.overlap = datetime.timedelta(seconds=overlap)
+        self.listen = listen
+        self.watermark: Optional[datetime.datetime] = None
+        self._key_set: Optional[str] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._listener = None
+        self.stats = {'polls': 0, 'notifications': 0, 'refreshed': 0, 'removed': 0, 'errors': 0}
+
+    def _fetch(self, query: str, params=()) -> list:
+        """Run a query on a pooled connection and return all rows"""
+        pool = self._pool or get_pool()
+        with pool.connection() as conn, conn.cursor(cursor_factory=RealDictCursor) as cursor:
+            cursor.execute(query, params)
+            return cursor.fetchall()
+
+    def _apply(self, category: str, filename: str, version):
+        """Bring every cache up to one document version"""
+        stale = [cache for cache in self.caches
+                 if cache.version_of((category, filename)) not in (None, version)]
+        for cache in self.caches:
+            if cache not in stale:
+                cache.discard_stale(category, filename, version)
+        if not stale:
+            return
+        rows = self._fetch("""
+            SELECT data, updated_at
+            FROM json_documents
+            WHERE category = %s AND filename = %s
+            LIMIT 1
+        """, (category, filename))
+        if not rows:
+            self._remove(category, filename)
+            return
+        for cache in stale:
+            cache.replace_document(category, filename, rows[0]['data'], rows[0]['updated_at'])
+        self.stats['refreshed'] += 1
+        logger.info(f"Refreshed cached document {category}/{filename}")
+
+    def _remove(self, category: str, filename: str):
+        """Drop a deleted document from every cache"""
+        for cache in self.caches:
+            cache.invalidate_document(category, filename)
+        self.stats['removed'] += 1
+
+    def poll(self):
+        """Apply every change since the watermark, then advance it"""
+        if self.watermark is None:
+            state = self._fetch(_STATE_QUERY)[0]
+            self.watermark = state['watermark'] or datetime.datetime(1970, 1, 1)
+            self._key_set = state['key_set']
+            # Entries cached before the watermark existed may predate it
+            for cache in self.caches:
+                cache.invalidate()
+            return
+
+        changed = self._fetch("""
+            SELECT category, filename, updated_at
+            FROM json_documents
+            WHERE updated_at > %s
+            ORDER BY updated_at
+        """, (self.watermark - self.overlap,))
+        for row in changed:
+            self._apply(row['category'], row['filename'], row['updated_at'])
+            self.watermark = max(self.watermark, row['updated_at'])
+
+        # Deletes leave no updated_at behind; a changed key-set fingerprint finds them
+        key_set = self._fetch(_STATE_QUERY)[0]['key_set']
+        if key_set != self._key_set:
+            present = {(row['category'], row['filename'])
+                       for row in self._fetch("SELECT category, filename FROM json_documents")}
+            for cache in self.caches:
+                for key in {key[:2] for key in cache.keys()} - present:
+                    self._remove(*key)
+            self._key_set = key_set
+
+        for cache in self.caches:
+            cache.mark_all_fresh()
+        self.stats['polls'] += 1
+
+    def _open_listener(self):
+        """Dedicated autocommit connection for LISTEN (sessions cannot be pooled)"""
+        conn = psycopg2.connect(**get_db_config())
+        conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+        with conn.cursor() as cursor:
+            cursor.execute(f"LISTEN {NOTIFY_CHANNEL}")
+        return conn
+
+    def _wait(self):
+        """Sleep until the next poll, applying notifications as they arrive"""
+        if not self.listen:
+            self._stop.wait(self.interval)
+            return
+        if self._listener is None or self._listener.closed:
+            self._listener = self._open_listener()
+        ready, _, _ = select.select([self._listener], [], [], self.interval)
+        if not ready:
+            return
+        self._listener.poll()
+        while self._listener.notifies:
+            notification = self._listener.notifies.pop(0)
+            self.stats['notifications'] += 1
+            change = json.loads(notification.payload)
+            if change['op'] == 'DELETE':
+                self._remove(change['category'], change['filename'])
+            else:
+                self._apply(change['category'], change['filename'],
+                            datetime.datetime.fromisoformat(change['updated_at']))
+
+    def _run(self):
+        """Thread body: poll, wait, repeat until stopped"""
+        while not self._stop.is_set():
+            try:
+                self.poll()
+                self._wait()
+            except Exception as e:
+                self.stats['errors'] += 1
+                logger.error(f"Document refresh failed: {str(e)}")
+                if self._listener is not None:
+                    self._listener.close()
+                    self._listener = None
+                self._stop.wait(self.interval)
+
+    def start(self):
+        """Start the background thread (no-op if already running)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='document-refresher', daemon=True)
+        self._thread.start()
+        logger.info(f"Started document refresher (interval={self.interval}s, listen={self.listen})")
+
+    def stop(self):
+        """Stop the background thread and close the LISTEN connection"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 1)
+        if self._listener is not None:
+            self._listener.close()
+            self._listener = None
+
+
+_refresher: Optional[DocumentRefresher] = None
+
+
+def start_refresher() -> Optional[DocumentRefresher]:
+    """
+    Start the refresher for the shared loaders when DOCUMENT_REFRESH_INTERVAL is set
+
+    Returns:
+        DocumentRefresher: The running refresher, or None when disabled or when
+            documents do not come from PostgreSQL
+    """
+    global _refresher
+    interval = float(os.getenv('DOCUMENT_REFRESH_INTERVAL', 0))
+    if interval <= 0 or os.getenv('DOCUMENT_BACKEND', 'postgres').lower() != 'postgres':
+        return None
+    if _refresher is None:
+        from .db_loader import get_loader
+        # The async loader shares this cache
+        _refresher = DocumentRefresher(
+            caches=[get_loader().cache],
+            interval=interval,
+            overlap=float(os.getenv('DOCUMENT_REFRESH_OVERLAP', 30)),
+            listen=os.getenv('DOCUMENT_REFRESH_LISTEN', 'false').lower() == 'true'
+        )
+    _refresher.start()
+    return _refresher
@@ -0,0 +1,234 @@
+"""
+Encoded corpus shared by the workers of one host
+One publisher writes snapshot generations (documents plus their searchable
+text) to a tmpfs directory; every worker process maps the current generation
+read-only, so the encoded corpus is stored once per host and workers never
+query json_documents themselves.
+
+Only those bytes are shared. Each worker still decodes the documents it uses
+into its own DocumentCache and builds its own search indexes, pattern
+matchers and directories (tools/search_index.py and friends) from them, so
+that memory and start-up work grow with the number of workers as they do
+with the postgres backend. What this backend saves is the database: one
+publisher reads json_documents instead of every worker.
+
+Directory layout:
+    gen-<ns>.snapshot   complete snapshot files (see database/snapshot.py)
+    CURRENT             name of the generation readers should use
+
+A generation is fully written before CURRENT is replaced with os.replace, so
+readers switch between complete generations only. Replaced generations are
+unlinked; workers still mapping one keep a valid mapping until they move on.
+
+Usage:
+    python -m new_hire.database.shared_corpus publish [--from-sql onboard.sql] [--interval SECONDS]
+"""
+
+import os
+import sys
+import time
+import fcntl
+import argparse
+import tempfile
+from typing import Any, Dict, Iterable, Optional
+import logging
+
+from .document_cache import DocumentCache
+from .snapshot import Snapshot, SnapshotError, SnapshotLoader, write_snapshot, rows_from_database, rows_from_sql
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+CURRENT_POINTER = 'CURRENT'
+
+
+def shared_corpus_dir() -> str:
+    """Directory configured by SHARED_CORPUS_DIR (tmpfs by default)"""
+    if os.getenv('SHARED_CORPUS_DIR'):
+        return os.getenv('SHARED_CORPUS_DIR')
+    base = '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir()
+    return os.path.join(base, 'new_hire_corpus')
+
+
+def current_generation(directory: str) -> Optional[str]:
+    """Name of the published generation, or None if nothing has been published"""
+    try:
+        with open(os.path.join(directory, CURRENT_POINTER), encoding='utf-8') as handle:
+            return handle.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def publish(rows: Iterable[Dict[str, Any]], directory: Optional[str] = None, source: str = "",
+            keep: int = 2) -> str:
+    """
+    Write a new generation and make it current
+
+    Args:
+        rows: json_documents rows (see snapshot.write_snapshot)
+        directory: Shared corpus directory (defaults to SHARED_CORPUS_DIR)
+        source: Free-text description of where the rows came from
+        keep: Number of most recent generations left on disk
+
+    Returns:
+        str: Path of the published generation
+    """
+    directory = directory or shared_corpus_dir()
+    os.makedirs(directory, exist_ok=True)
+    generation = f"gen-{time.time_ns()}.snapshot"
+    path = os.path.join(directory, generation)
+    write_snapshot(path, rows, source)
+
+    pointer = os.path.join(directory, CURRENT_POINTER)
+    temporary = f"{pointer}.tmp.{os.getpid()}"
+    with open(temporary, 'w', encoding='utf-8') as handle:
+        handle.write(generation)
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(temporary, pointer)
+    logger.info(f"Published corpus generation {generation}")
+
+    generations = sorted(name for name in os.listdir(directory)
+                         if name.startswith('gen-') and name.endswith('.snapshot'))
+    for name in generations[:-keep]:
+        try:
+            os.unlink(os.path.join(directory, name))
+        except FileNotFoundError:
+            pass
+    return path
+
+
+def publish_once(directory: Optional[str] = None) -> Optional[str]:
+    """
+    Publish from the database unless a generation already exists
+
+    Concurrent callers (e.g. workers starting together) serialize on a lock
+    file, so only one of them reads json_documents.
+
+    Returns:
+        str: Name of the current generation
+    """
+    directory = directory or shared_corpus_dir()
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, '.publish.lock'), 'w') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            if current_generation(directory) is None:
+                publish(rows_from_database(), directory,
+                        f"postgresql://{os.getenv('DB_HOST')}/{os.getenv('DB_NAME')}")
+            return current_generation(directory)
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+class SharedCorpusLoader(SnapshotLoader):
+    """SnapshotLoader that follows the current generation of a shared corpus directory
+
+    The encoded corpus and the search text are read from the shared mapping;
+    decoded documents, and the indexes the tools build from them, are per
+    process.
+    """
+
+    def __init__(self, directory: Optional[str] = None, cache: Optional[DocumentCache] = None,
+                 check_interval: Optional[float] = None):
+        """
+        Initialize the loader
+
+        Args:
+            directory: Shared corpus directory (defaults to SHARED_CORPUS_DIR)
+            cache: Cache for decoded documents and projections
+            check_interval: Seconds between checks for a newer generation
+                (defaults to SHARED_CORPUS_CHECK_INTERVAL)
+        """
+        self.directory = directory or shared_corpus_dir()
+        super().__init__(path=os.path.join(self.directory, CURRENT_POINTER), cache=cache)
+        self.check_interval = check_interval if check_interval is not None else \
+            float(os.getenv('SHARED_CORPUS_CHECK_INTERVAL', 1))
+        self._generation: Optional[str] = None
+        self._checked_at = 0.0
+
+    @property
+    def snapshot(self) -> Snapshot:
+        """The current generation, re-checked at most every check_interval seconds"""
+        if self._snapshot is not None and time.monotonic() - self._checked_at < self.check_interval:
+            return self._snapshot
+        with self._lock:
+            self._checked_at = time.monotonic()
+            generation = current_generation(self.directory)
+            if generation is None and self._snapshot is None:
+                generation = publish_once(self.directory)
+            if generation and generation != self._generation:
+                try:
+                    snapshot = Snapshot(os.path.join(self.directory, generation))
+                except SnapshotError as e:
+                    if self._snapshot is None:
+                        raise
+                    # Superseded while we were switching; keep serving the mapped one
+                    logger.warning(f"Keeping corpus generation {self._generation}: {str(e)}")
+                else:
+                    # The previous mapping is released once in-flight readers drop it
+                    self._snapshot = snapshot
+                    self._generation = generation
+                    self.path = snapshot.path
+                    self.cache.invalidate()
+                    logger.info(f"Attached corpus generation {generation} (version {snapshot.version})")
+            if self._snapshot is None:
+                raise SnapshotError(f"No corpus published in {self.directory}")
+            return self._snapshot
+
+    @property
+    def generation(self) -> Optional[str]:
+        """Name of the generation currently attached"""
+        return self._generation
+
+
+def _database_state():
+    """Cheap change marker for json_documents: row count and newest updated_at"""
+    from psycopg2.extras import RealDictCursor
+    from .connection_pool import get_pool
+
+    with get_pool().connection() as conn, conn.cursor(cursor_factory=RealDictCursor) as cursor:
+        cursor.execute("SELECT count(*) AS documents, max(updated_at) AS version FROM json_documents")
+        row = cursor.fetchone()
+        return row['documents'], row['version']
+
+
+def main(argv=None) -> int:
+    """Command line entry point for the corpus publisher"""
+    parser = argparse.ArgumentParser(prog='python -m new_hire.database.shared_corpus',
+                                     description='Publish the encoded onboarding corpus to shared memory')
+    commands = parser.add_subparsers(dest='command', required=True)
+    publisher = commands.add_parser('publish', help='Write a new corpus generation')
+    publisher.add_argument('--directory', default=shared_corpus_dir(), help='Shared corpus directory')
+    publisher.add_argument('--from-sql', metavar='SQL_FILE',
+                           help='Read rows from an onboard.sql script instead of the database')
+    publisher.add_argument('--interval', type=float, default=0,
+                           help='Keep running and republish when json_documents changes, checking every N seconds')
+    args = parser.parse_args(argv)
+
+    try:
+        if args.from_sql:
+            path = publish(rows_from_sql(args.from_sql), args.directory, os.path.basename(args.from_sql))
+            print(f"Published {path}")
+            return 0
+
+        source = f"postgresql://{os.getenv('DB_HOST')}/{os.getenv('DB_NAME')}"
+        published_state = None
+        while True:
+            state = _database_state()
+            if state != published_state:
+                path = publish(rows_from_database(), args.directory, source)
+                published_state = state
+                print(f"Published {path}")
+            if args.interval <= 0:
+                return 0
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        return 0
+    except Exception as e:
+        print(f"Corpus publish failed: {str(e)}", file=sys.stderr)
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,596 @@
+"""
+Offline snapshot backend for the onboarding corpus
+Serves the DatabaseLoader interface from a local, checksummed binary file
+exported from json_documents, so tools start without a database round trip
+
+File layout (all integers little-endian, all text UTF-8):
+    header    magic, format version, index offset/length, SHA-256 of the index
+    documents one JSON payload per document, followed by the document's
+              searchable text
+    index     JSON metadata: snapshot version, source, and per document
+              category, subcategory, filename, document_type, updated_at,
+              payload and text offset/length and CRC-32
+
+JSON keeps snapshots readable by any Python version, and decoding one
+never executes or constructs anything beyond plain JSON values.
+
+Usage:
+    python -m new_hire.database.snapshot export [--output PATH] [--from-sql onboard.sql]
+    python -m new_hire.database.snapshot info [PATH] [--verify]
+"""
+
+import os
+import re
+import sys
+import json
+import mmap
+import zlib
+import hashlib
+import argparse
+import datetime
+import struct
+import threading
+from typing import AsyncIterator, Dict, Iterable, Iterator, List, Optional, Any, Tuple
+import logging
+
+from .document_cache import DocumentCache
+from .db_loader import MAX_SEARCH_LIMIT
+from . import jsonpath
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_MAGIC = b'NHSNAP\r\n'
+SNAPSHOT_FORMAT_VERSION = 2
+DEFAULT_SNAPSHOT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'onboard.snapshot')
+
+# Magic and format version lead every format, so older files are recognized
+_PREFIX = struct.Struct('<8sH')
+_HEADER = struct.Struct('<8sHQQ32s')
+
+# Rows of json_documents as written by onboard.sql
+_SQL_ROW = re.compile(r"\('([^']*)', '([^']*)', '([^']*)', '([^']*)', '((?:[^']|'')*)'(?:::jsonb)?\)", re.S)
+
+
+class SnapshotError(Exception):
+    """Raised when a snapshot file is missing, corrupt or of an unknown version"""
+
+
+def snapshot_path() -> str:
+    """Snapshot file configured by DOCUMENT_SNAPSHOT_PATH"""
+    return os.getenv('DOCUMENT_SNAPSHOT_PATH') or DEFAULT_SNAPSHOT_PATH
+
+
+def _encode(value: Any) -> bytes:
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def _decode(payload: bytes) -> Any:
+    return json.loads(payload.decode('utf-8'))
+
+
+def _document_text(value: Any, parts: List[str]):
+    """Collect every string value of a document (keys and structure are dropped)"""
+    if isinstance(value, str):
+        parts.append(value)
+    elif isinstance(value, dict):
+        for member in value.values():
+            _document_text(member, parts)
+    elif isinstance(value, list):
+        for member in value:
+            _document_text(member, parts)
+
+
+def write_snapshot(path: str, rows: Iterable[Dict[str, Any]], source: str = "") -> Dict[str, Any]:
+    """
+    Write json_documents rows to a snapshot file
+
+    The file is written next to the target and renamed into place, so readers
+    never observe a partially written snapshot.
+
+    Args:
+        path: Destination file
+        rows: Rows with category, subcategory, filename, document_type, data, updated_at
+        source: Free-text description of where the rows came from
+
+    Returns:
+        Dict: The snapshot index that was written
+    """
+    documents = []
+    temporary = f"{path}.tmp.{os.getpid()}"
+    with open(temporary, 'wb') as handle:
+        handle.write(b'\0' * _HEADER.size)
+        offset = _HEADER.size
+        for row in rows:
+            payload = _encode(row['data'])
+            parts = []
+            _document_text(row['data'], parts)
+            text = ' '.join(parts).encode('utf-8')
+            handle.write(payload)
+            handle.write(text)
+            updated_at = row.get('updated_at')
+            documents.append({
+                'category': row['category'],
+                'subcategory': row.get('subcategory') or '',
+                'filename': row['filename'],
+                'document_type': row.get('document_type') or '',
+                'updated_at': updated_at.isoformat() if hasattr(updated_at, 'isoformat') else (updated_at or ''),
+                'offset': offset,
+                'length': len(payload),
+                'crc32': zlib.crc32(payload),
+                'text_offset': offset + len(payload),
+                'text_length': len(text),
+                'text_crc32': zlib.crc32(text)
+            })
+            offset += len(payload) + len(text)
+
+        index = {
+            'version': max((doc['updated_at'] for doc in documents), default=''),
+            'created_at': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            'source': source,
+            'documents': documents
+        }
+        index_bytes = _encode(index)
+        handle.write(index_bytes)
+        handle.seek(0)
+        handle.write(_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_FORMAT_VERSION,
+                                  offset, len(index_bytes), hashlib.sha256(index_bytes).digest()))
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(temporary, path)
+    return index
+
+
+class Snapshot:
+    """Read-only, memory-mapped snapshot file with per-document lazy decoding"""
+
+    def __init__(self, path: str):
+        """
+        Open and validate a snapshot
+
+        Args:
+            path: Snapshot file
+
+        Raises:
+            SnapshotError: If the file is missing, truncated, corrupt or from another format version
+        """
+        self.path = path
+        try:
+            with open(path, 'rb') as handle:
+                self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            raise SnapshotError(f"Cannot open snapshot {path}: {str(e)}")
+
+        if len(self._map) < _PREFIX.size:
+            raise SnapshotError(f"Snapshot {path} is truncated")
+        magic, format_version = _PREFIX.unpack_from(self._map)
+        if magic != SNAPSHOT_MAGIC:
+            raise SnapshotError(f"{path} is not a snapshot file")
+        if format_version != SNAPSHOT_FORMAT_VERSION:
+            raise SnapshotError(f"Snapshot {path} has format {format_version}, "
+                                f"expected {SNAPSHOT_FORMAT_VERSION}; export it again")
+        if len(self._map) < _HEADER.size:
+            raise SnapshotError(f"Snapshot {path} is truncated")
+        _, _, index_offset, index_length, digest = _HEADER.unpack_from(self._map)
+        index_bytes = self._map[index_offset:index_offset + index_length]
+        if len(index_bytes) != index_length or hashlib.sha256(index_bytes).digest() != digest:
+            raise SnapshotError(f"Snapshot {path} index checksum mismatch")
+
+        index = _decode(index_bytes)
+        self.digest = digest.hex()
+        self.version = index['version']
+        self.created_at = index['created_at']
+        self.source = index['source']
+        self.documents: List[Dict[str, Any]] = index['documents']
+        self._by_key = {(doc['category'], doc['filename']): doc for doc in self.documents}
+
+    def entry(self, category: str, filename: str) -> Optional[Dict[str, Any]]:
+        """Index entry of a document, or None if the snapshot does not contain it"""
+        return self._by_key.get((category, filename))
+
+    def decode(self, entry: Dict[str, Any]) -> Any:
+        """
+        Decode one document, verifying its checksum
+
+        Raises:
+            SnapshotError: If the payload does not match its recorded CRC-32
+        """
+        payload = self._map[entry['offset']:entry['offset'] + entry['length']]
+        if zlib.crc32(payload) != entry['crc32']:
+            raise SnapshotError(f"Snapshot {self.path}: checksum mismatch for "
+                                f"{entry['category']}/{entry['filename']}")
+        return _decode(payload)
+
+    def text(self, entry: Dict[str, Any]) -> Optional[str]:
+        """
+        Searchable text of one document, or None for snapshots written without it
+
+        Raises:
+            SnapshotError: If the text does not match its recorded CRC-32
+        """
+        if 'text_offset' not in entry:
+            return None
+        payload = self._map[entry['text_offset']:entry['text_offset'] + entry['text_length']]
+        if zlib.crc32(payload) != entry['text_crc32']:
+            raise SnapshotError(f"Snapshot {self.path}: text checksum mismatch for "
+                                f"{entry['category']}/{entry['filename']}")
+        return payload.decode('utf-8')
+
+    def verify(self):
+        """Check every document payload against its checksum"""
+        for entry in self.documents:
+            self.decode(entry)
+            self.text(entry)
+
+    def close(self):
+        """Unmap the file"""
+        self._map.close()
+
+
+class SnapshotLoader:
+    """Load JSON data from a local snapshot file instead of PostgreSQL"""
+
+    def __init__(self, path: Optional[str] = None, cache: Optional[DocumentCache] = None):
+        """
+        Initialize the loader
+
+        Args:
+            path: Snapshot file (defaults to DOCUMENT_SNAPSHOT_PATH)
+            cache: Cache for decoded documents and projections (entries are
+                versioned by the snapshot's index digest, so they never expire)
+        """
+        self.path = path or snapshot_path()
+        self.cache = cache or DocumentCache(max_entries=int(os.getenv('DOCUMENT_CACHE_MAX_ENTRIES', 128)), ttl=None,
+                                            max_projections=int(os.getenv('DOCUMENT_CACHE_MAX_PROJECTIONS', 256)))
+        self._snapshot: Optional[Snapshot] = None
+        self._lock = threading.Lock()
+
+    @property
+    def snapshot(self) -> Snapshot:
+        """The opened snapshot (opened on first use)"""
+        if self._snapshot is None:
+            with self._lock:
+                if self._snapshot is None:
+                    self._snapshot = Snapshot(self.path)
+                    logger.info(f"Opened snapshot {self.path} (version {self._snapshot.version}, "
+                                f"{len(self._snapshot.documents)} documents)")
+        return self._snapshot
+
+    @staticmethod
+    def _split_path(path: str):
+        """Split "category/filename.json" into its cache key"""
+        parts = path.split('/')
+        if len(parts) != 2:
+            raise ValueError(f"Invalid path format: {path}. Expected 'category/filename.json'")
+        return parts[0], parts[1]
+
+    def _document(self, snapshot: Snapshot, category: str, filename: str):
+        """Decode a document of the given snapshot once and keep it in the cache"""
+        key = (category, filename)
+        entry, _ = self.cache.lookup(key)
+        if entry is not None and entry.version == snapshot.digest:
+            return True, entry.data
+        index_entry = snapshot.entry(category, filename)
+        if index_entry is None:
+            return False, None
+        data = snapshot.decode(index_entry)
+        self.cache.put(key, data, snapshot.digest)
+        return True, data
+
+    def load_data(self, path: str) -> Dict[str, Any]:
+        """
+        Load JSON data from the snapshot based on path
+
+        Args:
+            path: Path in format "category/filename.json" (e.g., "codebase/repositories.json")
+
+        Returns:
+            Dict: JSON data from the snapshot (shared with other callers, do not mutate)
+        """
+        try:
+            category, filename = self._split_path(path)
+            found, data = self._document(self.snapshot, category, filename)
+            if found:
+                return data
+            logger.warning(f"No data found for category='{category}', filename='{filename}'")
+            return {}
+
+        except Exception as e:
+            logger.error(f"Failed to load data from snapshot: {str(e)}")
+            return {}
+
+    def load_path(self, path: str, json_path: str, variables: Optional[Dict[str, Any]] = None,
+                  first: bool = False) -> Any:
+        """
+        Load only the parts of a document selected by a SQL/JSON path expression
+
+        Args:
+            path: Path in format "category/filename.json"
+            json_path: SQL/JSON path in the subset supported by database.jsonpath
+            variables: Values for $variables referenced by the expression
+            first: Return only the first match (or None) instead of a list
+
+        Returns:
+            List of matching JSON values, or the first match when first is set
+        """
+        try:
+            category, filename = self._split_path(path)
+            key = (category, filename, json_path, json.dumps(variables or {}, sort_keys=True))
+            snapshot = self.snapshot
+            entry, _ = self.cache.lookup(key)
+            if entry is not None and entry.version == snapshot.digest:
+                matches = entry.data
+            else:
+                found, data = self._document(snapshot, category, filename)
+                matches = jsonpath.evaluate(data, json_path, variables) if found else []
+                self.cache.put(key, matches, snapshot.digest)
+        except Exception as e:
+            logger.error(f"Failed to load path '{json_path}' from snapshot: {str(e)}")
+            matches = []
+        if first:
+            return matches[0] if matches else None
+        return matches
+
+    def invalidate_cache(self, path: Optional[str] = None):
+        """
+        Drop decoded documents so the next load decodes them again
+
+        Args:
+            path: Document to drop ("category/filename.json"); all documents when omitted
+        """
+        if path:
+            self.cache.invalidate_document(*self._split_path(path))
+        else:
+            self.cache.invalidate()
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """
+        Get document cache hit/miss counters
+
+        Returns:
+            Dict: Cache statistics (see DocumentCache.stats)
+        """
+        return self.cache.stats()
+
+    def load_data_by_category(self, category: str) -> Dict[str, Any]:
+        """
+        Load all JSON data for a specific category
+
+        Args:
+            category: Category name (e.g., "teams", "codebase", "documentation")
+
+        Returns:
+            Dict: All JSON data for the category
+        """
+        try:
+            snapshot = self.snapshot
+            combined_data = {}
+            for entry in snapshot.documents:
+                if entry['category'] == category:
+                    _, combined_data[entry['filename']] = self._document(snapshot, category, entry['filename'])
+            return combined_data
+
+        except Exception as e:
+            logger.error(f"Failed to load category data from snapshot: {str(e)}")
+            return {}
+
+    def _ranked(self, search_term: str) -> List[Dict[str, Any]]:
+        """Every document containing all words of the term, best first"""
+        words = re.findall(r'\w+', search_term.lower())
+        if not words:
+            return []
+        snapshot = self.snapshot
+        results = []
+        for entry in snapshot.documents:
+            text = self._text(snapshot, entry)
+            lowered = text.lower()
+            counts = [lowered.count(word) for word in words]
+            if not all(counts):
+                continue
+            start = max(lowered.find(words[0]) - 80, 0)
+            results.append({
+                'category': entry['category'],
+                'subcategory': entry['subcategory'],
+                'filename': entry['filename'],
+                'document_type': entry['document_type'],
+                'rank': round(sum(counts) / (1 + len(lowered) / 1000), 4),
+                'snippet': text[start:start + 240]
+            })
+        results.sort(key=lambda result: result['rank'], reverse=True)
+        return results
+
+    def _text(self, snapshot: Snapshot, entry: Dict[str, Any]) -> str:
+        """Searchable text of a document, read from the mapped file when it has one"""
+        text = snapshot.text(entry)
+        if text is None:
+            parts = []
+            _document_text(self._document(snapshot, entry['category'], entry['filename'])[1], parts)
+            text = ' '.join(parts)
+        return text
+
+    def search_all_data(self, search_term: str, limit: int = 20, offset: int = 0,
+                        fuzzy: bool = True) -> list:
+        """
+        Search across all documents in the snapshot
+
+        Documents must contain every word of the term (case-insensitive) and are
+        ranked by how often the words occur. There is no stemming or typo
+        tolerance, so fuzzy is accepted for interface compatibility only.
+
+        Args:
+            search_term: Words to search for
+            limit: Maximum number of results to return (capped at MAX_SEARCH_LIMIT)
+            offset: Number of ranked results to skip, for pagination
+            fuzzy: Ignored
+
+        Returns:
+            List: Matching records with category, subcategory, filename, document_type,
+                rank and a snippet around the first match
+        """
+        limit = max(1, min(int(limit), MAX_SEARCH_LIMIT))
+        offset = max(0, int(offset))
+        try:
+            return self._ranked(search_term)[offset:offset + limit]
+
+        except Exception as e:
+            logger.error(f"Failed to search snapshot: {str(e)}")
+            return []
+
+
+    def iter_category(self, category: str, itersize: Optional[int] = None) -> Iterator[Tuple[str, Any]]:
+        """
+        Stream the documents of a category, decoding one at a time
+
+        Args:
+            category: Category name (e.g., "teams", "codebase", "documentation")
+            itersize: Ignored (documents are decoded individually from the mapping)
+
+        Yields:
+            Tuple: (filename, data) in filename order
+        """
+        snapshot = self.snapshot
+        for entry in sorted(snapshot.documents, key=lambda entry: entry['filename']):
+            if entry['category'] == category:
+                yield entry['filename'], snapshot.decode(entry)
+
+    def iter_search(self, search_term: str, fuzzy: bool = True,
+                    itersize: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Stream every search match in rank order
+
+        Args:
+            search_term: Words to search for
+            fuzzy: Ignored
+            itersize: Ignored
+
+        Yields:
+            Dict: Matching records (see search_all_data)
+        """
+        yield from self._ranked(search_term)
+
+
+class AsyncSnapshotLoader:
+    """AsyncDatabaseLoader interface over a SnapshotLoader
+
+    Snapshot reads are memory-mapped and never wait on the network, so the
+    coroutines call the synchronous loader directly.
+    """
+
+    def __init__(self, loader: Optional[SnapshotLoader] = None):
+        """
+        Initialize the loader
+
+        Args:
+            loader: Snapshot loader to wrap (defaults to one for DOCUMENT_SNAPSHOT_PATH)
+        """
+        self.loader = loader or SnapshotLoader()
+
+    async def load_data(self, path: str) -> Dict[str, Any]:
+        """Load JSON data from the snapshot based on path"""
+        return self.loader.load_data(path)
+
+    async def load_path(self, path: str, json_path: str, variables: Optional[Dict[str, Any]] = None,
+                        first: bool = False) -> Any:
+        """Load the parts of a document selected by a SQL/JSON path expression"""
+        return self.loader.load_path(path, json_path, variables, first)
+
+    async def load_data_by_category(self, category: str) -> Dict[str, Any]:
+        """Load all JSON data for a specific category"""
+        return self.loader.load_data_by_category(category)
+
+    async def search_all_data(self, search_term: str, limit: int = 20, offset: int = 0,
+                              fuzzy: bool = True) -> list:
+        """Search across all documents in the snapshot"""
+        return self.loader.search_all_data(search_term, limit, offset, fuzzy)
+
+    async def iter_category(self, category: str, itersize: Optional[int] = None) -> AsyncIterator[Tuple[str, Any]]:
+        """Stream the documents of a category, decoding one at a time"""
+        for item in self.loader.iter_category(category, itersize):
+            yield item
+
+    async def iter_search(self, search_term: str, fuzzy: bool = True,
+                          itersize: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Stream every search match in rank order"""
+        for result in self.loader.iter_search(search_term, fuzzy, itersize):
+            yield result
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Get document cache hit/miss counters"""
+        return self.loader.cache_stats()
+
+    async def close(self):
+        """Nothing to release; present for interface compatibility"""
+        pass
+
+
+def rows_from_database() -> List[Dict[str, Any]]:
+    """Read every json_documents row through the shared connection pool"""
+    from psycopg2.extras import RealDictCursor
+    from .connection_pool import get_pool
+
+    with get_pool().connection() as conn, conn.cursor(cursor_factory=RealDictCursor) as cursor:
+        cursor.execute("""
+            SELECT category, subcategory, filename, document_type, data, updated_at
+            FROM json_documents
+            ORDER BY category, filename
+        """)
+        return cursor.fetchall()
+
+
+def rows_from_sql(path: str) -> List[Dict[str, Any]]:
+    """Read json_documents rows from the INSERT statements of onboard.sql"""
+    with open(path, encoding='utf-8') as handle:
+        sql = handle.read()
+    rows = []
+    for category, subcategory, filename, document_type, body in _SQL_ROW.findall(sql):
+        rows.append({
+            'category': category,
+            'subcategory': subcategory,
+            'filename': filename,
+            'document_type': document_type,
+            'data': json.loads(body.replace("''", "'")),
+            'updated_at': ''
+        })
+    return rows
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point for exporting and inspecting snapshots"""
+    parser = argparse.ArgumentParser(prog='python -m new_hire.database.snapshot',
+                                     description='Export or inspect a json_documents snapshot')
+    commands = parser.add_subparsers(dest='command', required=True)
+    export = commands.add_parser('export', help='Write a snapshot of json_documents')
+    export.add_argument('--output', default=snapshot_path(), help='Snapshot file to write')
+    export.add_argument('--from-sql', metavar='SQL_FILE',
+                        help='Read rows from an onboard.sql script instead of the database')
+    info = commands.add_parser('info', help='Describe a snapshot')
+    info.add_argument('path', nargs='?', default=snapshot_path(), help='Snapshot file to read')
+    info.add_argument('--verify', action='store_true', help='Check every document checksum')
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == 'export':
+            if args.from_sql:
+                rows, source = rows_from_sql(args.from_sql), os.path.basename(args.from_sql)
+            else:
+                rows, source = rows_from_database(), f"postgresql://{os.getenv('DB_HOST')}/{os.getenv('DB_NAME')}"
+            index = write_snapshot(args.output, rows, source)
+            print(f"Wrote {len(index['documents'])} documents to {args.output} (version {index['version'] or 'n/a'})")
+        else:
+            snapshot = Snapshot(args.path)
+            if args.verify:
+                snapshot.verify()
+            print(f"{args.path}: {len(snapshot.documents)} documents, version {snapshot.version or 'n/a'}, "
+                  f"created {snapshot.created_at} from {snapshot.source or 'unknown source'}"
+                  f"{', checksums OK' if args.verify else ''}")
+            for entry in snapshot.documents:
+                print(f"  {entry['category']}/{entry['filename']}  {entry['length']} bytes  {entry['updated_at']}")
+            snapshot.close()
+        return 0
+    except Exception as e:
+        print(f"Snapshot {args.command} failed: {str(e)}", file=sys.stderr)
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -563,6 +563,143 @@ INSERT INTO json_documents (category, subcategory, filename, document_type, data
   }
 }'::jsonb);
 
+-- Team Calendars (fixture standing in for the calendar backend; busy times by member email)
+INSERT INTO json_documents (category, subcategory, filename, document_type, data) VALUES 
+('teams', 'calendars', 'calendars.json', 'team_info', '{
+  "source": "fixture",
+  "slot_step_minutes": 15,
+  "calendars": {
+    "alice.chen@company.com": {
+      "weekly_busy": [
+        {"days": ["Mon", "Tue", "Wed", "Thu", "Fri"], "start": "09:00", "end": "09:15", "title": "Backend Authentication standup", "timezone": "PST"},
+        {"days": ["Mon"], "start": "14:00", "end": "15:00", "title": "Sprint planning", "timezone": "PST"},
+        {"days": ["Fri"], "start": "15:00", "end": "16:00", "title": "Retrospective", "timezone": "PST"},
+        {"days": ["Mon", "Tue", "Wed", "Thu", "Fri"], "start": "12:00", "end": "13:00", "title": "Lunch"},
+        {"days": ["Tue", "Thu"], "start": "13:00", "end": "15:00", "title": "Focus time: auth service"}
+      ],
+      "busy": []
+    },
+    "bob.johnson@company.com": {
+      "weekly_busy": [
+        {"days": ["Mon", "Tue", "Wed", "Thu", "Fri"], "start": "09:00", "end": "09:15", "title": "Backend Authentication standup", "timezone": "PST"},
+        {"days": ["Mon"], "start": "14:00", "end": "15:00", "title": "Sprint planning", "timezone": "PST"},
+        {"days": ["Fri"], "start": "15:00", "end": "16:00", "title": "Retrospective", "timezone": "PST"},
+        {"days": ["Mon", "Tue", "Wed", "Thu", "Fri"], "start": "12:00", "end": "13:00", "title": "Lunch"},
+        {"days": ["Wed"], "start": "10:00", "end": "11:30", "title": "Rate limiter pairing"}
+      ],
+      "busy": []
+    },
+    "carol.white@company.com": {
+      "weekly_busy": [
+        {"days": ["Mon", "Tue", "Wed", "Thu", "Fri"], "start": "09:00", "end": "09:15", "title": "Backend Authentication standup", "timezone": "PST"},
+        {"days": ["Mon"], "start": "14:00", "end": "15:00", "title": "Sprint planning", "timezone": "PST"},
+        {"days": ["Fri"], "start": "15:00", "end": "16:00", "title": "Retrospective", "timezone": "PST"},
+        {"days": ["Mon", "Tue", "Wed", "Thu", "Fri"], "start": "12:00", "end": "13:00", "title": "Lunch"},
+        {"days": ["Mon", "Wed"], "start": "16:00", "end": "17:00", "title": "Interviews"}
+      ],
+      "busy": []
+    },
+    "eric.wang@company.com": {
+      "weekly_busy": [
+        {"days": ["Mon", "Tue", "Wed", "Thu", "Fri"], "start": "09:30", "end": "09:45", "title": "Payments standup", "timezone": "PST"},
+        {"days": ["Mon"], "start": "10:00", "end": "11:00", "title": "Sprint planning", "timezone": "PST"},
+        {"days": ["Wed"], "start": "14:00", "end": "15:00", "title": "Security review", "timezone": "PST"},
+        {"days": ["Mon", "Tue", "Wed", "Thu", "Fri"], "start": "12:00", "end": "13:00", "title": "Lunch"},
+        {"days": ["Tue", "Thu"], "start": "11:00", "end": "12:00", "title": "Payment provider sync"}
+      ],
+      "busy": []
+    },
+    "grace.kim@company.com": {
+      "weekly_busy": [
+        {"days": ["Mon", "Tue", "Wed", "Thu", "Fri"], "start": "09:30", "end": "09:45", "title": "Payments standup", "timezone": "PST"},
+        {"days": ["Mon"], "start": "10:00", "end": "11:00", "title": "Sprint planning", "timezone": "PST"},
+        {"days": ["Wed"], "start": "14:00", "end": "15:00", "title": "Security review", "timezone": "PST"},
+        {"days": ["Mon", "Tue", "Wed", "Thu", "Fri"], "start": "12:00", "end": "13:00", "title": "Lunch"},
+        {"days": ["Wed", "Fri"], "start": "13:00", "end": "14:30", "title": "Model review"}
+      ],
+      "busy": []
+    },
+    "henry.taylor@company.com": {
+      "weekly_busy": [
+        {"days": ["Mon", "Tue", "Wed", "Thu", "Fri"], "start": "10:00", "end": "10:15", "title": "Frontend standup", "timezone": "PST"},
+        {"days": ["Mon"], "start": "15:00", "end": "16:00", "title": "Sprint planning", "timezone": "PST"},
+        {"days": ["Tue"], "start": "14:00", "end": "15:00", "title": "Design review", "timezone": "PST"},
+        {"days": ["Mon", "Tue", "Wed", "Thu", "Fri"], "start": "12:00", "end": "13:00", "title": "Lunch"},
+        {"days": ["Thu"], "start": "09:00", "end": "11:00", "title": "Performance audit"}
+      ],
+      "busy": []
+    },
+    "isabel.martinez@company.com": {
+      "weekly_busy": [
+        {"days": ["Mon", "Tue", "Wed", "Thu", "Fri"], "start": "10:00", "end": "10:15", "title": "Frontend standup", "timezone": "PST"},
+        {"days": ["Mon"], "start": "15:00", "end": "16:00", "title": "Sprint planning", "timezone": "PST"},
+        {"days": ["Tue"], "start": "14:00", "end": "15:00", "title": "Design review", "timezone": "PST"},
+        {"days": ["Mon", "Tue", "Wed", "Thu", "Fri"], "start": "12:00", "end": "13:00", "title": "Lunch"},
+        {"days": ["Wed"], "start": "15:00", "end": "16:00", "title": "Accessibility office hours"}
+      ],
+      "busy": []
+    },
+    "laura.anderson@company.com": {
+      "weekly_busy": [
+        {"days": ["Mon", "Tue", "Wed", "Thu", "Fri"], "start": "08:30", "end": "08:45", "title": "Infrastructure standup", "timezone": "PST"},
+        {"days": ["Fri"], "start": "14:00", "end": "15:00", "title": "Incident review", "timezone": "PST"},
+        {"days": ["Mon", "Tue", "Wed", "Thu", "Fri"], "start": "12:00", "end": "13:00", "title": "Lunch"},
+        {"days": ["Tue", "Thu"], "start": "10:00", "end": "12:00", "title": "Pipeline maintenance window"}
+      ],
+      "busy": []
+    },
+    "mark.thompson@company.com": {
+      "weekly_busy": [
+        {"days": ["Mon", "Tue", "Wed", "Thu", "Fri"], "start": "08:30", "end": "08:45", "title": "Infrastructure standup", "timezone": "PST"},
+        {"days": ["Fri"], "start": "14:00", "end": "15:00", "title": "Incident review", "timezone": "PST"},
+        {"days": ["Mon", "Tue", "Wed", "Thu", "Fri"], "start": "12:00", "end": "13:00", "title": "Lunch"},
+        {"days": ["Mon", "Tue", "Wed", "Thu", "Fri"], "start": "16:00", "end": "17:00", "title": "On-call handoff"}
+      ],
+      "busy": []
+    },
+    "olivia.parker@company.com": {
+      "weekly_busy": [
+        {"days": ["Mon", "Tue", "Wed", "Thu", "Fri"], "start": "09:00", "end": "09:15", "title": "Data Engineering standup", "timezone": "PST"},
+        {"days": ["Thu"], "start": "14:00", "end": "15:00", "title": "Data quality review", "timezone": "PST"},
+        {"days": ["Mon", "Tue", "Wed", "Thu", "Fri"], "start": "12:00", "end": "13:00", "title": "Lunch"},
+        {"days": ["Mon", "Thu"], "start": "11:00", "end": "12:00", "title": "Stakeholder sync"}
+      ],
+      "busy": []
+    },
+    "peter.zhang@company.com": {
+      "weekly_busy": [
+        {"days": ["Mon", "Tue", "Wed", "Thu", "Fri"], "start": "09:00", "end": "09:15", "title": "Data Engineering standup", "timezone": "PST"},
+        {"days": ["Thu"], "start": "14:00", "end": "15:00", "title": "Data quality review", "timezone": "PST"},
+        {"days": ["Mon", "Tue", "Wed", "Thu", "Fri"], "start": "12:00", "end": "13:00", "title": "Lunch"},
+        {"days": ["Tue"], "start": "13:00", "end": "16:00", "title": "Model training review"}
+      ],
+      "busy": []
+    },
+    "mike.rodriguez@company.com": {
+      "weekly_busy": [
+        {"days": ["Mon", "Tue", "Wed", "Thu", "Fri"], "start": "09:00", "end": "09:15", "title": "Backend Authentication standup", "timezone": "PST"},
+        {"days": ["Mon"], "start": "14:00", "end": "15:00", "title": "Sprint planning", "timezone": "PST"},
+        {"days": ["Fri"], "start": "15:00", "end": "16:00", "title": "Retrospective", "timezone": "PST"},
+        {"days": ["Mon", "Tue", "Wed", "Thu", "Fri"], "start": "12:00", "end": "13:00", "title": "Lunch"},
+        {"days": ["Tue", "Thu"], "start": "10:00", "end": "11:00", "title": "Manager 1:1s"},
+        {"days": ["Wed"], "start": "13:00", "end": "14:00", "title": "Engineering leads sync"}
+      ],
+      "busy": []
+    },
+    "jennifer.liu@company.com": {
+      "weekly_busy": [
+        {"days": ["Mon", "Tue", "Wed", "Thu", "Fri"], "start": "09:30", "end": "09:45", "title": "Payments standup", "timezone": "PST"},
+        {"days": ["Mon"], "start": "10:00", "end": "11:00", "title": "Sprint planning", "timezone": "PST"},
+        {"days": ["Wed"], "start": "14:00", "end": "15:00", "title": "Security review", "timezone": "PST"},
+        {"days": ["Mon", "Tue", "Wed", "Thu", "Fri"], "start": "12:00", "end": "13:00", "title": "Lunch"},
+        {"days": ["Mon", "Wed"], "start": "15:00", "end": "16:00", "title": "Manager 1:1s"},
+        {"days": ["Wed"], "start": "13:00", "end": "14:00", "title": "Engineering leads sync"}
+      ],
+      "busy": []
+    }
+  }
+}'::jsonb);
+
 -- 2. CODEBASE DATA
 -- ============================================================================
 
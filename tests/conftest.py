@@ -0,0 +1,56 @@
+"""
+Shared test setup
+The repository root is the new_hire package, and its __init__.py builds the
+agents, so the package is registered without running it and tests import
+the tool and database modules directly. Tools read a snapshot exported from
+onboard.sql (DOCUMENT_BACKEND=snapshot), so no database is needed.
+
+Run from the repository root:
+    python -m pytest -q tests
+"""
+
+import os
+import sys
+import types
+import shutil
+import tempfile
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+ONBOARD_SQL = REPO_ROOT / "onboard.sql"
+
+if 'new_hire' not in sys.modules:
+    package = types.ModuleType('new_hire')
+    package.__path__ = [str(REPO_ROOT)]
+    sys.modules['new_hire'] = package
+
+# Set before any tool module creates the shared loaders
+_SNAPSHOT_DIR = tempfile.mkdtemp(prefix='new_hire_tests_')
+os.environ['DOCUMENT_BACKEND'] = 'snapshot'
+os.environ['DOCUMENT_SNAPSHOT_PATH'] = os.path.join(_SNAPSHOT_DIR, 'onboard.snapshot')
+os.environ['ERROR_OCCURRENCE_TRACKING'] = 'false'
+
+
+@pytest.fixture(scope="session")
+def onboard_rows():
+    """json_documents rows of onboard.sql"""
+    from new_hire.database.snapshot import rows_from_sql
+    return rows_from_sql(str(ONBOARD_SQL))
+
+
+@pytest.fixture(scope="session")
+def documents(onboard_rows):
+    """Documents of onboard.sql by "category/filename.json" """
+    return {f"{row['category']}/{row['filename']}": row['data'] for row in onboard_rows}
+
+
+@pytest.fixture(scope="session", autouse=True)
+def onboard_snapshot(onboard_rows):
+    """Snapshot of onboard.sql that the tools' shared loaders read"""
+    from new_hire.database.snapshot import write_snapshot
+    path = os.environ['DOCUMENT_SNAPSHOT_PATH']
+    write_snapshot(path, onboard_rows, ONBOARD_SQL.name)
+    yield path
+    shutil.rmtree(_SNAPSHOT_DIR, ignore_errors=True)
@@ -0,0 +1,98 @@
+import asyncio
+import os
+
+import pytest
+
+from new_hire.tools import troubleshooting_tools
+from new_hire.tools.troubleshooting_tools import analyze_log, analyze_log_async
+
+CI_LOG = """\
+step 1: install
+ERROR connection refused while fetching packages
+Traceback (most recent call last):
+  File "build.py", line 3, in main
+ModuleNotFoundError: No module named 'yaml'
+ERROR connection refused while fetching packages
+"""
+
+
+@pytest.fixture
+def log_dir(tmp_path, monkeypatch):
+    logs = tmp_path / "logs"
+    (logs / "ci").mkdir(parents=True)
+    (logs / "ci" / "build.log").write_text(CI_LOG)
+    (tmp_path / "secret.env").write_text("DB_PASSWORD=connection refused\n")
+    monkeypatch.setenv("LOG_ANALYSIS_DIR", str(logs))
+    return logs
+
+
+def categories(summary):
+    return {error["error_category"]: error["count"] for error in summary["errors"]}
+
+
+def test_pasted_log_is_summarized():
+    summary = analyze_log(log_content=CI_LOG, context="nightly build")
+    assert summary["status"] == "success"
+    assert summary["source"] == "<pasted log>"
+    assert summary["lines_scanned"] == 6
+    assert categories(summary) == {"connection_errors": 2, "import_errors": 1}
+    assert summary["stack_traces_found"] == 1
+
+
+def test_file_reads_are_disabled_without_a_log_directory(monkeypatch, tmp_path):
+    monkeypatch.delenv("LOG_ANALYSIS_DIR", raising=False)
+    (tmp_path / "build.log").write_text(CI_LOG)
+    summary = analyze_log(log_name=str(tmp_path / "build.log"))
+    assert summary["status"] == "error"
+    assert "LOG_ANALYSIS_DIR" in summary["error_message"]
+
+
+def test_files_are_read_by_name_inside_the_log_directory(log_dir):
+    summary = analyze_log(log_name="ci/build.log")
+    assert summary["status"] == "success"
+    assert summary["source"] == "ci/build.log"
+    assert categories(summary) == {"connection_errors": 2, "import_errors": 1}
+
+
+@pytest.mark.parametrize("name", ["../secret.env", "ci/../../secret.env", "/etc/passwd", "ci", "missing.log",
+                                  "link.log"])
+def test_names_outside_the_directory_or_not_files_are_refused_alike(log_dir, name):
+    (log_dir / "link.log").symlink_to(log_dir.parent / "secret.env")
+    summary = analyze_log(log_name=name)
+    assert summary == {"status": "error",
+                       "error_message": f"Failed to analyze log: No log named '{name}' in the log directory"}
+
+
+@pytest.mark.skipif(not hasattr(os, "mkfifo"), reason="needs FIFOs")
+def test_fifos_are_refused_without_blocking(log_dir):
+    os.mkfifo(log_dir / "pipe.log")
+    assert analyze_log(log_name="pipe.log")["status"] == "error"
+
+
+def test_total_size_and_line_length_are_capped(log_dir, monkeypatch):
+    line_cap = troubleshooting_tools._MAX_LOG_LINE_BYTES
+    (log_dir / "long.log").write_text("x" * (3 * line_cap) + " oom\nout of memory\n" + "filler\n" * 1000)
+    summary = analyze_log(log_name="long.log")
+    # The tail of the long line (with its "oom") is skipped, not scanned as more lines
+    assert summary["lines_scanned"] == 1002
+    assert summary["long_lines_cut"] == 1
+    assert categories(summary) == {"memory_errors": 1}
+    assert "truncated" not in summary
+
+    # The cap ends the scan inside the long line
+    monkeypatch.setenv("LOG_ANALYSIS_MAX_BYTES", str(2 * line_cap))
+    summary = analyze_log(log_name="long.log")
+    assert summary["truncated"] is True
+    assert summary["lines_scanned"] == 1
+    assert summary["errors"] == []
+
+
+def test_content_and_name_are_exclusive(log_dir):
+    assert analyze_log(log_content=CI_LOG, log_name="ci/build.log")["status"] == "error"
+    assert analyze_log()["status"] == "error"
+
+
+def test_async_variant_reads_the_same_way(log_dir):
+    summary = asyncio.run(analyze_log_async(log_name="ci/build.log"))
+    assert categories(summary) == {"connection_errors": 2, "import_errors": 1}
+    assert asyncio.run(analyze_log_async(log_name="../secret.env"))["status"] == "error"
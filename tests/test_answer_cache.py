@@ -0,0 +1,106 @@
+from types import SimpleNamespace
+
+import pytest
+
+from new_hire.database.document_cache import DocumentCache
+from new_hire.tools import answer_cache
+from new_hire.tools.answer_cache import AnswerCache, embed, is_cacheable_query, normalize
+
+
+HANDBOOK = "policies/hr_handbook.json"
+
+
+@pytest.fixture
+def documents():
+    """Document cache holding the handbook at version 1"""
+    cache = DocumentCache(ttl=None)
+    cache.put(("policies", "hr_handbook.json"), {"policies": []}, 1)
+    return cache
+
+
+def similarity(first, second):
+    left, right = embed(normalize(first)), embed(normalize(second))
+    return sum(weight * right.get(bucket, 0.0) for bucket, weight in left.items())
+
+
+def test_rephrasings_with_the_same_words_are_served(documents):
+    cache = AnswerCache()
+    cache.store("What is the PTO policy?", "20 days", {HANDBOOK: 1})
+    assert cache.lookup("what's the PTO policy", documents)[0] == "20 days"
+    answer, score = cache.lookup("What are the PTO policies?", documents)
+    assert answer == "20 days" and score >= cache.min_similarity
+
+
+@pytest.mark.parametrize("stored, asked", [
+    ("Which services depend on the auth service?", "Which services does the auth service depend on?"),
+    ("How to set up the dev environment?", "How to set up the dev environment on Windows?"),
+    ("What is the remote work policy?", "What is the remote work policy for contractors?"),
+])
+def test_near_misses_are_not_served(documents, stored, asked):
+    cache = AnswerCache()
+    cache.store(stored, "answer", {})
+    assert cache.lookup(asked, documents) is None
+
+
+def test_reordered_words_fall_below_the_threshold():
+    assert similarity("Which services depend on the auth service?",
+                      "Which services does the auth service depend on?") < AnswerCache().min_similarity
+
+
+@pytest.mark.parametrize("query", [
+    "Who is my manager?",
+    "How do I set up my dev environment?",
+    "What did we decide about the release?",
+    "Is this laptop mine?",
+    "What about the API docs?",
+])
+def test_personal_and_follow_up_questions_are_not_cached(query):
+    assert not is_cacheable_query(query)
+
+
+def test_questions_about_the_company_are_cached():
+    assert is_cacheable_query("What is the parental leave policy?")
+    assert is_cacheable_query("Which modules depend on the auth service?")
+
+
+def test_answers_are_dropped_when_their_documents_change(documents):
+    cache = AnswerCache()
+    cache.store("What is the PTO policy?", "20 days", {HANDBOOK: 1})
+    documents.put(("policies", "hr_handbook.json"), {"policies": ["new"]}, 2)
+    assert cache.lookup("What is the PTO policy?", documents) is None
+    assert cache.stats()["stale"] == 1
+    assert cache.stats()["size"] == 0
+
+
+def test_answers_wait_while_their_documents_are_unverified(documents):
+    cache = AnswerCache()
+    cache.store("What is the PTO policy?", "20 days", {HANDBOOK: 1})
+    documents.invalidate()
+    assert cache.lookup("What is the PTO policy?", documents) is None
+    assert cache.stats()["size"] == 1
+    # A tool call reloads the same version
+    documents.put(("policies", "hr_handbook.json"), {"policies": []}, 1)
+    assert cache.lookup("What is the PTO policy?", documents)[0] == "20 days"
+
+
+def test_answers_are_stored_with_the_versions_their_tools_read(documents, monkeypatch):
+    monkeypatch.setattr(answer_cache, "get_loader", lambda: SimpleNamespace(cache=documents))
+    monkeypatch.setattr(answer_cache, "_cache", AnswerCache())
+    monkeypatch.setenv("ANSWER_CACHE", "true")
+
+    def ask(invocation_id, question, version_after_tool):
+        context = SimpleNamespace(invocation_id=invocation_id, agent_name="policy_guide",
+                                  user_content=SimpleNamespace(parts=[SimpleNamespace(text=question)]))
+        assert answer_cache.answer_from_cache(context) is None
+        answer_cache.track_tool_call(SimpleNamespace(name="search_policies"), {}, context)
+        answer_cache.track_tool_result(SimpleNamespace(name="search_policies"), {}, context, {})
+        documents.put(("policies", "hr_handbook.json"), {"version": version_after_tool}, version_after_tool)
+        answer_cache.capture_answer(context, SimpleNamespace(
+            partial=False, content=SimpleNamespace(parts=[SimpleNamespace(text="20 days", function_call=None)])))
+        answer_cache.store_answer(context)
+
+    # The handbook changes after the tool read it: the answer is tied to what the tool read
+    ask("first", "What is the PTO policy?", 2)
+    assert answer_cache.get_answer_cache().stats()["stores"] == 1
+    assert answer_cache.get_answer_cache().lookup("What is the PTO policy?", documents) is None
+    assert answer_cache.get_answer_cache().stats()["stale"] == 1
@@ -0,0 +1,35 @@
+import asyncio
+
+from new_hire.database import async_loader as async_module
+from new_hire.database import db_loader
+from new_hire.database.async_loader import AsyncDatabaseLoader, get_async_loader
+from new_hire.database.document_cache import DocumentCache
+
+
+class FakePool:
+    def __init__(self):
+        self.terminated = False
+
+    def terminate(self):
+        self.terminated = True
+
+
+def test_the_postgres_loaders_share_one_document_cache(monkeypatch):
+    monkeypatch.setenv("DOCUMENT_BACKEND", "postgres")
+    monkeypatch.setattr(db_loader, "_shared_loader", None)
+    monkeypatch.setattr(async_module, "_shared_async_loader", None)
+    assert get_async_loader().cache is db_loader.get_loader().cache
+
+
+def test_pools_of_earlier_event_loops_are_terminated(monkeypatch):
+    pools = []
+
+    async def create_pool(**settings):
+        pools.append(FakePool())
+        return pools[-1]
+
+    monkeypatch.setattr(async_module.asyncpg, "create_pool", create_pool, raising=False)
+    loader = AsyncDatabaseLoader(cache=DocumentCache())
+    first = asyncio.run(loader._get_pool())
+    assert asyncio.run(loader._get_pool()) is not first
+    assert [pool.terminated for pool in pools] == [True, False]
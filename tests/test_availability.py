@@ -0,0 +1,131 @@
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+from new_hire.tools.availability import (
+    CalendarBook, MemberCalendar, _subtract, common_slots, intersect, parse_duration, timezone_for, working_hours
+)
+
+LOS_ANGELES = ZoneInfo("America/Los_Angeles")
+NEW_YORK = ZoneInfo("America/New_York")
+
+
+def utc(*args) -> float:
+    return datetime(*args, tzinfo=timezone.utc).timestamp()
+
+
+def member(name, timezone_name, availability="Available 9 AM - 5 PM"):
+    return {"name": name, "email": f"{name.lower()}@company.com", "timezone": timezone_name,
+            "availability": availability}
+
+
+def test_subtract_removes_busy_time_from_each_free_interval():
+    free = [(0, 10), (20, 30), (40, 50)]
+    busy = [(-5, 2), (4, 6), (8, 22), (25, 26), (45, 60)]
+    assert _subtract(free, busy) == [(2, 4), (6, 8), (22, 25), (26, 30), (40, 45)]
+    assert _subtract(free, []) == free
+    assert _subtract([(0, 10)], [(0, 10)]) == []
+
+
+def test_intersect_keeps_time_free_in_both():
+    first = [(0, 10), (20, 30)]
+    second = [(5, 25), (28, 40)]
+    assert intersect(first, second) == [(5, 10), (20, 25), (28, 30)]
+    assert intersect(first, []) == []
+    # Touching intervals share no time
+    assert intersect([(0, 10)], [(10, 20)]) == []
+
+
+def test_working_hours_and_durations_parse_the_fixture_formats():
+    assert working_hours("Available 9 AM - 6 PM PST") == (9 * 60, 18 * 60)
+    assert working_hours("8:30am-5pm") == (8 * 60 + 30, 17 * 60)
+    assert working_hours("whenever") == (9 * 60, 17 * 60)
+    assert parse_duration("1 hour 30 minutes") == 90
+    assert parse_duration("1.5h") == 90
+    assert parse_duration("45") == 45
+    assert parse_duration("soon") is None
+
+
+def test_timezone_abbreviations_map_to_dst_aware_zones():
+    assert timezone_for("pst") == LOS_ANGELES
+    assert timezone_for("EDT") == NEW_YORK
+    assert timezone_for("Europe/Berlin") == ZoneInfo("Europe/Berlin")
+    assert timezone_for("Nowhere/Special") == timezone.utc
+
+
+def test_at_follows_wall_clock_across_dst_changes():
+    # 2026-03-08: clocks in Los Angeles jump from 2:00 to 3:00
+    spring = datetime(2026, 3, 8, tzinfo=LOS_ANGELES)
+    assert MemberCalendar._at(spring, 9 * 60) == utc(2026, 3, 8, 16)
+    # 2026-11-01: clocks fall back from 2:00 to 1:00
+    autumn = datetime(2026, 11, 1, tzinfo=LOS_ANGELES)
+    assert MemberCalendar._at(autumn, 9 * 60) == utc(2026, 11, 1, 17)
+    # Minutes past midnight roll over to the next local day
+    assert MemberCalendar._at(spring, 24 * 60 + 60) == utc(2026, 3, 9, 8)
+
+
+def test_free_time_is_working_hours_minus_weekly_and_one_off_busy_time():
+    calendar = MemberCalendar(member("Ana", "PST"), {
+        "weekly_busy": [
+            {"days": ["Mon", "Tue"], "start": "10:00", "end": "10:30"},
+            # Written in another timezone: 13:00-14:00 New York is 10:00-11:00 Los Angeles
+            {"days": ["Tue"], "start": "13:00", "end": "14:00", "timezone": "America/New_York"}
+        ],
+        "busy": [{"start": "2026-10-19T14:00:00-07:00", "end": "2026-10-19T14:50:00-07:00"}]
+    })
+    monday = datetime(2026, 10, 19, tzinfo=LOS_ANGELES)
+    assert calendar.free(monday, monday + timedelta(days=1)) == [
+        (utc(2026, 10, 19, 16), utc(2026, 10, 19, 17)),
+        (utc(2026, 10, 19, 17, 30), utc(2026, 10, 19, 21)),
+        (utc(2026, 10, 19, 21, 50), utc(2026, 10, 20, 0)),
+    ]
+    tuesday = monday + timedelta(days=1)
+    assert calendar.free(tuesday, tuesday + timedelta(days=1)) == [
+        (utc(2026, 10, 20, 16), utc(2026, 10, 20, 17)),
+        (utc(2026, 10, 20, 18), utc(2026, 10, 21, 0)),
+    ]
+    # Weekends are not working days
+    saturday = monday + timedelta(days=5)
+    assert calendar.free(saturday, saturday + timedelta(days=2)) == []
+
+
+def test_free_time_is_clipped_to_the_window():
+    calendar = MemberCalendar(member("Ana", "UTC"), {})
+    start = datetime(2026, 10, 19, 12, tzinfo=timezone.utc)
+    assert calendar.free(start, start + timedelta(hours=2)) == [(utc(2026, 10, 19, 12), utc(2026, 10, 19, 14))]
+
+
+def test_free_time_follows_the_members_dst_change():
+    calendar = MemberCalendar(member("Ana", "PST"), {})
+    friday = datetime(2026, 10, 30, tzinfo=LOS_ANGELES)
+    free = calendar.free(friday, friday + timedelta(days=4))
+    # Friday in PDT (UTC-7), Monday in PST (UTC-8)
+    assert free == [(utc(2026, 10, 30, 16), utc(2026, 10, 31, 0)),
+                    (utc(2026, 11, 2, 17), utc(2026, 11, 3, 1))]
+
+
+def test_common_slots_overlap_timezones_and_align_to_the_step():
+    book = CalendarBook({"calendars": {
+        "ana@company.com": {"weekly_busy": [{"days": ["Mon"], "start": "10:00", "end": "10:30"}]},
+        "ben@company.com": {"busy": [{"start": "2026-10-19T14:00:00-04:00", "end": "2026-10-19T14:07:00-04:00"}]}
+    }})
+    ana = book.calendar(member("Ana", "PST"))
+    ben = book.calendar(member("Ben", "EST"))
+    monday = datetime(2026, 10, 19, tzinfo=timezone.utc)
+    slots = common_slots([ana, ben], 45, monday, monday + timedelta(days=1), max_slots=10, step_minutes=15)
+    # Both work 16:00-21:00 UTC; Ana's standup takes 17:00-17:30 and Ben is
+    # busy 18:00-18:07, so 17:30-18:00 is too short and 18:07 rounds up to 18:15
+    assert slots == [
+        (utc(2026, 10, 19, 16), utc(2026, 10, 19, 16, 45)),
+        (utc(2026, 10, 19, 18, 15), utc(2026, 10, 19, 19)),
+        (utc(2026, 10, 19, 19), utc(2026, 10, 19, 19, 45)),
+        (utc(2026, 10, 19, 19, 45), utc(2026, 10, 19, 20, 30)),
+    ]
+    assert all(start % (15 * 60) == 0 for start, _ in slots)
+    assert common_slots([ana, ben], 45, monday, monday + timedelta(days=1), max_slots=2)[-1] == slots[1]
+
+
+def test_calendar_book_reuses_member_calendars():
+    book = CalendarBook({"calendars": {}, "slot_step_minutes": 30})
+    assert book.step_minutes == 30
+    assert book.calendar(member("Ana", "PST")) is book.calendar(member("Ana", "PST"))
+    assert book.calendar(member("Ana", "PST")) is not book.calendar(member("Ana", "EST"))
@@ -0,0 +1,95 @@
+import pytest
+
+from new_hire.tools.code_checks import PythonFacts, check
+from new_hire.tools.codebase_tools import _check_best_practices, check_best_practices
+
+
+def assigned(code):
+    return PythonFacts(code).literal_assignments
+
+
+@pytest.mark.parametrize("code", [
+    'api_key = "abc"',
+    'api_key: str = "abc"',
+    'client = Client(api_key="abc")',
+    'settings = {"api_key": "abc"}',
+    'self.api_key = "abc"',
+    'os.environ["API_KEY"] = "abc"',
+    'def connect(host, api_key="abc"): pass',
+    'def connect(host, /, api_key="abc"): pass',
+    'def connect(*, api_key="abc", retries=3): pass',
+    'connect = lambda api_key="abc": api_key',
+])
+def test_hardcoded_literals_are_found_wherever_they_are_stored(code):
+    facts = PythonFacts(code)
+    assert ("api_key", "abc") in facts.literal_assignments
+    assert check(facts, "assigned_literal", "api_key")
+
+
+def test_defaults_pair_with_the_last_positional_parameters():
+    assert assigned('def f(token, region="eu", *, api_key, mode="fast"): pass') == [
+        ("region", "eu"), ("mode", "fast")]
+
+
+def test_values_that_are_not_literals_are_not_flagged():
+    facts = PythonFacts('\n'.join([
+        'api_key = os.environ["API_KEY"]',
+        'os.environ[key] = "abc"',
+        'def f(api_key=None, token=""): pass',
+        'print("api_key")',
+    ]))
+    assert not check(facts, "assigned_literal", "api_key")
+
+
+def test_static_mode_flags_the_secrets_text_mode_flags():
+    for code in ('def call(api_key="sk-123"):\n    return api_key',
+                 'import os\nos.environ["API_KEY"] = "sk-123"'):
+        text = check_best_practices(code, static_analysis=False)["code_analysis"]
+        static = check_best_practices(code, static_analysis=True)["code_analysis"]
+        assert static["analysis_mode"] == "ast"
+        assert text["violations"]
+        assert static["violations"] == text["violations"]
+
+
+@pytest.mark.parametrize("code", [
+    'cursor.execute(f"SELECT * FROM users WHERE name = \'{name}\'")',
+    'cursor.execute("SELECT * FROM users WHERE id = %s" % user_id)',
+    'cursor.execute("SELECT * FROM " + table)',
+    'db.executemany("DELETE FROM {} WHERE id = ?".format(table), rows)',
+    'query = f"SELECT * FROM users WHERE id = {user_id}"\ncursor.execute(query)',
+])
+def test_formatted_sql_passed_to_execute_is_flagged(code):
+    assert check(PythonFacts(code), "formatted_sql", "sql")
+
+
+@pytest.mark.parametrize("code", [
+    'cursor.execute("SELECT * FROM users WHERE id = %s", (user_id,))',
+    '# build the sql by hand\nlog("sql is fine")',
+    'query = "SELECT 1"\ncursor.execute(query)',
+    'label = f"{count} sql rows"',
+])
+def test_parameterized_or_unrelated_sql_is_not_flagged(code):
+    assert not check(PythonFacts(code), "formatted_sql", "sql")
+
+
+def test_password_rule_needs_code_handling_a_password():
+    assert check(PythonFacts("def login(user, password):\n    return user.check_password(password)"),
+                 "identifier", "password")
+    assert check(PythonFacts("connect(host, password=secret)"), "identifier", "password")
+    assert not check(PythonFacts('# reset the password weekly\nmessage = "forgot password?"'),
+                     "identifier", "password")
+
+
+def test_static_mode_has_a_structural_check_for_every_default_rule():
+    static = check_best_practices('# sql and password notes\nlog("http")', static_analysis=True)["code_analysis"]
+    assert static["analysis_mode"] == "ast"
+    assert static["recommendations"] == [] and static["violations"] == []
+    assert "text_matched_rules" not in static
+
+
+def test_rules_without_a_structural_check_are_reported_as_text_matched():
+    practices = {"rules": [{"trigger": "eval(", "type": "violation", "rule": "No eval", "message": "m"},
+                           {"trigger": "print(", "type": "violation", "rule": "Logging", "message": "m"}]}
+    analysis = _check_best_practices(practices, "x = eval(data)", "python", True)["code_analysis"]
+    assert analysis["text_matched_rules"] == ["No eval"]
+    assert [violation["rule"] for violation in analysis["violations"]] == ["No eval"]
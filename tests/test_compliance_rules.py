@@ -0,0 +1,56 @@
+from new_hire.tools.policy_tools import _ComplianceRules, check_compliance, check_compliance_batch
+
+COMPLIANCE = {"regulations": {
+    "GDPR": {"description": "EU data protection", "requirements": [
+        {"title": "Data Subject Rights", "applicable_scenarios": ["customer data", "personal information"],
+         "compliance_level": "critical"},
+        {"title": "Breach Notification", "applicable_scenarios": ["data breach"]},
+    ]},
+    "HIPAA": {"description": "US health data", "requirements": [
+        {"title": "Protected Health Information", "applicable_scenarios": ["health data", "customer data"]},
+    ]},
+}}
+
+
+def titles(requirements):
+    return [requirement["requirement_title"] for requirement in requirements]
+
+
+def test_each_scenario_gets_its_own_requirements_in_document_order():
+    rules = _ComplianceRules(COMPLIANCE)
+    result = rules.evaluate(["Exporting CUSTOMER DATA to a vendor", "A data breach at a health data vendor",
+                             "Ordering office chairs"])
+    assert [titles(requirements) for requirements in result] == [
+        ["Data Subject Rights", "Protected Health Information"],
+        ["Breach Notification", "Protected Health Information"],
+        [],
+    ]
+
+
+def test_keywords_do_not_match_across_scenarios():
+    rules = _ComplianceRules(COMPLIANCE)
+    assert rules.evaluate(["we store customer", "data in the cloud"]) == [[], []]
+
+
+def test_regulation_type_restricts_the_requirements():
+    rules = _ComplianceRules(COMPLIANCE)
+    assert titles(rules.evaluate(["customer data"], "hipaa")[0]) == ["Protected Health Information"]
+    assert rules.evaluate(["customer data"], "SOX") == [[]]
+
+
+def test_tools_apply_the_onboard_compliance_rules():
+    single = check_compliance("We process credit card data for refunds")
+    assert single["status"] == "success" and single["total_requirements"] == 1
+
+    batch = check_compliance_batch(["customer data export", "credit card data", "team lunch"])
+    assert batch["status"] == "success"
+    assert [titles(result["requirements"]) for result in batch["results"]] == [
+        ["Data Subject Rights"], ["Cardholder Data Protection"], []]
+
+
+def test_scenarios_that_grow_when_lowercased_keep_their_matches():
+    rules = _ComplianceRules(COMPLIANCE)
+    # 'İ'.lower() is two characters, shifting every later match offset
+    result = rules.evaluate(["İ" * 20 + " customer data", "y" * 60, "personal information"])
+    assert [titles(requirements) for requirements in result] == [
+        ["Data Subject Rights", "Protected Health Information"], [], ["Data Subject Rights"]]
@@ -0,0 +1,66 @@
+from new_hire.tools.dependency_graph import DependencyGraph
+
+DEPENDENCIES = {"modules": {
+    "web-app": {"architecture_layer": "presentation", "dependencies": ["api-gateway"]},
+    "api-gateway": {"architecture_layer": "service", "dependencies": ["auth-service", "user-service"]},
+    "auth-service": {"architecture_layer": "service", "dependencies": ["user-service", "postgres"]},
+    "user-service": {"architecture_layer": "service", "dependencies": ["auth-service", "user-db"]},
+    "user-db": {"architecture_layer": "data", "dependencies": ["user-service"]},
+    "billing": {"architecture_layer": "service", "dependencies": ["billing"], "dependents": ["web-app"]},
+}}
+
+
+def names(graph, nodes):
+    return sorted(graph.names[node] for node in nodes)
+
+
+def test_edges_come_from_dependencies_and_dependents():
+    graph = DependencyGraph(DEPENDENCIES)
+    web = graph.resolve("web-app")[0]
+    assert names(graph, graph.dependencies[web]) == ["api-gateway", "billing"]
+    assert names(graph, graph.dependents[graph.ids["postgres"]]) == ["auth-service"]
+
+
+def test_cycles_are_strongly_connected_components_and_self_loops():
+    graph = DependencyGraph(DEPENDENCIES)
+    cycles = sorted(names(graph, cycle) for cycle in graph.cycles())
+    assert cycles == [["auth-service", "user-db", "user-service"], ["billing"]]
+    assert graph.cycle_of(graph.ids["web-app"]) is None
+    assert names(graph, graph.cycle_of(graph.ids["user-db"])) == ["auth-service", "user-db", "user-service"]
+
+
+def test_tarjan_handles_long_chains_without_recursion():
+    size = 5000
+    modules = {f"m{i}": {"dependencies": [f"m{i + 1}"]} for i in range(size)}
+    modules[f"m{size - 1}"]["dependencies"] = ["m0"]
+    graph = DependencyGraph({"modules": modules})
+    assert [len(cycle) for cycle in graph.cycles()] == [size]
+    modules[f"m{size - 1}"]["dependencies"] = []
+    assert DependencyGraph({"modules": modules}).cycles() == ()
+
+
+def test_shortest_path_and_reach_count_hops():
+    graph = DependencyGraph(DEPENDENCIES)
+    web, user_db = graph.ids["web-app"], graph.ids["user-db"]
+    path = graph.shortest_path(web, user_db)
+    assert [graph.names[node] for node in path] == ["web-app", "api-gateway", "user-service", "user-db"]
+    assert graph.shortest_path(user_db, web) is None
+    assert graph.shortest_path(web, web) == (web,)
+    reach = {graph.names[node]: hops for node, hops in graph.transitive_dependencies(web)}
+    assert reach == {"api-gateway": 1, "billing": 1, "auth-service": 2, "user-service": 2,
+                     "postgres": 3, "user-db": 3}
+
+
+def test_blast_radius_and_layer_violations():
+    graph = DependencyGraph(DEPENDENCIES)
+    count, depth, layers = graph.blast_radius(graph.ids["postgres"])
+    assert (count, depth) == (5, 3)
+    assert dict(layers) == {"service": 3, "data": 1, "presentation": 1}
+    assert [(graph.names[a], graph.names[b]) for a, b in graph.layer_violations()] == [("user-db", "user-service")]
+
+
+def test_resolve_prefers_exact_then_prefix_then_substring():
+    graph = DependencyGraph(DEPENDENCIES)
+    assert [graph.names[node] for node in graph.resolve("user")] == ["user-db", "user-service"]
+    assert [graph.names[node] for node in graph.resolve("SERVICE")] == ["auth-service", "user-service"]
+    assert graph.resolve("payments") == []
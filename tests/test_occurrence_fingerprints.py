@@ -0,0 +1,32 @@
+from new_hire.database.occurrence_store import fingerprint, normalize_trace
+
+TRACE = '''Traceback (most recent call last):
+  File "/srv/app/handlers.py", line 42, in handle
+    user = load_user(request_id)
+  File "/tmp/pytest-of-ana/pytest-17/app.py", line 7, in load_user
+KeyError: 'user 123456 at 0x7f3a2b1c at 2026-10-17T09:30:12.123Z'
+'''
+
+
+def test_volatile_parts_are_replaced():
+    assert normalize_trace(TRACE).splitlines() == [
+        "Traceback (most recent call last):",
+        'File "/srv/app/handlers.py", line <n>, in handle',
+        "user = load_user(request_id)",
+        'File "<tmp>", line <n>, in load_user',
+        "KeyError: 'user <n> at <addr> at <time>'",
+    ]
+
+
+def test_java_and_javascript_locations_and_ids():
+    assert normalize_trace("at Service.run(Service.java:118)") == "at Service.run(Service.java:<n>)"
+    assert normalize_trace("at main (index.js:10:5)") == "at main (index.js:<n>)"
+    assert normalize_trace("request 3f2b8c1e-0d4a-4b6e-9f1a-2c3d4e5f6a7b failed") == "request <uuid> failed"
+
+
+def test_same_failure_has_one_fingerprint():
+    other_run = (TRACE.replace("line 42", "line 45").replace("pytest-17", "pytest-18")
+                 .replace("0x7f3a2b1c", "0x55d0aa10").replace("123456", "987654"))
+    assert fingerprint(other_run) == fingerprint(TRACE)
+    assert fingerprint(TRACE.replace("KeyError", "ValueError")) != fingerprint(TRACE)
+    assert len(fingerprint(TRACE)) == 40
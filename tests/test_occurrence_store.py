@@ -0,0 +1,155 @@
+import copy
+import datetime
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import pytest
+
+from new_hire.database import occurrence_store as store_module
+from new_hire.database.occurrence_store import OccurrenceStore, fingerprint, normalize_trace
+from new_hire.tools import troubleshooting_tools
+
+TRACE = "psycopg2.OperationalError: connection refused at 0x7f3a2b1c"
+
+
+class FakePool:
+    """Pooled connection double recording the statements run on it"""
+
+    def __init__(self, rows=()):
+        self.statements = []
+        self.rows = list(rows)
+        self.fail = False
+
+    @contextmanager
+    def connection(self):
+        if self.fail:
+            raise ConnectionError("database unavailable")
+        yield self
+
+    @contextmanager
+    def cursor(self, cursor_factory=None):
+        yield self
+
+    def execute(self, query, params):
+        self.statements.append((" ".join(query.split()), params))
+        self.description = "SELECT" in query or "RETURNING" in query
+
+    def fetchall(self):
+        rows, self.rows = self.rows, []
+        return rows
+
+
+@pytest.fixture
+def batches(monkeypatch):
+    written = []
+    monkeypatch.setattr(store_module, "execute_values", lambda cursor, query, rows: written.append(rows))
+    return written
+
+
+def test_occurrences_are_counted_in_memory_and_written_in_one_batch(batches):
+    pool = FakePool()
+    store = OccurrenceStore(pool=pool)
+    assert store.lookup("a" * 40) is None
+    for _ in range(3):
+        store.record("a" * 40, "trace a")
+    store.record("b" * 40, "trace b", [{"category": "connection_errors"}])
+    assert store.lookup("a" * 40)["occurrences"] == 3
+    assert pool.statements == []
+
+    store.flush()
+    assert len(batches) == 1
+    assert sorted((row[0][0], row[3]) for row in batches[0]) == [("a", 3), ("b", 1)]
+    store.flush()
+    assert len(batches) == 1
+
+
+def test_failed_writes_are_retried_with_later_counts(batches):
+    pool = FakePool()
+    store = OccurrenceStore(pool=pool)
+    store.record("a" * 40, "trace a")
+    pool.fail = True
+    with pytest.raises(ConnectionError):
+        store.flush()
+    store.record("a" * 40, "trace a")
+    pool.fail = False
+    store.flush()
+    assert [row[3] for row in batches[0]] == [2]
+
+
+def test_rows_changed_by_other_workers_are_loaded(batches):
+    seen = datetime.datetime(2026, 10, 17, 9, 30)
+    pool = FakePool(rows=[{"fingerprint": "c" * 40, "matches": None, "occurrences": 7, "first_seen": seen,
+                           "last_seen": seen, "resolved_by": "Restart the pool", "resolved_at": seen}])
+    store = OccurrenceStore(pool=pool)
+    store.record("c" * 40, "trace c")
+    store.flush()
+    loaded = store.lookup("c" * 40)
+    assert loaded["resolved_by"] == "Restart the pool"
+    assert loaded["occurrences"] == 7
+
+
+def test_memory_is_bounded():
+    store = OccurrenceStore(pool=FakePool(), max_entries=2)
+    for name in "abc":
+        store.record(name * 40, name)
+    assert store.lookup("a" * 40) is None
+    assert store.lookup("c" * 40)["occurrences"] == 1
+
+
+def test_analyze_error_uses_the_stored_classification(monkeypatch):
+    store = OccurrenceStore(pool=FakePool())
+    monkeypatch.setattr(troubleshooting_tools, "occurrence_store", store)
+    first = troubleshooting_tools.analyze_error(TRACE)
+    assert first["analysis"]["error_category"] == "connection_errors"
+    assert first["occurrence"]["times_seen"] == 1
+    assert store.lookup(fingerprint(TRACE))["matches"]["matches"][0]["category"] == "connection_errors"
+
+    calls = []
+    monkeypatch.setattr(troubleshooting_tools, "_match_errors", lambda *args: calls.append(args))
+    second = troubleshooting_tools.analyze_error(TRACE.replace("0x7f3a2b1c", "0x55d0aa10"))
+    assert calls == []
+    assert second["analysis"]["error_category"] == "connection_errors"
+    assert second["occurrence"]["times_seen"] == 2
+
+
+def test_traces_are_reclassified_when_the_error_patterns_change(monkeypatch):
+    store = OccurrenceStore(pool=FakePool())
+    monkeypatch.setattr(troubleshooting_tools, "occurrence_store", store)
+    error_data = copy.deepcopy(troubleshooting_tools.loader.load_data("troubleshooting/common_errors.json"))
+    first, _ = troubleshooting_tools._matches_with_history(error_data, TRACE)
+    assert first[0]["category"] == "connection_errors"
+
+    # A more specific pattern added later wins for traces already classified
+    edited = copy.deepcopy(error_data)
+    edited["error_patterns"]["postgres_errors"] = {"patterns": ["OperationalError: connection refused"],
+                                                   "type": "PostgreSQL unreachable", "severity": "high"}
+    again, _ = troubleshooting_tools._matches_with_history(edited, TRACE)
+    assert again[0]["category"] == "postgres_errors"
+    assert store.lookup(fingerprint(TRACE))["matches"]["version"] == troubleshooting_tools._patterns_version(edited)
+
+    calls = []
+    monkeypatch.setattr(troubleshooting_tools, "_match_errors", lambda *args: calls.append(args))
+    known, _ = troubleshooting_tools._matches_with_history(edited, TRACE)
+    assert calls == [] and known[0]["category"] == "postgres_errors"
+
+
+def test_only_listed_maintainers_record_resolutions(monkeypatch):
+    seen = datetime.datetime(2026, 10, 17, 9, 30)
+    pool = FakePool()
+    store = OccurrenceStore(pool=pool)
+    monkeypatch.setattr(troubleshooting_tools, "occurrence_store", store)
+    monkeypatch.setenv("ERROR_RESOLUTION_EDITORS", "sre-lead, platform-oncall")
+    title = troubleshooting_tools.loader.load_data("troubleshooting/solutions.json")["solutions"][0]["title"]
+
+    for tool_context in (None, SimpleNamespace(user_id="new-hire")):
+        refused = troubleshooting_tools.mark_error_resolved(TRACE, title, tool_context)
+        assert refused["status"] == "error"
+        assert "maintainers" in refused["error_message"]
+    assert pool.statements == []
+
+    pool.rows = [{"fingerprint": fingerprint(TRACE), "matches": None, "occurrences": 1, "first_seen": seen,
+                  "last_seen": seen, "resolved_by": title, "resolved_at": seen}]
+    recorded = troubleshooting_tools.mark_error_resolved(TRACE, title, SimpleNamespace(user_id="sre-lead"))
+    assert recorded["status"] == "success"
+    assert pool.statements[0][1] == (fingerprint(TRACE), normalize_trace(TRACE), title)
+    assert store.lookup(fingerprint(TRACE))["resolved_by"] == title
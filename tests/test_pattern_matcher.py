@@ -0,0 +1,33 @@
+from new_hire.tools.pattern_matcher import PatternMatch, PatternMatcher
+
+
+def test_reports_every_occurrence_case_insensitively():
+    matcher = PatternMatcher([("timeout", "network"), ("Connection refused", "network")])
+    text = "Timeout after connection REFUSED, then another timeout"
+    assert [(match.start, match.pattern) for match in matcher.find(text)] == [
+        (0, "timeout"), (14, "connection refused"), (47, "timeout")]
+    assert text[14:32].lower() == "connection refused"
+
+
+def test_overlapping_and_nested_patterns_are_all_found():
+    matcher = PatternMatcher([("null", 1), ("null pointer", 2), ("pointer exception", 3)])
+    matches = matcher.find("a null pointer exception")
+    # Longest first at each offset
+    assert [(match.start, match.end, match.pattern) for match in matches] == [
+        (2, 14, "null pointer"), (2, 6, "null"), (7, 24, "pointer exception")]
+
+
+def test_values_of_repeated_patterns_are_grouped():
+    matcher = PatternMatcher([("oom", "memory"), ("OOM", "kubernetes"), ("", "ignored")])
+    assert len(matcher) == 1
+    assert matcher.find("pod OOMKilled") == [PatternMatch(4, 7, "oom", ["memory", "kubernetes"])]
+
+
+def test_regex_characters_are_literal():
+    matcher = PatternMatcher([("a.b", 1), ("(x)", 2)])
+    assert [match.pattern for match in matcher.find("axb a.b (x)")] == ["a.b", "(x)"]
+
+
+def test_empty_matcher_and_text_find_nothing():
+    assert PatternMatcher([]).find("anything") == []
+    assert PatternMatcher([("x", 1)]).find("") == []
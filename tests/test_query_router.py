@@ -0,0 +1,56 @@
+import pytest
+
+from new_hire.tools.query_router import CALIBRATION_EXAMPLES, ORCHESTRATOR, ROUTING_EXAMPLES, QueryRouter
+
+
+@pytest.fixture(scope="module")
+def router():
+    return QueryRouter()
+
+
+@pytest.mark.parametrize("query, agent", [
+    ("What's the PTO policy?", "policy_guide"),
+    ("Who is my manager?", "team_integrator"),
+    ("Show me the API reference for the orders endpoint", "documentation_assistant"),
+    ("How do I fix JWT token expired errors?", "troubleshooting_copilot"),
+])
+def test_clear_queries_take_the_fast_path(router, query, agent):
+    route = router.classify(query)
+    assert (route.agent, route.method, route.fast_path) == (agent, "classifier", True)
+
+
+@pytest.mark.parametrize("query", [
+    "What happens if I fail my probation?",
+    "I want to leave the company",
+])
+def test_a_single_keyword_is_not_enough_for_the_fast_path(router, query):
+    route = router.classify(query)
+    assert not route.fast_path
+    assert route.confidence < router.min_confidence
+
+
+def test_ticket_lookups_call_the_ticket_tool(router):
+    route = router.classify("ticket 42")
+    assert route.fast_path and route.tool_call[1] == {"ticket_id": 42}
+
+
+def test_cross_domain_and_orchestrator_queries_reach_the_model(router):
+    assert router.classify("What's the PTO policy and who is my manager?").method == "cross_domain"
+    assert router.classify("Hello").agent == ORCHESTRATOR
+    assert router.classify("Where do I park at the office?").method == "no_signal"
+
+
+def test_calibration_examples_are_held_out():
+    trained = {query for queries in ROUTING_EXAMPLES.values() for query in queries}
+    assert not trained & {query for query, _ in CALIBRATION_EXAMPLES}
+
+
+def test_confidence_tracks_accuracy_on_the_calibration_set(router):
+    routes = [(router.classify(query), label) for query, label in CALIBRATION_EXAMPLES]
+    confidences = [route.confidence for route, _ in routes]
+    assert max(confidences) < 1.0
+    # Mean confidence is close to the share of routes that are right
+    accuracy = sum(route.agent == label for route, label in routes) / len(routes)
+    assert abs(sum(confidences) / len(confidences) - accuracy) < 0.1
+    fast = [route.agent == label for route, label in routes if route.fast_path]
+    assert fast and all(fast)
@@ -0,0 +1,65 @@
+import asyncio
+import inspect
+from types import SimpleNamespace
+
+from new_hire.tools.response_shaping import RESULTS_STATE_KEY, expand_result, shape_response, shaped
+
+POLICIES = {"status": "success", "matching_policies": [
+    {"title": f"Policy {number}", "category": "benefits", "description": "d" * 300,
+     "details": {"eligibility": "everyone", "steps": ["ask", "wait"]}, "contact": "hr@example.com"}
+    for number in range(8)]}
+
+
+def session():
+    return SimpleNamespace(state={})
+
+
+def test_summaries_keep_the_key_fields_within_budget():
+    summary = shape_response("search_policies", POLICIES, store=None)
+    assert len(str(summary)) < len(str(POLICIES))
+    assert set(summary["matching_policies"][0]) == {"title", "category", "description"}
+    assert "details" in summary["truncated"]["matching_policies[]"]
+    assert "result_id" not in summary
+
+
+def test_full_results_are_expanded_within_their_session_only():
+    def search_policies(query: str) -> dict:
+        return POLICIES
+
+    tool = shaped(search_policies)
+    alice, bob = session(), session()
+    summary = tool("leave", tool_context=alice)
+    expanded = expand_result(summary["result_id"], "matching_policies.3", tool_context=alice)
+    assert expanded["content"]["details"]["eligibility"] == "everyone"
+    assert expand_result(summary["result_id"], tool_context=bob)["status"] == "error"
+    assert bob.state == {}
+
+
+def test_each_session_keeps_a_bounded_number_of_results():
+    def search_policies(query: str) -> dict:
+        return POLICIES
+
+    tool = shaped(search_policies)
+    context = session()
+    ids = [tool("leave", tool_context=context)["result_id"] for _ in range(20)]
+    assert list(context.state[RESULTS_STATE_KEY]) == ids[-16:]
+    assert expand_result(ids[0], tool_context=context)["status"] == "error"
+
+
+def test_tools_taking_the_context_still_get_it():
+    seen = []
+
+    async def mark(message: str, tool_context=None) -> dict:
+        seen.append(tool_context)
+        return {"status": "success"}
+
+    tool = shaped(mark)
+    context = session()
+    assert asyncio.run(tool("boom", tool_context=context)) == {"status": "success"}
+    assert seen == [context]
+    assert list(inspect.signature(tool).parameters) == ["message", "tool_context", "detail", "fields"]
+
+
+def test_small_results_are_returned_unchanged():
+    result = {"status": "success", "teams": [{"name": "Payments", "manager": "Ana", "size": 4, "notes": "x"}]}
+    assert shape_response("get_team_info", result, store=None) is result
@@ -0,0 +1,66 @@
+from new_hire.tools.search_index import SearchIndex, get_index, stem, tokenize
+
+ENTRIES = [
+    {"title": "Deploying services", "body": "Use the deploy pipeline for every service"},
+    {"title": "Database migrations", "body": "Run migrations before deploying"},
+    {"title": "Kubernetes basics", "body": "Pods, deployments and services on the cluster"},
+    {"title": "Vacation policy", "body": "Request vacation two weeks ahead"},
+]
+WEIGHTS = {"title": 3.0, "body": 1.0}
+
+
+def test_tokenize_drops_stopwords_and_stems():
+    assert tokenize("How do I deploy the Services?") == ["deploy", "service"]
+    assert tokenize(["Policies", "meetings"]) == ["policy", "meet"]
+    assert tokenize(None) == []
+    assert stem("classes") == "class"
+    assert stem("status") == "status"
+    assert stem("2024") == "2024"
+
+
+def test_search_ranks_title_matches_first_and_counts_all_matches():
+    index = SearchIndex(ENTRIES, WEIGHTS)
+    hits, total = index.search("deploy")
+    assert total == 3
+    assert hits[0].position == 0
+    assert hits[0].fields == frozenset({"title", "body"})
+    assert [hit.score for hit in hits] == sorted((hit.score for hit in hits), reverse=True)
+
+
+def test_search_without_matches_is_empty():
+    index = SearchIndex(ENTRIES, WEIGHTS)
+    assert index.search("payroll") == ([], 0)
+    assert index.search("the and of") == ([], 0)
+
+
+def test_prefixes_match_longer_terms_at_lower_weight():
+    index = SearchIndex(ENTRIES, WEIGHTS)
+    hits, _ = index.search("kube")
+    assert [hit.position for hit in hits] == [2]
+    exact, _ = index.search("kubernetes")
+    assert 0 < hits[0].score < exact[0].score
+
+
+def test_k_and_where_restrict_the_hits():
+    index = SearchIndex(ENTRIES, WEIGHTS, items=["a", "b", "c", "d"])
+    hits, total = index.search("deploy", k=1)
+    assert len(hits) == 1 and total == 3
+    hits, total = index.search("deploy", where=lambda position: position != 0)
+    assert {hit.position for hit in hits} == {1, 2} and total == 2
+    assert index.items[hits[0].position] in ("b", "c")
+
+
+def test_get_index_builds_once_per_document_object():
+    built = []
+
+    def build(document):
+        built.append(document)
+        return SearchIndex(document["entries"], WEIGHTS)
+
+    document = {"entries": ENTRIES}
+    first = get_index("test_entries", document, build)
+    assert get_index("test_entries", document, build) is first
+    # A changed document is a new object and gets its own index
+    changed = {"entries": ENTRIES[:2]}
+    assert get_index("test_entries", changed, build) is not first
+    assert len(built) == 2
@@ -0,0 +1,99 @@
+import json
+
+import pytest
+
+from new_hire.database.snapshot import (
+    SNAPSHOT_MAGIC, Snapshot, SnapshotError, SnapshotLoader, write_snapshot
+)
+
+
+@pytest.fixture
+def small_snapshot(tmp_path):
+    rows = [
+        {"category": "teams", "subcategory": "people", "filename": "team_members.json", "document_type": "members",
+         "data": {"members": [{"name": "Zoë Ångström", "role": "Engineer", "expertise": ["Kafka"]}]},
+         "updated_at": "2026-01-02T03:04:05"},
+        {"category": "policies", "subcategory": "hr", "filename": "hr_handbook.json", "document_type": "handbook",
+         "data": {"policies": {"leave": [{"title": "Vacation", "days": 25, "paid": True, "notes": None}]}},
+         "updated_at": "2026-01-01T00:00:00"},
+    ]
+    path = tmp_path / "small.snapshot"
+    write_snapshot(str(path), rows, "test")
+    return path, rows
+
+
+def test_round_trip_keeps_documents_and_metadata(small_snapshot):
+    path, rows = small_snapshot
+    snapshot = Snapshot(str(path))
+    try:
+        assert snapshot.version == "2026-01-02T03:04:05"
+        assert snapshot.source == "test"
+        for row in rows:
+            entry = snapshot.entry(row["category"], row["filename"])
+            assert snapshot.decode(entry) == row["data"]
+            assert entry["subcategory"] == row["subcategory"]
+        assert "Ångström" in snapshot.text(snapshot.entry("teams", "team_members.json"))
+        snapshot.verify()
+    finally:
+        snapshot.close()
+
+
+def test_payloads_are_plain_json(small_snapshot):
+    path, rows = small_snapshot
+    snapshot = Snapshot(str(path))
+    entry = snapshot.entry("policies", "hr_handbook.json")
+    raw = path.read_bytes()[entry["offset"]:entry["offset"] + entry["length"]]
+    snapshot.close()
+    assert json.loads(raw.decode("utf-8")) == rows[1]["data"]
+
+
+def test_corrupt_payload_is_detected(small_snapshot):
+    path, _ = small_snapshot
+    snapshot = Snapshot(str(path))
+    entry = snapshot.entry("teams", "team_members.json")
+    snapshot.close()
+    data = bytearray(path.read_bytes())
+    data[entry["offset"] + 2] ^= 0xFF
+    path.write_bytes(bytes(data))
+
+    corrupt = Snapshot(str(path))
+    with pytest.raises(SnapshotError, match="checksum mismatch"):
+        corrupt.decode(corrupt.entry("teams", "team_members.json"))
+    corrupt.close()
+
+
+def test_other_format_versions_are_refused(small_snapshot):
+    path, _ = small_snapshot
+    data = bytearray(path.read_bytes())
+    data[len(SNAPSHOT_MAGIC)] = 1
+    path.write_bytes(bytes(data))
+    with pytest.raises(SnapshotError, match="export it again"):
+        Snapshot(str(path))
+
+
+def test_non_snapshot_files_are_refused(tmp_path):
+    path = tmp_path / "notes.txt"
+    path.write_text("not a snapshot at all, just text")
+    with pytest.raises(SnapshotError, match="not a snapshot"):
+        Snapshot(str(path))
+    with pytest.raises(SnapshotError, match="Cannot open"):
+        Snapshot(str(tmp_path / "missing.snapshot"))
+
+
+def test_onboard_snapshot_matches_the_sql_script(onboard_snapshot, documents):
+    loader = SnapshotLoader(onboard_snapshot)
+    for path, data in documents.items():
+        assert loader.load_data(path) == data
+    # Loaders hand out one object per document version; indexes key on it
+    assert loader.load_data("teams/team_members.json") is loader.load_data("teams/team_members.json")
+    assert loader.load_data("teams/missing.json") == {}
+
+
+def test_onboard_snapshot_serves_projections_and_search(onboard_snapshot, documents):
+    loader = SnapshotLoader(onboard_snapshot)
+    names = loader.load_path("teams/team_structure.json", "$.teams.keyvalue().key")
+    assert names == list(documents["teams/team_structure.json"]["teams"])
+
+    results = loader.search_all_data("kubernetes", limit=3)
+    assert 0 < len(results) <= 3
+    assert [result["rank"] for result in results] == sorted((result["rank"] for result in results), reverse=True)
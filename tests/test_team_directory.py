@@ -0,0 +1,50 @@
+from new_hire.tools.team_directory import TeamDirectory
+
+TEAM = {"members": [
+    {"name": "Alice Chen", "email": "alice.chen@company.com", "slack_handle": "@alice",
+     "role": "Senior Backend Engineer", "team": "Backend", "expertise": ["Python", "Kafka"]},
+    {"name": "Bob Johnson", "email": "bob.j@company.com", "slack_handle": "@bobj",
+     "role": "Frontend Engineer", "team": "Frontend", "expertise": ["React"]},
+    {"name": "Alicia Chen-Ramos", "email": "alicia@company.com", "slack_handle": "@alicia",
+     "role": "Engineering Manager", "team": "Backend", "expertise": ["Hiring"]},
+    {"name": "Li Wu", "email": "li.wu@company.com", "slack_handle": "@li",
+     "role": "SRE", "team": "Platform", "expertise": ["Kubernetes"]},
+]}
+
+
+def test_similar_names_tolerate_one_typo_per_word():
+    directory = TeamDirectory(TEAM)
+    assert directory._similar_names("Alcie Chen") == {0: 0.9}
+    assert directory._similar_names("bob jonhson") == {1: 0.9}
+    assert directory._similar_names("Bob Johnson") == {1: 1.0}
+
+
+def test_similar_names_need_every_word():
+    directory = TeamDirectory(TEAM)
+    # "chen" is in two names, but only Alicia's also has "ramos"
+    assert directory._similar_names("chen ramos") == {2: 1.0}
+    assert directory._similar_names("alice smith") == {}
+    assert directory._similar_names("") == {}
+
+
+def test_similar_names_reject_two_typos_and_short_word_typos():
+    directory = TeamDirectory(TEAM)
+    assert directory._similar_names("Alcei") == {}
+    # One-letter words only match exactly
+    assert directory._similar_names("x wu") == {}
+
+
+def test_find_person_prefers_exact_then_substring_then_similar():
+    directory = TeamDirectory(TEAM)
+    assert directory.find_person("@BOBJ") == (TEAM["members"][1], False)
+    assert directory.find_person("alicia") == (TEAM["members"][2], False)
+    assert directory.find_person("Johnsen") == (TEAM["members"][1], True)
+    assert directory.find_person("Zed") == (None, False)
+
+
+def test_role_expertise_and_team_lookups_match_substrings():
+    directory = TeamDirectory(TEAM)
+    assert sorted(directory.by_role("engineer")) == [0, 1, 2]
+    assert directory.by_role("frontend") == [1]
+    assert directory.by_expertise("kube") == [3]
+    assert directory.by_team("back") == [0, 2]
@@ -7,31 +7,56 @@ from .codebase_tools import (
     search_codebase,
     analyze_dependencies,
     check_best_practices,
-    get_tech_stack_info
+    get_tech_stack_info,
+    search_codebase_async,
+    analyze_dependencies_async,
+    check_best_practices_async,
+    get_tech_stack_info_async
 )
 
 from .documentation_tools import (
     search_documentation,
     find_wiki_content,
-    get_api_docs
+    get_api_docs,
+    search_documentation_async,
+    find_wiki_content_async,
+    get_api_docs_async
 )
 
 from .troubleshooting_tools import (
     analyze_error,
+    analyze_log,
+    analyze_log_lines,
     find_solutions,
-    run_diagnostics
+    mark_error_resolved,
+    run_diagnostics,
+    analyze_error_async,
+    analyze_log_async,
+    find_solutions_async,
+    mark_error_resolved_async,
+    run_diagnostics_async
 )
 
 from .policy_tools import (
     search_policies,
     check_compliance,
-    find_guidelines
+    check_compliance_batch,
+    find_guidelines,
+    search_policies_async,
+    check_compliance_async,
+    check_compliance_batch_async,
+    find_guidelines_async
 )
 
 from .team_tools import (
     get_team_info,
     find_team_member,
-    schedule_meeting
+    schedule_meeting,
+    find_common_slots,
+    get_team_info_async,
+    find_team_member_async,
+    schedule_meeting_async,
+    find_common_slots_async
 )
 
 # Export all tools
@@ -47,14 +72,40 @@ __all__ = [
     'get_api_docs',
     # Troubleshooting tools
     'analyze_error',
+    'analyze_log',
+    'analyze_log_lines',
     'find_solutions',
+    'mark_error_resolved',
     'run_diagnostics',
     # Policy tools
     'search_policies',
     'check_compliance',
+    'check_compliance_batch',
     'find_guidelines',
     # Team tools
     'get_team_info',
     'find_team_member',
-    'schedule_meeting'
+    'schedule_meeting',
+    'find_common_slots',
+    # Async variants (same tool names, non-blocking database access)
+    'search_codebase_async',
+    'analyze_dependencies_async',
+    'check_best_practices_async',
+    'get_tech_stack_info_async',
+    'search_documentation_async',
+    'find_wiki_content_async',
+    'get_api_docs_async',
+    'analyze_error_async',
+    'analyze_log_async',
+    'find_solutions_async',
+    'mark_error_resolved_async',
+    'run_diagnostics_async',
+    'search_policies_async',
+    'check_compliance_async',
+    'check_compliance_batch_async',
+    'find_guidelines_async',
+    'get_team_info_async',
+    'find_team_member_async',
+    'schedule_meeting_async',
+    'find_common_slots_async'
 ]
@@ -0,0 +1,416 @@
+"""
+Semantic answer cache in front of the agents
+Final answers are stored under the normalized query and a hashed
+bag-of-words embedding, and served again for the same or a near-identical
+question without running the agents. Each answer is tagged with the
+versions (updated_at) of the json_documents its tools read, taken from the
+shared document cache right after each tool call, and is dropped as soon as
+one of them changes. Freshness is checked against that cache only, so the
+callbacks never query the database from the event loop; answers that used anything else
+(tickets, GitHub, web search, calendars, log files) are not cached. The cache
+is shared by every user, so questions about the asker ("my manager", "do I")
+are never cached either.
+"""
+
+import os
+import re
+import time
+import zlib
+import math
+import logging
+import threading
+from collections import OrderedDict, defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+from google.genai import types
+
+from new_hire.database.db_loader import get_loader
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Tools whose results depend only on these documents; an answer that called
+# any other tool is not cached
+TOOL_DOCUMENTS: Dict[str, Tuple[str, ...]] = {
+    "transfer_to_agent": (),
+    "search_codebase": ("codebase/repositories.json",),
+    "analyze_dependencies": ("codebase/dependencies.json",),
+    "check_best_practices": ("codebase/best_practices.json",),
+    "get_tech_stack_info": ("codebase/tech_stack.json",),
+    "search_documentation": ("documentation/wiki_pages.json", "documentation/api_docs.json",
+                             "documentation/tutorials.json"),
+    "find_wiki_content": ("documentation/wiki_pages.json",),
+    "get_api_docs": ("documentation/api_docs.json",),
+    "find_solutions": ("troubleshooting/solutions.json",),
+    "run_diagnostics": ("troubleshooting/diagnostics.json",),
+    "search_policies": ("policies/hr_handbook.json",),
+    "check_compliance": ("policies/compliance_docs.json",),
+    "check_compliance_batch": ("policies/compliance_docs.json",),
+    "find_guidelines": ("policies/security_guidelines.json",),
+    "get_team_info": ("teams/team_structure.json",),
+    "find_team_member": ("teams/team_members.json",),
+}
+
+# Hash buckets of the query embedding
+_DIMENSIONS = 1 << 20
+
+_WORD = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be can do does for from how i in is me my of on or our please show tell the "
+    "to we what when where which with you your s t d m ll re ve".split()
+)
+# Questions that lean on earlier turns mean something else in another conversation
+_FOLLOW_UP = re.compile(
+    r"^\s*(?:and|also|what about|how about|same|more|why)\b|\b(?:it|that|this|those|these|them|he|she|they|his|her|their)\b",
+    re.IGNORECASE
+)
+
+# Questions about the asker have a different answer for each user
+_PERSONAL = re.compile(r"\b(?:i|me|my|mine|myself|we)\b", re.IGNORECASE)
+
+# In-flight invocations tracked at once; older ones are dropped
+_MAX_PENDING = 1024
+
+
+def normalize(query: str) -> str:
+    """Lowercased words of a query separated by single spaces"""
+    return " ".join(_WORD.findall(query.lower()))
+
+
+def _terms(normalized: str) -> List[str]:
+    terms = []
+    for word in normalized.split():
+        if word in _STOPWORDS:
+            continue
+        if len(word) > 4 and word.endswith("ies"):
+            word = word[:-3] + "y"
+        elif len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        terms.append(word)
+    return terms
+
+
+def embed(normalized: str) -> Dict[int, float]:
+    """
+    Unit-length hashed embedding of a normalized query
+
+    Content words and adjacent word pairs are hashed (crc32, stable across
+    processes) into signed buckets, so word order matters a little and
+    synonyms not at all; near-identical phrasings land close together.
+    """
+    terms = _terms(normalized)
+    features = terms + [f"{left} {right}" for left, right in zip(terms, terms[1:])]
+    vector: Dict[int, float] = defaultdict(float)
+    for feature in features:
+        digest = zlib.crc32(feature.encode("utf-8"))
+        vector[digest % _DIMENSIONS] += 1.0 if digest & 0x80000000 else -1.0
+    norm = math.sqrt(sum(value * value for value in vector.values()))
+    return {bucket: value / norm for bucket, value in vector.items() if value} if norm else {}
+
+
+def is_cacheable_query(query: str) -> bool:
+    """Whether a query stands on its own and means the same for every user
+    (no follow-up or first-person cues, at least one content word)"""
+    return bool(_terms(normalize(query))) and not _FOLLOW_UP.search(query) and not _PERSONAL.search(query)
+
+
+class _Entry:
+    """A cached answer with the versions of the documents it was built from"""
+
+    __slots__ = ('key', 'answer', 'vector', 'words', 'documents', 'stored_at')
+
+    # documents: path ("category/filename.json") -> version the answer was built from
+    def __init__(self, key: str, answer: str, vector: Dict[int, float], documents: Dict[str, Any]):
+        self.key = key
+        self.answer = answer
+        self.vector = vector
+        self.words = frozenset(_terms(key))
+        self.documents = documents
+        self.stored_at = time.monotonic()
+
+
+class AnswerCache:
+    """Thread-safe LRU of answers with exact and nearest-neighbour lookup
+
+    Lookups try the normalized query first, then the stored embedding with
+    the highest cosine similarity, found through an inverted index over the
+    embedding buckets. A similar question must use the same content words:
+    one more word ("... on Windows?") changes the question, and the
+    similarity threshold is high enough that reordering them ("A depends on
+    B" against "B depends on A") misses too. A hit is checked against the
+    document cache the tools read through: an answer whose documents are now
+    at another version is stale and dropped; one whose documents the cache
+    cannot vouch for (evicted, or past their TTL) is kept but not served
+    until a tool call revalidates them.
+    """
+
+    def __init__(self, max_entries: int = 512, min_similarity: float = 0.95, ttl: Optional[float] = 3600.0):
+        """
+        Initialize the cache
+
+        Args:
+            max_entries: Answers kept before the least recently used is dropped
+            min_similarity: Cosine similarity a different phrasing needs to reuse an answer
+            ttl: Seconds an answer is served at most (None: until its documents change)
+        """
+        self.max_entries = max_entries
+        self.min_similarity = min_similarity
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        # Embedding bucket -> keys of the entries using it
+        self._postings: Dict[int, set] = defaultdict(set)
+        self._lock = threading.Lock()
+        self._stats = {'exact_hits': 0, 'similar_hits': 0, 'misses': 0, 'stale': 0, 'stores': 0, 'evictions': 0}
+
+    def lookup(self, query: str, cache=None) -> Optional[Tuple[str, float]]:
+        """
+        Find a cached answer for a query
+
+        Args:
+            query: User query
+            cache: Document cache the tools read through (defaults to the shared loader's)
+
+        Returns:
+            Tuple: (answer, similarity) or None on a miss
+        """
+        key = normalize(query)
+        with self._lock:
+            entry, similarity = self._entries.get(key), 1.0
+            if entry is None:
+                entry, similarity = self._nearest(embed(key), frozenset(_terms(key)))
+            if entry is None:
+                self._stats['misses'] += 1
+                return None
+
+        current = self._current(entry, cache or get_loader().cache)
+        with self._lock:
+            if not current:
+                if current is False:
+                    if self._entries.get(entry.key) is entry:
+                        self._remove(entry)
+                    self._stats['stale'] += 1
+                self._stats['misses'] += 1
+                return None
+            if entry.key in self._entries:
+                self._entries.move_to_end(entry.key)
+            self._stats['exact_hits' if entry.key == key else 'similar_hits'] += 1
+        return entry.answer, similarity
+
+    def _nearest(self, vector: Dict[int, float], words: frozenset) -> Tuple[Optional[_Entry], float]:
+        scores: Dict[str, float] = defaultdict(float)
+        for bucket, weight in vector.items():
+            for key in self._postings.get(bucket, ()):
+                scores[key] += weight * self._entries[key].vector[bucket]
+        scores = {key: score for key, score in scores.items() if self._entries[key].words == words}
+        if not scores:
+            return None, 0.0
+        key = max(scores, key=scores.get)
+        if scores[key] < self.min_similarity:
+            return None, 0.0
+        return self._entries[key], scores[key]
+
+    def _current(self, entry: _Entry, cache) -> Optional[bool]:
+        """True if the answer's documents are current, False if one changed
+        (or the TTL passed), None if the cache cannot tell without a query"""
+        if self.ttl is not None and time.monotonic() - entry.stored_at > self.ttl:
+            return False
+        current = True
+        for path, version in entry.documents.items():
+            cached = cache.current_version(*path.split("/", 1))
+            if cached is None:
+                current = None
+            elif cached != version:
+                return False
+        return current
+
+    def store(self, query: str, answer: str, documents: Dict[str, Any]):
+        """
+        Cache an answer
+
+        Args:
+            query: User query the answer is for
+            answer: Final answer text
+            documents: Path ("category/filename.json") -> version of each document
+                the answer was built from, as the tools read it
+        """
+        key = normalize(query)
+        entry = _Entry(key, answer, embed(key), dict(documents))
+        with self._lock:
+            existing = self._entries.get(key)
+            if existing is not None:
+                self._remove(existing)
+            self._entries[key] = entry
+            for bucket in entry.vector:
+                self._postings[bucket].add(key)
+            self._stats['stores'] += 1
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries.values())))
+                self._stats['evictions'] += 1
+
+    def _remove(self, entry: _Entry):
+        del self._entries[entry.key]
+        for bucket in entry.vector:
+            keys = self._postings.get(bucket)
+            if keys is not None:
+                keys.discard(entry.key)
+                if not keys:
+                    del self._postings[bucket]
+
+    def clear(self):
+        """Drop every answer"""
+        with self._lock:
+            self._entries.clear()
+            self._postings.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache counters
+
+        Returns:
+            Dict: exact_hits, similar_hits, misses, stale (dropped because a
+                document changed or the TTL passed), stores, evictions, size and hit_rate
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats['size'] = len(self._entries)
+        hits = stats['exact_hits'] + stats['similar_hits']
+        lookups = hits + stats['misses']
+        stats['hit_rate'] = round(hits / lookups, 4) if lookups else 0.0
+        return stats
+
+
+_cache: Optional[AnswerCache] = None
+_cache_lock = threading.Lock()
+# invocation_id -> {"query", "entry_agent", "tools", "versions", "answer"}
+_pending: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_pending_lock = threading.Lock()
+
+
+def get_answer_cache() -> AnswerCache:
+    """Process-wide answer cache configured from ANSWER_CACHE_*"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                ttl = float(os.getenv('ANSWER_CACHE_TTL', 3600))
+                _cache = AnswerCache(
+                    max_entries=int(os.getenv('ANSWER_CACHE_MAX_ENTRIES', 512)),
+                    min_similarity=float(os.getenv('ANSWER_CACHE_MIN_SIMILARITY', 0.95)),
+                    ttl=ttl if ttl >= 0 else None
+                )
+    return _cache
+
+
+def answer_cache_stats() -> Dict[str, Any]:
+    """Counters of the process-wide answer cache"""
+    return get_answer_cache().stats()
+
+
+def _enabled() -> bool:
+    return os.getenv('ANSWER_CACHE', 'true').lower() == 'true'
+
+
+def _text(content) -> str:
+    return "".join(part.text or "" for part in (getattr(content, "parts", None) or [])).strip()
+
+
+def answer_from_cache(callback_context) -> Optional[types.Content]:
+    """
+    before_agent_callback: answer a repeated question from the cache
+
+    Only the agent that starts an invocation looks the query up; agents
+    transferred to later in the same invocation run normally. On a miss the
+    invocation is tracked so its final answer can be stored.
+    """
+    if not _enabled():
+        return None
+    invocation_id = callback_context.invocation_id
+    with _pending_lock:
+        if invocation_id in _pending:
+            return None
+    query = _text(callback_context.user_content)
+    if not query or not is_cacheable_query(query):
+        return None
+
+    hit = get_answer_cache().lookup(query)
+    if hit is not None:
+        return types.Content(role="model", parts=[types.Part(text=hit[0])])
+    with _pending_lock:
+        _pending[invocation_id] = {"query": query, "entry_agent": callback_context.agent_name,
+                                   "tools": set(), "versions": {}, "answer": None}
+        while len(_pending) > _MAX_PENDING:
+            _pending.popitem(last=False)
+    return None
+
+
+def track_tool_call(tool, args, tool_context) -> None:
+    """before_tool_callback: remember which tools an answer is built from"""
+    with _pending_lock:
+        pending = _pending.get(tool_context.invocation_id)
+        if pending is not None:
+            pending["tools"].add(tool.name)
+    return None
+
+
+def track_tool_result(tool, args, tool_context, tool_response) -> None:
+    """after_tool_callback: note the version of each document the tool just read
+
+    The version is read from the shared document cache, which the tool has
+    just loaded through, so no query is made. A document seen at two
+    versions in one invocation (or not cached) keeps the answer out of the cache.
+    """
+    with _pending_lock:
+        pending = _pending.get(tool_context.invocation_id)
+    if pending is None:
+        return None
+    cache = get_loader().cache
+    for path in TOOL_DOCUMENTS.get(tool.name, ()):
+        version = cache.current_version(*path.split("/", 1))
+        with _pending_lock:
+            if pending["versions"].setdefault(path, version) != version:
+                pending["versions"][path] = None
+    return None
+
+
+def capture_answer(callback_context, llm_response) -> None:
+    """after_model_callback: keep the latest complete text response of the invocation"""
+    if getattr(llm_response, "partial", False) or llm_response.content is None:
+        return None
+    parts = llm_response.content.parts or []
+    if any(part.function_call for part in parts):
+        return None
+    text = _text(llm_response.content)
+    if text:
+        with _pending_lock:
+            pending = _pending.get(callback_context.invocation_id)
+            if pending is not None:
+                pending["answer"] = text
+    return None
+
+
+def store_answer(callback_context) -> None:
+    """after_agent_callback: cache the final answer once the entry agent finishes"""
+    with _pending_lock:
+        pending = _pending.get(callback_context.invocation_id)
+        if pending is None or pending["entry_agent"] != callback_context.agent_name:
+            return None
+        del _pending[callback_context.invocation_id]
+    if pending["answer"] and all(tool in TOOL_DOCUMENTS for tool in pending["tools"]):
+        documents = {path for tool in pending["tools"] for path in TOOL_DOCUMENTS[tool]}
+        versions = {path: pending["versions"].get(path) for path in documents}
+        if all(version is not None for version in versions.values()):
+            try:
+                get_answer_cache().store(pending["query"], pending["answer"], versions)
+            except Exception as e:
+                logger.error(f"Failed to cache answer: {str(e)}")
+    return None
+
+
+# Callbacks every agent that can start an invocation needs: LlmAgent(..., **ANSWER_CACHE_CALLBACKS)
+ANSWER_CACHE_CALLBACKS = {
+    "before_agent_callback": answer_from_cache,
+    "before_tool_callback": track_tool_call,
+    "after_tool_callback": track_tool_result,
+    "after_model_callback": capture_answer,
+    "after_agent_callback": store_answer,
+}
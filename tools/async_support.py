@@ -0,0 +1,23 @@
+"""
+Helpers for the asyncio-native tool variants
+Following ADK patterns for tool implementation
+"""
+
+
+def async_variant_of(sync_tool):
+    """Register an async tool under the name and docstring of its sync counterpart.
+
+    ADK derives the tool name and description from the function itself, so
+    agents see the same tool whichever variant they are given.
+
+    Args:
+        sync_tool: The synchronous tool function being mirrored
+
+    Returns:
+        Decorator for the async implementation
+    """
+    def decorate(async_tool):
+        async_tool.__name__ = sync_tool.__name__
+        async_tool.__doc__ = sync_tool.__doc__
+        return async_tool
+    return decorate
@@ -0,0 +1,314 @@
+"""
+Free/busy engine for the scheduling tools
+Working hours come from each member's availability and timezone in
+team_members.json, busy times from teams/calendars.json (a fixture standing
+in for the calendar backend). Intervals are kept as sorted (start, end) UNIX
+timestamps, so free time is intersected across timezones with linear merges
+Following ADK patterns for tool implementation
+"""
+
+import re
+import bisect
+import math
+import threading
+from datetime import date, datetime, time, timedelta, timezone, tzinfo
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+# (start, end) in seconds since the epoch, end exclusive
+Interval = Tuple[float, float]
+
+# Abbreviations used in team_members.json, with the fixed offset used if the
+# system has no timezone database
+_TIMEZONES = {
+    "PST": ("America/Los_Angeles", -8), "PDT": ("America/Los_Angeles", -8),
+    "MST": ("America/Denver", -7), "MDT": ("America/Denver", -7),
+    "CST": ("America/Chicago", -6), "CDT": ("America/Chicago", -6),
+    "EST": ("America/New_York", -5), "EDT": ("America/New_York", -5),
+    "UTC": ("UTC", 0), "GMT": ("UTC", 0)
+}
+_WEEKDAYS = {"mon": 0, "tue": 1, "wed": 2, "thu": 3, "fri": 4, "sat": 5, "sun": 6}
+_WORKING_DAYS = ("Mon", "Tue", "Wed", "Thu", "Fri")
+
+# "9 AM - 6 PM", "8:30am-5pm"
+_HOURS = re.compile(r'(\d{1,2})(?::(\d{2}))?\s*([ap])\.?m\.?\s*(?:-|–|to)\s*(\d{1,2})(?::(\d{2}))?\s*([ap])\.?m\.?', re.I)
+_DEFAULT_WORKING_HOURS = (9 * 60, 17 * 60)
+_DURATION = re.compile(r'(\d+(?:\.\d+)?)\s*(h|hr|hrs|hours?|m|min|mins|minutes?)?\b', re.I)
+
+# Local days of free time cached per member calendar
+_MAX_CACHED_DAYS = 62
+
+# Slot starts are aligned to this many minutes unless calendars.json says otherwise
+DEFAULT_SLOT_STEP_MINUTES = 15
+
+
+def timezone_for(name: str) -> tzinfo:
+    """
+    tzinfo for a timezone abbreviation (PST, EST, ...) or IANA name
+
+    Args:
+        name: Timezone as written in team_members.json or calendars.json
+
+    Returns:
+        tzinfo: The zone (UTC when unknown)
+    """
+    name = name.strip()
+    return _timezone_for(name.upper() if name.upper() in _TIMEZONES else name)
+
+
+_zones: Dict[str, tzinfo] = {}
+_zones_lock = threading.Lock()
+
+
+def _timezone_for(name: str) -> tzinfo:
+    with _zones_lock:
+        zone = _zones.get(name)
+    if zone is not None:
+        return zone
+    zone_name, offset = _TIMEZONES.get(name, (name, None))
+    try:
+        zone = ZoneInfo(zone_name) if zone_name else timezone.utc
+    except (ZoneInfoNotFoundError, ValueError):
+        zone = timezone(timedelta(hours=offset)) if offset is not None else timezone.utc
+    with _zones_lock:
+        _zones[name] = zone
+    return zone
+
+
+def parse_duration(text: str) -> Optional[int]:
+    """
+    Minutes in a duration such as "30 minutes", "1 hour" or "1.5h" (bare numbers are minutes)
+
+    Returns:
+        int: Minutes, or None if the text holds no positive duration
+    """
+    total = 0.0
+    for amount, unit in _DURATION.findall(text or ""):
+        total += float(amount) * (60 if unit and unit.lower().startswith('h') else 1)
+    minutes = int(round(total))
+    return minutes if minutes > 0 else None
+
+
+def working_hours(availability: str) -> Tuple[int, int]:
+    """(start, end) minutes after local midnight from text like "Available 9 AM - 6 PM PST" """
+    match = _HOURS.search(availability or "")
+    if not match:
+        return _DEFAULT_WORKING_HOURS
+    start_hour, start_minute, start_half, end_hour, end_minute, end_half = match.groups()
+
+    def minutes(hour: str, minute: Optional[str], half: str) -> int:
+        return (int(hour) % 12 + (12 if half.lower() == 'p' else 0)) * 60 + int(minute or 0)
+
+    start, end = minutes(start_hour, start_minute, start_half), minutes(end_hour, end_minute, end_half)
+    return (start, end) if start < end else _DEFAULT_WORKING_HOURS
+
+
+def _clock(text: str) -> int:
+    """Minutes after midnight for "HH:MM" """
+    hour, _, minute = text.partition(':')
+    return int(hour) * 60 + int(minute or 0)
+
+
+def _merge(intervals: List[Interval]) -> List[Interval]:
+    """Sort and coalesce overlapping or touching intervals"""
+    merged: List[Interval] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        elif start < end:
+            merged.append((start, end))
+    return merged
+
+
+def _subtract(free: List[Interval], busy: List[Interval]) -> List[Interval]:
+    """free minus busy; both sorted and non-overlapping"""
+    result = []
+    index = 0
+    for start, end in free:
+        while index < len(busy) and busy[index][1] <= start:
+            index += 1
+        cursor = start
+        position = index
+        while position < len(busy) and busy[position][0] < end:
+            if busy[position][0] > cursor:
+                result.append((cursor, busy[position][0]))
+            cursor = max(cursor, busy[position][1])
+            position += 1
+        if cursor < end:
+            result.append((cursor, end))
+    return result
+
+
+def intersect(first: List[Interval], second: List[Interval]) -> List[Interval]:
+    """Time free in both lists; both sorted and non-overlapping"""
+    result = []
+    i = j = 0
+    while i < len(first) and j < len(second):
+        start = max(first[i][0], second[j][0])
+        end = min(first[i][1], second[j][1])
+        if start < end:
+            result.append((start, end))
+        if first[i][1] < second[j][1]:
+            i += 1
+        else:
+            j += 1
+    return result
+
+
+class MemberCalendar:
+    """Working hours and busy times of one team member"""
+
+    def __init__(self, member: Dict[str, Any], calendar: Dict[str, Any]):
+        """
+        Args:
+            member: team_members.json entry
+            calendar: The member's calendars.json entry ({} if none)
+        """
+        self.name = member.get("name", "")
+        self.email = member.get("email", "")
+        self.timezone_name = member.get("timezone", "") or "UTC"
+        self.zone = timezone_for(self.timezone_name)
+        self.work_start, self.work_end = working_hours(member.get("availability", ""))
+        self.working_days = {_WEEKDAYS[day[:3].lower()] for day in calendar.get("working_days", _WORKING_DAYS)
+                             if day[:3].lower() in _WEEKDAYS}
+
+        # Weekday -> (start minute, end minute, zone) blocks; a block may be in another timezone
+        self.weekly: Dict[int, List[Tuple[int, int, tzinfo]]] = {}
+        for block in calendar.get("weekly_busy", []):
+            zone = timezone_for(block["timezone"]) if block.get("timezone") else self.zone
+            for day in block.get("days", []):
+                weekday = _WEEKDAYS.get(day[:3].lower())
+                if weekday is not None:
+                    self.weekly.setdefault(weekday, []).append((_clock(block["start"]), _clock(block["end"]), zone))
+
+        # One-off events as parallel sorted arrays for bisect
+        busy = _merge([(datetime.fromisoformat(event["start"]).timestamp(),
+                        datetime.fromisoformat(event["end"]).timestamp())
+                       for event in calendar.get("busy", [])])
+        self._busy_starts = [start for start, _ in busy]
+        self._busy = busy
+
+        # Local day -> free intervals before one-off events
+        self._days: Dict[date, Tuple[Interval, ...]] = {}
+        self._days_lock = threading.Lock()
+
+    def working_hours_label(self) -> str:
+        """Working hours as "9:00 AM - 6:00 PM PST" """
+        def label(minutes: int) -> str:
+            return time(minutes // 60 % 24, minutes % 60).strftime('%I:%M %p').lstrip('0')
+        return f"{label(self.work_start)} - {label(self.work_end)} {self.timezone_name}"
+
+    def free(self, window_start: datetime, window_end: datetime) -> List[Interval]:
+        """
+        Free working time within a window
+
+        Args:
+            window_start: Aware start of the window
+            window_end: Aware end of the window
+
+        Returns:
+            List[Interval]: Sorted, non-overlapping free intervals
+        """
+        lower, upper = window_start.timestamp(), window_end.timestamp()
+        day = window_start.astimezone(self.zone).date()
+        last_day = window_end.astimezone(self.zone).date()
+        free: List[Interval] = []
+        while day <= last_day:
+            free.extend(self._free_on(day))
+            day += timedelta(days=1)
+
+        # One-off events overlapping the window
+        first = max(0, bisect.bisect_right(self._busy_starts, lower) - 1)
+        busy = self._busy[first:bisect.bisect_left(self._busy_starts, upper)]
+        if busy:
+            free = _subtract(free, busy)
+        return [(max(start, lower), min(end, upper)) for start, end in free if end > lower and start < upper]
+
+    def _free_on(self, day: date) -> Tuple[Interval, ...]:
+        """Working hours on a local day minus the weekly busy blocks (cached per day)"""
+        with self._days_lock:
+            cached = self._days.get(day)
+        if cached is not None:
+            return cached
+        free: Tuple[Interval, ...] = ()
+        if day.weekday() in self.working_days:
+            midnight = datetime.combine(day, time(0), tzinfo=self.zone)
+            busy = []
+            for start, end, zone in self.weekly.get(day.weekday(), []):
+                block_midnight = midnight if zone is self.zone else datetime.combine(day, time(0), tzinfo=zone)
+                busy.append((self._at(block_midnight, start), self._at(block_midnight, end)))
+            working = [(self._at(midnight, self.work_start), self._at(midnight, self.work_end))]
+            free = tuple(_subtract(working, _merge(busy)))
+        with self._days_lock:
+            self._days[day] = free
+            while len(self._days) > _MAX_CACHED_DAYS:
+                del self._days[next(iter(self._days))]
+        return free
+
+    @staticmethod
+    def _at(midnight: datetime, minutes: int) -> float:
+        """Timestamp of a wall-clock time on a local day (DST-aware)"""
+        local = datetime.combine(midnight.date(), time(minutes // 60 % 24, minutes % 60), tzinfo=midnight.tzinfo)
+        return (local + timedelta(days=minutes // (24 * 60))).timestamp()
+
+
+class CalendarBook:
+    """Parsed calendars.json, built once per document version (see search_index.get_index)"""
+
+    def __init__(self, calendar_data: Dict[str, Any]):
+        self.calendars = {email.lower(): entry for email, entry in calendar_data.get("calendars", {}).items()}
+        self.source = calendar_data.get("source", "working hours only")
+        self.step_minutes = int(calendar_data.get("slot_step_minutes", DEFAULT_SLOT_STEP_MINUTES))
+        # (email, timezone, availability) -> MemberCalendar
+        self._members: Dict[Tuple[str, str, str], MemberCalendar] = {}
+        self._lock = threading.Lock()
+
+    def calendar(self, member: Dict[str, Any]) -> MemberCalendar:
+        """Calendar of a team_members.json entry"""
+        key = (member.get("email", "").lower(), member.get("timezone", ""), member.get("availability", ""))
+        with self._lock:
+            calendar = self._members.get(key)
+        if calendar is None:
+            calendar = MemberCalendar(member, self.calendars.get(key[0], {}))
+            with self._lock:
+                calendar = self._members.setdefault(key, calendar)
+        return calendar
+
+
+def common_slots(calendars: Sequence[MemberCalendar], duration_minutes: int, window_start: datetime,
+                 window_end: datetime, max_slots: int, step_minutes: int = DEFAULT_SLOT_STEP_MINUTES) -> List[Interval]:
+    """
+    Earliest slots in which every calendar is free
+
+    Args:
+        calendars: Attendees' calendars
+        duration_minutes: Slot length
+        window_start: Aware start of the search window
+        window_end: Aware end of the search window
+        max_slots: Most slots to return
+        step_minutes: Slot starts are aligned to this many minutes
+
+    Returns:
+        List[Interval]: Non-overlapping slots, earliest first
+    """
+    duration = duration_minutes * 60
+    # Attendees with the least free time first, so the intersection shrinks fastest
+    free_lists = sorted((calendar.free(window_start, window_end) for calendar in calendars),
+                        key=lambda free: sum(end - start for start, end in free))
+    common = free_lists[0] if free_lists else []
+    for free in free_lists[1:]:
+        if not common:
+            break
+        common = intersect(common, free)
+
+    step = step_minutes * 60
+    slots = []
+    for start, end in common:
+        slot_start = math.ceil(start / step) * step
+        while slot_start + duration <= end and len(slots) < max_slots:
+            slots.append((slot_start, slot_start + duration))
+            slot_start = math.ceil((slot_start + duration) / step) * step
+        if len(slots) >= max_slots:
+            break
+    return slots
@@ -0,0 +1,199 @@
+"""
+Structural checks for Python snippets used by check_best_practices
+The snippet is parsed and visited once; every rule is then evaluated against
+the collected facts, so triggers no longer match inside unrelated strings
+or comments
+Following ADK patterns for tool implementation
+"""
+
+import io
+import ast
+import tokenize
+from typing import List
+
+# Structural check used for a rule trigger when the rule does not name one
+DEFAULT_PYTHON_CHECKS = {
+    "print(": "call:print",
+    "except:": "bare_except",
+    "api_key": "assigned_literal",
+    "password": "identifier",
+    "sql": "formatted_sql",
+    "todo": "comment",
+    "http://": "string"
+}
+
+# Calls that run their first argument as SQL
+SQL_EXECUTORS = frozenset({"execute", "executemany", "executescript", "mogrify", "raw", "read_sql", "read_sql_query"})
+
+
+class PythonFacts(ast.NodeVisitor):
+    """Everything the structural checks need, collected in one pass over the tree"""
+
+    def __init__(self, code: str):
+        """
+        Parse and visit a snippet
+
+        Args:
+            code: Python source
+
+        Raises:
+            SyntaxError: If the snippet does not parse
+        """
+        self.calls = set()
+        self.bare_excepts = 0
+        self.strings: List[str] = []
+        self.identifiers = set()
+        # (lowercased target name, literal value) for name = "literal" style assignments
+        self.literal_assignments = []
+        # Names assigned a string built by formatting, and the first arguments of SQL calls
+        self._formatted_names = set()
+        self._sql_arguments = []
+        self.visit(ast.parse(code))
+        self.comments = self._comments(code)
+        # SQL calls whose query is formatted in place or assigned one anywhere in the snippet
+        self.formatted_sql_calls = sum(
+            1 for argument in self._sql_arguments
+            if self._is_formatted(argument) or (isinstance(argument, ast.Name) and argument.id in self._formatted_names))
+
+    @staticmethod
+    def _comments(code: str) -> List[str]:
+        """Comment text (tokenize is the only place comments survive)"""
+        comments = []
+        try:
+            for token in tokenize.generate_tokens(io.StringIO(code).readline):
+                if token.type == tokenize.COMMENT:
+                    comments.append(token.string.lower())
+        except (tokenize.TokenError, IndentationError):
+            pass
+        return comments
+
+    def visit_Call(self, node: ast.Call):
+        name = None
+        if isinstance(node.func, ast.Name):
+            name = node.func.id
+        elif isinstance(node.func, ast.Attribute):
+            name = node.func.attr
+        if name:
+            self.calls.add(name)
+            if name in SQL_EXECUTORS and node.args:
+                self._sql_arguments.append(node.args[0])
+        self.generic_visit(node)
+
+    @classmethod
+    def _is_formatted(cls, node) -> bool:
+        """Whether an expression builds a string from other values: f-string, %, + or str.format"""
+        if isinstance(node, ast.JoinedStr):
+            return any(isinstance(value, ast.FormattedValue) for value in node.values)
+        if isinstance(node, ast.BinOp) and isinstance(node.op, (ast.Add, ast.Mod)):
+            sides = (node.left, node.right)
+            textual = any(isinstance(side, ast.JoinedStr) or cls._is_formatted(side) or (
+                isinstance(side, ast.Constant) and isinstance(side.value, str)) for side in sides)
+            return textual and not all(isinstance(side, ast.Constant) for side in sides)
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute) and node.func.attr == "format":
+            return isinstance(node.func.value, (ast.Constant, ast.JoinedStr))
+        return False
+
+    def visit_ExceptHandler(self, node: ast.ExceptHandler):
+        if node.type is None:
+            self.bare_excepts += 1
+        self.generic_visit(node)
+
+    def visit_Constant(self, node: ast.Constant):
+        if isinstance(node.value, str):
+            self.strings.append(node.value.lower())
+
+    def visit_Name(self, node: ast.Name):
+        self.identifiers.add(node.id.lower())
+
+    def visit_Attribute(self, node: ast.Attribute):
+        self.identifiers.add(node.attr.lower())
+        self.generic_visit(node)
+
+    def visit_arg(self, node: ast.arg):
+        self.identifiers.add(node.arg.lower())
+        self.generic_visit(node)
+
+    def visit_arguments(self, node: ast.arguments):
+        # def f(api_key="...") hardcodes the value as its default; defaults
+        # belong to the last positional parameters, kw_defaults to each
+        # keyword-only one (None where there is no default)
+        positional = node.posonlyargs + node.args
+        for arg, default in zip(positional[len(positional) - len(node.defaults):], node.defaults):
+            self._literal_targets([ast.Name(id=arg.arg)], default)
+        for arg, default in zip(node.kwonlyargs, node.kw_defaults):
+            if default is not None:
+                self._literal_targets([ast.Name(id=arg.arg)], default)
+        self.generic_visit(node)
+
+    @staticmethod
+    def _target_name(target):
+        """Name a value is stored under: name, attribute, or string subscript (os.environ["API_KEY"])"""
+        if isinstance(target, ast.Name):
+            return target.id
+        if isinstance(target, ast.Attribute):
+            return target.attr
+        if isinstance(target, ast.Subscript):
+            key = target.slice
+            if isinstance(key, ast.Constant) and isinstance(key.value, str):
+                return key.value
+        return None
+
+    def _literal_targets(self, targets, value):
+        if isinstance(value, ast.Constant) and isinstance(value.value, str) and value.value:
+            for target in targets:
+                name = self._target_name(target)
+                if name:
+                    self.literal_assignments.append((name.lower(), value.value))
+
+    def visit_Assign(self, node: ast.Assign):
+        self._literal_targets(node.targets, node.value)
+        if self._is_formatted(node.value):
+            self._formatted_names.update(target.id for target in node.targets if isinstance(target, ast.Name))
+        self.generic_visit(node)
+
+    def visit_AnnAssign(self, node: ast.AnnAssign):
+        self._literal_targets([node.target], node.value)
+        self.generic_visit(node)
+
+    def visit_keyword(self, node: ast.keyword):
+        if node.arg:
+            self.identifiers.add(node.arg.lower())
+            self._literal_targets([ast.Name(id=node.arg)], node.value)
+        self.generic_visit(node)
+
+    def visit_Dict(self, node: ast.Dict):
+        # {"api_key": "..."} hardcodes a value as much as api_key = "..." does
+        for key, value in zip(node.keys, node.values):
+            if isinstance(key, ast.Constant) and isinstance(key.value, str):
+                self._literal_targets([ast.Name(id=key.value)], value)
+        self.generic_visit(node)
+
+
+def check(facts: PythonFacts, check_name: str, trigger: str) -> bool:
+    """
+    Evaluate one structural check
+
+    Args:
+        facts: Facts collected from the snippet
+        check_name: "call:<name>", "bare_except", "assigned_literal", "comment",
+            "string", "identifier" or "formatted_sql"
+        trigger: Rule trigger (lowercased), used by the text-based checks
+
+    Returns:
+        bool: True if the rule fires
+    """
+    if check_name.startswith("call:"):
+        return check_name[len("call:"):] in facts.calls
+    if check_name == "bare_except":
+        return facts.bare_excepts > 0
+    if check_name == "assigned_literal":
+        return any(trigger in name for name, _ in facts.literal_assignments)
+    if check_name == "comment":
+        return any(trigger in comment for comment in facts.comments)
+    if check_name == "string":
+        return any(trigger in string for string in facts.strings)
+    if check_name == "identifier":
+        return any(trigger in identifier for identifier in facts.identifiers)
+    if check_name == "formatted_sql":
+        return facts.formatted_sql_calls > 0
+    raise ValueError(f"Unknown structural check '{check_name}'")
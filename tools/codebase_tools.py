@@ -3,16 +3,30 @@ Codebase navigation and analysis tools for new hire onboarding
 Following ADK patterns for tool implementation
 """
 
+import copy
+import hashlib
 import json
 import os
 import sys
+import threading
+from collections import OrderedDict
 from typing import Dict, List, Optional
 
 
-from new_hire.database.db_loader import DatabaseLoader
+from new_hire.database.db_loader import get_loader
+from new_hire.database.async_loader import get_async_loader
+from new_hire.tools.async_support import async_variant_of
+from new_hire.tools.code_checks import DEFAULT_PYTHON_CHECKS, PythonFacts, check
+from new_hire.tools.dependency_graph import DependencyGraph
+from new_hire.tools.pattern_matcher import PatternMatcher
+from new_hire.tools.search_index import SearchIndex, get_index
 
-# Initialize database loader
-loader = DatabaseLoader()
+# Shared database loaders (one connection pool per process)
+loader = get_loader()
+async_loader = get_async_loader()
+
+# Transitive dependencies/dependents listed per response (counts cover all of them)
+_MAX_LISTED_MODULES = 50
 
 def search_codebase(query: str, file_type: str = "all") -> dict:
     """Search through codebase for relevant files, functions, and repositories.
@@ -26,181 +40,344 @@ def search_codebase(query: str, file_type: str = "all") -> dict:
     """
     try:
         codebase_data = loader.load_data("codebase/repositories.json")
-        results = []
-        query_lower = query.lower()
-        
-        # Search through repositories
-        for repo in codebase_data.get("repositories", []):
-            match_score = 0
-            repo_info = {
-                "repo_name": repo.get("name", ""),
-                "description": repo.get("description", ""),
-                "language": repo.get("language", ""),
-                "framework": repo.get("framework", ""),
-                "key_files": repo.get("key_files", []),
-                "team": repo.get("team", ""),
-                "documentation": repo.get("documentation", ""),
-                "examples": repo.get("examples", {})
-            }
-            
-            # Check for matches in name, description, dependencies
-            if query_lower in repo.get("name", "").lower():
-                match_score += 3
-            if query_lower in repo.get("description", "").lower():
-                match_score += 2
-            if query_lower in str(repo.get("dependencies", [])).lower():
-                match_score += 1
-            
-            if match_score > 0:
-                repo_info["match_score"] = match_score
-                results.append(repo_info)
-        
-        # Search through code snippets
-        code_snippets = []
-        for snippet_key, snippet_data in codebase_data.get("code_snippets", {}).items():
-            if query_lower in snippet_key.lower() or query_lower in snippet_data.get("description", "").lower():
-                code_snippets.append({
-                    "type": snippet_key,
-                    "file": snippet_data.get("file", ""),
-                    "function": snippet_data.get("function", ""),
-                    "code": snippet_data.get("code", ""),
-                    "description": snippet_data.get("description", ""),
-                    "best_practices": snippet_data.get("best_practices", [])
-                })
-        
-        # Sort results by match score
-        results.sort(key=lambda x: x.get("match_score", 0), reverse=True)
-        
+        return _search_codebase(codebase_data, query, file_type)
+    except Exception as e:
         return {
-            "status": "success",
-            "query": query,
-            "repositories": results[:5],  # Top 5 repository matches
-            "code_snippets": code_snippets[:3],  # Top 3 code examples
-            "total_repositories_found": len(results),
-            "total_snippets_found": len(code_snippets)
+            "status": "error",
+            "error_message": f"Failed to search codebase: {str(e)}"
         }
+
+@async_variant_of(search_codebase)
+async def search_codebase_async(query: str, file_type: str = "all") -> dict:
+    try:
+        codebase_data = await async_loader.load_data("codebase/repositories.json")
+        return _search_codebase(codebase_data, query, file_type)
     except Exception as e:
         return {
             "status": "error",
             "error_message": f"Failed to search codebase: {str(e)}"
         }
 
-def analyze_dependencies(module_name: str) -> dict:
+def _repository_index(codebase_data: dict) -> SearchIndex:
+    """Index repositories by name, description and dependencies"""
+    return SearchIndex([{
+        "name": repo.get("name", ""),
+        "description": repo.get("description", ""),
+        "dependencies": repo.get("dependencies", [])
+    } for repo in codebase_data.get("repositories", [])], {"name": 3, "description": 2, "dependencies": 1})
+
+def _snippet_index(codebase_data: dict) -> SearchIndex:
+    """Index code snippets by their key and description"""
+    snippets = list(codebase_data.get("code_snippets", {}).items())
+    return SearchIndex([{
+        "type": snippet_key,
+        "description": snippet_data.get("description", "")
+    } for snippet_key, snippet_data in snippets], {"type": 2, "description": 1}, items=snippets)
+
+def _search_codebase(codebase_data: dict, query: str, file_type: str) -> dict:
+    """Rank repositories and code snippets from repositories.json against a query"""
+    repositories = codebase_data.get("repositories", [])
+    repo_hits, total_repositories = get_index("repositories", codebase_data, _repository_index).search(query, k=5)
+
+    results = []
+    for hit in repo_hits:
+        repo = repositories[hit.position]
+        results.append({
+            "repo_name": repo.get("name", ""),
+            "description": repo.get("description", ""),
+            "language": repo.get("language", ""),
+            "framework": repo.get("framework", ""),
+            "key_files": repo.get("key_files", []),
+            "team": repo.get("team", ""),
+            "documentation": repo.get("documentation", ""),
+            "examples": repo.get("examples", {}),
+            "match_score": hit.score
+        })
+
+    # Search through code snippets
+    snippet_index = get_index("code_snippets", codebase_data, _snippet_index)
+    snippet_hits, total_snippets = snippet_index.search(query, k=3)
+    code_snippets = []
+    for hit in snippet_hits:
+        snippet_key, snippet_data = snippet_index.items[hit.position]
+        code_snippets.append({
+            "type": snippet_key,
+            "file": snippet_data.get("file", ""),
+            "function": snippet_data.get("function", ""),
+            "code": snippet_data.get("code", ""),
+            "description": snippet_data.get("description", ""),
+            "best_practices": snippet_data.get("best_practices", [])
+        })
+
+    return {
+        "status": "success",
+        "query": query,
+        "repositories": results,  # Top 5 repository matches
+        "code_snippets": code_snippets,  # Top 3 code examples
+        "total_repositories_found": total_repositories,
+        "total_snippets_found": total_snippets
+    }
+
+def analyze_dependencies(module_name: str, target_module: str = "") -> dict:
     """Analyze dependencies and relationships for a given module or service.
     
     Args:
         module_name: Name of the module/service to analyze (e.g., "user-auth-service", "payment-gateway")
+        target_module: Another module/service; if given, the shortest dependency chain
+            between the two is included (optional)
     
     Returns:
-        Dict: Dependency information, relationships, and architectural context
+        Dict: Dependency information, relationships, and architectural context,
+            including transitive dependencies, blast radius, cycles and layer violations
     """
     try:
-        deps_data = loader.load_data("codebase/dependencies.json")
-        module_lower = module_name.lower()
-        found_module = None
-        
-        # Find module (case-insensitive)
-        for mod_name, mod_data in deps_data.get("modules", {}).items():
-            if module_lower in mod_name.lower():
-                found_module = mod_name
-                break
-        
-        if found_module:
-            module_info = deps_data["modules"][found_module]
-            return {
-                "status": "success",
-                "module": found_module,
-                "description": module_info.get("description", ""),
-                "dependencies": module_info.get("dependencies", []),
-                "dependents": module_info.get("dependents", []),
-                "architecture_layer": module_info.get("architecture_layer", ""),
-                "communication_methods": module_info.get("communication_methods", []),
-                "data_flows": module_info.get("data_flows", []),
-                "integration_points": module_info.get("integration_points", [])
-            }
-        else:
-            # Return available modules if not found
-            available_modules = list(deps_data.get("modules", {}).keys())
-            return {
-                "status": "error",
-                "error_message": f"Module '{module_name}' not found in dependency graph",
-                "available_modules": available_modules,
-                "suggestion": "Try searching for one of the available modules listed above"
-            }
+        dependency_data = loader.load_data("codebase/dependencies.json")
+        return _analyze_dependencies(dependency_data, module_name, target_module)
     except Exception as e:
         return {
             "status": "error",
             "error_message": f"Failed to analyze dependencies: {str(e)}"
         }
 
-def check_best_practices(code_snippet: str = "", language: str = "python") -> dict:
+@async_variant_of(analyze_dependencies)
+async def analyze_dependencies_async(module_name: str, target_module: str = "") -> dict:
+    try:
+        dependency_data = await async_loader.load_data("codebase/dependencies.json")
+        return _analyze_dependencies(dependency_data, module_name, target_module)
+    except Exception as e:
+        return {
+            "status": "error",
+            "error_message": f"Failed to analyze dependencies: {str(e)}"
+        }
+
+def _module_not_found(graph: DependencyGraph, module_name: str) -> dict:
+    return {
+        "status": "error",
+        "error_message": f"Module '{module_name}' not found in dependency graph",
+        "available_modules": list(graph.modules),
+        "suggestion": "Try searching for one of the available modules listed above"
+    }
+
+def _listed_modules(graph: DependencyGraph, reached) -> list:
+    """[{"module", "hops"}] for (node, hops) pairs, nearest first and capped"""
+    return [{"module": graph.names[node], "hops": hops} for node, hops in reached[:_MAX_LISTED_MODULES]]
+
+def _analyze_dependencies(dependency_data: dict, module_name: str, target_module: str) -> dict:
+    """Describe the best-matching module and its place in the compiled dependency graph"""
+    graph = get_index("dependency_graph", dependency_data, DependencyGraph)
+    matches = graph.resolve(module_name)
+    if not matches:
+        return _module_not_found(graph, module_name)
+
+    node = matches[0]
+    name = graph.names[node]
+    module_info = graph.modules.get(name, {})
+    dependencies = graph.transitive_dependencies(node)
+    dependents = graph.transitive_dependents(node)
+
+    affected, max_hops, affected_by_layer = graph.blast_radius(node)
+    cycle = graph.cycle_of(node)
+    violations = [
+        {"module": graph.names[source], "depends_on": graph.names[target],
+         "module_layer": graph.layers[source], "dependency_layer": graph.layers[target]}
+        for source, target in graph.layer_violations_of(node)
+    ]
+
+    result = {
+        "status": "success",
+        "module": name,
+        "description": module_info.get("description", ""),
+        # As declared by the module; the graph also counts edges declared by the other side
+        "dependencies": module_info.get("dependencies", [graph.names[target] for target in graph.dependencies[node]]),
+        "dependents": module_info.get("dependents", [graph.names[source] for source in graph.dependents[node]]),
+        "architecture_layer": module_info.get("architecture_layer", ""),
+        "communication_methods": module_info.get("communication_methods", []),
+        "data_flows": module_info.get("data_flows", []),
+        "integration_points": module_info.get("integration_points", []),
+        "transitive_dependencies": _listed_modules(graph, dependencies),
+        "transitive_dependency_count": len(dependencies),
+        "transitive_dependents": _listed_modules(graph, dependents),
+        "blast_radius": {
+            "affected_modules": affected,
+            "share_of_graph": round(affected / max(1, len(graph) - 1), 3),
+            "max_hops": max_hops,
+            "affected_by_layer": dict(affected_by_layer)
+        },
+        "dependency_cycle": [graph.names[member] for member in cycle] if cycle else [],
+        "layer_violations": violations
+    }
+    if name not in graph.modules:
+        result["note"] = f"'{name}' is an external system referenced by other modules; it has no entry of its own"
+    if len(matches) > 1:
+        result["other_matches"] = [graph.names[other] for other in matches[1:10]]
+
+    if target_module:
+        targets = graph.resolve(target_module)
+        if not targets:
+            result["path_to_target"] = {"target": target_module, "found": False,
+                                        "message": f"Module '{target_module}' not found in dependency graph"}
+        else:
+            target = targets[0]
+            path = graph.shortest_path(node, target)
+            direction = "depends_on"
+            if path is None:
+                path = graph.shortest_path(target, node)
+                direction = "depended_on_by"
+            result["path_to_target"] = {
+                "target": graph.names[target],
+                "found": path is not None,
+                "direction": direction if path is not None else None,
+                "path": [graph.names[hop] for hop in path] if path else [],
+                "hops": len(path) - 1 if path else None
+            }
+    return result
+
+def check_best_practices(code_snippet: str = "", language: str = "python", static_analysis: bool = False) -> dict:
     """Check code against internal coding standards and best practices.
     
     Args:
         code_snippet: Code to analyze (optional - if empty, returns general guidelines)
         language: Programming language for context (default: "python")
+        static_analysis: For Python, parse the code and check its structure instead of
+            matching text, so strings and comments do not trigger code rules (default: False)
     
     Returns:
         Dict: Best practices analysis, recommendations, and coding standards
     """
     try:
         practices_data = loader.load_data("codebase/best_practices.json")
-        
-        # Get language-specific practices
-        language_practices = practices_data.get("languages", {}).get(language, {})
-        general_practices = practices_data.get("general", {})
-        
-        result = {
-            "status": "success",
-            "language": language,
-            "general_guidelines": general_practices.get("guidelines", []),
-            "language_specific": language_practices.get("guidelines", []),
-            "code_quality_checklist": practices_data.get("quality_checklist", [])
+        return _check_best_practices(practices_data, code_snippet, language, static_analysis)
+    except Exception as e:
+        return {
+            "status": "error",
+            "error_message": f"Failed to check best practices: {str(e)}"
         }
-        
-        if code_snippet:
-            # Analyze specific code snippet
-            violations = []
-            recommendations = []
-            
-            # Check against mock rules
-            for rule in practices_data.get("rules", []):
-                trigger = rule.get("trigger", "").lower()
-                if trigger and trigger in code_snippet.lower():
-                    if rule.get("type") == "violation":
-                        violations.append({
-                            "rule": rule.get("rule", ""),
-                            "message": rule.get("message", ""),
-                            "severity": rule.get("severity", "medium")
-                        })
-                    else:
-                        recommendations.append({
-                            "rule": rule.get("rule", ""),
-                            "message": rule.get("message", ""),
-                            "improvement": rule.get("improvement", "")
-                        })
-            
-            # Calculate score
-            total_checks = len(practices_data.get("rules", []))
-            violations_count = len(violations)
-            score = max(0, int((total_checks - violations_count) / total_checks * 100))
-            
-            result.update({
-                "code_analysis": {
-                    "violations": violations,
-                    "recommendations": recommendations,
-                    "quality_score": score,
-                    "analysis_summary": f"Found {violations_count} potential issues out of {total_checks} checks"
-                }
-            })
-        
-        return result
+
+@async_variant_of(check_best_practices)
+async def check_best_practices_async(code_snippet: str = "", language: str = "python", static_analysis: bool = False) -> dict:
+    try:
+        practices_data = await async_loader.load_data("codebase/best_practices.json")
+        return _check_best_practices(practices_data, code_snippet, language, static_analysis)
     except Exception as e:
         return {
             "status": "error",
             "error_message": f"Failed to check best practices: {str(e)}"
         }
 
+class _PracticeRules:
+    """best_practices.json rules for one language, with their triggers compiled into one matcher"""
+
+    def __init__(self, practices_data: dict, language: str):
+        self.rules = [rule for rule in practices_data.get("rules", [])
+                      if not rule.get("languages") or language in rule["languages"]]
+        self.triggers = [rule.get("trigger", "").lower() for rule in self.rules]
+        self.matcher = PatternMatcher((trigger, position) for position, trigger in enumerate(self.triggers))
+        # Structural check per rule for Python static analysis (None: match the trigger as text)
+        self.python_checks = [rule.get("python_check") or DEFAULT_PYTHON_CHECKS.get(trigger)
+                              for rule, trigger in zip(self.rules, self.triggers)]
+
+    def fired(self, code_snippet: str, facts: Optional[PythonFacts] = None) -> List[int]:
+        """Positions of the rules a snippet triggers, in rule order"""
+        text_hits = {position for match in self.matcher.find(code_snippet) for position in match.values}
+        if facts is None:
+            return sorted(text_hits)
+        return [position for position, check_name in enumerate(self.python_checks)
+                if (check(facts, check_name, self.triggers[position]) if check_name else position in text_hits)]
+
+# Snippet analyses by (snippet hash, language, static analysis), most recently used last
+_analysis_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+_analysis_cache_lock = threading.Lock()
+_ANALYSIS_CACHE_SIZE = 256
+
+def _analyze_snippet(practices_data: dict, code_snippet: str, language: str, static_analysis: bool) -> dict:
+    """Evaluate the rules for a language against a snippet (cached per snippet and rules version)"""
+    key = (hashlib.sha256(code_snippet.encode("utf-8")).hexdigest(), language, static_analysis)
+    with _analysis_cache_lock:
+        cached = _analysis_cache.get(key)
+        if cached is not None and cached[0] is practices_data:
+            _analysis_cache.move_to_end(key)
+            return copy.deepcopy(cached[1])
+
+    rules = get_index(f"best_practices:{language}", practices_data,
+                      lambda data: _PracticeRules(data, language))
+    facts = None
+    analysis_mode = "text"
+    analysis_note = ""
+    if static_analysis:
+        if language != "python":
+            analysis_note = f"Static analysis is only available for python; matched {language} code as text"
+        else:
+            try:
+                facts = PythonFacts(code_snippet)
+                analysis_mode = "ast"
+            except SyntaxError as e:
+                analysis_note = f"Snippet is not valid Python ({e.msg}, line {e.lineno}); matched as text"
+
+    violations = []
+    recommendations = []
+    for position in rules.fired(code_snippet, facts):
+        rule = rules.rules[position]
+        if rule.get("type") == "violation":
+            violations.append({
+                "rule": rule.get("rule", ""),
+                "message": rule.get("message", ""),
+                "severity": rule.get("severity", "medium")
+            })
+        else:
+            recommendations.append({
+                "rule": rule.get("rule", ""),
+                "message": rule.get("message", ""),
+                "improvement": rule.get("improvement", "")
+            })
+
+    # Calculate score
+    total_checks = len(rules.rules)
+    violations_count = len(violations)
+    score = max(0, int((total_checks - violations_count) / total_checks * 100)) if total_checks else 100
+
+    analysis = {
+        "violations": violations,
+        "recommendations": recommendations,
+        "quality_score": score,
+        "analysis_summary": f"Found {violations_count} potential issues out of {total_checks} checks",
+        "analysis_mode": analysis_mode
+    }
+    if analysis_note:
+        analysis["analysis_note"] = analysis_note
+    if facts is not None:
+        # Rules without a structural check are still matched as text; say which
+        text_matched = [rules.rules[position].get("rule", rules.triggers[position])
+                        for position, check_name in enumerate(rules.python_checks) if not check_name]
+        if text_matched:
+            analysis["text_matched_rules"] = text_matched
+
+    with _analysis_cache_lock:
+        _analysis_cache[key] = (practices_data, analysis)
+        _analysis_cache.move_to_end(key)
+        while len(_analysis_cache) > _ANALYSIS_CACHE_SIZE:
+            _analysis_cache.popitem(last=False)
+    return copy.deepcopy(analysis)
+
+def _check_best_practices(practices_data: dict, code_snippet: str, language: str, static_analysis: bool = False) -> dict:
+    """Match a code snippet against best_practices.json rules"""
+    # Get language-specific practices
+    language_practices = practices_data.get("languages", {}).get(language, {})
+    general_practices = practices_data.get("general", {})
+
+    result = {
+        "status": "success",
+        "language": language,
+        "general_guidelines": general_practices.get("guidelines", []),
+        "language_specific": language_practices.get("guidelines", []),
+        "code_quality_checklist": practices_data.get("quality_checklist", [])
+    }
+
+    if code_snippet:
+        # Analyze specific code snippet
+        result["code_analysis"] = _analyze_snippet(practices_data, code_snippet, language, static_analysis)
+
+    return result
+
 def get_tech_stack_info(component: str = "") -> dict:
     """Get information about the technology stack and tools used.
     
@@ -212,39 +389,53 @@ def get_tech_stack_info(component: str = "") -> dict:
     """
     try:
         tech_data = loader.load_data("codebase/tech_stack.json")
-        
-        if not component:
-            # Return overall tech stack
-            return {
-                "status": "success",
-                "overview": tech_data.get("overview", ""),
-                "frontend": tech_data.get("frontend", {}),
-                "backend": tech_data.get("backend", {}),
-                "infrastructure": tech_data.get("infrastructure", {}),
-                "tools": tech_data.get("tools", {}),
-                "databases": tech_data.get("databases", {})
-            }
-        
-        # Search for specific component
-        component_lower = component.lower()
-        for category, items in tech_data.items():
-            if isinstance(items, dict):
-                for key, value in items.items():
-                    if component_lower in key.lower():
-                        return {
-                            "status": "success",
-                            "component": key,
-                            "category": category,
-                            "details": value
-                        }
-        
+        return _get_tech_stack_info(tech_data, component)
+    except Exception as e:
         return {
             "status": "error",
-            "error_message": f"Component '{component}' not found in tech stack",
-            "suggestion": "Try searching for frontend, backend, database, or infrastructure components"
+            "error_message": f"Failed to get tech stack info: {str(e)}"
         }
+
+@async_variant_of(get_tech_stack_info)
+async def get_tech_stack_info_async(component: str = "") -> dict:
+    try:
+        tech_data = await async_loader.load_data("codebase/tech_stack.json")
+        return _get_tech_stack_info(tech_data, component)
     except Exception as e:
         return {
             "status": "error",
             "error_message": f"Failed to get tech stack info: {str(e)}"
         }
+
+def _get_tech_stack_info(tech_data: dict, component: str) -> dict:
+    """Describe the whole tech stack or a single component from tech_stack.json"""
+    if not component:
+        # Return overall tech stack
+        return {
+            "status": "success",
+            "overview": tech_data.get("overview", ""),
+            "frontend": tech_data.get("frontend", {}),
+            "backend": tech_data.get("backend", {}),
+            "infrastructure": tech_data.get("infrastructure", {}),
+            "tools": tech_data.get("tools", {}),
+            "databases": tech_data.get("databases", {})
+        }
+
+    # Search for specific component
+    component_lower = component.lower()
+    for category, items in tech_data.items():
+        if isinstance(items, dict):
+            for key, value in items.items():
+                if component_lower in key.lower():
+                    return {
+                        "status": "success",
+                        "component": key,
+                        "category": category,
+                        "details": value
+                    }
+
+    return {
+        "status": "error",
+        "error_message": f"Component '{component}' not found in tech stack",
+        "suggestion": "Try searching for frontend, backend, database, or infrastructure components"
+    }
\ No newline at end of file
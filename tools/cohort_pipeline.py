@@ -0,0 +1,261 @@
+"""
+Onboarding packs for a whole cohort of new hires in one batch
+Runs the lookups the TeamIntegrator and HR agents would make for each hire
+(team, manager and buddy, intro loop slots, policies, tech stack) directly
+against the loaded corpora, without LLM turns. Identical lookups across the
+cohort run once and hires are processed in parallel.
+
+    python -m new_hire.tools.cohort_pipeline cohort.csv --output-dir onboarding_packs
+"""
+
+import os
+import re
+import csv
+import sys
+import copy
+import json
+import time
+import argparse
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from new_hire.tools.codebase_tools import get_tech_stack_info
+from new_hire.tools.policy_tools import search_policies
+from new_hire.tools.team_tools import find_common_slots, find_team_member, get_team_info
+
+# Policies every new hire is walked through
+ONBOARDING_POLICY_TOPICS = ["health insurance", "retirement", "vacation", "remote work", "code of conduct"]
+
+# tech_stack.json component to introduce first, by the first role keyword found
+_ROLE_STACK_FOCUS = [
+    ("frontend", "react"),
+    ("data", "bigquery"),
+    ("ml", "python"),
+    ("devops", "container_orchestration"),
+    ("reliability", "monitoring"),
+    ("backend", "python"),
+    ("payment", "python")
+]
+
+_INTRO_LOOP_DURATION = "30 minutes"
+_INTRO_LOOP_DAYS = 5
+_INTRO_LOOP_SLOTS = 3
+
+_COHORT_FIELDS = ("name", "team", "role", "start_date")
+
+
+class SharedCalls:
+    """Run each distinct tool call once per batch
+
+    Concurrent callers of a call that is already running wait for its
+    result instead of repeating it. The first caller runs it in its own
+    thread, so waiting never needs a free worker.
+    """
+
+    def __init__(self):
+        self._results: Dict[Tuple[str, tuple], Future] = {}
+        self._lock = threading.Lock()
+        self.requested = 0
+
+    def __call__(self, tool: Callable[..., dict], *args) -> dict:
+        key = (tool.__name__, args)
+        with self._lock:
+            self.requested += 1
+            future = self._results.get(key)
+            owner = future is None
+            if owner:
+                future = self._results[key] = Future()
+        if owner:
+            try:
+                future.set_result(tool(*args))
+            except Exception as e:
+                future.set_exception(e)
+        return future.result()
+
+    @property
+    def executed(self) -> int:
+        """Number of distinct calls made"""
+        return len(self._results)
+
+
+def load_cohort(path: str) -> List[Dict[str, str]]:
+    """
+    Read a cohort file
+
+    Args:
+        path: CSV with a header row, or JSON list of objects, with the
+            fields name, team, role and start_date (YYYY-MM-DD)
+
+    Returns:
+        List[Dict]: One entry per hire
+
+    Raises:
+        ValueError: If a hire lacks a name or team
+    """
+    with open(path, encoding='utf-8', newline='') as handle:
+        if path.lower().endswith('.json'):
+            rows = json.load(handle)
+        else:
+            rows = list(csv.DictReader(handle))
+    cohort = []
+    for number, row in enumerate(rows, 1):
+        hire = {field: str(row.get(field) or "").strip() for field in _COHORT_FIELDS}
+        if not hire["name"] or not hire["team"]:
+            raise ValueError(f"Cohort entry {number} needs at least a name and a team")
+        cohort.append(hire)
+    return cohort
+
+
+def _stack_focus(role: str) -> Optional[str]:
+    role = role.lower()
+    for keyword, component in _ROLE_STACK_FOCUS:
+        if re.search(rf'\b{keyword}\b', role):
+            return component
+    return None
+
+
+def _buddy(calls: SharedCalls, hire: Dict[str, str], team_name: str, manager: str) -> Optional[dict]:
+    """A teammate in the same role if there is one, otherwise the first non-manager teammate"""
+    if hire["role"]:
+        peers = calls(find_team_member, "", "", hire["role"])
+        teammates = [member for member in peers.get("matching_members", [])
+                     if member["team"] == team_name and member["name"] != manager]
+        if teammates:
+            # Exactly the same role before e.g. its senior variant
+            return min(teammates, key=lambda member: member["role"].lower() != hire["role"].lower())
+    team = calls(get_team_info, hire["team"])
+    for teammate in team.get("members", []):
+        name = teammate.get("name", "")
+        if name and name != manager:
+            found = calls(find_team_member, name, "", "")
+            for member in found.get("matching_members", []):
+                if member["name"] == name:
+                    return member
+    return None
+
+
+def build_pack(calls: SharedCalls, hire: Dict[str, str]) -> Dict[str, Any]:
+    """
+    Onboarding pack of one new hire
+
+    Args:
+        calls: Shared call cache of the batch
+        hire: Cohort entry
+
+    Returns:
+        Dict: Team, manager, buddy, intro loop slots, policies and tech stack,
+            with the problems met along the way under "issues"
+    """
+    issues = []
+    team = calls(get_team_info, hire["team"])
+    if team.get("status") != "success":
+        issues.append(team.get("error_message", f"Team '{hire['team']}' not found"))
+    team_name = team.get("team_name", hire["team"])
+    manager_name = team.get("manager", "")
+
+    manager = None
+    if manager_name:
+        found = calls(find_team_member, manager_name, "", "")
+        manager = (found.get("matching_members") or [None])[0]
+    buddy = _buddy(calls, hire, team_name, manager_name) if team.get("status") == "success" else None
+    if team.get("status") == "success" and buddy is None:
+        issues.append(f"No onboarding buddy found in {team_name}")
+
+    intro_loop = None
+    attendees = tuple(person["email"] for person in (manager, buddy) if person)
+    if attendees:
+        intro_loop = calls(find_common_slots, attendees, _INTRO_LOOP_DURATION, "", _INTRO_LOOP_DAYS,
+                           _INTRO_LOOP_SLOTS, hire["start_date"])
+        if intro_loop.get("status") != "success":
+            issues.append(intro_loop.get("error_message", "Could not find intro loop slots"))
+
+    focus = _stack_focus(hire["role"])
+    pack = {
+        "hire": dict(hire),
+        "status": "success" if not issues else "partial",
+        "team": team,
+        "manager": manager,
+        "buddy": buddy,
+        "intro_loop": intro_loop,
+        "policies": {topic: calls(search_policies, topic, "all") for topic in ONBOARDING_POLICY_TOPICS},
+        "tech_stack": {
+            "overview": calls(get_tech_stack_info, ""),
+            "focus": calls(get_tech_stack_info, focus) if focus else None
+        },
+        "issues": issues
+    }
+    # Shared results are cached once per batch; each pack gets its own copy
+    return copy.deepcopy(pack)
+
+
+def build_onboarding_packs(cohort: List[Dict[str, str]], max_workers: int = 8) -> Dict[str, Any]:
+    """
+    Onboarding packs for every hire of a cohort
+
+    Args:
+        cohort: Entries as returned by load_cohort
+        max_workers: Hires processed in parallel
+
+    Returns:
+        Dict: {"packs": [...] in cohort order, "stats": {...}}
+    """
+    calls = SharedCalls()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        packs = list(executor.map(lambda hire: build_pack(calls, hire), cohort))
+    return {
+        "packs": packs,
+        "stats": {
+            "hires": len(packs),
+            "complete_packs": sum(1 for pack in packs if pack["status"] == "success"),
+            "lookups_requested": calls.requested,
+            "lookups_executed": calls.executed,
+            "seconds": round(time.perf_counter() - started, 3)
+        }
+    }
+
+
+def _pack_filename(hire: Dict[str, str], used: set) -> str:
+    """File name for a hire's pack, unique within the output directory"""
+    stem = re.sub(r'[^a-z0-9]+', '-', hire["name"].lower()).strip('-') or "hire"
+    name = f"{stem}.json"
+    counter = 2
+    while name in used:
+        name = f"{stem}-{counter}.json"
+        counter += 1
+    used.add(name)
+    return name
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point for building a cohort's onboarding packs"""
+    parser = argparse.ArgumentParser(prog='python -m new_hire.tools.cohort_pipeline',
+                                     description='Build onboarding packs for a cohort of new hires')
+    parser.add_argument('cohort', help='Cohort file: CSV or JSON with name, team, role, start_date')
+    parser.add_argument('--output-dir', default='onboarding_packs', help='Directory for one JSON pack per hire')
+    parser.add_argument('--workers', type=int, default=8, help='Hires processed in parallel')
+    args = parser.parse_args(argv)
+
+    try:
+        result = build_onboarding_packs(load_cohort(args.cohort), args.workers)
+        os.makedirs(args.output_dir, exist_ok=True)
+        used = set()
+        for pack in result["packs"]:
+            path = os.path.join(args.output_dir, _pack_filename(pack["hire"], used))
+            with open(path, 'w', encoding='utf-8') as handle:
+                json.dump(pack, handle, indent=2, default=str)
+        stats = result["stats"]
+        print(f"Wrote {stats['hires']} packs to {args.output_dir} ({stats['complete_packs']} complete) in "
+              f"{stats['seconds']}s; {stats['lookups_executed']} lookups for {stats['lookups_requested']} requested")
+        for pack in result["packs"]:
+            for issue in pack["issues"]:
+                print(f"  {pack['hire']['name']}: {issue}")
+        return 0
+    except Exception as e:
+        print(f"Cohort pipeline failed: {str(e)}", file=sys.stderr)
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
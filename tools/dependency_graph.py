@@ -0,0 +1,248 @@
+"""
+In-memory dependency graph compiled from codebase/dependencies.json
+Modules and the external systems they name get compact integer ids, with
+dependency and dependent adjacency lists; traversal results are memoized on
+the graph, which is rebuilt when the document changes (see search_index.get_index)
+Following ADK patterns for tool implementation
+"""
+
+import threading
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
+
+# Architecture layers from the top of the stack down; a module should only
+# depend on its own layer or the ones below it. A "layer_order" list in the
+# document replaces this.
+DEFAULT_LAYER_ORDER = ["presentation", "service", "data"]
+
+# Memoized query results kept per graph, oldest dropped first
+_MAX_MEMO_ENTRIES = 4096
+
+
+class DependencyGraph:
+    """Directed graph: an edge a -> b means module a depends on b"""
+
+    def __init__(self, dependency_data: Dict[str, Any]):
+        """
+        Compile a dependencies.json document
+
+        Both sides of a relationship are read: "dependencies" of a and
+        "dependents" of b each add the edge a -> b.
+
+        Args:
+            dependency_data: Loaded codebase/dependencies.json
+        """
+        self.modules: Dict[str, Dict[str, Any]] = dependency_data.get("modules", {})
+        self.names: List[str] = []
+        self.ids: Dict[str, int] = {}
+        for name, info in self.modules.items():
+            self._node(name)
+            for other in info.get("dependencies", []) + info.get("dependents", []):
+                self._node(other)
+
+        # Node id -> sorted ids it depends on / ids depending on it
+        dependencies = [set() for _ in self.names]
+        for name, info in self.modules.items():
+            node = self.ids[name]
+            for other in info.get("dependencies", []):
+                dependencies[node].add(self.ids[other])
+            for other in info.get("dependents", []):
+                dependencies[self.ids[other]].add(node)
+        self.dependencies: List[List[int]] = [sorted(targets) for targets in dependencies]
+        self.dependents: List[List[int]] = [[] for _ in self.names]
+        for node, targets in enumerate(self.dependencies):
+            for target in targets:
+                self.dependents[target].append(node)
+
+        # Layer per node ("" for external systems) and its rank (None if not in layer_order)
+        self.layers: List[str] = [self.modules.get(name, {}).get("architecture_layer", "") for name in self.names]
+        self.layer_order = dependency_data.get("layer_order") or DEFAULT_LAYER_ORDER
+        layer_rank = {layer: rank for rank, layer in enumerate(self.layer_order)}
+        self.layer_ranks: List[Optional[int]] = [layer_rank.get(layer) for layer in self.layers]
+
+        self._memo: Dict[tuple, Any] = {}
+        self._memo_lock = threading.Lock()
+
+    def _node(self, name: str) -> int:
+        node = self.ids.get(name)
+        if node is None:
+            node = self.ids[name] = len(self.names)
+            self.names.append(name)
+        return node
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _memoized(self, key: tuple, compute):
+        """Result of compute(), computed once per graph"""
+        with self._memo_lock:
+            if key in self._memo:
+                return self._memo[key]
+        result = compute()
+        with self._memo_lock:
+            result = self._memo.setdefault(key, result)
+            while len(self._memo) > _MAX_MEMO_ENTRIES:
+                del self._memo[next(iter(self._memo))]
+            return result
+
+    def resolve(self, query: str) -> List[int]:
+        """
+        Nodes a module name query refers to, best first
+
+        Exact (case-insensitive) name, then names starting with the query,
+        then names containing it; shorter names first within each group.
+
+        Args:
+            query: Full or partial module name
+
+        Returns:
+            List[int]: Matching node ids (empty if none)
+        """
+        return list(self._memoized(("resolve", query.lower()), lambda: self._resolve(query.lower())))
+
+    def _resolve(self, query: str) -> Tuple[int, ...]:
+        ranked = []
+        for node, name in enumerate(self.names):
+            lowered = name.lower()
+            if query in lowered:
+                group = 0 if lowered == query else 1 if lowered.startswith(query) else 2
+                # Modules described in the document before external systems they name
+                ranked.append((group, name not in self.modules, len(name), node))
+        return tuple(node for *_, node in sorted(ranked))
+
+    def transitive_dependencies(self, node: int) -> Tuple[Tuple[int, int], ...]:
+        """(node, hops) for everything node depends on directly or indirectly, nearest first"""
+        return self._memoized(("dependencies", node), lambda: self._reach(node, self.dependencies))
+
+    def transitive_dependents(self, node: int) -> Tuple[Tuple[int, int], ...]:
+        """(node, hops) for everything depending on node directly or indirectly, nearest first"""
+        return self._memoized(("dependents", node), lambda: self._reach(node, self.dependents))
+
+    @staticmethod
+    def _reach(start: int, adjacency: List[List[int]]) -> Tuple[Tuple[int, int], ...]:
+        """Breadth-first reachable set with hop counts, start excluded"""
+        hops = {start: 0}
+        queue = deque([start])
+        reached = []
+        while queue:
+            node = queue.popleft()
+            for neighbor in adjacency[node]:
+                if neighbor not in hops:
+                    hops[neighbor] = hops[node] + 1
+                    reached.append((neighbor, hops[neighbor]))
+                    queue.append(neighbor)
+        return tuple(reached)
+
+    def blast_radius(self, node: int) -> Tuple[int, int, Tuple[Tuple[str, int], ...]]:
+        """
+        What can break when node does
+
+        Returns:
+            Tuple: (number of transitive dependents, most hops to one of them,
+                (layer, count) pairs with "external" for systems without an entry)
+        """
+        return self._memoized(("blast_radius", node), lambda: self._blast_radius(node))
+
+    def _blast_radius(self, node: int) -> Tuple[int, int, Tuple[Tuple[str, int], ...]]:
+        dependents = self.transitive_dependents(node)
+        by_layer: Dict[str, int] = {}
+        for dependent, _ in dependents:
+            layer = self.layers[dependent] or "external"
+            by_layer[layer] = by_layer.get(layer, 0) + 1
+        return len(dependents), dependents[-1][1] if dependents else 0, tuple(by_layer.items())
+
+    def shortest_path(self, source: int, target: int) -> Optional[Tuple[int, ...]]:
+        """
+        Fewest-hop dependency chain from source to target
+
+        Returns:
+            Tuple[int, ...]: Node ids from source to target, or None if source
+                does not depend on target, even indirectly
+        """
+        return self._memoized(("path", source, target), lambda: self._path(source, target))
+
+    def _path(self, source: int, target: int) -> Optional[Tuple[int, ...]]:
+        previous = {source: None}
+        queue = deque([source])
+        while queue:
+            node = queue.popleft()
+            if node == target:
+                path = []
+                while node is not None:
+                    path.append(node)
+                    node = previous[node]
+                return tuple(reversed(path))
+            for neighbor in self.dependencies[node]:
+                if neighbor not in previous:
+                    previous[neighbor] = node
+                    queue.append(neighbor)
+        return None
+
+    def cycles(self) -> Tuple[Tuple[int, ...], ...]:
+        """Strongly connected components with more than one node (or a self-dependency)"""
+        return self._memoized(("cycles",), self._strongly_connected)
+
+    def _strongly_connected(self) -> Tuple[Tuple[int, ...], ...]:
+        # Tarjan's algorithm, iterative so deep graphs do not hit the recursion limit
+        index = {}
+        lowlink = {}
+        stack = []
+        on_stack = set()
+        components = []
+        for root in range(len(self.names)):
+            if root in index:
+                continue
+            index[root] = lowlink[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+            work = [(root, iter(self.dependencies[root]))]
+            while work:
+                node, neighbors = work[-1]
+                advanced = False
+                for neighbor in neighbors:
+                    if neighbor not in index:
+                        index[neighbor] = lowlink[neighbor] = len(index)
+                        stack.append(neighbor)
+                        on_stack.add(neighbor)
+                        work.append((neighbor, iter(self.dependencies[neighbor])))
+                        advanced = True
+                        break
+                    if neighbor in on_stack:
+                        lowlink[node] = min(lowlink[node], index[neighbor])
+                if advanced:
+                    continue
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+                if lowlink[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    if len(component) > 1 or node in self.dependencies[node]:
+                        components.append(tuple(sorted(component)))
+        return tuple(components)
+
+    def cycle_of(self, node: int) -> Optional[Tuple[int, ...]]:
+        """The dependency cycle (strongly connected component) node is part of, if any"""
+        return self._memoized(("cycle", node), lambda: next(
+            (component for component in self.cycles() if node in component), None))
+
+    def layer_violations(self) -> Tuple[Tuple[int, int], ...]:
+        """(module, dependency) edges where a module depends on a layer above its own"""
+        return self._memoized(("layer_violations",), lambda: tuple(
+            (node, target)
+            for node, targets in enumerate(self.dependencies)
+            for target in targets
+            if self.layer_ranks[node] is not None and self.layer_ranks[target] is not None
+            and self.layer_ranks[target] < self.layer_ranks[node]
+        ))
+
+    def layer_violations_of(self, node: int) -> Tuple[Tuple[int, int], ...]:
+        """The layer violations node takes part in, as module or as dependency"""
+        return self._memoized(("layer_violations", node), lambda: tuple(
+            edge for edge in self.layer_violations() if node in edge))
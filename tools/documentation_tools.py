@@ -3,16 +3,31 @@ Documentation search and access tools for internal knowledge bases
 Following ADK patterns for tool implementation
 """
 
+import asyncio
 import json
 import os
 import sys
 from typing import Dict, List
 
 
-from new_hire.database.db_loader import DatabaseLoader
+from new_hire.database.db_loader import get_loader, like_regex_literal
+from new_hire.database.async_loader import get_async_loader
+from new_hire.tools.async_support import async_variant_of
+from new_hire.tools.search_index import SearchIndex, get_index
 
-# Initialize database loader
-loader = DatabaseLoader()
+# Shared database loaders (one connection pool per process)
+loader = get_loader()
+async_loader = get_async_loader()
+
+# Names of all APIs, used when a lookup finds nothing
+_API_NAMES_PATH = "$.apis[*].name"
+
+# Documents searched by search_documentation, keyed by doc_type
+_DOC_SOURCES = {
+    "wiki": "documentation/wiki_pages.json",
+    "api": "documentation/api_docs.json",
+    "tutorial": "documentation/tutorials.json"
+}
 
 def search_documentation(query: str, doc_type: str = "all") -> dict:
     """Search through all internal documentation for relevant information.
@@ -25,76 +40,117 @@ def search_documentation(query: str, doc_type: str = "all") -> dict:
         Dict: Search results from multiple documentation sources
     """
     try:
-        results = {
-            "status": "success",
-            "query": query,
-            "wiki_results": [],
-            "api_results": [],
-            "tutorial_results": [],
-            "total_found": 0
+        docs = {kind: loader.load_data(path) for kind, path in _DOC_SOURCES.items()
+                if doc_type in ["all", kind]}
+        return _search_documentation(docs, query, doc_type)
+    except Exception as e:
+        return {
+            "status": "error",
+            "error_message": f"Failed to search documentation: {str(e)}"
         }
-        
-        query_lower = query.lower()
-        
-        # Search wiki pages if requested
-        if doc_type in ["all", "wiki"]:
-            wiki_data = loader.load_data("documentation/wiki_pages.json")
-            for page in wiki_data.get("pages", []):
-                if (query_lower in page.get("title", "").lower() or
-                    query_lower in page.get("content", "").lower() or
-                    any(query_lower in tag.lower() for tag in page.get("tags", []))):
-                    results["wiki_results"].append({
-                        "title": page.get("title", ""),
-                        "url": page.get("url", ""),
-                        "summary": page.get("summary", ""),
-                        "last_updated": page.get("last_updated", ""),
-                        "author": page.get("author", ""),
-                        "tags": page.get("tags", [])
-                    })
-        
-        # Search API documentation if requested
-        if doc_type in ["all", "api"]:
-            api_data = loader.load_data("documentation/api_docs.json")
-            for api in api_data.get("apis", []):
-                if (query_lower in api.get("name", "").lower() or
-                    query_lower in api.get("description", "").lower()):
-                    results["api_results"].append({
-                        "name": api.get("name", ""),
-                        "description": api.get("description", ""),
-                        "version": api.get("version", ""),
-                        "base_url": api.get("base_url", ""),
-                        "documentation_url": api.get("documentation_url", ""),
-                        "key_endpoints": api.get("key_endpoints", [])
-                    })
-        
-        # Search tutorials if requested
-        if doc_type in ["all", "tutorial"]:
-            tutorial_data = loader.load_data("documentation/tutorials.json")
-            for tutorial in tutorial_data.get("tutorials", []):
-                if (query_lower in tutorial.get("title", "").lower() or
-                    query_lower in tutorial.get("description", "").lower() or
-                    any(query_lower in topic.lower() for topic in tutorial.get("topics", []))):
-                    results["tutorial_results"].append({
-                        "title": tutorial.get("title", ""),
-                        "description": tutorial.get("description", ""),
-                        "difficulty": tutorial.get("difficulty", ""),
-                        "estimated_time": tutorial.get("estimated_time", ""),
-                        "url": tutorial.get("url", ""),
-                        "topics": tutorial.get("topics", [])
-                    })
-        
-        # Calculate total results
-        results["total_found"] = (len(results["wiki_results"]) +
-                                  len(results["api_results"]) +
-                                  len(results["tutorial_results"]))
-        
-        return results
+
+@async_variant_of(search_documentation)
+async def search_documentation_async(query: str, doc_type: str = "all") -> dict:
+    try:
+        kinds = [kind for kind in _DOC_SOURCES if doc_type in ["all", kind]]
+        loaded = await asyncio.gather(*(async_loader.load_data(_DOC_SOURCES[kind]) for kind in kinds))
+        return _search_documentation(dict(zip(kinds, loaded)), query, doc_type)
     except Exception as e:
         return {
             "status": "error",
             "error_message": f"Failed to search documentation: {str(e)}"
         }
 
+# Field weights for wiki pages; together they decide main vs related pages
+_WIKI_FIELDS = {"title": 3, "content": 2, "tags": 1}
+_MAIN_PAGE_WEIGHT = 3
+
+def _wiki_index(wiki_data: dict) -> SearchIndex:
+    """Index wiki pages by title, content and tags"""
+    return SearchIndex([{
+        "title": page.get("title", ""),
+        "content": page.get("content", ""),
+        "tags": page.get("tags", [])
+    } for page in wiki_data.get("pages", [])], _WIKI_FIELDS)
+
+def _api_index(api_data: dict) -> SearchIndex:
+    """Index APIs by name and description"""
+    return SearchIndex([{
+        "name": api.get("name", ""),
+        "description": api.get("description", "")
+    } for api in api_data.get("apis", [])], {"name": 3, "description": 2})
+
+def _tutorial_index(tutorial_data: dict) -> SearchIndex:
+    """Index tutorials by title, description and topics"""
+    return SearchIndex([{
+        "title": tutorial.get("title", ""),
+        "description": tutorial.get("description", ""),
+        "topics": tutorial.get("topics", [])
+    } for tutorial in tutorial_data.get("tutorials", [])], {"title": 3, "description": 2, "topics": 1})
+
+def _search_documentation(docs: dict, query: str, doc_type: str) -> dict:
+    """Search the loaded wiki, API and tutorial documents for a query"""
+    results = {
+        "status": "success",
+        "query": query,
+        "wiki_results": [],
+        "api_results": [],
+        "tutorial_results": [],
+        "total_found": 0
+    }
+
+    # Search wiki pages if requested
+    if "wiki" in docs:
+        pages = docs["wiki"].get("pages", [])
+        hits, _ = get_index("wiki_pages", docs["wiki"], _wiki_index).search(query)
+        for hit in hits:
+            page = pages[hit.position]
+            results["wiki_results"].append({
+                "title": page.get("title", ""),
+                "url": page.get("url", ""),
+                "summary": page.get("summary", ""),
+                "last_updated": page.get("last_updated", ""),
+                "author": page.get("author", ""),
+                "tags": page.get("tags", [])
+            })
+
+    # Search API documentation if requested
+    if "api" in docs:
+        apis = docs["api"].get("apis", [])
+        hits, _ = get_index("apis", docs["api"], _api_index).search(query)
+        for hit in hits:
+            api = apis[hit.position]
+            results["api_results"].append({
+                "name": api.get("name", ""),
+                "description": api.get("description", ""),
+                "version": api.get("version", ""),
+                "base_url": api.get("base_url", ""),
+                "documentation_url": api.get("documentation_url", ""),
+                "key_endpoints": api.get("key_endpoints", [])
+            })
+
+    # Search tutorials if requested
+    if "tutorial" in docs:
+        tutorials = docs["tutorial"].get("tutorials", [])
+        hits, _ = get_index("tutorials", docs["tutorial"], _tutorial_index).search(query)
+        for hit in hits:
+            tutorial = tutorials[hit.position]
+            results["tutorial_results"].append({
+                "title": tutorial.get("title", ""),
+                "description": tutorial.get("description", ""),
+                "difficulty": tutorial.get("difficulty", ""),
+                "estimated_time": tutorial.get("estimated_time", ""),
+                "url": tutorial.get("url", ""),
+                "topics": tutorial.get("topics", [])
+            })
+
+    # Calculate total results
+    results["total_found"] = (len(results["wiki_results"]) +
+                              len(results["api_results"]) +
+                              len(results["tutorial_results"]))
+
+    return results
+
 def find_wiki_content(topic: str) -> dict:
     """Find specific wiki pages and content for a given topic.
     
@@ -106,58 +162,58 @@ def find_wiki_content(topic: str) -> dict:
     """
     try:
         wiki_data = loader.load_data("documentation/wiki_pages.json")
-        topic_lower = topic.lower()
-        main_pages = []
-        related_pages = []
-        
-        for page in wiki_data.get("pages", []):
-            relevance_score = 0
-            
-            # Check title match (highest priority)
-            if topic_lower in page.get("title", "").lower():
-                relevance_score += 3
-            
-            # Check content match
-            if topic_lower in page.get("content", "").lower():
-                relevance_score += 2
-            
-            # Check tags match
-            if any(topic_lower in tag.lower() for tag in page.get("tags", [])):
-                relevance_score += 1
-            
-            page_info = {
-                "title": page.get("title", ""),
-                "url": page.get("url", ""),
-                "summary": page.get("summary", ""),
-                "content": page.get("content", "")[:500] + "..." if len(page.get("content", "")) > 500 else page.get("content", ""),
-                "last_updated": page.get("last_updated", ""),
-                "author": page.get("author", ""),
-                "tags": page.get("tags", []),
-                "relevance_score": relevance_score
-            }
-            
-            if relevance_score >= 3:
-                main_pages.append(page_info)
-            elif relevance_score > 0:
-                related_pages.append(page_info)
-        
-        # Sort by relevance
-        main_pages.sort(key=lambda x: x["relevance_score"], reverse=True)
-        related_pages.sort(key=lambda x: x["relevance_score"], reverse=True)
-        
+        return _find_wiki_content(wiki_data, topic)
+    except Exception as e:
         return {
-            "status": "success",
-            "topic": topic,
-            "main_pages": main_pages[:3],  # Top 3 most relevant
-            "related_pages": related_pages[:5],  # Top 5 related
-            "total_pages_found": len(main_pages) + len(related_pages)
+            "status": "error",
+            "error_message": f"Failed to find wiki content: {str(e)}"
         }
+
+@async_variant_of(find_wiki_content)
+async def find_wiki_content_async(topic: str) -> dict:
+    try:
+        wiki_data = await async_loader.load_data("documentation/wiki_pages.json")
+        return _find_wiki_content(wiki_data, topic)
     except Exception as e:
         return {
             "status": "error",
             "error_message": f"Failed to find wiki content: {str(e)}"
         }
 
+def _find_wiki_content(wiki_data: dict, topic: str) -> dict:
+    """Split wiki pages into main and related matches for a topic"""
+    pages = wiki_data.get("pages", [])
+    hits, _ = get_index("wiki_pages", wiki_data, _wiki_index).search(topic)
+
+    main_pages = []
+    related_pages = []
+    for hit in hits:
+        page = pages[hit.position]
+        page_info = {
+            "title": page.get("title", ""),
+            "url": page.get("url", ""),
+            "summary": page.get("summary", ""),
+            "content": page.get("content", "")[:500] + "..." if len(page.get("content", "")) > 500 else page.get("content", ""),
+            "last_updated": page.get("last_updated", ""),
+            "author": page.get("author", ""),
+            "tags": page.get("tags", []),
+            "relevance_score": hit.score
+        }
+
+        # Main pages match in the title, or in both content and tags
+        if sum(_WIKI_FIELDS[field] for field in hit.fields) >= _MAIN_PAGE_WEIGHT:
+            main_pages.append(page_info)
+        else:
+            related_pages.append(page_info)
+
+    return {
+        "status": "success",
+        "topic": topic,
+        "main_pages": main_pages[:3],  # Top 3 most relevant
+        "related_pages": related_pages[:5],  # Top 5 related
+        "total_pages_found": len(main_pages) + len(related_pages)
+    }
+
 def get_api_docs(api_name: str = "", endpoint: str = "") -> dict:
     """Get detailed API documentation and endpoint information.
     
@@ -169,65 +225,85 @@ def get_api_docs(api_name: str = "", endpoint: str = "") -> dict:
         Dict: API documentation, endpoints, and usage examples
     """
     try:
-        api_data = loader.load_data("documentation/api_docs.json")
-        
         if not api_name:
-            # Return list of available APIs
-            api_list = []
-            for api in api_data.get("apis", []):
-                api_list.append({
-                    "name": api.get("name", ""),
-                    "description": api.get("description", ""),
-                    "version": api.get("version", ""),
-                    "status": api.get("status", "")
-                })
-            return {
-                "status": "success",
-                "available_apis": api_list,
-                "message": "Specify an api_name to get detailed information"
-            }
-        
-        # Find specific API
-        api_name_lower = api_name.lower()
-        target_api = None
-        for api in api_data.get("apis", []):
-            if api_name_lower in api.get("name", "").lower():
-                target_api = api
-                break
-        
-        if not target_api:
-            return {
-                "status": "error",
-                "error_message": f"API '{api_name}' not found",
-                "available_apis": [api.get("name", "") for api in api_data.get("apis", [])]
-            }
-        
-        result = {
-            "status": "success",
-            "api_name": target_api.get("name", ""),
-            "description": target_api.get("description", ""),
-            "version": target_api.get("version", ""),
-            "base_url": target_api.get("base_url", ""),
-            "authentication": target_api.get("authentication", {}),
-            "documentation_url": target_api.get("documentation_url", ""),
-            "status": target_api.get("status", ""),
-            "endpoints": target_api.get("key_endpoints", [])
+            api_data = loader.load_data("documentation/api_docs.json")
+            return _list_apis(api_data)
+        # Only the matching API is fetched from the database
+        target_api = loader.load_path("documentation/api_docs.json", _api_match_path(api_name), first=True)
+        available_apis = [] if target_api else loader.load_path("documentation/api_docs.json", _API_NAMES_PATH)
+        return _describe_api(api_name, endpoint, target_api, available_apis)
+    except Exception as e:
+        return {
+            "status": "error",
+            "error_message": f"Failed to get API information: {str(e)}"
         }
-        
-        # If specific endpoint requested, filter to that
-        if endpoint:
-            endpoint_lower = endpoint.lower()
-            matching_endpoints = []
-            for ep in target_api.get("key_endpoints", []):
-                if (endpoint_lower in ep.get("path", "").lower() or
-                    endpoint_lower in ep.get("description", "").lower()):
-                    matching_endpoints.append(ep)
-            result["endpoints"] = matching_endpoints
-            result["endpoint_filter"] = endpoint
-        
-        return result
+
+@async_variant_of(get_api_docs)
+async def get_api_docs_async(api_name: str = "", endpoint: str = "") -> dict:
+    try:
+        if not api_name:
+            api_data = await async_loader.load_data("documentation/api_docs.json")
+            return _list_apis(api_data)
+        target_api = await async_loader.load_path("documentation/api_docs.json", _api_match_path(api_name), first=True)
+        available_apis = [] if target_api else await async_loader.load_path("documentation/api_docs.json", _API_NAMES_PATH)
+        return _describe_api(api_name, endpoint, target_api, available_apis)
     except Exception as e:
         return {
             "status": "error",
             "error_message": f"Failed to get API information: {str(e)}"
         }
+
+def _api_match_path(api_name: str) -> str:
+    """Path selecting the APIs whose name contains api_name (case-insensitive)"""
+    return f'$.apis[*] ? (@.name like_regex {like_regex_literal(api_name)} flag "i")'
+
+def _list_apis(api_data: dict) -> dict:
+    """List the documented APIs without their endpoint details"""
+    # Return list of available APIs
+    api_list = []
+    for api in api_data.get("apis", []):
+        api_list.append({
+            "name": api.get("name", ""),
+            "description": api.get("description", ""),
+            "version": api.get("version", ""),
+            "status": api.get("status", "")
+        })
+    return {
+        "status": "success",
+        "available_apis": api_list,
+        "message": "Specify an api_name to get detailed information"
+    }
+
+def _describe_api(api_name: str, endpoint: str, target_api: dict, available_apis: list) -> dict:
+    """Describe the first API matched by _api_match_path, optionally filtering its endpoints"""
+    if not target_api:
+        return {
+            "status": "error",
+            "error_message": f"API '{api_name}' not found",
+            "available_apis": available_apis
+        }
+
+    result = {
+        "status": "success",
+        "api_name": target_api.get("name", ""),
+        "description": target_api.get("description", ""),
+        "version": target_api.get("version", ""),
+        "base_url": target_api.get("base_url", ""),
+        "authentication": target_api.get("authentication", {}),
+        "documentation_url": target_api.get("documentation_url", ""),
+        "status": target_api.get("status", ""),
+        "endpoints": target_api.get("key_endpoints", [])
+    }
+
+    # If specific endpoint requested, filter to that
+    if endpoint:
+        endpoint_lower = endpoint.lower()
+        matching_endpoints = []
+        for ep in target_api.get("key_endpoints", []):
+            if (endpoint_lower in ep.get("path", "").lower() or
+                endpoint_lower in ep.get("description", "").lower()):
+                matching_endpoints.append(ep)
+        result["endpoints"] = matching_endpoints
+        result["endpoint_filter"] = endpoint
+
+    return result
\ No newline at end of file
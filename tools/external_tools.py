@@ -1,7 +1,16 @@
 import os
+import time
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+
+_import_started = time.perf_counter()
+
 from google.adk.agents import Agent
-from google.adk.tools import google_search
+from google.adk.tools import FunctionTool, google_search
 from google.adk.tools.agent_tool import AgentTool
+from google.adk.tools.base_tool import BaseTool
+from google.adk.tools.base_toolset import BaseToolset
 from google.adk.tools.mcp_tool import MCPToolset, StreamableHTTPConnectionParams
 from toolbox_core import ToolboxSyncClient
 
@@ -10,6 +19,15 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Seconds taken by each startup step, reported once the agents are built
+STARTUP_TIMINGS: Dict[str, float] = {"external_tools.imports": time.perf_counter() - _import_started}
+
+# Seconds before a failed ToolBox load is tried again
+_RETRY_INTERVAL = 30
+
 
 search_agent = Agent(
     model="gemini-2.5-flash",
@@ -24,11 +42,115 @@ search_tool = AgentTool(search_agent)
 
 
 #tool box
-toolbox = ToolboxSyncClient( str(os.getenv("URL")))
-toolbox_tools = toolbox.load_toolset("tickets-read-only")
+class DeferredToolboxToolset(BaseToolset):
+    """ToolBox toolset loaded in a background thread instead of at import
+
+    Until the toolset has loaded, or while the ToolBox server is unreachable,
+    get_tools offers a single ticket_tools_status tool reporting that the
+    ticket tools are warming up, so neither startup nor an agent turn blocks
+    on the server. A failed load is retried on a later turn.
+    """
+
+    def __init__(self, url: Optional[str], toolset_name: str):
+        super().__init__()
+        self.url = url
+        self.toolset_name = toolset_name
+        self.load_seconds: Optional[float] = None
+        self._client = None
+        self._tools: Optional[List[BaseTool]] = None
+        self._error: Optional[str] = None
+        self._failed_at = 0.0
+        self._started_at: Optional[float] = None
+        self._lock = threading.Lock()
+        # Set whenever no load is in progress
+        self._idle = threading.Event()
+        self._idle.set()
+
+        def ticket_tools_status() -> dict:
+            """
+            Status of the ticket tools (get-all-tickets, search-tickets, get-ticket-by-id, ...)
+            Call this when the user asks about tickets and those tools are not listed yet.
+
+            Returns:
+                Dict: warming_up while the ticket tools load, or the error if they are unavailable
+            """
+            return self.status()
+
+        self._status_tool = FunctionTool(func=ticket_tools_status)
+
+    def start(self) -> None:
+        """Begin loading in the background unless loaded, loading or recently failed"""
+        with self._lock:
+            if self._tools is not None or not self._idle.is_set():
+                return
+            if self._error is not None and time.monotonic() - self._failed_at < _RETRY_INTERVAL:
+                return
+            self._idle.clear()
+            self._started_at = time.perf_counter()
+            threading.Thread(target=self._load, name="toolbox-loader", daemon=True).start()
+
+    def _load(self) -> None:
+        try:
+            if not self.url:
+                raise ValueError("URL is not set")
+            if self._client is None:
+                self._client = ToolboxSyncClient(self.url)
+            tools = [FunctionTool(func=tool) for tool in self._client.load_toolset(self.toolset_name)]
+            with self._lock:
+                self._tools, self._error = tools, None
+                self.load_seconds = time.perf_counter() - self._started_at
+            logger.info(f"Loaded {len(tools)} ticket tools from ToolBox in {self.load_seconds:.2f}s")
+        except Exception as e:
+            with self._lock:
+                self._error, self._failed_at = str(e), time.monotonic()
+            logger.warning(f"Ticket tools unavailable: {str(e)}")
+        finally:
+            self._idle.set()
+
+    def warm_up(self, budget: float) -> bool:
+        """
+        Wait for a load in progress until budget seconds after it began
+
+        Args:
+            budget: Seconds startup may spend on the toolset, counted from the
+                start of loading so that time spent importing overlaps with it
+
+        Returns:
+            bool: True if the ticket tools are ready
+        """
+        if self._started_at is not None:
+            self._idle.wait(max(0.0, budget - (time.perf_counter() - self._started_at)))
+        return self._tools is not None
+
+    def status(self) -> Dict[str, Any]:
+        """Loading state of the ticket tools"""
+        with self._lock:
+            if self._tools is not None:
+                return {"status": "success", "state": "ready", "tool_count": len(self._tools),
+                        "load_seconds": round(self.load_seconds, 3)}
+            if self._idle.is_set() and self._error is not None:
+                return {"status": "error", "state": "unavailable",
+                        "error_message": f"Ticket tools unavailable: {self._error}"}
+        return {"status": "warming_up", "state": "warming_up",
+                "message": "Ticket tools warming up; they will be available in a few seconds, please ask again shortly"}
+
+    async def get_tools(self, readonly_context=None) -> List[BaseTool]:
+        self.start()
+        return list(self._tools) if self._tools is not None else [self._status_tool]
+
+    async def close(self) -> None:
+        # Loaded tools stay usable; the client is shut down with the process
+        pass
+
+
+ticket_toolset = DeferredToolboxToolset(os.getenv("URL"), "tickets-read-only")
+# Load during startup unless disabled, otherwise on first use
+if os.getenv('TOOLBOX_WARMUP', 'true').lower() == 'true':
+    ticket_toolset.start()
 
 
 #github mcp
+# MCPToolset only connects on its first get_tools call, not here
 git_tools = MCPToolset(
     connection_params=StreamableHTTPConnectionParams(
         url="https://api.githubcopilot.com/mcp/",
@@ -45,4 +167,40 @@ git_tools = MCPToolset(
         "list_pull_requests",
         "get_pull_request",
     ],
-)
\ No newline at end of file
+)
+
+STARTUP_TIMINGS["external_tools"] = time.perf_counter() - _import_started
+
+
+def report_startup(step: str, started: float) -> Dict[str, Any]:
+    """
+    Record a startup step and log the cold start so far
+
+    Waits for the ticket toolset for what is left of TOOLBOX_STARTUP_BUDGET
+    seconds first, and warns when the step took longer than
+    COLD_START_TARGET_SECONDS.
+
+    Args:
+        step: Name of the step, e.g. "agent"
+        started: time.perf_counter() when the step began
+
+    Returns:
+        Dict: As returned by startup_report
+    """
+    ticket_toolset.warm_up(float(os.getenv('TOOLBOX_STARTUP_BUDGET', 2)))
+    seconds = STARTUP_TIMINGS[step] = time.perf_counter() - started
+    report = startup_report()
+    timings = ", ".join(f"{name} {value:.2f}s" for name, value in report["timings"].items())
+    logger.info(f"Startup timings: {timings}; ticket tools {report['ticket_tools']['state']}")
+    target = float(os.getenv('COLD_START_TARGET_SECONDS', 5))
+    if seconds > target:
+        logger.warning(f"Cold start of {step} took {seconds:.2f}s, over the {target:.2f}s target")
+    return report
+
+
+def startup_report() -> Dict[str, Any]:
+    """Startup step timings in seconds and the state of the ticket tools"""
+    return {
+        "timings": {name: round(value, 3) for name, value in STARTUP_TIMINGS.items()},
+        "ticket_tools": ticket_toolset.status()
+    }
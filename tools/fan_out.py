@@ -0,0 +1,118 @@
+"""
+Parallel fan-out to several specialists for cross-domain questions
+The orchestrator splits a question into independent sub-questions and calls
+consult_specialists once; each specialist answers its part in its own
+session, all of them concurrently, and the orchestrator merges the answers.
+A branch that runs past its timeout is cancelled and reported instead of
+holding up the others, so the whole call takes about as long as the slowest
+branch that finishes rather than the sum of all of them.
+"""
+
+import os
+import time
+import asyncio
+import inspect
+from typing import Any, Callable, Dict, List
+
+from google.adk.agents import BaseAgent
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+
+# User id of the branch sessions
+_BRANCH_USER = "fan_out"
+
+
+def _branch_agent(agent: BaseAgent) -> BaseAgent:
+    """Copy of a specialist that runs on its own: no parent to transfer back to"""
+    return agent.model_copy(update={
+        "parent_agent": None,
+        "disallow_transfer_to_parent": True,
+        "disallow_transfer_to_peers": True
+    })
+
+
+async def _ask(agent: BaseAgent, question: str) -> str:
+    """Final text answer of an agent to one question, in a fresh session"""
+    runner = InMemoryRunner(agent=agent, app_name=agent.name)
+    session = runner.session_service.create_session(app_name=agent.name, user_id=_BRANCH_USER)
+    if inspect.isawaitable(session):
+        session = await session
+    message = types.Content(role="user", parts=[types.Part(text=question)])
+    answer = ""
+    async for event in runner.run_async(user_id=_BRANCH_USER, session_id=session.id, new_message=message):
+        if event.partial or event.content is None:
+            continue
+        text = "".join(part.text or "" for part in (event.content.parts or []) if not getattr(part, "thought", False))
+        if text.strip():
+            answer = text.strip()
+    return answer
+
+
+def fan_out_tool(specialists: List[BaseAgent]) -> Callable:
+    """
+    Build the consult_specialists tool over a set of specialist agents
+
+    Args:
+        specialists: Agents the orchestrator may consult; each branch runs a
+            detached copy, so they stay sub-agents of the orchestrator
+
+    Returns:
+        Async tool function for the orchestrator
+    """
+    branches: Dict[str, BaseAgent] = {agent.name: _branch_agent(agent) for agent in specialists}
+
+    async def consult_specialists(specialists: List[str], sub_queries: List[str]) -> dict:
+        """
+        Ask several specialists their part of a cross-domain question at the same time
+
+        Args:
+            specialists: Specialist agent names, e.g. ["troubleshooting_copilot", "policy_guide", "team_integrator"]
+            sub_queries: One self-contained question per specialist, in the same order
+
+        Returns:
+            Dict: Each specialist's answer, plus the branches that timed out or failed
+        """
+        try:
+            if len(specialists) != len(sub_queries):
+                return {
+                    "status": "error",
+                    "error_message": f"Got {len(specialists)} specialists but {len(sub_queries)} sub-queries"
+                }
+            timeout = float(os.getenv('FAN_OUT_TIMEOUT', 45))
+            started = time.perf_counter()
+
+            async def branch(name: str, question: str) -> Dict[str, Any]:
+                result = {"specialist": name, "question": question}
+                if name not in branches:
+                    return {**result, "status": "error",
+                            "error_message": f"Unknown specialist '{name}'. Available: {', '.join(branches)}"}
+                branch_started = time.perf_counter()
+                try:
+                    answer = await asyncio.wait_for(_ask(branches[name], question), timeout)
+                    result.update(status="success", answer=answer)
+                except asyncio.TimeoutError:
+                    result.update(status="timeout", error_message=f"No answer within {timeout:g}s")
+                except Exception as e:
+                    result.update(status="error", error_message=str(e))
+                result["seconds"] = round(time.perf_counter() - branch_started, 2)
+                return result
+
+            results = await asyncio.gather(*(branch(name, question) for name, question in zip(specialists, sub_queries)))
+            answers = [result for result in results if result["status"] == "success"]
+            response = {
+                "status": "success" if answers else "error",
+                "answers": answers,
+                "timed_out": [result for result in results if result["status"] == "timeout"],
+                "failed": [result for result in results if result["status"] == "error"],
+                "seconds": round(time.perf_counter() - started, 2)
+            }
+            if not answers:
+                response["error_message"] = "No specialist answered"
+            return response
+        except Exception as e:
+            return {
+                "status": "error",
+                "error_message": f"Failed to consult specialists: {str(e)}"
+            }
+
+    return consult_specialists
@@ -0,0 +1,78 @@
+"""
+Multi-pattern substring matcher for error and rule patterns
+All patterns are compiled into one regular expression shaped like a trie of
+the patterns, so a text is scanned in a single pass however many patterns
+there are
+Following ADK patterns for tool implementation
+"""
+
+import re
+from collections import namedtuple
+from typing import Any, Dict, Iterable, List, Tuple
+
+# One occurrence of a pattern: offsets into the lowercased text, the (lowercased)
+# pattern, and the values registered for it
+PatternMatch = namedtuple('PatternMatch', ['start', 'end', 'pattern', 'values'])
+
+
+def _trie_regex(trie: Dict[str, Any]) -> str:
+    """Regex source matching the longest pattern in a trie"""
+    branches = [re.escape(char) + _trie_regex(child) for char, child in sorted(trie.items()) if char]
+    if not branches:
+        return ''
+    body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+    # A pattern ends here; longer patterns through this node are optional
+    return f'(?:{body})?' if '' in trie else body
+
+
+class PatternMatcher:
+    """Case-insensitive matcher reporting every occurrence of every pattern"""
+
+    def __init__(self, patterns: Iterable[Tuple[str, Any]]):
+        """
+        Compile the patterns
+
+        Args:
+            patterns: (pattern, value) pairs; a pattern may carry several values
+        """
+        self._values: Dict[str, List[Any]] = {}
+        for pattern, value in patterns:
+            if pattern:
+                self._values.setdefault(pattern.lower(), []).append(value)
+
+        trie: Dict[str, Any] = {}
+        for pattern in self._values:
+            node = trie
+            for char in pattern:
+                node = node.setdefault(char, {})
+            node[''] = True
+        # The lookahead tries every start offset, and yields the longest pattern there
+        self._regex = re.compile(f'(?=({_trie_regex(trie)}))') if trie else None
+
+        # Shorter patterns at the same offset are exactly the prefixes of the longest one
+        by_length = sorted(self._values, key=len, reverse=True)
+        self._prefixes = {pattern: [other for other in by_length if pattern.startswith(other)]
+                          for pattern in self._values}
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def find(self, text: str) -> List[PatternMatch]:
+        """
+        Find all pattern occurrences in a text, overlapping ones included
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            List[PatternMatch]: Occurrences by start offset, longest first at each offset;
+                offsets are into text.lower(), which can be longer than text
+        """
+        if self._regex is None or not text:
+            return []
+        matches = []
+        for found in self._regex.finditer(text.lower()):
+            start = found.start()
+            for pattern in self._prefixes[found.group(1)]:
+                matches.append(PatternMatch(start, start + len(pattern), pattern, self._values[pattern]))
+        return matches
@@ -3,16 +3,22 @@ HR policy, security, and compliance tools for company guidelines
 Following ADK patterns for tool implementation
 """
 
+import bisect
 import json
 import os
 import sys
 from typing import Dict, List
 
 
-from new_hire.database.db_loader import DatabaseLoader
+from new_hire.database.db_loader import get_loader
+from new_hire.database.async_loader import get_async_loader
+from new_hire.tools.async_support import async_variant_of
+from new_hire.tools.pattern_matcher import PatternMatcher
+from new_hire.tools.search_index import SearchIndex, get_index
 
-# Initialize database loader
-loader = DatabaseLoader()
+# Shared database loaders (one connection pool per process)
+loader = get_loader()
+async_loader = get_async_loader()
 
 def search_policies(topic: str, policy_type: str = "all") -> dict:
     """Search HR policies and company procedures for specific topics.
@@ -26,72 +32,81 @@ def search_policies(topic: str, policy_type: str = "all") -> dict:
     """
     try:
         hr_data = loader.load_data("policies/hr_handbook.json")
-        topic_lower = topic.lower()
-        policy_type_lower = policy_type.lower()
-        
-        matching_policies = []
-        for policy_category, policies in hr_data.get("policies", {}).items():
-            # Filter by policy type if specified
-            if policy_type != "all" and policy_type_lower not in policy_category.lower():
-                continue
-            
-            for policy in policies:
-                relevance_score = 0
-                
-                # Check title match
-                if topic_lower in policy.get("title", "").lower():
-                    relevance_score += 3
-                
-                # Check description match
-                if topic_lower in policy.get("description", "").lower():
-                    relevance_score += 2
-                
-                # Check keywords match
-                if any(topic_lower in keyword.lower() for keyword in policy.get("keywords", [])):
-                    relevance_score += 1
-                
-                if relevance_score > 0:
-                    policy_info = {
-                        "category": policy_category,
-                        "title": policy.get("title", ""),
-                        "description": policy.get("description", ""),
-                        "details": policy.get("details", []),
-                        "effective_date": policy.get("effective_date", ""),
-                        "last_updated": policy.get("last_updated", ""),
-                        "contact": policy.get("contact", ""),
-                        "keywords": policy.get("keywords", []),
-                        "relevance_score": relevance_score
-                    }
-                    matching_policies.append(policy_info)
-        
-        # Sort by relevance
-        matching_policies.sort(key=lambda x: x["relevance_score"], reverse=True)
-        
-        if not matching_policies:
-            # Return available policy categories
-            available_categories = list(hr_data.get("policies", {}).keys())
-            return {
-                "status": "success",
-                "topic": topic,
-                "policies_found": 0,
-                "available_categories": available_categories,
-                "suggestion": "Try searching with different keywords or browse by category"
-            }
-        
+        return _search_policies(hr_data, topic, policy_type)
+    except Exception as e:
         return {
-            "status": "success",
-            "topic": topic,
-            "policy_type_filter": policy_type,
-            "policies_found": len(matching_policies),
-            "matching_policies": matching_policies[:5],  # Top 5 matches
-            "additional_policies_available": max(0, len(matching_policies) - 5)
+            "status": "error",
+            "error_message": f"Failed to search policies: {str(e)}"
         }
+
+@async_variant_of(search_policies)
+async def search_policies_async(topic: str, policy_type: str = "all") -> dict:
+    try:
+        hr_data = await async_loader.load_data("policies/hr_handbook.json")
+        return _search_policies(hr_data, topic, policy_type)
     except Exception as e:
         return {
             "status": "error",
             "error_message": f"Failed to search policies: {str(e)}"
         }
 
+def _policy_index(hr_data: dict) -> SearchIndex:
+    """Index HR policies of every category by title, description and keywords"""
+    policies = [(policy_category, policy)
+                for policy_category, category_policies in hr_data.get("policies", {}).items()
+                for policy in category_policies]
+    return SearchIndex([{
+        "title": policy.get("title", ""),
+        "description": policy.get("description", ""),
+        "keywords": policy.get("keywords", [])
+    } for _, policy in policies], {"title": 3, "description": 2, "keywords": 1}, items=policies)
+
+def _search_policies(hr_data: dict, topic: str, policy_type: str) -> dict:
+    """Rank HR handbook policies for a topic"""
+    policy_type_lower = policy_type.lower()
+    index = get_index("hr_policies", hr_data, _policy_index)
+
+    # Filter by policy type if specified
+    where = None
+    if policy_type != "all":
+        where = lambda position: policy_type_lower in index.items[position][0].lower()
+    hits, total_found = index.search(topic, k=5, where=where)
+
+    matching_policies = []
+    for hit in hits:
+        policy_category, policy = index.items[hit.position]
+        matching_policies.append({
+            "category": policy_category,
+            "title": policy.get("title", ""),
+            "description": policy.get("description", ""),
+            "details": policy.get("details", []),
+            "effective_date": policy.get("effective_date", ""),
+            "last_updated": policy.get("last_updated", ""),
+            "contact": policy.get("contact", ""),
+            "keywords": policy.get("keywords", []),
+            "relevance_score": hit.score
+        })
+
+    if not matching_policies:
+        # Return available policy categories
+        available_categories = list(hr_data.get("policies", {}).keys())
+        return {
+            "status": "success",
+            "topic": topic,
+            "policies_found": 0,
+            "available_categories": available_categories,
+            "suggestion": "Try searching with different keywords or browse by category"
+        }
+
+    return {
+        "status": "success",
+        "topic": topic,
+        "policy_type_filter": policy_type,
+        "policies_found": total_found,
+        "matching_policies": matching_policies,  # Top 5 matches
+        "additional_policies_available": max(0, total_found - 5)
+    }
+
 def check_compliance(scenario: str, regulation_type: str = "") -> dict:
     """Check compliance requirements for specific scenarios or actions.
     
@@ -104,71 +119,191 @@ def check_compliance(scenario: str, regulation_type: str = "") -> dict:
     """
     try:
         compliance_data = loader.load_data("policies/compliance_docs.json")
-        scenario_lower = scenario.lower()
-        regulation_lower = regulation_type.lower() if regulation_type else ""
-        
-        applicable_requirements = []
+        return _check_compliance(compliance_data, scenario, regulation_type)
+    except Exception as e:
+        return {
+            "status": "error",
+            "error_message": f"Failed to check compliance: {str(e)}"
+        }
+
+@async_variant_of(check_compliance)
+async def check_compliance_async(scenario: str, regulation_type: str = "") -> dict:
+    try:
+        compliance_data = await async_loader.load_data("policies/compliance_docs.json")
+        return _check_compliance(compliance_data, scenario, regulation_type)
+    except Exception as e:
+        return {
+            "status": "error",
+            "error_message": f"Failed to check compliance: {str(e)}"
+        }
+
+class _ComplianceRules:
+    """Requirements of compliance_docs.json compiled into a rule table keyed by scenario keyword"""
+
+    def __init__(self, compliance_data: dict):
+        self.regulations = []
+        self.requirements = []
+        keywords = []
         for regulation, reg_data in compliance_data.get("regulations", {}).items():
-            # Filter by regulation type if specified
-            if regulation_lower and regulation_lower not in regulation.lower():
-                continue
-            
             for requirement in reg_data.get("requirements", []):
-                # Check if requirement applies to scenario
-                if any(keyword.lower() in scenario_lower for keyword in requirement.get("applicable_scenarios", [])):
-                    req_info = {
-                        "regulation": regulation,
-                        "regulation_description": reg_data.get("description", ""),
-                        "requirement_title": requirement.get("title", ""),
-                        "description": requirement.get("description", ""),
-                        "mandatory_actions": requirement.get("mandatory_actions", []),
-                        "prohibited_actions": requirement.get("prohibited_actions", []),
-                        "documentation_required": requirement.get("documentation_required", []),
-                        "compliance_level": requirement.get("compliance_level", "standard"),
-                        "penalties": requirement.get("penalties", ""),
-                        "review_frequency": requirement.get("review_frequency", ""),
-                        "responsible_team": requirement.get("responsible_team", "")
-                    }
-                    applicable_requirements.append(req_info)
-        
-        if not applicable_requirements:
-            # Return available regulations if no matches
-            available_regulations = list(compliance_data.get("regulations", {}).keys())
-            return {
-                "status": "success",
-                "scenario": scenario,
-                "applicable_requirements": 0,
-                "available_regulations": available_regulations,
-                "general_guidance": compliance_data.get("general_guidance", []),
-                "suggestion": "Scenario may not have specific compliance requirements, or try rephrasing"
-            }
-        
-        # Group by compliance level
-        critical_requirements = [req for req in applicable_requirements if req["compliance_level"] == "critical"]
-        standard_requirements = [req for req in applicable_requirements if req["compliance_level"] == "standard"]
-        recommended_requirements = [req for req in applicable_requirements if req["compliance_level"] == "recommended"]
-        
+                position = len(self.requirements)
+                keywords.extend((keyword, position) for keyword in requirement.get("applicable_scenarios", []))
+                self.regulations.append(regulation.lower())
+                self.requirements.append({
+                    "regulation": regulation,
+                    "regulation_description": reg_data.get("description", ""),
+                    "requirement_title": requirement.get("title", ""),
+                    "description": requirement.get("description", ""),
+                    "mandatory_actions": requirement.get("mandatory_actions", []),
+                    "prohibited_actions": requirement.get("prohibited_actions", []),
+                    "documentation_required": requirement.get("documentation_required", []),
+                    "compliance_level": requirement.get("compliance_level", "standard"),
+                    "penalties": requirement.get("penalties", ""),
+                    "review_frequency": requirement.get("review_frequency", ""),
+                    "responsible_team": requirement.get("responsible_team", "")
+                })
+        # keyword -> positions of the requirements it applies to
+        self.matcher = PatternMatcher(keywords)
+
+    def evaluate(self, scenarios: List[str], regulation_type: str = "") -> List[List[dict]]:
+        """
+        Requirements applying to each scenario, scanning all scenarios in one pass
+
+        Args:
+            scenarios: Scenario descriptions
+            regulation_type: Regulation name substring to restrict to (optional)
+
+        Returns:
+            List: For each scenario, its applicable requirements in document order
+        """
+        regulation_lower = regulation_type.lower() if regulation_type else ""
+        # Match offsets are into the lowercased text, and lowercasing can change
+        # a scenario's length ('İ' becomes two characters), so the offsets of
+        # the scenarios are taken after lowercasing them
+        lowered = [scenario.lower() for scenario in scenarios]
+        # NUL never occurs in a keyword, so no match spans two scenarios
+        starts = []
+        offset = 0
+        for scenario in lowered:
+            starts.append(offset)
+            offset += len(scenario) + 1
+        matched = [set() for _ in scenarios]
+        for match in self.matcher.find("\0".join(lowered)):
+            matched[bisect.bisect_right(starts, match.start) - 1].update(match.values)
+        return [[self.requirements[position] for position in sorted(positions)
+                 if regulation_lower in self.regulations[position]]
+                for positions in matched]
+
+def _check_compliance(compliance_data: dict, scenario: str, regulation_type: str) -> dict:
+    """Collect the compliance requirements that apply to a scenario"""
+    rules = get_index("compliance_rules", compliance_data, _ComplianceRules)
+    applicable_requirements = rules.evaluate([scenario], regulation_type)[0]
+
+    if not applicable_requirements:
+        # Return available regulations if no matches
+        available_regulations = list(compliance_data.get("regulations", {}).keys())
         return {
             "status": "success",
             "scenario": scenario,
-            "regulation_filter": regulation_type if regulation_type else "all",
-            "total_requirements": len(applicable_requirements),
-            "compliance_summary": {
-                "critical_requirements": len(critical_requirements),
-                "standard_requirements": len(standard_requirements),
-                "recommended_requirements": len(recommended_requirements)
-            },
-            "critical_requirements": critical_requirements,
-            "standard_requirements": standard_requirements[:3],  # Top 3 standard
-            "recommended_requirements": recommended_requirements[:2],  # Top 2 recommended
-            "general_guidance": compliance_data.get("general_guidance", [])
+            "applicable_requirements": 0,
+            "available_regulations": available_regulations,
+            "general_guidance": compliance_data.get("general_guidance", []),
+            "suggestion": "Scenario may not have specific compliance requirements, or try rephrasing"
         }
+
+    # Group by compliance level
+    critical_requirements = [req for req in applicable_requirements if req["compliance_level"] == "critical"]
+    standard_requirements = [req for req in applicable_requirements if req["compliance_level"] == "standard"]
+    recommended_requirements = [req for req in applicable_requirements if req["compliance_level"] == "recommended"]
+
+    return {
+        "status": "success",
+        "scenario": scenario,
+        "regulation_filter": regulation_type if regulation_type else "all",
+        "total_requirements": len(applicable_requirements),
+        "compliance_summary": {
+            "critical_requirements": len(critical_requirements),
+            "standard_requirements": len(standard_requirements),
+            "recommended_requirements": len(recommended_requirements)
+        },
+        "critical_requirements": critical_requirements,
+        "standard_requirements": standard_requirements[:3],  # Top 3 standard
+        "recommended_requirements": recommended_requirements[:2],  # Top 2 recommended
+        "general_guidance": compliance_data.get("general_guidance", [])
+    }
+
+def check_compliance_batch(scenarios: List[str], regulation_type: str = "") -> dict:
+    """Check compliance requirements for many scenarios at once (e.g. a design review checklist).
+    
+    Args:
+        scenarios: Descriptions of the scenarios or actions to check
+        regulation_type: Specific regulation to check against (e.g., "GDPR", "SOX") (optional)
+    
+    Returns:
+        Dict: Applicable requirements per scenario and the combined mandatory actions
+    """
+    try:
+        compliance_data = loader.load_data("policies/compliance_docs.json")
+        return _check_compliance_batch(compliance_data, scenarios, regulation_type)
+    except Exception as e:
+        return {
+            "status": "error",
+            "error_message": f"Failed to check compliance: {str(e)}"
+        }
+
+@async_variant_of(check_compliance_batch)
+async def check_compliance_batch_async(scenarios: List[str], regulation_type: str = "") -> dict:
+    try:
+        compliance_data = await async_loader.load_data("policies/compliance_docs.json")
+        return _check_compliance_batch(compliance_data, scenarios, regulation_type)
     except Exception as e:
         return {
             "status": "error",
             "error_message": f"Failed to check compliance: {str(e)}"
         }
 
+# Order of requirements and their actions in batch results
+_COMPLIANCE_LEVEL_RANK = {"critical": 0, "standard": 1, "recommended": 2}
+
+def _check_compliance_batch(compliance_data: dict, scenarios: List[str], regulation_type: str) -> dict:
+    """Evaluate every scenario against the compiled rules, with requirement details given once"""
+    rules = get_index("compliance_rules", compliance_data, _ComplianceRules)
+    per_scenario = rules.evaluate(scenarios, regulation_type)
+
+    results = []
+    requirements = {}
+    for scenario, applicable in zip(scenarios, per_scenario):
+        levels = {"critical_requirements": 0, "standard_requirements": 0, "recommended_requirements": 0}
+        for req in applicable:
+            requirements[(req["regulation"], req["requirement_title"])] = req
+            if f"{req['compliance_level']}_requirements" in levels:
+                levels[f"{req['compliance_level']}_requirements"] += 1
+        results.append({
+            "scenario": scenario,
+            "total_requirements": len(applicable),
+            "compliance_summary": levels,
+            # Details are listed once under "requirements"
+            "requirements": [{"regulation": req["regulation"],
+                              "requirement_title": req["requirement_title"],
+                              "compliance_level": req["compliance_level"]} for req in applicable]
+        })
+
+    ordered = sorted(requirements.values(), key=lambda req: _COMPLIANCE_LEVEL_RANK.get(req["compliance_level"], 3))
+    mandatory_actions = list(dict.fromkeys(action for req in ordered for action in req["mandatory_actions"]))
+    prohibited_actions = list(dict.fromkeys(action for req in ordered for action in req["prohibited_actions"]))
+
+    return {
+        "status": "success",
+        "regulation_filter": regulation_type if regulation_type else "all",
+        "scenarios_checked": len(scenarios),
+        "scenarios_with_requirements": sum(1 for applicable in per_scenario if applicable),
+        "results": results,
+        "requirements": ordered,
+        "mandatory_actions": mandatory_actions,
+        "prohibited_actions": prohibited_actions,
+        "general_guidance": compliance_data.get("general_guidance", [])
+    }
+
 def find_guidelines(guideline_type: str, specific_topic: str = "") -> dict:
     """Find security guidelines and procedural documentation.
     
@@ -181,84 +316,97 @@ def find_guidelines(guideline_type: str, specific_topic: str = "") -> dict:
     """
     try:
         security_data = loader.load_data("policies/security_guidelines.json")
-        guideline_type_lower = guideline_type.lower()
-        topic_lower = specific_topic.lower() if specific_topic else ""
-        
-        # Find matching guideline category
-        matching_guidelines = []
-        for category, category_data in security_data.get("guidelines", {}).items():
-            # Check if category matches guideline type
-            if guideline_type_lower in category.lower() or guideline_type == "general":
-                for guideline in category_data.get("items", []):
-                    relevance_score = 0
-                    
-                    # If specific topic provided, check relevance
-                    if specific_topic:
-                        if topic_lower in guideline.get("title", "").lower():
-                            relevance_score += 3
-                        if topic_lower in guideline.get("description", "").lower():
-                            relevance_score += 2
-                        if any(topic_lower in tag.lower() for tag in guideline.get("tags", [])):
-                            relevance_score += 1
-                        
-                        # Skip if not relevant to specific topic
-                        if relevance_score == 0:
-                            continue
-                    else:
-                        relevance_score = 1  # Include all if no specific topic
-                    
-                    guideline_info = {
-                        "category": category,
-                        "title": guideline.get("title", ""),
-                        "description": guideline.get("description", ""),
-                        "requirements": guideline.get("requirements", []),
-                        "best_practices": guideline.get("best_practices", []),
-                        "common_violations": guideline.get("common_violations", []),
-                        "implementation_guide": guideline.get("implementation_guide", []),
-                        "severity": guideline.get("severity", "medium"),
-                        "compliance_frameworks": guideline.get("compliance_frameworks", []),
-                        "last_updated": guideline.get("last_updated", ""),
-                        "tags": guideline.get("tags", []),
-                        "relevance_score": relevance_score
-                    }
-                    matching_guidelines.append(guideline_info)
-        
-        # Sort by relevance
-        matching_guidelines.sort(key=lambda x: x["relevance_score"], reverse=True)
-        
-        if not matching_guidelines:
-            available_categories = list(security_data.get("guidelines", {}).keys())
-            return {
-                "status": "success",
-                "guideline_type": guideline_type,
-                "specific_topic": specific_topic,
-                "guidelines_found": 0,
-                "available_categories": available_categories,
-                "suggestion": "Try a different guideline type or topic from the available categories"
-            }
-        
-        # Group by severity for better organization
-        critical_guidelines = [g for g in matching_guidelines if g["severity"] == "critical"]
-        high_guidelines = [g for g in matching_guidelines if g["severity"] == "high"]
-        medium_guidelines = [g for g in matching_guidelines if g["severity"] == "medium"]
-        
+        return _find_guidelines(security_data, guideline_type, specific_topic)
+    except Exception as e:
         return {
-            "status": "success",
-            "guideline_type": guideline_type,
-            "specific_topic": specific_topic if specific_topic else "all topics",
-            "total_guidelines_found": len(matching_guidelines),
-            "severity_breakdown": {
-                "critical": len(critical_guidelines),
-                "high": len(high_guidelines),
-                "medium": len(medium_guidelines)
-            },
-            "critical_guidelines": critical_guidelines,
-            "high_priority_guidelines": high_guidelines[:3],  # Top 3 high priority
-            "standard_guidelines": medium_guidelines[:5],  # Top 5 standard
-            "general_security_principles": security_data.get("general_principles", [])
+            "status": "error",
+            "error_message": f"Failed to find guidelines: {str(e)}"
         }
+
+@async_variant_of(find_guidelines)
+async def find_guidelines_async(guideline_type: str, specific_topic: str = "") -> dict:
+    try:
+        security_data = await async_loader.load_data("policies/security_guidelines.json")
+        return _find_guidelines(security_data, guideline_type, specific_topic)
     except Exception as e:
         return {
             "status": "error",
             "error_message": f"Failed to find guidelines: {str(e)}"
         }
+
+def _guideline_index(security_data: dict) -> SearchIndex:
+    """Index security guidelines of every category by title, description and tags"""
+    guidelines = [(category, guideline)
+                  for category, category_data in security_data.get("guidelines", {}).items()
+                  for guideline in category_data.get("items", [])]
+    return SearchIndex([{
+        "title": guideline.get("title", ""),
+        "description": guideline.get("description", ""),
+        "tags": guideline.get("tags", [])
+    } for _, guideline in guidelines], {"title": 3, "description": 2, "tags": 1}, items=guidelines)
+
+def _find_guidelines(security_data: dict, guideline_type: str, specific_topic: str) -> dict:
+    """Collect security guidelines for a guideline type and topic"""
+    guideline_type_lower = guideline_type.lower()
+    index = get_index("security_guidelines", security_data, _guideline_index)
+
+    # Check if category matches guideline type
+    def in_type(position: int) -> bool:
+        return guideline_type_lower in index.items[position][0].lower() or guideline_type == "general"
+
+    if specific_topic:
+        # Only guidelines relevant to the specific topic, best first
+        hits, _ = index.search(specific_topic, where=in_type)
+        selected = [(hit.position, hit.score) for hit in hits]
+    else:
+        selected = [(position, 1) for position in range(index.size) if in_type(position)]  # Include all if no specific topic
+
+    matching_guidelines = []
+    for position, relevance_score in selected:
+        category, guideline = index.items[position]
+        matching_guidelines.append({
+            "category": category,
+            "title": guideline.get("title", ""),
+            "description": guideline.get("description", ""),
+            "requirements": guideline.get("requirements", []),
+            "best_practices": guideline.get("best_practices", []),
+            "common_violations": guideline.get("common_violations", []),
+            "implementation_guide": guideline.get("implementation_guide", []),
+            "severity": guideline.get("severity", "medium"),
+            "compliance_frameworks": guideline.get("compliance_frameworks", []),
+            "last_updated": guideline.get("last_updated", ""),
+            "tags": guideline.get("tags", []),
+            "relevance_score": relevance_score
+        })
+
+    if not matching_guidelines:
+        available_categories = list(security_data.get("guidelines", {}).keys())
+        return {
+            "status": "success",
+            "guideline_type": guideline_type,
+            "specific_topic": specific_topic,
+            "guidelines_found": 0,
+            "available_categories": available_categories,
+            "suggestion": "Try a different guideline type or topic from the available categories"
+        }
+
+    # Group by severity for better organization
+    critical_guidelines = [g for g in matching_guidelines if g["severity"] == "critical"]
+    high_guidelines = [g for g in matching_guidelines if g["severity"] == "high"]
+    medium_guidelines = [g for g in matching_guidelines if g["severity"] == "medium"]
+
+    return {
+        "status": "success",
+        "guideline_type": guideline_type,
+        "specific_topic": specific_topic if specific_topic else "all topics",
+        "total_guidelines_found": len(matching_guidelines),
+        "severity_breakdown": {
+            "critical": len(critical_guidelines),
+            "high": len(high_guidelines),
+            "medium": len(medium_guidelines)
+        },
+        "critical_guidelines": critical_guidelines,
+        "high_priority_guidelines": high_guidelines[:3],  # Top 3 high priority
+        "standard_guidelines": medium_guidelines[:5],  # Top 5 standard
+        "general_security_principles": security_data.get("general_principles", [])
+    }
\ No newline at end of file
@@ -0,0 +1,467 @@
+"""
+Deterministic fast-path router in front of the onboarding orchestrator
+Keyword rules plus a TF-IDF nearest-centroid model trained on the routing
+examples below classify each new user query locally. Its confidence is a
+logistic model of the similarity evidence fitted on separate, held-out
+calibration examples, so it estimates how often such a route is right. When
+the classifier is confident, the orchestrator's model call is replaced by the
+transfer to the specialist (or, for a plain "ticket 42" lookup, by the ticket
+tool call), saving a full model round trip. Everything else reaches the model
+as before.
+"""
+
+import os
+import re
+import math
+import time
+import threading
+from collections import Counter, namedtuple
+from typing import Any, Dict, List, Optional
+
+from google.adk.models import LlmResponse
+from google.genai import types
+
+# Class for queries the orchestrator answers itself (greetings, ticket searches)
+ORCHESTRATOR = "onboarding_orchestrator"
+
+# Agent name -> example queries; mirrors the routing guidance in agent.py
+ROUTING_EXAMPLES: Dict[str, List[str]] = {
+    "codebase_navigator": [
+        "How does user authentication work in our system?",
+        "What are the dependencies for the payment gateway?",
+        "What breaks if Redis goes down?",
+        "How does the frontend dashboard end up depending on PostgreSQL?",
+        "Show me the best practices for Python development standards",
+        "How do I understand this codebase structure?",
+        "Where is the code for the user service?",
+        "Which modules depend on the auth service?",
+        "What tech stack do we use for the frontend?",
+        "Explain the architecture of the payment service",
+        "Is this code following our coding standards?",
+        "Find the function that validates JWT tokens in the repository",
+        "What database and cache does our backend use?",
+        "Show me the module dependency graph",
+    ],
+    "documentation_assistant": [
+        "Where can I find the API documentation for payments?",
+        "Show me tutorials on our authentication system",
+        "Find wiki pages about deployment process of pipelines",
+        "Where are the docs for the user API endpoints?",
+        "Is there a how-to guide for setting up the local environment?",
+        "Find the design doc for the notification service",
+        "Show me the API reference for the orders endpoint",
+        "Where is the onboarding wiki?",
+        "Find documentation about our release process",
+        "Is there a tutorial for writing integration tests?",
+        "Show me the technical specification for the search service",
+    ],
+    "troubleshooting_copilot": [
+        "I'm getting a database connection refused error",
+        "ModuleNotFoundError when importing auth module",
+        "How do I fix JWT token expired errors?",
+        "My CI build failed, the log is at /tmp/build.log",
+        "I'm getting a build error",
+        "Docker container keeps crashing on startup",
+        "npm install fails with permission denied",
+        "Tests are failing with a timeout exception",
+        "My local environment won't start, port already in use",
+        "Getting a 500 internal server error from the API",
+        "Kubernetes pod stuck in CrashLoopBackOff",
+        "How do I debug this stack trace?",
+        "Run a health check on my development environment",
+    ],
+    "policy_guide": [
+        "What's the PTO policy?",
+        "What's our vacation policy?",
+        "What are the security requirements for handling customer data?",
+        "Show me password security guidelines",
+        "What health insurance benefits do we have?",
+        "What is the remote work policy?",
+        "How does the 401k retirement plan work?",
+        "What are the GDPR compliance requirements?",
+        "What is our code of conduct?",
+        "How many sick days do I get?",
+        "What's the parental leave policy?",
+        "What are the rules for expense reimbursement?",
+        "Which security training is mandatory?",
+    ],
+    "team_integrator": [
+        "Who should I talk to about authentication issues?",
+        "Find team members with Python expertise",
+        "Show me the Backend Authentication Team structure",
+        "Find someone who knows about Docker",
+        "Schedule an intro with Jenifer Lu",
+        "Find an hour this week for my intro loop with Mike Rodriguez and Alice Chen",
+        "Who is my manager?",
+        "Who is on the payments team?",
+        "Set up a meeting with my onboarding buddy",
+        "Who leads the infrastructure team?",
+        "What is the team culture like on the data engineering team?",
+        "Who is the expert on Kubernetes?",
+    ],
+    ORCHESTRATOR: [
+        "Hi! What can you help me with?",
+        "Hello",
+        "Hey there, I'm new here",
+        "What can you do?",
+        "Show me recent tickets about authentication issues",
+        "Show me all open tickets",
+        "Show me all critical priority tickets",
+        "What tickets has Bob Johnson reported?",
+        "Give me ticket statistics and summary",
+        "Find all repositories created by Mahesh5h9",
+        "Get issues of a GitHub repo",
+        "Search the web for the latest React release",
+        "Thanks!",
+    ],
+}
+
+# Held-out (query, correct class) pairs the confidence is calibrated on; none
+# of them are training examples. They include queries whose keywords point to
+# the wrong specialist, so a lone keyword does not make a route look certain.
+CALIBRATION_EXAMPLES: List[tuple] = [
+    ("Which services call the billing module?", "codebase_navigator"),
+    ("What framework does the backend use?", "codebase_navigator"),
+    ("How is the notification service structured?", "codebase_navigator"),
+    ("What are our Python coding standards?", "codebase_navigator"),
+    ("Which libraries does the search service depend on?", "codebase_navigator"),
+    ("Where do I find the docs for the billing API?", "documentation_assistant"),
+    ("Is there a wiki page on feature flags?", "documentation_assistant"),
+    ("Show me the tutorial for our deployment pipeline", "documentation_assistant"),
+    ("Where is the API reference for user profiles?", "documentation_assistant"),
+    ("Find the design doc for the payments service", "documentation_assistant"),
+    ("My tests fail with a connection timeout", "troubleshooting_copilot"),
+    ("Getting ImportError: cannot import name config", "troubleshooting_copilot"),
+    ("The app crashes when I start it locally", "troubleshooting_copilot"),
+    ("Postgres connection refused on my laptop", "troubleshooting_copilot"),
+    ("Why does my Docker build keep failing?", "troubleshooting_copilot"),
+    ("How much vacation do new hires get?", "policy_guide"),
+    ("What is the policy on working from home?", "policy_guide"),
+    ("Do we get dental insurance?", "policy_guide"),
+    ("What are the rules for handling customer personal data?", "policy_guide"),
+    ("How do I file an expense reimbursement?", "policy_guide"),
+    ("Who knows the most about Kafka?", "team_integrator"),
+    ("Who is on the platform team?", "team_integrator"),
+    ("Book a meeting with Alice Chen next week", "team_integrator"),
+    ("Who should I ask about the payment gateway?", "team_integrator"),
+    ("Who is the manager of the frontend team?", "team_integrator"),
+    ("Hi there!", ORCHESTRATOR),
+    ("Show me open tickets assigned to me", ORCHESTRATOR),
+    ("Thanks, that helps", ORCHESTRATOR),
+    # Keywords of one specialist, question for another (or for the orchestrator)
+    ("What happens if my visa application fails?", "policy_guide"),
+    ("Can I take leave to attend a conference about Kubernetes errors?", "policy_guide"),
+    ("I want to leave early on Friday", ORCHESTRATOR),
+    ("What is the dress code?", "policy_guide"),
+    ("Is the error budget policy documented anywhere?", "documentation_assistant"),
+    ("Who decides the architecture of new services?", "team_integrator"),
+    ("Which team owns the failing payment module?", "team_integrator"),
+    ("How do I request a new laptop?", ORCHESTRATOR),
+    ("What should I do in my first week?", ORCHESTRATOR),
+    ("Where do I park at the office?", ORCHESTRATOR),
+    ("My badge failed at the front door", ORCHESTRATOR),
+    ("How do I schedule time off for a doctor's appointment?", "policy_guide"),
+]
+
+# Strong cues per class; a query hitting the cues of several specialists is
+# treated as cross-domain and always goes to the orchestrator
+KEYWORD_RULES: Dict[str, str] = {
+    "codebase_navigator": r"\b(?:codebase|repository structure|architecture|dependenc(?:y|ies)|depends? on|tech(?:nology)? stack|best practices?|coding standards?|modules?)\b",
+    "documentation_assistant": r"\b(?:docs?|documentation|wiki|tutorials?|how-to|api reference|design doc|spec(?:ification)?s?)\b",
+    "troubleshooting_copilot": r"\b(?:errors?|exceptions?|fail(?:s|ed|ing|ure)?|crash(?:es|ing)?|broken|debug|stack ?trace|traceback|refused|timeout|\w+Error)\b",
+    "policy_guide": r"\b(?:polic(?:y|ies)|pto|vacation|benefits?|insurance|401k|retirement|leave|gdpr|compliance|code of conduct|reimbursement|sick days?)\b",
+    "team_integrator": r"\b(?:who(?:'s| is| should)|team members?|manager|buddy|schedule|meeting|intro(?: loop)?|expertise|knows about|talk to)\b",
+    ORCHESTRATOR: r"\b(?:tickets?|github|search the web|hi|hello|hey|thanks?)\b",
+}
+
+# "show ticket 42", "what's the status of ticket #7"
+_TICKET_LOOKUP = re.compile(
+    r"^\s*(?:(?:please\s+)?(?:show|get|open|find|fetch|look up|lookup|what(?:'s| is)|details (?:of|for)|status of)\s+(?:me\s+)?(?:the\s+)?)*"
+    r"(?:status of\s+)?ticket\s*(?:id\s*)?#?\s*(\d+)\s*[?.!]?\s*$",
+    re.IGNORECASE
+)
+TICKET_LOOKUP_TOOL = "get-ticket-by-id"
+
+# Bonus added to the similarity of the class whose keyword rule fired, when
+# picking the class (the confidence is calibrated separately)
+_RULE_WEIGHT = 0.35
+# L2 penalty of the calibration fit, keeping a few examples from making it extreme
+_CALIBRATION_PENALTY = 0.1
+
+_WORD = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be can do does for from how i in is it me my of on or our show the this to "
+    "we what when where which with you your".split()
+)
+
+
+def _terms(text: str) -> List[str]:
+    """Lowercased words without stopwords, plural s stripped"""
+    terms = []
+    for word in _WORD.findall(text.lower()):
+        if word in _STOPWORDS:
+            continue
+        if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        terms.append(word)
+    return terms
+
+
+# Classification of one query: fast_path is True when it may skip the
+# orchestrator, to agent or, with tool_call (name, args) set, to that tool
+Route = namedtuple('Route', ['agent', 'confidence', 'method', 'fast_path', 'tool_call', 'scores'])
+
+
+class QueryRouter:
+    """Keyword rules plus a TF-IDF nearest-centroid classifier over routing examples"""
+
+    def __init__(self, examples: Dict[str, List[str]] = None, rules: Dict[str, str] = None,
+                 min_confidence: float = 0.75, calibration: List[tuple] = None):
+        """
+        Train the classifier and calibrate its confidence
+
+        Args:
+            examples: Class (agent name) -> example queries
+            rules: Class -> keyword regex
+            min_confidence: Confidence a specialist route needs to skip the orchestrator
+            calibration: Held-out (query, correct class) pairs, not among examples
+        """
+        examples = examples or ROUTING_EXAMPLES
+        self.min_confidence = min_confidence
+        self.classes = list(examples)
+        self.rules = {name: re.compile(pattern, re.IGNORECASE)
+                      for name, pattern in (rules or KEYWORD_RULES).items()}
+
+        documents = [(name, Counter(_terms(text))) for name, texts in examples.items() for text in texts]
+        document_frequency = Counter(term for _, counts in documents for term in counts)
+        self.idf = {term: math.log((1 + len(documents)) / (1 + count)) + 1.0
+                    for term, count in document_frequency.items()}
+        # Weight of a query word no example has, so unexplained words lower the similarity
+        self.unseen_idf = math.log(1 + len(documents)) + 1.0
+
+        # Class centroid: normalized mean of its normalized example vectors
+        self.centroids: Dict[str, Dict[str, float]] = {}
+        for name in self.classes:
+            centroid = Counter()
+            for label, counts in documents:
+                if label == name:
+                    centroid.update(self._vector(counts))
+            self.centroids[name] = self._normalized(centroid)
+
+        self.coefficients = self._calibrate(calibration or CALIBRATION_EXAMPLES)
+
+    def _vector(self, counts: Counter) -> Dict[str, float]:
+        return self._normalized({term: (1 + math.log(count)) * self.idf.get(term, self.unseen_idf)
+                                 for term, count in counts.items()})
+
+    @staticmethod
+    def _normalized(vector: Dict[str, float]) -> Dict[str, float]:
+        norm = math.sqrt(sum(value * value for value in vector.values()))
+        return {term: value / norm for term, value in vector.items()} if norm else {}
+
+    def _evidence(self, query: str):
+        """
+        Class scores of a query and the features its confidence is computed from
+
+        Returns:
+            Tuple: (agent, scores, keyword rule hits, features), features being
+                [1, similarity to the agent's centroid, its margin over the
+                next class, 1 if the agent's keyword rule fired]
+        """
+        vector = self._vector(Counter(_terms(query)))
+        hits = [name for name, pattern in self.rules.items() if pattern.search(query)]
+        similarities = {name: sum(weight * self.centroids[name].get(term, 0.0) for term, weight in vector.items())
+                        for name in self.classes}
+        scores = {name: similarity + (_RULE_WEIGHT if name in hits else 0.0)
+                  for name, similarity in similarities.items()}
+        agent = max(scores, key=scores.get)
+        runner_up = max((similarity for name, similarity in similarities.items() if name != agent), default=0.0)
+        features = [1.0, similarities[agent], similarities[agent] - runner_up, 1.0 if agent in hits else 0.0]
+        return agent, scores, hits, features
+
+    def _calibrate(self, calibration: List[tuple]) -> List[float]:
+        """
+        Fit P(route is correct) = sigmoid(coefficients . features) on held-out
+        examples (L2-regularized logistic regression, Newton's method)
+        """
+        samples = []
+        for query, label in calibration:
+            agent, _, _, features = self._evidence(query)
+            samples.append((features, 1.0 if agent == label else 0.0))
+        size = len(samples[0][0]) if samples else 4
+        coefficients = [0.0] * size
+        for _ in range(25):
+            gradient = [_CALIBRATION_PENALTY * value for value in coefficients]
+            gradient[0] = 0.0
+            hessian = [[_CALIBRATION_PENALTY if i == j and i else 0.0 for j in range(size)] for i in range(size)]
+            for features, correct in samples:
+                predicted = _sigmoid(sum(c * x for c, x in zip(coefficients, features)))
+                for i in range(size):
+                    gradient[i] += (predicted - correct) * features[i]
+                    for j in range(size):
+                        hessian[i][j] += predicted * (1 - predicted) * features[i] * features[j]
+            step = _solve(hessian, gradient)
+            coefficients = [c - d for c, d in zip(coefficients, step)]
+            if max(abs(d) for d in step) < 1e-9:
+                break
+        return coefficients
+
+    def confidence(self, features: List[float]) -> float:
+        """Calibrated probability that the route the features describe is correct"""
+        return _sigmoid(sum(c * x for c, x in zip(self.coefficients, features)))
+
+    def classify(self, query: str) -> Route:
+        """
+        Route a user query
+
+        Returns:
+            Route: Target, confidence in [0, 1] and the method that decided
+        """
+        lookup = _TICKET_LOOKUP.match(query)
+        if lookup:
+            return Route(ORCHESTRATOR, 1.0, "ticket_lookup", True,
+                         (TICKET_LOOKUP_TOOL, {"ticket_id": int(lookup.group(1))}), {})
+
+        agent, scores, hits, features = self._evidence(query)
+        confidence = self.confidence(features)
+        rounded = {name: round(score, 3) for name, score in scores.items()}
+
+        specialists_hit = [name for name in hits if name != ORCHESTRATOR]
+        if len(specialists_hit) > 1:
+            return Route(ORCHESTRATOR, confidence, "cross_domain", False, None, rounded)
+        if agent == ORCHESTRATOR or ORCHESTRATOR in hits:
+            return Route(ORCHESTRATOR, confidence, "orchestrator", False, None, rounded)
+        if not features[1] and not hits:
+            return Route(ORCHESTRATOR, 0.0, "no_signal", False, None, rounded)
+        fast_path = confidence >= self.min_confidence
+        return Route(agent, confidence, "classifier" if fast_path else "low_confidence", fast_path, None, rounded)
+
+
+def _sigmoid(value: float) -> float:
+    if value < -60:
+        return 0.0
+    return 1.0 / (1.0 + math.exp(-value))
+
+
+def _solve(matrix: List[List[float]], vector: List[float]) -> List[float]:
+    """Solve matrix . x = vector by Gaussian elimination with partial pivoting"""
+    size = len(vector)
+    rows = [row[:] + [value] for row, value in zip(matrix, vector)]
+    for column in range(size):
+        pivot = max(range(column, size), key=lambda row: abs(rows[row][column]))
+        rows[column], rows[pivot] = rows[pivot], rows[column]
+        if abs(rows[column][column]) < 1e-12:
+            continue
+        for row in range(column + 1, size):
+            factor = rows[row][column] / rows[column][column]
+            for k in range(column, size + 1):
+                rows[row][k] -= factor * rows[column][k]
+    solution = [0.0] * size
+    for row in reversed(range(size)):
+        if abs(rows[row][row]) < 1e-12:
+            continue
+        solution[row] = (rows[row][size] - sum(rows[row][k] * solution[k] for k in range(row + 1, size))) / rows[row][row]
+    return solution
+
+
+class RoutingMetrics:
+    """Thread-safe counters of routing decisions"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._decisions = Counter()
+        self._fast_path = Counter()
+        self._queries = 0
+        self._classify_seconds = 0.0
+
+    def record(self, route: Route, seconds: float, taken: bool) -> None:
+        with self._lock:
+            self._queries += 1
+            self._classify_seconds += seconds
+            # A fast path the request could not take (e.g. tool not loaded) counts as unavailable
+            self._decisions[route.method if taken or not route.fast_path else "fast_path_unavailable"] += 1
+            if taken:
+                self._fast_path[TICKET_LOOKUP_TOOL if route.tool_call else route.agent] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            fast = sum(self._fast_path.values())
+            return {
+                "queries": self._queries,
+                "fast_path": fast,
+                "fast_path_rate": round(fast / self._queries, 3) if self._queries else 0.0,
+                "fast_path_targets": dict(self._fast_path),
+                "decisions": dict(self._decisions),
+                "avg_classify_ms": round(1000 * self._classify_seconds / self._queries, 3) if self._queries else 0.0
+            }
+
+
+_router: Optional[QueryRouter] = None
+_router_lock = threading.Lock()
+_metrics = RoutingMetrics()
+
+
+def get_router() -> QueryRouter:
+    """Process-wide router, thresholds from ROUTER_MIN_CONFIDENCE"""
+    global _router
+    if _router is None:
+        with _router_lock:
+            if _router is None:
+                _router = QueryRouter(min_confidence=float(os.getenv('ROUTER_MIN_CONFIDENCE', 0.75)))
+    return _router
+
+
+def routing_metrics() -> Dict[str, Any]:
+    """Counts of routing decisions, fast paths taken per target and classification time"""
+    return _metrics.snapshot()
+
+
+def _new_user_query(callback_context, llm_request) -> Optional[str]:
+    """Text of the user message when this is the first model call of the turn"""
+    contents = getattr(llm_request, "contents", None) or []
+    if not contents or contents[-1].role != "user":
+        return None
+    parts = contents[-1].parts or []
+    if any(part.function_response for part in parts):
+        return None
+    text = "".join(part.text or "" for part in parts).strip()
+    user_content = getattr(callback_context, "user_content", None)
+    if user_content is not None:
+        expected = "".join(part.text or "" for part in (user_content.parts or [])).strip()
+        if expected != text:
+            return None
+    return text or None
+
+
+def fast_path_router(callback_context, llm_request) -> Optional[LlmResponse]:
+    """
+    before_model_callback for the orchestrator
+
+    Answers the first model call of a turn with the function call the model
+    would have made when the router is confident: transfer_to_agent to the
+    specialist, or the ticket lookup tool. Returns None (call the model)
+    otherwise, and always when FAST_PATH_ROUTING is false.
+    """
+    if os.getenv('FAST_PATH_ROUTING', 'true').lower() != 'true':
+        return None
+    query = _new_user_query(callback_context, llm_request)
+    if query is None:
+        return None
+
+    started = time.perf_counter()
+    route = get_router().classify(query)
+    available = getattr(llm_request, "tools_dict", {}) or {}
+    if route.tool_call:
+        call = route.tool_call
+    else:
+        call = ("transfer_to_agent", {"agent_name": route.agent})
+    taken = route.fast_path and call[0] in available
+    _metrics.record(route, time.perf_counter() - started, taken)
+    if not taken:
+        return None
+
+    name, args = call
+    return LlmResponse(content=types.Content(
+        role="model",
+        parts=[types.Part(function_call=types.FunctionCall(name=name, args=args))]
+    ))
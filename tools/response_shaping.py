@@ -0,0 +1,384 @@
+"""
+Compact, budgeted tool responses for the agents
+Tools registered through shaped_tools() return a summary by default: item
+lists projected to their key fields, long texts and lists cut, deep nesting
+collapsed, and the whole payload held under a byte budget. What was left out
+is listed under "truncated", and the full result stays available to the
+expand_result tool under "result_id", kept in the calling session's state so
+one user's results are never handed to another session. Callers of the tool functions
+themselves (scripts, the cohort pipeline) still get complete results.
+Following ADK patterns for tool implementation
+"""
+
+import os
+import re
+import json
+import inspect
+import secrets
+import functools
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Item fields kept in summaries, per tool and item list; lists not named
+# here keep their items' scalar fields
+SUMMARY_FIELDS: Dict[str, Dict[str, Tuple[str, ...]]] = {
+    "search_codebase": {
+        "repositories": ("repo_name", "description", "language", "team"),
+        "code_snippets": ("file", "function"),
+    },
+    "search_policies": {
+        "matching_policies": ("title", "category", "description"),
+    },
+    # Guidelines and requirements are already grouped by severity
+    "find_guidelines": {
+        "critical_guidelines": ("title", "description"),
+        "high_priority_guidelines": ("title", "description"),
+        "standard_guidelines": ("title", "description"),
+    },
+    "check_compliance": {
+        "critical_requirements": ("requirement_title", "regulation", "description"),
+        "standard_requirements": ("requirement_title", "regulation", "description"),
+        "recommended_requirements": ("requirement_title", "regulation", "description"),
+    },
+    "find_solutions": {
+        "top_solutions": ("title", "estimated_time", "description"),
+    },
+    "find_wiki_content": {
+        "main_pages": ("title", "url", "summary"),
+        "related_pages": ("title", "url"),
+    },
+    "find_team_member": {
+        "matching_members": ("name", "role", "team", "email", "expertise"),
+    },
+    "get_team_info": {
+        "teams": ("name", "manager", "size"),
+    },
+    "run_diagnostics": {
+        "checks_performed": ("name", "status", "message"),
+    },
+}
+
+# Summaries cut texts and plain lists to these lengths and show nested
+# objects this deep, replacing deeper ones by their keys; the depth is
+# lowered further while a summary is over budget
+_SUMMARY_TEXT_CHARS = 200
+_SUMMARY_LIST_ITEMS = 5
+_SUMMARY_DEPTH = 3
+
+# Full results kept for expand_result per session, oldest dropped first; they
+# live in the session state, so this also bounds what each session persists
+_MAX_STORED_RESULTS = 16
+# Session state key of the stored results
+RESULTS_STATE_KEY = "shaped_results"
+
+_INDEX = re.compile(r'\[(\d+)\]')
+
+
+def _size(value: Any) -> int:
+    return len(json.dumps(value, default=str))
+
+
+def _budget(detail: bool) -> int:
+    if detail:
+        return int(os.getenv('TOOL_RESPONSE_DETAIL_BYTES', 6000))
+    return int(os.getenv('TOOL_RESPONSE_SUMMARY_BYTES', 800))
+
+
+def _is_items(value: Any) -> bool:
+    return isinstance(value, list) and bool(value) and all(isinstance(item, dict) for item in value)
+
+
+def _parse_fields(fields: str) -> List[str]:
+    return [name.strip() for name in (fields or "").split(",") if name.strip()]
+
+
+class _ResultStore:
+    """Full tool results by result id, in one session's state
+
+    ADK records a state change only when a key is assigned, so every put
+    writes a new mapping; insertion order (kept through JSON) is the age.
+    """
+
+    def __init__(self, state, max_entries: int = _MAX_STORED_RESULTS):
+        self.state = state
+        self.max_entries = max_entries
+
+    def put(self, tool_name: str, result: Any) -> str:
+        result_id = secrets.token_hex(4)
+        results = dict(self.state.get(RESULTS_STATE_KEY) or {})
+        results[result_id] = {"tool": tool_name, "result": result}
+        for stale in list(results)[:-self.max_entries]:
+            del results[stale]
+        self.state[RESULTS_STATE_KEY] = results
+        return result_id
+
+    def get(self, result_id: str) -> Optional[Tuple[str, Any]]:
+        stored = (self.state.get(RESULTS_STATE_KEY) or {}).get(result_id)
+        return (stored["tool"], stored["result"]) if stored is not None else None
+
+
+def _session_store(tool_context) -> Optional[_ResultStore]:
+    """Result store of the session a tool call belongs to (None outside a session)"""
+    state = getattr(tool_context, "state", None)
+    return _ResultStore(state) if state is not None else None
+
+
+class _Shaper:
+    """One shaping pass over a tool result, noting what it leaves out"""
+
+    def __init__(self, summary_fields: Dict[str, Tuple[str, ...]], wanted: List[str], detail: bool,
+                 max_depth: int = _SUMMARY_DEPTH):
+        self.summary_fields = summary_fields
+        self.wanted = wanted
+        self.detail = detail
+        self.max_depth = max_depth
+        self.truncated: Dict[str, str] = {}
+
+    def value(self, value: Any, path: str, depth: int) -> Any:
+        if isinstance(value, str):
+            return self.text(value, path)
+        if _is_items(value):
+            return self.items(value, path, depth)
+        if isinstance(value, list):
+            if not self.detail and len(value) > _SUMMARY_LIST_ITEMS:
+                self.truncated[path] = (f"cut to {_SUMMARY_LIST_ITEMS} entries" if "[]" in path
+                                        else f"{_SUMMARY_LIST_ITEMS} of {len(value)} entries")
+                value = value[:_SUMMARY_LIST_ITEMS]
+            return [self.value(entry, f"{path}[{index}]", depth + 1) for index, entry in enumerate(value)]
+        if isinstance(value, dict):
+            if not self.detail and depth >= self.max_depth:
+                self.truncated[path] = "nested object, keys only"
+                return sorted(value)
+            return {key: self.value(entry, f"{path}.{key}" if path else key, depth + 1)
+                    for key, entry in value.items()}
+        return value
+
+    def text(self, text: str, path: str) -> str:
+        if self.detail or len(text) <= _SUMMARY_TEXT_CHARS:
+            return text
+        self.truncated[path] = (f"texts cut at {_SUMMARY_TEXT_CHARS} characters" if "[]" in path
+                                else f"text cut at {_SUMMARY_TEXT_CHARS} of {len(text)} characters")
+        return text[:_SUMMARY_TEXT_CHARS].rstrip() + "..."
+
+    def items(self, items: List[Dict[str, Any]], path: str, depth: int) -> List[Dict[str, Any]]:
+        """Project each item to the requested, summary or (in detail mode) all fields"""
+        key = path.rsplit(".", 1)[-1]
+        if self.wanted:
+            keep = self.wanted
+        elif not self.detail and key in self.summary_fields:
+            keep = self.summary_fields[key]
+        elif not self.detail:
+            keep = [name for name, value in items[0].items()
+                    if not isinstance(value, (dict, list)) or (
+                        isinstance(value, list) and len(value) <= _SUMMARY_LIST_ITEMS
+                        and not any(isinstance(entry, (dict, list)) for entry in value))]
+        else:
+            keep = None
+        projected = []
+        left_out = set()
+        for index, item in enumerate(items):
+            if keep is not None:
+                left_out.update(name for name in item if name not in keep)
+                item = {name: item[name] for name in keep if name in item}
+            # Items are never collapsed to their keys; projection already trimmed them
+            # Notes on item fields are shared by all items, as "<list>[].<field>"
+            projected.append({name: self.value(value, f"{path}[].{name}", depth + 1)
+                              for name, value in item.items()})
+        if left_out:
+            self.truncated[f"{path}[]"] = "fields left out: " + ", ".join(sorted(left_out))
+        return projected
+
+    def fit(self, shaped: Dict[str, Any], original: Dict[str, Any], budget: int) -> Dict[str, Any]:
+        """Drop trailing items of the largest lists until the payload fits the budget"""
+        while _size({**shaped, "truncated": self.truncated}) > budget:
+            lists = [(_size(value), key) for key, value in shaped.items()
+                     if isinstance(value, list) and len(value) > 1]
+            if not lists:
+                break
+            _, key = max(lists)
+            shaped[key] = shaped[key][:-1]
+            total = len(original[key]) if isinstance(original.get(key), list) else len(shaped[key]) + 1
+            self.truncated[key] = f"{len(shaped[key])} of {total} items (byte budget)"
+        return shaped
+
+
+def shape_response(tool_name: str, result: Any, detail: bool = False, fields: str = "",
+                   max_bytes: Optional[int] = None, store: Optional[_ResultStore] = None) -> Any:
+    """
+    Compact a tool result for an agent
+
+    Args:
+        tool_name: Tool that produced the result (selects SUMMARY_FIELDS)
+        result: Tool result
+        detail: Keep complete items instead of summaries
+        fields: Comma-separated item fields to keep (overrides the summary fields)
+        max_bytes: Budget for the JSON payload (default: TOOL_RESPONSE_SUMMARY_BYTES,
+            or TOOL_RESPONSE_DETAIL_BYTES in detail mode)
+        store: Session result store the full result is kept in for expand_result
+            (without one the summary has no result_id)
+
+    Returns:
+        The result, unchanged if nothing had to be left out or the summary is
+        not smaller, otherwise the compacted result with "truncated" notes
+        and a "result_id" for expand_result
+    """
+    if not isinstance(result, dict) or result.get("status") == "error":
+        return result
+    budget = max_bytes or _budget(detail)
+    wanted = _parse_fields(fields)
+    best = None
+    for max_depth in range(_SUMMARY_DEPTH, 0, -1):
+        shaper = _Shaper(SUMMARY_FIELDS.get(tool_name, {}), wanted, detail, max_depth)
+        shaped = shaper.value(result, "", 0)
+        if wanted and not any(_is_items(value) for value in result.values()):
+            # No item lists to project: the fields select top-level keys
+            shaped = {key: value for key, value in shaped.items() if key in wanted or key == "status"}
+            shaper.truncated.update((key, "not requested") for key in result if key not in shaped)
+        shaped = shaper.fit(shaped, result, budget)
+        size = _size({**shaped, "truncated": shaper.truncated})
+        if best is None or size < best[0]:
+            best = (size, shaped, shaper)
+        if detail or size <= budget:
+            break
+    size, shaped, shaper = best
+    if not shaper.truncated:
+        return result
+
+    first_list = next((key for key, value in shaped.items() if _is_items(value)), None)
+    shaped["truncated"] = shaper.truncated
+    expand_with = (f"expand_result(result_id, item='{first_list}.0')" if first_list
+                   else "expand_result(result_id, item='<key>')")
+    # Keep the full result when the summary, with its notes, would not be smaller
+    if not wanted and _size({**shaped, "result_id": "0" * 8, "expand_with": expand_with}) >= _size(result):
+        return result
+    if store is not None:
+        shaped["result_id"] = store.put(tool_name, result)
+        shaped["expand_with"] = expand_with
+    return shaped
+
+
+def _resolve(value: Any, item: str) -> Any:
+    """Part of a result at a dotted path such as "top_solutions.0.steps" or "teams[1]" """
+    for step in _INDEX.sub(r'.\1', item).strip(".").split("."):
+        if not step:
+            continue
+        if isinstance(value, list):
+            value = value[int(step)]
+        elif isinstance(value, dict):
+            value = value[step]
+        else:
+            raise KeyError(step)
+    return value
+
+
+def expand_result(result_id: str, item: str = "", fields: str = "", tool_context=None) -> dict:
+    """Get the full content of a summarized tool result, or of one item in it.
+
+    Args:
+        result_id: The result_id of an earlier, summarized tool response
+        item: Path of the part to expand, e.g. "matching_policies.0" or "databases.redis" (optional, default: whole result)
+        fields: Comma-separated fields to return from the item(s) (optional)
+        tool_context: Injected by ADK; results are looked up in this session only
+
+    Returns:
+        Dict: The requested content in full, within the detail byte budget
+    """
+    try:
+        store = _session_store(tool_context)
+        stored = store.get(result_id.strip()) if store is not None else None
+        if stored is None:
+            return {
+                "status": "error",
+                "error_message": f"Result '{result_id}' is no longer available; call the original tool again"
+            }
+        tool_name, result = stored
+        try:
+            content = _resolve(result, item)
+        except (KeyError, IndexError, ValueError):
+            keys = list(result) if isinstance(result, dict) else []
+            return {
+                "status": "error",
+                "error_message": f"No item '{item}' in result '{result_id}'",
+                "available_keys": keys
+            }
+        wanted = _parse_fields(fields)
+        if wanted and isinstance(content, dict):
+            content = {key: content[key] for key in wanted if key in content}
+            fields = ""
+        return shape_response(tool_name, {"status": "success", "result_id": result_id, "item": item,
+                                          "content": content}, detail=True, fields=fields, store=store)
+    except Exception as e:
+        return {
+            "status": "error",
+            "error_message": f"Failed to expand result: {str(e)}"
+        }
+
+
+_SHAPING_ARGS = (
+    'detail: Return complete items instead of summaries (default: False)',
+    'fields: Comma-separated item fields to return, e.g. "title,description" (optional)',
+)
+_SHAPING_NOTE = ('Long results are summarized; pass their result_id to expand_result '
+                 'for the full content of an item.')
+
+
+def _document(doc: str) -> str:
+    """Tool docstring with the shaping arguments added to its Args section"""
+    lines = (doc or "").rstrip().split("\n")
+    for number, line in enumerate(lines):
+        if line.strip() == "Args:":
+            indent = line[:len(line) - len(line.lstrip())] + "    "
+            end = number + 1
+            while end < len(lines) and lines[end].strip():
+                end += 1
+            lines[end:end] = [indent + argument for argument in _SHAPING_ARGS]
+            break
+    else:
+        lines += ["", "Args:"] + ["    " + argument for argument in _SHAPING_ARGS]
+    indent = next((line[:len(line) - len(line.lstrip())] for line in lines[1:] if line.strip()), "")
+    return "\n".join(lines + ["", indent + _SHAPING_NOTE])
+
+
+def shaped(tool: Callable) -> Callable:
+    """
+    Wrap a tool so agents get compact responses
+
+    The wrapper keeps the tool's name and adds the detail and fields
+    arguments to its signature and docstring, which ADK reads to describe
+    the tool to the model. It also takes the tool_context ADK injects, to
+    keep full results in the session, and passes it on to tools that take it.
+    """
+    name = tool.__name__
+    signature = inspect.signature(tool)
+    takes_context = 'tool_context' in signature.parameters
+
+    def call_args(kwargs, tool_context):
+        return {**kwargs, 'tool_context': tool_context} if takes_context else kwargs
+
+    if inspect.iscoroutinefunction(tool):
+        @functools.wraps(tool)
+        async def wrapper(*args, detail: bool = False, fields: str = "", tool_context=None, **kwargs):
+            result = await tool(*args, **call_args(kwargs, tool_context))
+            return shape_response(name, result, detail, fields, store=_session_store(tool_context))
+    else:
+        @functools.wraps(tool)
+        def wrapper(*args, detail: bool = False, fields: str = "", tool_context=None, **kwargs):
+            result = tool(*args, **call_args(kwargs, tool_context))
+            return shape_response(name, result, detail, fields, store=_session_store(tool_context))
+
+    parameters = [
+        *signature.parameters.values(),
+        inspect.Parameter('detail', inspect.Parameter.POSITIONAL_OR_KEYWORD, default=False, annotation=bool),
+        inspect.Parameter('fields', inspect.Parameter.POSITIONAL_OR_KEYWORD, default="", annotation=str),
+    ]
+    if not takes_context:
+        parameters.append(inspect.Parameter('tool_context', inspect.Parameter.POSITIONAL_OR_KEYWORD, default=None))
+    wrapper.__signature__ = signature.replace(parameters=parameters)
+    wrapper.__doc__ = _document(tool.__doc__)
+    return wrapper
+
+
+def shaped_tools(tools: List[Callable]) -> List[Callable]:
+    """An agent's tools wrapped by shaped(), plus expand_result"""
+    if os.getenv('TOOL_RESPONSE_SHAPING', 'true').lower() != 'true':
+        return list(tools)
+    return [shaped(tool) for tool in tools] + [expand_result]
@@ -0,0 +1,207 @@
+"""
+In-process inverted index with BM25 ranking for the tool corpora
+Indexes are built once per loaded document (the loaders hand out the same
+object until the document changes) and shared by every call
+Following ADK patterns for tool implementation
+"""
+
+import re
+import math
+import heapq
+import bisect
+import threading
+from functools import lru_cache
+from collections import Counter, OrderedDict, defaultdict, namedtuple
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+
+# One ranked match: position of the entry in the indexed list, BM25 score,
+# and the names of the fields the query matched
+SearchHit = namedtuple('SearchHit', ['position', 'score', 'fields'])
+
+_TOKEN = re.compile(r'[a-z0-9]+')
+
+_STOPWORDS = frozenset((
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'how', 'i', 'in', 'is',
+    'it', 'my', 'of', 'on', 'or', 'that', 'the', 'this', 'to', 'was', 'what', 'when', 'where',
+    'with', 'do', 'does', 'can', 'about'
+))
+
+# Query terms also match indexed terms they are a prefix of, at this weight
+_PREFIX_WEIGHT = 0.5
+_MIN_PREFIX_LENGTH = 3
+
+
+@lru_cache(maxsize=65536)
+def stem(token: str) -> str:
+    """Light suffix stripping so plural and inflected forms share a term"""
+    if len(token) <= 3 or token.isdigit():
+        return token
+    if token.endswith('ies') and len(token) > 4:
+        return token[:-3] + 'y'
+    if token.endswith('sses'):
+        return token[:-2]
+    for suffix in ('ments', 'ment', 'ings', 'ing', 'ed'):
+        if token.endswith(suffix) and len(token) - len(suffix) >= 3:
+            return token[:-len(suffix)]
+    if token.endswith(('ches', 'shes', 'xes', 'zes')):
+        return token[:-2]
+    if token.endswith('s') and not token.endswith(('ss', 'us', 'is')):
+        return token[:-1]
+    return token
+
+
+def tokenize(text: Any) -> List[str]:
+    """Lowercase, split on non-alphanumerics, drop stopwords and stem"""
+    if isinstance(text, (list, tuple)):
+        text = ' '.join(str(item) for item in text)
+    elif not isinstance(text, str):
+        text = str(text) if text is not None else ''
+    return [stem(token) for token in _TOKEN.findall(text.lower()) if token not in _STOPWORDS]
+
+
+class SearchIndex:
+    """BM25F-style inverted index over a list of entries with weighted text fields"""
+
+    def __init__(self, entries: List[Dict[str, Any]], field_weights: Dict[str, float],
+                 items: Optional[List[Any]] = None, k1: float = 1.2, b: float = 0.75):
+        """
+        Build the index
+
+        Args:
+            entries: One dict per entry mapping field name to text (or list of strings)
+            field_weights: Weight of a term occurrence in each field
+            items: Objects the entries were taken from, looked up by hit position
+                (defaults to entries)
+            k1: BM25 term frequency saturation
+            b: BM25 length normalization
+        """
+        self.items = entries if items is None else items
+        self.size = len(entries)
+        self.field_weights = dict(field_weights)
+
+        field_lengths = {field: [] for field in field_weights}
+        field_terms = []
+        for entry in entries:
+            terms = {}
+            for field in field_weights:
+                tokens = tokenize(entry.get(field, ''))
+                terms[field] = tokens
+                field_lengths[field].append(len(tokens))
+            field_terms.append(terms)
+        average_length = {field: (sum(lengths) / len(lengths)) if lengths and sum(lengths) else 1.0
+                          for field, lengths in field_lengths.items()}
+
+        # term -> {position: (length-normalized weighted frequency, matched fields)}
+        frequencies: Dict[str, Dict[int, Tuple[float, frozenset]]] = defaultdict(dict)
+        for position, terms in enumerate(field_terms):
+            for field, tokens in terms.items():
+                if not tokens:
+                    continue
+                scale = field_weights[field] / (1 - b + b * len(tokens) / average_length[field])
+                matched = frozenset((field,))
+                for token, count in Counter(tokens).items():
+                    docs = frequencies[token]
+                    if position in docs:
+                        frequency, fields = docs[position]
+                        docs[position] = (frequency + scale * count, fields | matched)
+                    else:
+                        docs[position] = (scale * count, matched)
+
+        # Term scores do not depend on the query, so postings hold each entry's BM25 score
+        self._postings: Dict[str, Dict[int, Tuple[float, frozenset]]] = {}
+        for term, docs in frequencies.items():
+            idf = math.log(1 + (self.size - len(docs) + 0.5) / (len(docs) + 0.5))
+            self._postings[term] = {position: (idf * frequency * (k1 + 1) / (frequency + k1), fields)
+                                    for position, (frequency, fields) in docs.items()}
+        self._vocabulary = sorted(self._postings)
+
+    def _expand(self, term: str) -> List[Tuple[str, float]]:
+        """The term itself plus indexed terms it is a prefix of"""
+        expansions = [(term, 1.0)] if term in self._postings else []
+        if len(term) >= _MIN_PREFIX_LENGTH:
+            index = bisect.bisect_left(self._vocabulary, term)
+            while index < len(self._vocabulary) and self._vocabulary[index].startswith(term):
+                if self._vocabulary[index] != term:
+                    expansions.append((self._vocabulary[index], _PREFIX_WEIGHT))
+                index += 1
+        return expansions
+
+    def search(self, query: str, k: Optional[int] = None,
+               where: Optional[Callable[[int], bool]] = None) -> Tuple[List[SearchHit], int]:
+        """
+        Rank entries against a query
+
+        Args:
+            query: Free-text query
+            k: Number of hits to return (all matches when None)
+            where: Optional predicate on entry positions restricting the candidates
+
+        Returns:
+            Tuple: (hits ordered by descending score, total number of matching entries)
+        """
+        scores: Dict[int, float] = defaultdict(float)
+        fields: Dict[int, frozenset] = defaultdict(frozenset)
+        for term in set(tokenize(query)):
+            expansions = self._expand(term)
+            if len(expansions) == 1 and expansions[0][1] == 1.0:
+                for position, (score, matched) in self._postings[term].items():
+                    scores[position] += score
+                    fields[position] |= matched
+                continue
+            # A term and its prefix expansions count once per entry, at the best weight
+            best: Dict[int, Tuple[float, frozenset]] = {}
+            for indexed_term, weight in expansions:
+                for position, (score, matched) in self._postings[indexed_term].items():
+                    previous_score, previous_fields = best.get(position, (0.0, frozenset()))
+                    best[position] = (max(weight * score, previous_score), previous_fields | matched)
+            for position, (score, matched) in best.items():
+                scores[position] += score
+                fields[position] |= matched
+
+        candidates = [(score, position) for position, score in scores.items()
+                      if where is None or where(position)]
+        if k is None:
+            ranked = sorted(candidates, key=lambda item: (-item[0], item[1]))
+        else:
+            ranked = heapq.nsmallest(k, candidates, key=lambda item: (-item[0], item[1]))
+        hits = [SearchHit(position, round(score, 4), fields[position]) for score, position in ranked]
+        return hits, len(candidates)
+
+
+IndexT = TypeVar('IndexT')
+
+_indexes: "OrderedDict[Tuple[str, int], Tuple[Any, Any]]" = OrderedDict()
+_indexes_lock = threading.Lock()
+_MAX_INDEXES = 64
+
+
+def get_index(name: str, source: Any, build: Callable[[Any], IndexT]) -> IndexT:
+    """
+    Get an index (SearchIndex, PatternMatcher, ...) for a loaded document,
+    building it on first use
+
+    Loaders return the same object for a document until it changes, so the
+    object's identity serves as its version.
+
+    Args:
+        name: Which index of the document (e.g. "wiki_pages")
+        source: The loaded document the index is built from
+        build: Function building the index from source
+
+    Returns:
+        Cached or newly built index
+    """
+    key = (name, id(source))
+    with _indexes_lock:
+        cached = _indexes.get(key)
+        if cached is not None and cached[0] is source:
+            _indexes.move_to_end(key)
+            return cached[1]
+    index = build(source)
+    with _indexes_lock:
+        # Hold the source so its id cannot be reused while the entry exists
+        _indexes[key] = (source, index)
+        _indexes.move_to_end(key)
+        while len(_indexes) > _MAX_INDEXES:
+            _indexes.popitem(last=False)
+    return index
@@ -0,0 +1,204 @@
+"""
+In-process team directory index for the team tools
+Built once per loaded teams/team_members.json (see search_index.get_index):
+exact maps by email and slack handle, inverted indexes on role and
+expertise, a trigram index on names and emails for substring lookups, and
+a name-word index that tolerates one typo per word
+Following ADK patterns for tool implementation
+"""
+
+import re
+from collections import defaultdict
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+_WORD = re.compile(r'\w+')
+
+# Name similarity of a word matched through one typo (an exact word is 1.0)
+_TYPO_SIMILARITY = 0.8
+# Shorter words only match exactly (initials would match everything)
+_MIN_TYPO_WORD_LENGTH = 2
+
+
+def _typos(word: str, alphabet: str) -> set:
+    """Strings one deletion, transposition, substitution or insertion away from word"""
+    splits = [(word[:i], word[i:]) for i in range(len(word) + 1)]
+    edits = {left + right[1:] for left, right in splits if right}
+    edits.update(left + right[1] + right[0] + right[2:] for left, right in splits if len(right) > 1)
+    edits.update(left + char + right[1:] for left, right in splits if right for char in alphabet)
+    edits.update(left + char + right for left, right in splits for char in alphabet)
+    edits.discard(word)
+    return edits
+
+
+def _handle(slack_handle: str) -> str:
+    """Slack handle key: lowercased, without the leading @"""
+    return slack_handle.strip().lstrip('@').lower()
+
+
+class _TrigramIndex:
+    """Substring lookups over a list of strings"""
+
+    def __init__(self, values: List[str]):
+        self._values = [value.lower() for value in values]
+        self._postings: Dict[str, List[int]] = defaultdict(list)
+        for position, value in enumerate(self._values):
+            for gram in {value[i:i + 3] for i in range(len(value) - 2)}:
+                self._postings[gram].append(position)
+
+    def containing(self, text: str) -> List[int]:
+        """Positions of the values containing text, in order"""
+        text = text.lower()
+        # Every trigram inside the query occurs in a value containing it
+        grams = [text[i:i + 3] for i in range(len(text) - 2)]
+        if not grams:
+            return [position for position, value in enumerate(self._values) if text in value]
+        # so checking the values under its rarest trigram is enough
+        rarest = min((self._postings.get(gram, ()) for gram in grams), key=len)
+        return [position for position in rarest if text in self._values[position]]
+
+
+class TeamDirectory:
+    """Indexed view of teams/team_members.json"""
+
+    def __init__(self, team_data: Dict[str, Any]):
+        """
+        Index the members of a team_members.json document
+
+        Args:
+            team_data: Loaded teams/team_members.json
+        """
+        self.members: List[Dict[str, Any]] = team_data.get("members", [])
+        self._by_email: Dict[str, int] = {}
+        self._by_slack: Dict[str, int] = {}
+        # Lowercased role / expertise area / team -> member positions
+        self._roles: Dict[str, List[int]] = defaultdict(list)
+        self._expertise: Dict[str, List[int]] = defaultdict(list)
+        self._teams: Dict[str, List[int]] = defaultdict(list)
+        roles = {}
+        expertise_areas = {}
+
+        for position, member in enumerate(self.members):
+            email = member.get("email", "").lower()
+            if email:
+                self._by_email.setdefault(email, position)
+            handle = _handle(member.get("slack_handle", ""))
+            if handle:
+                self._by_slack.setdefault(handle, position)
+
+            role = member.get("role", "")
+            roles.setdefault(role, None)
+            self._roles[role.lower()].append(position)
+            self._teams[member.get("team", "").lower()].append(position)
+            for area in member.get("expertise", []):
+                expertise_areas.setdefault(area, None)
+                positions = self._expertise[area.lower()]
+                if not positions or positions[-1] != position:
+                    positions.append(position)
+
+        self.available_roles = list(roles)
+        self.expertise_areas = list(expertise_areas)
+        names = [member.get("name", "") for member in self.members]
+        self._names = _TrigramIndex(names)
+        self._emails = _TrigramIndex([member.get("email", "") for member in self.members])
+
+        # Name word -> members whose name has it; typos are looked up here
+        name_words = defaultdict(set)
+        for position, name in enumerate(names):
+            for word in _WORD.findall(name.lower()):
+                name_words[word].add(position)
+        self._name_words: Dict[str, FrozenSet[int]] = {
+            word: frozenset(positions) for word, positions in name_words.items()}
+        self._alphabet = ''.join(sorted({char for word in self._name_words for char in word}))
+
+    def exact(self, person: str) -> Optional[int]:
+        """Position of the member with this email or slack handle"""
+        person = person.strip().lower()
+        position = self._by_email.get(person)
+        if position is None:
+            position = self._by_slack.get(_handle(person))
+        return position
+
+    def by_name(self, name: str) -> Dict[int, float]:
+        """
+        Members matching a name: exact email/handle, else name substring, else typos
+
+        Returns:
+            Dict: position -> name similarity (1.0 for exact and substring matches)
+        """
+        position = self.exact(name)
+        if position is not None:
+            return {position: 1.0}
+        found = self._names.containing(name)
+        if found:
+            return dict.fromkeys(found, 1.0)
+        return self._similar_names(name)
+
+    def _similar_names(self, name: str) -> Dict[int, float]:
+        """Members whose name has every word of name, each exactly or with one typo"""
+        words = _WORD.findall(name.lower())
+        # (exact matches, matches through a typo) per query word
+        word_matches = []
+        for word in words:
+            exact = self._name_words.get(word, frozenset())
+            typo = set()
+            if len(word) >= _MIN_TYPO_WORD_LENGTH:
+                for variant in _typos(word, self._alphabet):
+                    typo.update(self._name_words.get(variant, ()))
+            word_matches.append((exact, typo))
+        if not word_matches:
+            return {}
+
+        candidates = None
+        for exact, typo in sorted(word_matches, key=lambda match: len(match[0]) + len(match[1])):
+            matching = exact.union(typo)
+            candidates = matching if candidates is None else candidates & matching
+            if not candidates:
+                return {}
+        return {
+            position: sum(1.0 if position in exact else _TYPO_SIMILARITY for exact, _ in word_matches) / len(words)
+            for position in candidates
+        }
+
+    def by_role(self, role: str) -> List[int]:
+        """Positions of members whose role contains role"""
+        return self._matching(self._roles, role)
+
+    def by_expertise(self, expertise: str) -> List[int]:
+        """Positions of members with an expertise area containing expertise"""
+        return self._matching(self._expertise, expertise)
+
+    def by_team(self, team: str) -> List[int]:
+        """Positions of members of the teams whose name contains team, in order"""
+        return sorted(self._matching(self._teams, team))
+
+    @staticmethod
+    def _matching(index: Dict[str, List[int]], text: str) -> List[int]:
+        # Distinct roles/areas are far fewer than members, so scan the keys
+        text = text.lower()
+        positions = set()
+        for value, value_positions in index.items():
+            if text in value:
+                positions.update(value_positions)
+        return list(positions)
+
+    def find_person(self, person: str) -> Tuple[Optional[Dict[str, Any]], bool]:
+        """
+        Resolve a name or email to one member
+
+        Exact email or slack handle first, then the first member whose name or
+        email contains the text, then the most similar name.
+
+        Returns:
+            Tuple: (member or None, True if only a similar name was found)
+        """
+        position = self.exact(person)
+        if position is not None:
+            return self.members[position], False
+        found = self._names.containing(person) + self._emails.containing(person)
+        if found:
+            return self.members[min(found)], False
+        similar = self._similar_names(person)
+        if similar:
+            position = min(similar, key=lambda position: (-similar[position], position))
+            return self.members[position], True
+        return None, False
@@ -3,16 +3,37 @@ Team integration and collaboration tools for new hires
 Following ADK patterns for tool implementation
 """
 
+import asyncio
+import heapq
 import json
 import os
 import sys
+from datetime import datetime, timedelta, timezone
 from typing import Dict, List
 
 
-from new_hire.database.db_loader import DatabaseLoader
+from new_hire.database.db_loader import get_loader, like_regex_literal
+from new_hire.database.async_loader import get_async_loader
+from new_hire.database.entity_store import get_entity_store
+from new_hire.tools.async_support import async_variant_of
+from new_hire.tools.availability import CalendarBook, MemberCalendar, common_slots, parse_duration
+from new_hire.tools.search_index import get_index
+from new_hire.tools.team_directory import TeamDirectory
 
-# Initialize database loader
-loader = DatabaseLoader()
+# Shared database loaders (one connection pool per process)
+loader = get_loader()
+async_loader = get_async_loader()
+# Indexed entity tables, only when DB_LOADER_MODE=normalized
+entity_store = get_entity_store()
+
+# Names of all teams, used when a lookup finds nothing
+_TEAM_NAMES_PATH = "$.teams.keyvalue().key"
+
+# Meeting length when the requested duration cannot be read
+_DEFAULT_MEETING_MINUTES = 30
+# Slots suggested by schedule_meeting, and the days searched for them
+_SUGGESTED_SLOTS = 6
+_SCHEDULING_DAYS = 5
 
 def get_team_info(team_name: str = "") -> dict:
     """Get information about team structure, members, and dynamics.
@@ -24,63 +45,83 @@ def get_team_info(team_name: str = "") -> dict:
         Dict: Team structure, members, and organizational information
     """
     try:
-        team_data = loader.load_data("teams/team_structure.json")
-        
         if not team_name:
-            # Return overall team structure
-            teams_list = []
-            for team, info in team_data.get("teams", {}).items():
-                teams_list.append({
-                    "name": team,
-                    "description": info.get("description", ""),
-                    "size": len(info.get("members", [])),
-                    "manager": info.get("manager", ""),
-                    "focus_areas": info.get("focus_areas", [])
-                })
-            return {
-                "status": "success",
-                "organization_structure": team_data.get("organization_structure", {}),
-                "teams": teams_list,
-                "total_teams": len(teams_list),
-                "message": "Specify a team_name to get detailed information"
-            }
-        
-        # Find specific team
-        team_name_lower = team_name.lower()
-        found_team = None
-        for team, info in team_data.get("teams", {}).items():
-            if team_name_lower in team.lower():
-                found_team = team
-                break
-        
-        if not found_team:
-            return {
-                "status": "error",
-                "error_message": f"Team '{team_name}' not found",
-                "available_teams": list(team_data.get("teams", {}).keys()),
-                "suggestion": "Try searching for one of the available teams listed above"
-            }
-        
-        team_info = team_data["teams"][found_team]
+            team_data = loader.load_data("teams/team_structure.json")
+            return _summarize_teams(team_data)
+        # Only the matching team is fetched from the database
+        match = loader.load_path("teams/team_structure.json", _team_match_path(team_name), first=True)
+        available_teams = [] if match else loader.load_path("teams/team_structure.json", _TEAM_NAMES_PATH)
+        return _describe_team(team_name, match, available_teams)
+    except Exception as e:
         return {
-            "status": "success",
-            "team_name": found_team,
-            "description": team_info.get("description", ""),
-            "manager": team_info.get("manager", ""),
-            "size": len(team_info.get("members", [])),
-            "members": team_info.get("members", []),
-            "focus_areas": team_info.get("focus_areas", []),
-            "collaboration_tools": team_info.get("collaboration_tools", []),
-            "meeting_schedule": team_info.get("meeting_schedule", {}),
-            "key_projects": team_info.get("key_projects", []),
-            "team_culture": team_info.get("team_culture", "")
+            "status": "error",
+            "error_message": f"Failed to get team information: {str(e)}"
         }
+
+@async_variant_of(get_team_info)
+async def get_team_info_async(team_name: str = "") -> dict:
+    try:
+        if not team_name:
+            team_data = await async_loader.load_data("teams/team_structure.json")
+            return _summarize_teams(team_data)
+        match = await async_loader.load_path("teams/team_structure.json", _team_match_path(team_name), first=True)
+        available_teams = [] if match else await async_loader.load_path("teams/team_structure.json", _TEAM_NAMES_PATH)
+        return _describe_team(team_name, match, available_teams)
     except Exception as e:
         return {
             "status": "error",
             "error_message": f"Failed to get team information: {str(e)}"
         }
 
+def _team_match_path(team_name: str) -> str:
+    """Path selecting the teams whose name contains team_name (case-insensitive)"""
+    return f'$.teams.keyvalue() ? (@.key like_regex {like_regex_literal(team_name)} flag "i")'
+
+def _summarize_teams(team_data: dict) -> dict:
+    """Summarize every team in team_structure.json"""
+    # Return overall team structure
+    teams_list = []
+    for team, info in team_data.get("teams", {}).items():
+        teams_list.append({
+            "name": team,
+            "description": info.get("description", ""),
+            "size": len(info.get("members", [])),
+            "manager": info.get("manager", ""),
+            "focus_areas": info.get("focus_areas", [])
+        })
+    return {
+        "status": "success",
+        "organization_structure": team_data.get("organization_structure", {}),
+        "teams": teams_list,
+        "total_teams": len(teams_list),
+        "message": "Specify a team_name to get detailed information"
+    }
+
+def _describe_team(team_name: str, match: dict, available_teams: list) -> dict:
+    """Describe the first team matched by _team_match_path ({"key", "value"} pair)"""
+    if not match:
+        return {
+            "status": "error",
+            "error_message": f"Team '{team_name}' not found",
+            "available_teams": available_teams,
+            "suggestion": "Try searching for one of the available teams listed above"
+        }
+
+    team_info = match["value"]
+    return {
+        "status": "success",
+        "team_name": match["key"],
+        "description": team_info.get("description", ""),
+        "manager": team_info.get("manager", ""),
+        "size": len(team_info.get("members", [])),
+        "members": team_info.get("members", []),
+        "focus_areas": team_info.get("focus_areas", []),
+        "collaboration_tools": team_info.get("collaboration_tools", []),
+        "meeting_schedule": team_info.get("meeting_schedule", {}),
+        "key_projects": team_info.get("key_projects", []),
+        "team_culture": team_info.get("team_culture", "")
+    }
+
 def find_team_member(name: str = "", expertise: str = "", role: str = "") -> dict:
     """Find team members by name, expertise, or role.
     
@@ -93,69 +134,81 @@ def find_team_member(name: str = "", expertise: str = "", role: str = "") -> dic
         Dict: Matching team members with their information
     """
     try:
-        team_data = loader.load_data("teams/team_members.json")
-        members_data = team_data.get("members", [])
-        
-        if not any([name, expertise, role]):
-            return {
-                "status": "error",
-                "error_message": "Please provide at least one search criterion: name, expertise, or role",
-                "available_roles": list(set(m.get("role", "") for m in members_data)),
-                "expertise_areas": list(set(exp for m in members_data for exp in m.get("expertise", [])))
-            }
-        
-        matching_members = []
-        name_lower = name.lower() if name else ""
-        expertise_lower = expertise.lower() if expertise else ""
-        role_lower = role.lower() if role else ""
-        
-        for member in members_data:
-            relevance_score = 0
-            
-            # Check name match
-            if name and name_lower in member.get("name", "").lower():
-                relevance_score += 5
-            
-            # Check expertise match
-            if expertise and any(expertise_lower in exp.lower() for exp in member.get("expertise", [])):
-                relevance_score += 3
-            
-            # Check role match
-            if role and role_lower in member.get("role", "").lower():
-                relevance_score += 2
-            
-            if relevance_score > 0:
-                member_info = {
-                    "name": member.get("name", ""),
-                    "role": member.get("role", ""),
-                    "team": member.get("team", ""),
-                    "email": member.get("email", ""),
-                    "slack_handle": member.get("slack_handle", ""),
-                    "expertise": member.get("expertise", []),
-                    "bio": member.get("bio", ""),
-                    "location": member.get("location", ""),
-                    "timezone": member.get("timezone", ""),
-                    "availability": member.get("availability", ""),
-                    "fun_fact": member.get("fun_fact", ""),
-                    "relevance_score": relevance_score
-                }
-                matching_members.append(member_info)
-        
-        # Sort by relevance
-        matching_members.sort(key=lambda x: x["relevance_score"], reverse=True)
-        
-        if not matching_members:
-            return {
-                "status": "success",
-                "search_criteria": {
-                    "name": name if name else None,
-                    "expertise": expertise if expertise else None,
-                    "role": role if role else None
-                },
-                "members_found": 0,
-                "message": "No team members found matching your criteria"
-            }
-        
+        if entity_store and any([name, expertise, role]):
+            # Only the candidate rows, in document order; a directory over them
+            # ranks like one over the whole list (built per call, not cached)
+            directory = TeamDirectory(entity_store.team_members(name, expertise, role))
+        else:
+            directory = _team_directory(loader.load_data("teams/team_members.json"))
+        return _find_team_member(directory, name, expertise, role)
+    except Exception as e:
+        return {
+            "status": "error",
+            "error_message": f"Failed to find team members: {str(e)}"
+        }
+
+@async_variant_of(find_team_member)
+async def find_team_member_async(name: str = "", expertise: str = "", role: str = "") -> dict:
+    try:
+        if entity_store and any([name, expertise, role]):
+            directory = TeamDirectory(await asyncio.to_thread(entity_store.team_members, name, expertise, role))
+        else:
+            directory = _team_directory(await async_loader.load_data("teams/team_members.json"))
+        return _find_team_member(directory, name, expertise, role)
+    except Exception as e:
+        return {
+            "status": "error",
+            "error_message": f"Failed to find team members: {str(e)}"
+        }
+
+def _team_directory(team_data: dict) -> TeamDirectory:
+    """Directory index of a loaded team_members.json (built once per document version)"""
+    return get_index("team_directory", team_data, TeamDirectory)
+
+def _find_team_member(directory: TeamDirectory, name: str, expertise: str, role: str) -> dict:
+    """Rank team members by name, expertise and role matches"""
+
+    if not any([name, expertise, role]):
+        return {
+            "status": "error",
+            "error_message": "Please provide at least one search criterion: name, expertise, or role",
+            "available_roles": directory.available_roles,
+            "expertise_areas": directory.expertise_areas
+        }
+
+    # position -> relevance; a misspelled name scores by its similarity
+    scores = {}
+    if name:
+        for position, similarity in directory.by_name(name).items():
+            scores[position] = 5 if similarity == 1.0 else round(5 * similarity, 2)
+    if expertise:
+        for position in directory.by_expertise(expertise):
+            scores[position] = scores.get(position, 0) + 3
+    if role:
+        for position in directory.by_role(role):
+            scores[position] = scores.get(position, 0) + 2
+
+    # Best first, ties in directory order
+    top_positions = heapq.nsmallest(10, scores, key=lambda position: (-scores[position], position))
+    matching_members = []
+    for position in top_positions:
+        member = directory.members[position]
+        matching_members.append({
+            "name": member.get("name", ""),
+            "role": member.get("role", ""),
+            "team": member.get("team", ""),
+            "email": member.get("email", ""),
+            "slack_handle": member.get("slack_handle", ""),
+            "expertise": member.get("expertise", []),
+            "bio": member.get("bio", ""),
+            "location": member.get("location", ""),
+            "timezone": member.get("timezone", ""),
+            "availability": member.get("availability", ""),
+            "fun_fact": member.get("fun_fact", ""),
+            "relevance_score": scores[position]
+        })
+
+    if not matching_members:
         return {
             "status": "success",
             "search_criteria": {
@@ -163,16 +216,22 @@ def find_team_member(name: str = "", expertise: str = "", role: str = "") -> dic
                 "expertise": expertise if expertise else None,
                 "role": role if role else None
             },
-            "members_found": len(matching_members),
-            "matching_members": matching_members[:10],  # Top 10 matches
-            "additional_members_available": max(0, len(matching_members) - 10)
-        }
-    except Exception as e:
-        return {
-            "status": "error",
-            "error_message": f"Failed to find team members: {str(e)}"
+            "members_found": 0,
+            "message": "No team members found matching your criteria"
         }
 
+    return {
+        "status": "success",
+        "search_criteria": {
+            "name": name if name else None,
+            "expertise": expertise if expertise else None,
+            "role": role if role else None
+        },
+        "members_found": len(scores),
+        "matching_members": matching_members,  # Top 10 matches
+        "additional_members_available": max(0, len(scores) - 10)
+    }
+
 def schedule_meeting(with_person: str, purpose: str, duration: str = "30 minutes") -> dict:
     """Schedule a meeting with a team member.
     
@@ -185,68 +244,241 @@ def schedule_meeting(with_person: str, purpose: str, duration: str = "30 minutes
         Dict: Meeting scheduling information and next steps
     """
     try:
-        # Load team member data to validate person
-        team_data = loader.load_data("teams/team_members.json")
-        members_data = team_data.get("members", [])
-        
-        # Find the person
-        person_lower = with_person.lower()
-        found_person = None
-        for member in members_data:
-            if (person_lower in member.get("name", "").lower() or
-                person_lower in member.get("email", "").lower()):
-                found_person = member
-                break
-        
-        if not found_person:
-            return {
-                "status": "error",
-                "error_message": f"Person '{with_person}' not found in the team directory",
-                "suggestion": "Please use find_team_member to search for the correct name or email"
-            }
-        
-        # Mock scheduling data
+        if entity_store:
+            directory = TeamDirectory(entity_store.team_member_candidates(with_person))
+        else:
+            directory = _team_directory(loader.load_data("teams/team_members.json"))
         scheduling_data = loader.load_data("teams/scheduling.json")
-        
-        # Simulate finding available slots
-        meeting_info = {
-            "status": "success",
-            "meeting_with": found_person.get("name", ""),
-            "email": found_person.get("email", ""),
-            "purpose": purpose,
-            "duration": duration,
-            "suggested_times": scheduling_data.get("default_slots", []),
-            "timezone": found_person.get("timezone", "UTC"),
-            "calendar_link": f"https://calendar.company.com/schedule/{found_person.get('email', '').split('@')[0]}",
-            "meeting_tips": scheduling_data.get("meeting_tips", {}).get(purpose.lower(), []),
-            "next_steps": [
-                f"Click the calendar link to see {found_person.get('name', '')}'s availability",
-                "Choose a time slot that works for both of you",
-                "Include the meeting purpose in your invitation",
-                "Prepare any questions or topics you'd like to discuss"
-            ]
+        calendar_data = loader.load_data("teams/calendars.json")
+        return _schedule_meeting(directory, scheduling_data, calendar_data, with_person, purpose, duration)
+    except Exception as e:
+        return {
+            "status": "error",
+            "error_message": f"Failed to schedule meeting: {str(e)}"
         }
-        
-        # Add specific recommendations based on purpose
-        purpose_lower = purpose.lower()
-        if "introduction" in purpose_lower or "meet" in purpose_lower:
-            meeting_info["preparation_tips"] = [
-                "Prepare a brief introduction about yourself",
-                "Think about what you'd like to learn from them",
-                "Review their expertise areas beforehand",
-                "Have questions ready about their work"
-            ]
-        elif "help" in purpose_lower or "question" in purpose_lower:
-            meeting_info["preparation_tips"] = [
-                "Document your specific questions or issues",
-                "Gather any relevant context or error messages",
-                "Be specific about what kind of help you need",
-                "Consider what you've already tried"
-            ]
-        
-        return meeting_info
+
+@async_variant_of(schedule_meeting)
+async def schedule_meeting_async(with_person: str, purpose: str, duration: str = "30 minutes") -> dict:
+    try:
+        if entity_store:
+            directory = TeamDirectory(await asyncio.to_thread(entity_store.team_member_candidates, with_person))
+        else:
+            directory = _team_directory(await async_loader.load_data("teams/team_members.json"))
+        scheduling_data = await async_loader.load_data("teams/scheduling.json")
+        calendar_data = await async_loader.load_data("teams/calendars.json")
+        return _schedule_meeting(directory, scheduling_data, calendar_data, with_person, purpose, duration)
     except Exception as e:
         return {
             "status": "error",
             "error_message": f"Failed to schedule meeting: {str(e)}"
         }
+
+def _calendar_book(calendar_data: dict) -> CalendarBook:
+    """Parsed calendars.json (built once per document version)"""
+    return get_index("calendar_book", calendar_data, CalendarBook)
+
+def _meeting_minutes(duration: str) -> int:
+    return parse_duration(duration) or _DEFAULT_MEETING_MINUTES
+
+def _search_window(days_ahead: int, start_date: str = ""):
+    """(start, end) of the slot search: from now (or start_date, if later) until days_ahead days later"""
+    start = datetime.now(timezone.utc)
+    if start_date:
+        first_day = datetime.fromisoformat(start_date)
+        if first_day.tzinfo is None:
+            first_day = first_day.replace(tzinfo=timezone.utc)
+        start = max(start, first_day)
+    return start, start + timedelta(days=days_ahead)
+
+def _slots_by_day(slots: list, calendar: MemberCalendar) -> list:
+    """Slots in a member's local time, grouped like scheduling.json default_slots"""
+    days = []
+    for start, end in slots:
+        local_start = datetime.fromtimestamp(start, calendar.zone)
+        local_end = datetime.fromtimestamp(end, calendar.zone)
+        day = local_start.strftime("%A, %b %d").replace(" 0", " ")
+        label = f"{local_start.strftime('%I:%M %p').lstrip('0')} - {local_end.strftime('%I:%M %p').lstrip('0')}"
+        if not days or days[-1]["day"] != day:
+            days.append({"day": day, "slots": []})
+        days[-1]["slots"].append(label)
+    return days
+
+def _schedule_meeting(directory: TeamDirectory, scheduling_data: dict, calendar_data: dict, with_person: str, purpose: str, duration: str) -> dict:
+    """Validate the person and suggest free slots from their calendar"""
+    # Find the person
+    found_person, approximate = directory.find_person(with_person)
+
+    if not found_person:
+        return {
+            "status": "error",
+            "error_message": f"Person '{with_person}' not found in the team directory",
+            "suggestion": "Please use find_team_member to search for the correct name or email"
+        }
+
+    # Earliest free slots of the requested length in the person's working hours
+    book = _calendar_book(calendar_data)
+    calendar = book.calendar(found_person)
+    window_start, window_end = _search_window(_SCHEDULING_DAYS)
+    slots = common_slots([calendar], _meeting_minutes(duration), window_start, window_end,
+                         _SUGGESTED_SLOTS, book.step_minutes)
+
+    meeting_info = {
+        "status": "success",
+        "meeting_with": found_person.get("name", ""),
+        "email": found_person.get("email", ""),
+        "purpose": purpose,
+        "duration": duration,
+        "suggested_times": _slots_by_day(slots, calendar) if slots else scheduling_data.get("default_slots", []),
+        "availability_source": book.source if slots else "default_slots",
+        "working_hours": calendar.working_hours_label(),
+        "timezone": found_person.get("timezone", "UTC"),
+        "calendar_link": f"https://calendar.company.com/schedule/{found_person.get('email', '').split('@')[0]}",
+        "meeting_tips": scheduling_data.get("meeting_tips", {}).get(purpose.lower(), []),
+        "next_steps": [
+            f"Click the calendar link to see {found_person.get('name', '')}'s availability",
+            "Choose a time slot that works for both of you",
+            "Include the meeting purpose in your invitation",
+            "Prepare any questions or topics you'd like to discuss"
+        ]
+    }
+
+    if parse_duration(duration) is None:
+        meeting_info["duration_note"] = f"Could not read duration '{duration}'; suggested {_DEFAULT_MEETING_MINUTES}-minute slots"
+    if approximate:
+        meeting_info["note"] = (f"No exact match for '{with_person}'; "
+                                f"scheduling with the closest name, {found_person.get('name', '')}")
+
+    # Add specific recommendations based on purpose
+    purpose_lower = purpose.lower()
+    if "introduction" in purpose_lower or "meet" in purpose_lower:
+        meeting_info["preparation_tips"] = [
+            "Prepare a brief introduction about yourself",
+            "Think about what you'd like to learn from them",
+            "Review their expertise areas beforehand",
+            "Have questions ready about their work"
+        ]
+    elif "help" in purpose_lower or "question" in purpose_lower:
+        meeting_info["preparation_tips"] = [
+            "Document your specific questions or issues",
+            "Gather any relevant context or error messages",
+            "Be specific about what kind of help you need",
+            "Consider what you've already tried"
+        ]
+
+    return meeting_info
+
+def find_common_slots(attendees: List[str], duration: str = "30 minutes", team_name: str = "",
+                      days_ahead: int = 5, max_slots: int = 5, start_date: str = "") -> dict:
+    """Find times when several people are all free, e.g. for a new-hire intro loop.
+    
+    Args:
+        attendees: Names or emails of the people who must attend (e.g. manager, buddy)
+        duration: Meeting duration (default: "30 minutes")
+        team_name: Also invite every member of this team (optional)
+        days_ahead: How many days ahead to search (default: 5)
+        max_slots: How many slots to return (default: 5)
+        start_date: First day to search, YYYY-MM-DD (optional, default: now)
+    
+    Returns:
+        Dict: The earliest common slots, in UTC and in each attendee timezone
+    """
+    try:
+        team_data = loader.load_data("teams/team_members.json")
+        calendar_data = loader.load_data("teams/calendars.json")
+        return _find_common_slots(team_data, calendar_data, attendees, duration, team_name, days_ahead, max_slots,
+                                  start_date)
+    except Exception as e:
+        return {
+            "status": "error",
+            "error_message": f"Failed to find common slots: {str(e)}"
+        }
+
+@async_variant_of(find_common_slots)
+async def find_common_slots_async(attendees: List[str], duration: str = "30 minutes", team_name: str = "",
+                                  days_ahead: int = 5, max_slots: int = 5, start_date: str = "") -> dict:
+    try:
+        team_data = await async_loader.load_data("teams/team_members.json")
+        calendar_data = await async_loader.load_data("teams/calendars.json")
+        return _find_common_slots(team_data, calendar_data, attendees, duration, team_name, days_ahead, max_slots,
+                                  start_date)
+    except Exception as e:
+        return {
+            "status": "error",
+            "error_message": f"Failed to find common slots: {str(e)}"
+        }
+
+def _find_common_slots(team_data: dict, calendar_data: dict, attendees: List[str], duration: str,
+                       team_name: str, days_ahead: int, max_slots: int, start_date: str) -> dict:
+    """Resolve the attendees and intersect their free time"""
+    directory = _team_directory(team_data)
+    members = {}
+    not_found = []
+    notes = []
+    for person in attendees or []:
+        member, approximate = directory.find_person(person)
+        if member is None:
+            not_found.append(person)
+            continue
+        members.setdefault(member.get("email", "") or member.get("name", ""), member)
+        if approximate:
+            notes.append(f"'{person}' matched the closest name, {member.get('name', '')}")
+    if team_name:
+        team_members = directory.by_team(team_name)
+        if not team_members:
+            not_found.append(f"team '{team_name}'")
+        for position in team_members:
+            member = directory.members[position]
+            members.setdefault(member.get("email", "") or member.get("name", ""), member)
+
+    if not_found:
+        return {
+            "status": "error",
+            "error_message": f"Not found in the team directory: {', '.join(not_found)}",
+            "suggestion": "Please use find_team_member to search for the correct names or emails"
+        }
+    if not members:
+        return {
+            "status": "error",
+            "error_message": "Please provide at least one attendee or a team_name"
+        }
+
+    book = _calendar_book(calendar_data)
+    calendars = [book.calendar(member) for member in members.values()]
+    minutes = _meeting_minutes(duration)
+    days_ahead = min(max(int(days_ahead), 1), 30)
+    max_slots = min(max(int(max_slots), 1), 50)
+    window_start, window_end = _search_window(days_ahead, start_date)
+    slots = common_slots(calendars, minutes, window_start, window_end, max_slots, book.step_minutes)
+
+    # One local rendering per distinct attendee timezone
+    zones = {}
+    for calendar in calendars:
+        zones.setdefault(calendar.timezone_name, calendar)
+    common = []
+    for start, end in slots:
+        local_times = {}
+        for name, calendar in zones.items():
+            day = _slots_by_day([(start, end)], calendar)[0]
+            local_times[name] = f"{day['day']}, {day['slots'][0]}"
+        common.append({
+            "start": datetime.fromtimestamp(start, timezone.utc).isoformat(),
+            "end": datetime.fromtimestamp(end, timezone.utc).isoformat(),
+            "local_times": local_times
+        })
+
+    result = {
+        "status": "success",
+        "attendees": [{"name": calendar.name, "email": calendar.email,
+                       "working_hours": calendar.working_hours_label()} for calendar in calendars],
+        "duration_minutes": minutes,
+        "search_window": {"start": window_start.isoformat(), "end": window_end.isoformat()},
+        "availability_source": book.source,
+        "slots_found": len(common),
+        "common_slots": common
+    }
+    if not common:
+        result["message"] = (f"No time in the next {days_ahead} days when all {len(calendars)} attendees are free "
+                             f"for {minutes} minutes; try fewer attendees, a shorter meeting or more days")
+    if notes:
+        result["notes"] = notes
+    return result
@@ -3,17 +3,43 @@ Troubleshooting and error resolution tools for development issues
 Following ADK patterns for tool implementation
 """
 
+import asyncio
+import hashlib
+import io
 import json
 import os
 import re
+import stat
 import sys
-from typing import Dict, List
+from typing import Dict, Iterable, Iterator, List
 
 
-from new_hire.database.db_loader import DatabaseLoader
+from new_hire.database.db_loader import get_loader
+from new_hire.database.async_loader import get_async_loader
+from new_hire.database.occurrence_store import fingerprint, get_occurrence_store, normalize_trace
+from new_hire.tools.async_support import async_variant_of
+from new_hire.tools.pattern_matcher import PatternMatcher
+from new_hire.tools.search_index import SearchIndex, get_index
 
-# Initialize database loader
-loader = DatabaseLoader()
+# Shared database loaders (one connection pool per process)
+loader = get_loader()
+async_loader = get_async_loader()
+# Error fingerprint history, only when ERROR_OCCURRENCE_TRACKING=true
+occurrence_store = get_occurrence_store()
+
+# Tie-breaker when patterns are equally specific
+_SEVERITY_RANK = {"critical": 4, "high": 3, "medium": 2, "low": 1}
+
+# Stack frame lines: Python "File ..." / "Traceback", Java and JavaScript "at ...", "... N more"
+_TRACE_START = re.compile(r'Traceback \(most recent call last\)')
+_FRAME = re.compile(r'\s+(?:File "|at\s|\.\.\. \d+ more)')
+# Bounds that keep a log summary small whatever the log size
+_MAX_TRACE_FRAMES = 200
+_MAX_DISTINCT_TRACES = 100
+_MAX_EXAMPLE_LENGTH = 300
+# Bounds on the log analyze_log reads: total bytes (LOG_ANALYSIS_MAX_BYTES) and bytes per line
+_DEFAULT_MAX_LOG_BYTES = 50 * 1024 * 1024
+_MAX_LOG_LINE_BYTES = 64 * 1024
 
 def analyze_error(error_message: str, context: str = "") -> dict:
     """Analyze error messages and provide detailed diagnosis.
@@ -27,68 +53,432 @@ def analyze_error(error_message: str, context: str = "") -> dict:
     """
     try:
         error_data = loader.load_data("troubleshooting/common_errors.json")
-        error_lower = error_message.lower()
-        context_lower = context.lower() if context else ""
-        
-        # Find matching error patterns
-        matches = []
-        for error_category, error_info in error_data.get("error_patterns", {}).items():
-            for pattern in error_info.get("patterns", []):
-                if pattern.lower() in error_lower:
-                    matches.append({
-                        "category": error_category,
-                        "type": error_info.get("type", ""),
-                        "description": error_info.get("description", ""),
-                        "common_causes": error_info.get("common_causes", []),
-                        "initial_steps": error_info.get("initial_steps", []),
-                        "severity": error_info.get("severity", "medium"),
-                        "pattern_matched": pattern
-                    })
-        
-        if not matches:
-            # Generic analysis if no specific pattern found
-            generic_analysis = {
-                "category": "unknown",
-                "type": "Unrecognized Error",
-                "description": "This error pattern is not in our common issues database",
-                "suggested_approach": [
-                    "Check the full stack trace for more context",
-                    "Look for similar errors in logs",
-                    "Check recent code changes",
-                    "Verify environment configuration"
-                ],
-                "severity": "unknown"
-            }
-            return {
-                "status": "success",
-                "error_message": error_message,
-                "analysis": generic_analysis,
-                "context": context,
-                "recommendation": "Try using find_solutions to search for similar issues or run_diagnostics for system checks"
-            }
-        
-        # Return the best match (first one found)
-        best_match = matches[0]
+        matches, occurrence = _matches_with_history(error_data, error_message)
+        return _analyze_error(error_data, error_message, context, matches, occurrence)
+    except Exception as e:
+        return {
+            "status": "error",
+            "error_message": f"Failed to analyze error: {str(e)}"
+        }
+
+@async_variant_of(analyze_error)
+async def analyze_error_async(error_message: str, context: str = "") -> dict:
+    try:
+        error_data = await async_loader.load_data("troubleshooting/common_errors.json")
+        # Occurrences are looked up and counted in memory, so nothing here blocks
+        matches, occurrence = _matches_with_history(error_data, error_message)
+        return _analyze_error(error_data, error_message, context, matches, occurrence)
+    except Exception as e:
+        return {
+            "status": "error",
+            "error_message": f"Failed to analyze error: {str(e)}"
+        }
+
+def _matches_with_history(error_data: dict, error_message: str):
+    """
+    Pattern matches of an error and its occurrence history
+
+    A trace seen before is classified already, so patterns are matched only for
+    new ones and for traces classified against other error patterns than the
+    current ones. The store answers from memory and writes counts in the background.
+
+    Returns:
+        Tuple: (matches, occurrence row or None when tracking is off)
+    """
+    if not occurrence_store:
+        return _match_errors(error_data, error_message), None
+    normalized = normalize_trace(error_message)
+    error_fingerprint = fingerprint(error_message)
+    matches = _known_matches(error_data, occurrence_store.lookup(error_fingerprint))
+    classified = None
+    if matches is None:
+        matches = _match_errors(error_data, error_message)
+        classified = {"version": _patterns_version(error_data), "matches": _match_summaries(matches)}
+    return matches, occurrence_store.record(error_fingerprint, normalized, classified)
+
+def _patterns_version(error_data: dict) -> str:
+    """Hash of the error patterns, stored with each classification made against them"""
+    return get_index("error_patterns_version", error_data, lambda data: hashlib.sha1(
+        json.dumps(data.get("error_patterns", {}), sort_keys=True).encode("utf-8")).hexdigest())
+
+def _error_matcher(error_data: dict) -> PatternMatcher:
+    """Compile every error pattern, tagged with its category"""
+    return PatternMatcher((pattern, error_category)
+                          for error_category, error_info in error_data.get("error_patterns", {}).items()
+                          for pattern in error_info.get("patterns", []))
+
+def _match_errors(error_data: dict, text: str) -> list:
+    """
+    Find every known error pattern in a text
+
+    Returns:
+        list: One entry per (category, pattern) with its first offset and number of
+            occurrences, most specific (longest) pattern first, then most severe
+    """
+    error_patterns = error_data.get("error_patterns", {})
+    found = {}
+    for match in get_index("error_patterns", error_data, _error_matcher).find(text):
+        for error_category in match.values:
+            key = (error_category, match.pattern)
+            if key in found:
+                found[key]["occurrences"] += 1
+            else:
+                found[key] = {"category": error_category, "pattern_matched": match.pattern,
+                              "position": match.start, "occurrences": 1}
+
+    matches = [_with_error_info(error_patterns[occurrence["category"]], occurrence) for occurrence in found.values()]
+    matches.sort(key=lambda m: (-len(m["pattern_matched"]), -_SEVERITY_RANK.get(m["severity"], 0), m["position"]))
+    return matches
+
+def _with_error_info(error_info: dict, match: dict) -> dict:
+    """Add the category details from common_errors.json to a pattern match"""
+    return dict(match,
+                type=error_info.get("type", ""),
+                description=error_info.get("description", ""),
+                common_causes=error_info.get("common_causes", []),
+                initial_steps=error_info.get("initial_steps", []),
+                severity=error_info.get("severity", "medium"))
+
+def _match_summaries(matches: list) -> list:
+    """The part of each match stored with an error occurrence"""
+    return [{key: match[key] for key in ("category", "pattern_matched", "position", "occurrences")}
+            for match in matches]
+
+def _known_matches(error_data: dict, occurrence: dict):
+    """
+    Matches stored for a previously seen trace
+
+    Returns:
+        list: Matches with current category details, or None when the trace is new,
+            matched nothing, or was classified against other error patterns (any
+            edit of error_patterns in common_errors.json reclassifies it)
+    """
+    stored = (occurrence or {}).get("matches")
+    if not isinstance(stored, dict) or not stored.get("matches"):
+        return None
+    if stored.get("version") != _patterns_version(error_data):
+        return None
+    error_patterns = error_data.get("error_patterns", {})
+    return [_with_error_info(error_patterns[match["category"]], match) for match in stored["matches"]]
+
+def _describe_occurrence(occurrence: dict) -> dict:
+    """Occurrence history for a tool response"""
+    return {
+        "fingerprint": occurrence["fingerprint"],
+        "times_seen": occurrence["occurrences"],
+        "first_seen": occurrence["first_seen"].isoformat() if occurrence.get("first_seen") else "",
+        "last_seen": occurrence["last_seen"].isoformat() if occurrence.get("last_seen") else "",
+        "resolved_by": occurrence.get("resolved_by") or ""
+    }
+
+def _analyze_error(error_data: dict, error_message: str, context: str, matches: list,
+                   occurrence: dict = None) -> dict:
+    """Build the analysis for an error message from its pattern matches"""
+    history = {}
+    if occurrence:
+        history["occurrence"] = _describe_occurrence(occurrence)
+        if occurrence.get("resolved_by"):
+            history["known_resolution"] = (f"This exact error was resolved before with the solution "
+                                           f"'{occurrence['resolved_by']}'; use find_solutions to get its steps")
+
+    if not matches:
+        # Generic analysis if no specific pattern found
+        generic_analysis = {
+            "category": "unknown",
+            "type": "Unrecognized Error",
+            "description": "This error pattern is not in our common issues database",
+            "suggested_approach": [
+                "Check the full stack trace for more context",
+                "Look for similar errors in logs",
+                "Check recent code changes",
+                "Verify environment configuration"
+            ],
+            "severity": "unknown"
+        }
         return {
             "status": "success",
             "error_message": error_message,
-            "analysis": {
-                "error_category": best_match["category"],
-                "error_type": best_match["type"],
-                "description": best_match["description"],
-                "severity": best_match["severity"],
-                "common_causes": best_match["common_causes"],
-                "initial_troubleshooting_steps": best_match["initial_steps"],
-                "pattern_matched": best_match["pattern_matched"]
-            },
+            "analysis": generic_analysis,
             "context": context,
-            "additional_matches": len(matches) - 1 if len(matches) > 1 else 0
+            "recommendation": "Try using find_solutions to search for similar issues or run_diagnostics for system checks",
+            **history
+        }
+
+    # Return the best match (most specific, then most severe)
+    best_match = matches[0]
+    return {
+        "status": "success",
+        "error_message": error_message,
+        "analysis": {
+            "error_category": best_match["category"],
+            "error_type": best_match["type"],
+            "description": best_match["description"],
+            "severity": best_match["severity"],
+            "common_causes": best_match["common_causes"],
+            "initial_troubleshooting_steps": best_match["initial_steps"],
+            "pattern_matched": best_match["pattern_matched"]
+        },
+        "context": context,
+        "additional_matches": len(matches) - 1 if len(matches) > 1 else 0,
+        "all_matches": [{
+            "error_category": match["category"],
+            "pattern_matched": match["pattern_matched"],
+            "severity": match["severity"],
+            "position": match["position"],
+            "occurrences": match["occurrences"]
+        } for match in matches],
+        **history
+    }
+
+def analyze_log(log_content: str = "", log_name: str = "", context: str = "") -> dict:
+    """Triage a whole log (e.g. a CI log) and summarize it instead of reading it line by line.
+    
+    Args:
+        log_content: The log text the user pasted or uploaded
+        log_name: Instead of log_content, the name of a log file in the configured
+            log directory (LOG_ANALYSIS_DIR), e.g. "ci/build-1234.log"
+        context: Additional context about the run that produced the log (optional)
+    
+    Returns:
+        Dict: Distinct known errors with counts and first/last line numbers, and
+            de-duplicated stack traces
+    """
+    try:
+        error_data = loader.load_data("troubleshooting/common_errors.json")
+        return _summarize_log_source(error_data, log_content, log_name, context)
+    except Exception as e:
+        return {
+            "status": "error",
+            "error_message": f"Failed to analyze log: {str(e)}"
         }
+
+@async_variant_of(analyze_log)
+async def analyze_log_async(log_content: str = "", log_name: str = "", context: str = "") -> dict:
+    try:
+        error_data = await async_loader.load_data("troubleshooting/common_errors.json")
+        # Reading is capped at LOG_ANALYSIS_MAX_BYTES of text or of a regular file,
+        # so the worker thread finishes even if the awaiting task is cancelled
+        return await asyncio.to_thread(_summarize_log_source, error_data, log_content, log_name, context)
     except Exception as e:
         return {
             "status": "error",
-            "error_message": f"Failed to analyze error: {str(e)}"
+            "error_message": f"Failed to analyze log: {str(e)}"
+        }
+
+def analyze_log_lines(lines: Iterable[str], context: str = "") -> dict:
+    """
+    Triage a log given as an iterator of lines (e.g. a pipe or a streamed download)
+
+    Args:
+        lines: Log lines; consumed once, in bounded memory
+        context: Additional context about the run that produced the log (optional)
+
+    Returns:
+        Dict: Same summary as analyze_log
+    """
+    try:
+        error_data = loader.load_data("troubleshooting/common_errors.json")
+        return dict(_summarize_log(error_data, lines, context), source="<stream>")
+    except Exception as e:
+        return {
+            "status": "error",
+            "error_message": f"Failed to analyze log: {str(e)}"
+        }
+
+def _summarize_log_source(error_data: dict, log_content: str, log_name: str, context: str) -> dict:
+    """Summarize pasted log text, or a log file from the log directory (blocking for files)"""
+    if log_content and log_name:
+        raise ValueError("Give either log_content or log_name, not both")
+    if not log_name:
+        if not log_content:
+            raise ValueError("No log given; pass the log text as log_content")
+        stream = io.BytesIO(log_content.encode("utf-8", errors="replace"))
+        return _summarize_bounded(error_data, stream, context, "<pasted log>")
+
+    with _open_log_file(log_name) as stream:
+        return _summarize_bounded(error_data, stream, context, log_name)
+
+def _open_log_file(log_name: str):
+    """
+    Open a regular file inside LOG_ANALYSIS_DIR for binary reading
+
+    Raises:
+        ValueError: If no log directory is configured, or the name leaves it
+            (absolute paths, "..", symlinks out) or is not an existing regular file
+    """
+    log_dir = os.getenv("LOG_ANALYSIS_DIR", "")
+    if not log_dir:
+        raise ValueError("Reading log files is disabled (LOG_ANALYSIS_DIR is not set); pass the log text as log_content")
+    root = os.path.realpath(log_dir)
+    path = os.path.realpath(os.path.join(root, log_name))
+    # One message for every refusal, so names outside the directory reveal nothing
+    unavailable = ValueError(f"No log named '{log_name}' in the log directory")
+    if os.path.isabs(log_name) or os.path.commonpath([root, path]) != root or path == root:
+        raise unavailable
+    try:
+        # O_NONBLOCK keeps opening a FIFO from waiting for a writer; it is refused below
+        descriptor = os.open(path, os.O_RDONLY | getattr(os, "O_NONBLOCK", 0) | getattr(os, "O_NOFOLLOW", 0))
+    except OSError:
+        raise unavailable
+    if not stat.S_ISREG(os.fstat(descriptor).st_mode):
+        os.close(descriptor)
+        raise unavailable
+    return os.fdopen(descriptor, "rb")
+
+def _bounded_lines(stream, state: dict) -> Iterator[str]:
+    """
+    Decoded lines of a binary stream, stopping after LOG_ANALYSIS_MAX_BYTES and
+    cutting lines at _MAX_LOG_LINE_BYTES (the rest of a long line is skipped unread)
+    """
+    remaining = int(os.getenv("LOG_ANALYSIS_MAX_BYTES", _DEFAULT_MAX_LOG_BYTES))
+    while remaining > 0:
+        line = stream.readline(min(_MAX_LOG_LINE_BYTES, remaining))
+        if not line:
+            return
+        remaining -= len(line)
+        if not line.endswith(b"\n") and len(line) == _MAX_LOG_LINE_BYTES:
+            state["long_lines"] += 1
+            # Skip to the end of the line in bounded reads
+            while remaining > 0:
+                rest = stream.readline(min(_MAX_LOG_LINE_BYTES, remaining))
+                remaining -= len(rest)
+                if not rest or rest.endswith(b"\n"):
+                    break
+        yield line.decode("utf-8", errors="replace")
+    state["truncated"] = bool(stream.read(1))
+
+def _summarize_bounded(error_data: dict, stream, context: str, source: str) -> dict:
+    """Summarize a binary stream within the size limits, noting where they applied"""
+    state = {"long_lines": 0, "truncated": False}
+    summary = dict(_summarize_log(error_data, _bounded_lines(stream, state), context), source=source)
+    if state["truncated"]:
+        summary["truncated"] = True
+        summary["note"] = f"Only the first {summary['lines_scanned']} lines were scanned (LOG_ANALYSIS_MAX_BYTES)"
+    if state["long_lines"]:
+        summary["long_lines_cut"] = state["long_lines"]
+    return summary
+
+class _TraceCollector:
+    """Group stack traces by their frames, collapsing directly repeated frames"""
+
+    def __init__(self):
+        self.traces = {}
+        self.total = 0
+        self._frames = None
+
+    def frame(self, line: str, line_number: int, message: str):
+        """Add a frame line, starting a trace if none is open"""
+        if self._frames is None:
+            self._frames, self._start, self._message, self._collapsed = [], line_number, message, 0
+            self._message_follows = bool(_TRACE_START.match(line))
+        frame = line.strip()
+        if self._frames and self._frames[-1][0] == frame:
+            # Recursion and retry loops repeat the same frame; keep one with a count
+            self._frames[-1][1] += 1
+            self._collapsed += 1
+        elif len(self._frames) < _MAX_TRACE_FRAMES:
+            self._frames.append([frame, 1])
+        else:
+            self._collapsed += 1
+        self._end = line_number
+
+    def close(self, message: str = ""):
+        """Finish the open trace; message is the line following it, if any"""
+        if self._frames is None:
+            return
+        frames = tuple(frame for frame, _ in self._frames)
+        # Python prints the exception after the frames, Java and JavaScript before them
+        if not (self._message_follows and message):
+            message = self._message
+        self.total += 1
+        trace = self.traces.get(frames)
+        if trace is not None:
+            trace["count"] += 1
+            trace["last_line"] = self._start
+        elif len(self.traces) < _MAX_DISTINCT_TRACES:
+            self.traces[frames] = {
+                "message": message[:_MAX_EXAMPLE_LENGTH],
+                "count": 1,
+                "first_line": self._start,
+                "last_line": self._start,
+                "frame_count": len(frames),
+                "collapsed_frames": self._collapsed,
+                # The innermost frames are where the error was raised
+                "frames": [frame if repeats == 1 else f"{frame}  [repeated {repeats} times]"
+                           for frame, repeats in self._frames[-5:]]
+            }
+        self._frames = None
+
+    @property
+    def open(self) -> bool:
+        return self._frames is not None
+
+def _summarize_log(error_data: dict, lines: Iterable[str], context: str) -> dict:
+    """Match known error patterns line by line and collapse duplicate stack traces"""
+    error_patterns = error_data.get("error_patterns", {})
+    matcher = get_index("error_patterns", error_data, _error_matcher)
+    errors = {}
+    traces = _TraceCollector()
+    previous = ""
+    line_number = 0
+
+    for line_number, line in enumerate(lines, 1):
+        line = line.rstrip("\r\n")
+        if _FRAME.match(line) or _TRACE_START.match(line) or (traces.open and line[:1] in (" ", "\t")):
+            traces.frame(line, line_number, previous)
+        elif traces.open:
+            traces.close(line.strip())
+        if line.strip():
+            previous = line
+
+        for match in matcher.find(line):
+            for error_category in match.values:
+                key = (error_category, match.pattern)
+                error = errors.get(key)
+                if error is None:
+                    errors[key] = {"count": 1, "first_line": line_number, "last_line": line_number,
+                                   "example": line.strip()[:_MAX_EXAMPLE_LENGTH]}
+                elif error["last_line"] != line_number:
+                    error["count"] += 1
+                    error["last_line"] = line_number
+    traces.close()
+
+    distinct_errors = []
+    for (error_category, pattern), error in errors.items():
+        error_info = error_patterns[error_category]
+        distinct_errors.append(dict(
+            error_category=error_category,
+            error_type=error_info.get("type", ""),
+            severity=error_info.get("severity", "medium"),
+            pattern_matched=pattern,
+            **error
+        ))
+    # Most severe first, then the most frequent, then the earliest
+    distinct_errors.sort(key=lambda e: (-_SEVERITY_RANK.get(e["severity"], 0), -e["count"], e["first_line"]))
+
+    stack_traces = sorted(traces.traces.values(), key=lambda t: (-t["count"], t["first_line"]))
+    summary = {
+        "status": "success",
+        "lines_scanned": line_number,
+        "distinct_errors": len(distinct_errors),
+        "errors": distinct_errors[:20],
+        "stack_traces_found": traces.total,
+        "distinct_stack_traces": len(traces.traces),
+        "stack_traces": stack_traces[:10],
+        "context": context
+    }
+    if distinct_errors:
+        top_info = error_patterns[distinct_errors[0]["error_category"]]
+        summary["top_error"] = {
+            "error_category": distinct_errors[0]["error_category"],
+            "description": top_info.get("description", ""),
+            "common_causes": top_info.get("common_causes", []),
+            "initial_troubleshooting_steps": top_info.get("initial_steps", [])
         }
+    else:
+        summary["recommendation"] = ("No known error patterns found; use analyze_error on the "
+                                     "first stack trace message or find_solutions")
+    return summary
 
 def find_solutions(problem_description: str, category: str = "") -> dict:
     """Search for solutions to specific problems or error scenarios.
@@ -102,68 +492,185 @@ def find_solutions(problem_description: str, category: str = "") -> dict:
     """
     try:
         solutions_data = loader.load_data("troubleshooting/solutions.json")
-        problem_lower = problem_description.lower()
-        category_lower = category.lower() if category else ""
-        
-        matching_solutions = []
-        for solution in solutions_data.get("solutions", []):
-            relevance_score = 0
-            
-            # Check problem description match
-            if any(keyword.lower() in problem_lower for keyword in solution.get("keywords", [])):
-                relevance_score += 2
-            
-            # Check title match
-            if any(word in solution.get("title", "").lower() for word in problem_lower.split()):
-                relevance_score += 1
-            
-            # Check category match if specified
-            if category_lower and category_lower in solution.get("category", "").lower():
-                relevance_score += 3
-            
-            if relevance_score > 0:
-                solution_info = {
-                    "title": solution.get("title", ""),
-                    "category": solution.get("category", ""),
-                    "description": solution.get("description", ""),
-                    "difficulty": solution.get("difficulty", "medium"),
-                    "estimated_time": solution.get("estimated_time", ""),
-                    "prerequisites": solution.get("prerequisites", []),
-                    "steps": solution.get("steps", []),
-                    "verification": solution.get("verification", []),
-                    "prevention": solution.get("prevention", []),
-                    "related_issues": solution.get("related_issues", []),
-                    "relevance_score": relevance_score
-                }
-                matching_solutions.append(solution_info)
-        
-        # Sort by relevance
-        matching_solutions.sort(key=lambda x: x["relevance_score"], reverse=True)
-        
-        if not matching_solutions:
-            # Get available categories if no solutions found
-            categories = list(set(sol.get("category", "") for sol in solutions_data.get("solutions", [])))
-            return {
-                "status": "success",
-                "problem_description": problem_description,
-                "solutions_found": 0,
-                "available_categories": categories,
-                "suggestion": "Try rephrasing your problem or specify a category from the available list"
-            }
-        
+        return _find_solutions(solutions_data, problem_description, category)
+    except Exception as e:
+        return {
+            "status": "error",
+            "error_message": f"Failed to find solutions: {str(e)}"
+        }
+
+@async_variant_of(find_solutions)
+async def find_solutions_async(problem_description: str, category: str = "") -> dict:
+    try:
+        solutions_data = await async_loader.load_data("troubleshooting/solutions.json")
+        return _find_solutions(solutions_data, problem_description, category)
+    except Exception as e:
+        return {
+            "status": "error",
+            "error_message": f"Failed to find solutions: {str(e)}"
+        }
+
+def _solution_index(solutions_data: dict) -> SearchIndex:
+    """Index solutions by keywords, title and description"""
+    return SearchIndex([{
+        "keywords": solution.get("keywords", []),
+        "title": solution.get("title", ""),
+        "description": solution.get("description", "")
+    } for solution in solutions_data.get("solutions", [])], {"keywords": 2, "title": 1, "description": 0.5})
+
+def _find_solutions(solutions_data: dict, problem_description: str, category: str) -> dict:
+    """Rank solutions.json entries for a problem description"""
+    solutions = solutions_data.get("solutions", [])
+    category_lower = category.lower() if category else ""
+    hits, _ = get_index("solutions", solutions_data, _solution_index).search(problem_description)
+    scores = {hit.position: hit.score for hit in hits}
+
+    # Solutions in the requested category match even without shared terms, and rank first
+    in_category = set()
+    if category_lower:
+        in_category = {position for position, solution in enumerate(solutions)
+                       if category_lower in solution.get("category", "").lower()}
+    ranked = sorted(set(scores) | in_category,
+                    key=lambda position: (position not in in_category, -scores.get(position, 0), position))
+
+    matching_solutions = []
+    for position in ranked:
+        solution = solutions[position]
+        matching_solutions.append({
+            "title": solution.get("title", ""),
+            "category": solution.get("category", ""),
+            "description": solution.get("description", ""),
+            "difficulty": solution.get("difficulty", "medium"),
+            "estimated_time": solution.get("estimated_time", ""),
+            "prerequisites": solution.get("prerequisites", []),
+            "steps": solution.get("steps", []),
+            "verification": solution.get("verification", []),
+            "prevention": solution.get("prevention", []),
+            "related_issues": solution.get("related_issues", []),
+            "relevance_score": scores.get(position, 0)
+        })
+
+    if not matching_solutions:
+        # Get available categories if no solutions found
+        categories = list(set(sol.get("category", "") for sol in solutions_data.get("solutions", [])))
         return {
             "status": "success",
             "problem_description": problem_description,
-            "category_filter": category if category else "all",
-            "solutions_found": len(matching_solutions),
-            "top_solutions": matching_solutions[:3],  # Return top 3 solutions
-            "additional_solutions_available": max(0, len(matching_solutions) - 3)
+            "solutions_found": 0,
+            "available_categories": categories,
+            "suggestion": "Try rephrasing your problem or specify a category from the available list"
+        }
+
+    return {
+        "status": "success",
+        "problem_description": problem_description,
+        "category_filter": category if category else "all",
+        "solutions_found": len(matching_solutions),
+        "top_solutions": matching_solutions[:3],  # Return top 3 solutions
+        "additional_solutions_available": max(0, len(matching_solutions) - 3)
+    }
+
+def mark_error_resolved(error_message: str, solution_title: str, tool_context=None) -> dict:
+    """Record which solution fixed an error, so the next person hitting it is pointed to the fix.
+    Only troubleshooting maintainers (ERROR_RESOLUTION_EDITORS) can record a fix.
+    
+    Args:
+        error_message: The error message or stack trace that was resolved
+        solution_title: Title of the find_solutions result that fixed it
+    
+    Returns:
+        Dict: Confirmation with the error fingerprint and how often the error has been seen
+    """
+    try:
+        solutions_data = loader.load_data("troubleshooting/solutions.json")
+        solution = _solution_by_title(solutions_data, solution_title)
+        refusal = _resolution_refusal(solutions_data, solution_title, solution, tool_context)
+        if refusal:
+            return refusal
+        occurrence = occurrence_store.mark_resolved(fingerprint(error_message), normalize_trace(error_message),
+                                                    solution["title"])
+        return _describe_resolution(occurrence, solution)
+    except Exception as e:
+        return {
+            "status": "error",
+            "error_message": f"Failed to mark error resolved: {str(e)}"
         }
+
+@async_variant_of(mark_error_resolved)
+async def mark_error_resolved_async(error_message: str, solution_title: str, tool_context=None) -> dict:
+    try:
+        solutions_data = await async_loader.load_data("troubleshooting/solutions.json")
+        solution = _solution_by_title(solutions_data, solution_title)
+        refusal = _resolution_refusal(solutions_data, solution_title, solution, tool_context)
+        if refusal:
+            return refusal
+        occurrence = await asyncio.to_thread(occurrence_store.mark_resolved, fingerprint(error_message),
+                                             normalize_trace(error_message), solution["title"])
+        return _describe_resolution(occurrence, solution)
     except Exception as e:
         return {
             "status": "error",
-            "error_message": f"Failed to find solutions: {str(e)}"
+            "error_message": f"Failed to mark error resolved: {str(e)}"
+        }
+
+def _solution_by_title(solutions_data: dict, solution_title: str):
+    """The solutions.json entry with a title (case-insensitive), or None"""
+    title_lower = solution_title.strip().lower()
+    for solution in solutions_data.get("solutions", []):
+        if solution.get("title", "").lower() == title_lower:
+            return solution
+    return None
+
+def _may_record_resolutions(tool_context) -> bool:
+    """Whether the user behind a tool call is listed in ERROR_RESOLUTION_EDITORS"""
+    if tool_context is None:
+        return False
+    editors = {editor.strip() for editor in os.getenv("ERROR_RESOLUTION_EDITORS", "").split(",") if editor.strip()}
+    # ReadonlyContext.user_id only exists in newer google-adk releases
+    user_id = getattr(tool_context, "user_id", None) or tool_context._invocation_context.user_id
+    return user_id in editors
+
+def _resolution_refusal(solutions_data: dict, solution_title: str, solution, tool_context) -> dict:
+    """
+    Explain why a resolution cannot be recorded
+
+    The resolution is shared by every conversation, so only listed
+    maintainers may record one.
+
+    Returns:
+        Dict: Error response, or None if the resolution can be recorded
+    """
+    if occurrence_store is None:
+        return {
+            "status": "error",
+            "error_message": "Error occurrence tracking is not enabled (ERROR_OCCURRENCE_TRACKING=true)"
+        }
+    if not _may_record_resolutions(tool_context):
+        return {
+            "status": "error",
+            "error_message": ("Only troubleshooting maintainers can record a known fix; "
+                              "ask one to confirm it with mark_error_resolved")
+        }
+    if solution is None:
+        return {
+            "status": "error",
+            "error_message": f"No solution titled '{solution_title}'",
+            "available_solutions": [solution.get("title", "") for solution in solutions_data.get("solutions", [])]
+        }
+    return None
+
+def _describe_resolution(occurrence: dict, solution: dict) -> dict:
+    """Confirm a recorded resolution"""
+    if occurrence is None:
+        return {
+            "status": "error",
+            "error_message": "Failed to mark error resolved: the occurrence could not be stored"
         }
+    return {
+        "status": "success",
+        "solution_title": solution.get("title", ""),
+        "occurrence": _describe_occurrence(occurrence)
+    }
 
 def run_diagnostics(component: str = "system", check_type: str = "basic") -> dict:
     """Run diagnostic checks on system components and services.
@@ -177,91 +684,105 @@ def run_diagnostics(component: str = "system", check_type: str = "basic") -> dic
     """
     try:
         diagnostics_data = loader.load_data("troubleshooting/diagnostics.json")
-        
-        # Get diagnostic checks for the specified component
-        component_checks = diagnostics_data.get("components", {}).get(component, {})
-        
-        if not component_checks:
-            available_components = list(diagnostics_data.get("components", {}).keys())
-            return {
-                "status": "error",
-                "error_message": f"Component '{component}' not available for diagnostics",
-                "available_components": available_components
-            }
-        
-        # Get checks based on type
-        checks_to_run = component_checks.get(check_type, {})
-        
-        if not checks_to_run:
-            available_check_types = list(component_checks.keys())
-            return {
-                "status": "error",
-                "error_message": f"Check type '{check_type}' not available for component '{component}'",
-                "available_check_types": available_check_types
-            }
-        
-        # Simulate running checks (with mock results)
-        diagnostic_results = {
-            "status": "success",
-            "component": component,
-            "check_type": check_type,
-            "timestamp": "2025-01-01T12:00:00Z",
-            "overall_status": "healthy",
-            "checks_performed": [],
-            "issues_found": [],
-            "recommendations": []
-        }
-        
-        # Process each check
-        total_checks = len(checks_to_run.get("checks", []))
-        passed_checks = 0
-        
-        for check in checks_to_run.get("checks", []):
-            # Simulate check execution with mock results
-            check_result = {
-                "name": check.get("name", ""),
-                "description": check.get("description", ""),
-                "status": check.get("mock_status", "pass"),  # Mock status for demo
-                "value": check.get("mock_value", "OK"),
-                "expected": check.get("expected", ""),
-                "message": check.get("mock_message", "Check completed successfully")
-            }
-            
-            diagnostic_results["checks_performed"].append(check_result)
-            
-            if check_result["status"] == "pass":
-                passed_checks += 1
-            else:
-                # Add to issues if check failed
-                diagnostic_results["issues_found"].append({
-                    "check": check_result["name"],
-                    "issue": check_result["message"],
-                    "severity": check.get("severity", "medium"),
-                    "suggested_action": check.get("suggested_action", "Review check details")
-                })
-        
-        # Determine overall status
-        if passed_checks == total_checks:
-            diagnostic_results["overall_status"] = "healthy"
-        elif passed_checks >= total_checks * 0.8:
-            diagnostic_results["overall_status"] = "warning"
-        else:
-            diagnostic_results["overall_status"] = "critical"
-        
-        # Add general recommendations
-        diagnostic_results["recommendations"] = checks_to_run.get("recommendations", [])
-        
-        # Add summary
-        diagnostic_results["summary"] = {
-            "total_checks": total_checks,
-            "passed_checks": passed_checks,
-            "failed_checks": total_checks - passed_checks,
-            "health_score": int((passed_checks / total_checks) * 100) if total_checks > 0 else 0
+        return _run_diagnostics(diagnostics_data, component, check_type)
+    except Exception as e:
+        return {
+            "status": "error",
+            "error_message": f"Failed to run diagnostics: {str(e)}"
         }
-        
-        return diagnostic_results
+
+@async_variant_of(run_diagnostics)
+async def run_diagnostics_async(component: str = "system", check_type: str = "basic") -> dict:
+    try:
+        diagnostics_data = await async_loader.load_data("troubleshooting/diagnostics.json")
+        return _run_diagnostics(diagnostics_data, component, check_type)
     except Exception as e:
         return {
             "status": "error",
             "error_message": f"Failed to run diagnostics: {str(e)}"
         }
+
+def _run_diagnostics(diagnostics_data: dict, component: str, check_type: str) -> dict:
+    """Evaluate the configured diagnostic checks for a component"""
+    # Get diagnostic checks for the specified component
+    component_checks = diagnostics_data.get("components", {}).get(component, {})
+
+    if not component_checks:
+        available_components = list(diagnostics_data.get("components", {}).keys())
+        return {
+            "status": "error",
+            "error_message": f"Component '{component}' not available for diagnostics",
+            "available_components": available_components
+        }
+
+    # Get checks based on type
+    checks_to_run = component_checks.get(check_type, {})
+
+    if not checks_to_run:
+        available_check_types = list(component_checks.keys())
+        return {
+            "status": "error",
+            "error_message": f"Check type '{check_type}' not available for component '{component}'",
+            "available_check_types": available_check_types
+        }
+
+    # Simulate running checks (with mock results)
+    diagnostic_results = {
+        "status": "success",
+        "component": component,
+        "check_type": check_type,
+        "timestamp": "2025-01-01T12:00:00Z",
+        "overall_status": "healthy",
+        "checks_performed": [],
+        "issues_found": [],
+        "recommendations": []
+    }
+
+    # Process each check
+    total_checks = len(checks_to_run.get("checks", []))
+    passed_checks = 0
+
+    for check in checks_to_run.get("checks", []):
+        # Simulate check execution with mock results
+        check_result = {
+            "name": check.get("name", ""),
+            "description": check.get("description", ""),
+            "status": check.get("mock_status", "pass"),  # Mock status for demo
+            "value": check.get("mock_value", "OK"),
+            "expected": check.get("expected", ""),
+            "message": check.get("mock_message", "Check completed successfully")
+        }
+
+        diagnostic_results["checks_performed"].append(check_result)
+
+        if check_result["status"] == "pass":
+            passed_checks += 1
+        else:
+            # Add to issues if check failed
+            diagnostic_results["issues_found"].append({
+                "check": check_result["name"],
+                "issue": check_result["message"],
+                "severity": check.get("severity", "medium"),
+                "suggested_action": check.get("suggested_action", "Review check details")
+            })
+
+    # Determine overall status
+    if passed_checks == total_checks:
+        diagnostic_results["overall_status"] = "healthy"
+    elif passed_checks >= total_checks * 0.8:
+        diagnostic_results["overall_status"] = "warning"
+    else:
+        diagnostic_results["overall_status"] = "critical"
+
+    # Add general recommendations
+    diagnostic_results["recommendations"] = checks_to_run.get("recommendations", [])
+
+    # Add summary
+    diagnostic_results["summary"] = {
+        "total_checks": total_checks,
+        "passed_checks": passed_checks,
+        "failed_checks": total_checks - passed_checks,
+        "health_score": int((passed_checks / total_checks) * 100) if total_checks > 0 else 0
+    }
+
+    return diagnostic_results
\ No newline at end of file